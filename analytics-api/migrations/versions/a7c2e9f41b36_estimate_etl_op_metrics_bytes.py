@@ -0,0 +1,36 @@
+"""estimate_etl_op_metrics_bytes
+
+The etl no longer measures the parameter bytes of each statement, which cost as much as
+the batch loads it measured; it estimates the traffic from the statement text instead.
+The column is renamed to say so.
+
+Revision ID: a7c2e9f41b36
+Revises: f1c3d8a6b274
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c2e9f41b36'
+down_revision = 'f1c3d8a6b274'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column('etl_op_metrics', 'db_bytes_sent', new_column_name='db_bytes_sent_estimate',
+                    existing_type=sa.BigInteger(), existing_nullable=True,
+                    comment='Statement text length times the parameter sets sent, an estimate of the '
+                            'traffic to the databases.',
+                    existing_comment='Statement and parameter bytes sent to the databases.')
+
+
+def downgrade():
+    op.alter_column('etl_op_metrics', 'db_bytes_sent_estimate', new_column_name='db_bytes_sent',
+                    existing_type=sa.BigInteger(), existing_nullable=True,
+                    comment='Statement and parameter bytes sent to the databases.',
+                    existing_comment='Statement text length times the parameter sets sent, an estimate of the '
+                                     'traffic to the databases.')
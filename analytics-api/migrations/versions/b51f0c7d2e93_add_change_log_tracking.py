@@ -0,0 +1,38 @@
+"""add_change_log_tracking
+
+Columns the ETL needs to consume the met-api change_log: the transaction horizon each
+run cycle read up to, and the source submission of every loaded response so an
+edited or deleted submission can have its earlier rows deactivated.
+
+Revision ID: b51f0c7d2e93
+Revises: 96878b3a07fd
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b51f0c7d2e93'
+down_revision = '96878b3a07fd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('etl_runcycle', sa.Column('change_log_horizon', sa.BigInteger(), nullable=True))
+    op.add_column('response_type_option', sa.Column('source_submission_id', sa.Integer(), nullable=True))
+    op.create_index('ix_response_type_option_source_submission_id', 'response_type_option',
+                    ['source_submission_id'], unique=False)
+    op.add_column('user_response_detail', sa.Column('source_submission_id', sa.Integer(), nullable=True))
+    op.create_index('ix_user_response_detail_source_submission_id', 'user_response_detail',
+                    ['source_submission_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_user_response_detail_source_submission_id', table_name='user_response_detail')
+    op.drop_column('user_response_detail', 'source_submission_id')
+    op.drop_index('ix_response_type_option_source_submission_id', table_name='response_type_option')
+    op.drop_column('response_type_option', 'source_submission_id')
+    op.drop_column('etl_runcycle', 'change_log_horizon')
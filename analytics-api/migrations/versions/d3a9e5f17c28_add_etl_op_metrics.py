@@ -0,0 +1,49 @@
+"""add_etl_op_metrics
+
+Per op timings, row counts and database traffic recorded by each etl run, so a
+regressing stage can be spotted as the data grows.
+
+Revision ID: d3a9e5f17c28
+Revises: b51f0c7d2e93
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a9e5f17c28'
+down_revision = 'b51f0c7d2e93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'etl_op_metrics',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('runcycle_id', sa.Integer(), nullable=True),
+        sa.Column('run_id', sa.String(length=64), nullable=True, comment='Dagster run id.'),
+        sa.Column('packagename', sa.String(length=100), nullable=True),
+        sa.Column('op_name', sa.String(length=100), nullable=True),
+        sa.Column('startdatetime', sa.DateTime(), nullable=True),
+        sa.Column('duration_seconds', sa.Float(), nullable=True),
+        sa.Column('rows_in', sa.Integer(), nullable=True),
+        sa.Column('rows_out', sa.Integer(), nullable=True),
+        sa.Column('db_round_trips', sa.Integer(), nullable=True),
+        sa.Column('db_bytes_sent', sa.BigInteger(), nullable=True,
+                  comment='Statement and parameter bytes sent to the databases.'),
+        sa.Column('success', sa.Boolean(), nullable=True),
+        sa.Column('error', sa.String(length=3000), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_etl_op_metrics_runcycle_id'), 'etl_op_metrics', ['runcycle_id'], unique=False)
+    op.create_index('ix_etl_op_metrics_op_name_startdatetime', 'etl_op_metrics', ['op_name', 'startdatetime'],
+                    unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_etl_op_metrics_op_name_startdatetime', table_name='etl_op_metrics')
+    op.drop_index(op.f('ix_etl_op_metrics_runcycle_id'), table_name='etl_op_metrics')
+    op.drop_table('etl_op_metrics')
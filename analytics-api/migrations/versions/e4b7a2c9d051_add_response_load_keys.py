@@ -0,0 +1,54 @@
+"""add_response_load_keys
+
+Unique keys on the active rows loaded from a submission, so reloading a submission
+(e.g. retrying a run that failed part way) updates the rows loaded before instead of
+duplicating them. Duplicates already loaded are deactivated, keeping the latest copy.
+
+Revision ID: e4b7a2c9d051
+Revises: d3a9e5f17c28
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b7a2c9d051'
+down_revision = 'd3a9e5f17c28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        UPDATE response_type_option AS response SET is_active = false
+        FROM (
+            SELECT id, request_key, row_number() OVER (
+                PARTITION BY source_submission_id, request_key, md5(coalesce(value, '')) ORDER BY id DESC) AS copy
+            FROM response_type_option
+            WHERE is_active AND source_submission_id IS NOT NULL
+        ) AS duplicate
+        WHERE response.id = duplicate.id AND response.request_key = duplicate.request_key AND duplicate.copy > 1
+    """)
+    # the value is hashed to keep free text values from going over the btree entry size limit
+    op.create_index('ux_response_type_option_submission_key', 'response_type_option',
+                    ['source_submission_id', 'request_key', sa.text("md5(coalesce(value, ''))")],
+                    unique=True, postgresql_where=sa.text('is_active'))
+
+    op.execute("""
+        UPDATE user_response_detail AS detail SET is_active = false
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY source_submission_id ORDER BY id DESC) AS copy
+            FROM user_response_detail
+            WHERE is_active AND source_submission_id IS NOT NULL
+        ) AS duplicate
+        WHERE detail.id = duplicate.id AND duplicate.copy > 1
+    """)
+    op.create_index('ux_user_response_detail_source_submission_id', 'user_response_detail',
+                    ['source_submission_id'], unique=True, postgresql_where=sa.text('is_active'))
+
+
+def downgrade():
+    op.drop_index('ux_user_response_detail_source_submission_id', table_name='user_response_detail')
+    op.drop_index('ux_response_type_option_submission_key', table_name='response_type_option')
@@ -0,0 +1,54 @@
+"""add_package_watermark
+
+One row per etl package with its high-water mark (last successful run cycle, its end
+time and change log horizon) and the run currently loading it, so a run looks up where
+to start from without aggregating the whole run cycle table. The run cycle id sequence
+is moved past the ids the etl used to allocate itself.
+
+Revision ID: f1c3d8a6b274
+Revises: e4b7a2c9d051
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c3d8a6b274'
+down_revision = 'e4b7a2c9d051'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'package_watermark',
+        sa.Column('packagename', sa.String(length=100), nullable=False),
+        sa.Column('last_runcycle_id', sa.Integer(), nullable=True,
+                  comment='Last successful run cycle of the package.'),
+        sa.Column('last_enddatetime', sa.DateTime(), nullable=True,
+                  comment='End time of the last successful run cycle.'),
+        sa.Column('change_log_horizon', sa.BigInteger(), nullable=True,
+                  comment='met-api change_log horizon the package has loaded up to.'),
+        sa.Column('running_runcycle_id', sa.Integer(), nullable=True,
+                  comment='Run cycle currently loading the package.'),
+        sa.Column('running_run_id', sa.String(length=64), nullable=True,
+                  comment='Dagster run currently loading the package.'),
+        sa.Column('updated_date', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('packagename'),
+    )
+    op.execute("""
+        INSERT INTO package_watermark (packagename, last_runcycle_id, last_enddatetime, change_log_horizon,
+                                       updated_date)
+        SELECT packagename, max(id), max(enddatetime), max(change_log_horizon), now()
+        FROM etl_runcycle
+        WHERE success AND packagename IS NOT NULL
+        GROUP BY packagename
+    """)
+    op.execute("SELECT setval(pg_get_serial_sequence('etl_runcycle', 'id'), "
+               "(SELECT coalesce(max(id), 0) + 1 FROM etl_runcycle), false)")
+
+
+def downgrade():
+    op.drop_table('package_watermark')
@@ -11,7 +11,7 @@ from flask_cors import CORS
 
 from analytics_api.auth import jwt
 from analytics_api.config import get_named_config
-from analytics_api.models import db, ma, migrate
+from analytics_api.models import db, ma, migrate, replica
 from analytics_api.utils.util import allowedorigins
 
 
@@ -47,7 +47,8 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'development')):
     if os.getenv('FLASK_ENV', 'production') != 'testing':
         setup_jwt_manager(app, jwt)
 
-    # Database connection initialize
+    # Database connection initialize, with the read replica if there is one
+    replica.init_app(app)
     db.init_app(app)
 
     # Database migrate initialize
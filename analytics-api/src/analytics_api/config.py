@@ -67,6 +67,12 @@ class _Config():  # pylint: disable=too-few-public-methods
     )
     SQLALCHEMY_ECHO = False
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Optional read replica for the read-only service methods, see analytics_api.models.replica.
+    # Queries go to the primary while it is more than DB_REPLICA_MAX_LAG seconds behind, checked
+    # every DB_REPLICA_LAG_CHECK_INTERVAL seconds.
+    DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL', '')
+    DB_REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', '5'))
+    DB_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_LAG_CHECK_INTERVAL', '5'))
 
     # JWT_OIDC Settings
     JWT_OIDC_WELL_KNOWN_CONFIG = os.getenv('JWT_OIDC_WELL_KNOWN_CONFIG')
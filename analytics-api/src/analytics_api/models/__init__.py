@@ -22,5 +22,7 @@ from .user_details import UserDetails
 from .user_feedback import UserFeedback
 from .user_response_detail import UserResponseDetail
 from .etlruncycle import EtlRunCycle
+from .etl_op_metrics import EtlOpMetrics
+from .package_watermark import PackageWatermark
 from .request_type_option import RequestTypeOption
 from .response_type_option import ResponseTypeOption
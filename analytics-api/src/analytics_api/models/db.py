@@ -6,9 +6,12 @@ from flask_marshmallow import Marshmallow
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
+from .replica import RoutingSession
+
 # DB initialize in __init__ file
 # db variable use for create models from here
-db = SQLAlchemy()
+# queries of read_only blocks run on the replica, see replica
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Migrate initialize in __init__ file
 # Migrate database config
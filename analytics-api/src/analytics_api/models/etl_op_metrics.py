@@ -0,0 +1,29 @@
+"""etl_op_metrics model class.
+
+Manages the per op performance metrics of the etl runs
+"""
+from datetime import datetime
+
+from .db import db
+
+
+class EtlOpMetrics(db.Model):  # pylint: disable=too-few-public-methods
+    """Definition of the etl op metrics entity."""
+
+    __tablename__ = 'etl_op_metrics'
+    __table_args__ = (db.Index('ix_etl_op_metrics_op_name_startdatetime', 'op_name', 'startdatetime'),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    runcycle_id = db.Column(db.Integer, index=True)
+    run_id = db.Column(db.String(64), comment='Dagster run id.')
+    packagename = db.Column(db.String(100))
+    op_name = db.Column(db.String(100))
+    startdatetime = db.Column(db.DateTime, default=datetime.utcnow)
+    duration_seconds = db.Column(db.Float)
+    rows_in = db.Column(db.Integer)
+    rows_out = db.Column(db.Integer)
+    db_round_trips = db.Column(db.Integer)
+    db_bytes_sent_estimate = db.Column(db.BigInteger, comment='Statement text length times the parameter sets sent, '
+                                                              'an estimate of the traffic to the databases.')
+    success = db.Column(db.Boolean())
+    error = db.Column(db.String(3000))
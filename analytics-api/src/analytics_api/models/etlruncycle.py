@@ -19,3 +19,5 @@ class EtlRunCycle(db.Model):  # pylint: disable=too-few-public-methods
     enddatetime = db.Column(db.DateTime, default=datetime.utcnow)
     description = db.Column(db.String(3000))
     success = db.Column(db.Boolean(), default=True)
+    # met-api change_log transactions below this id had been read when the run cycle started
+    change_log_horizon = db.Column(db.BigInteger)
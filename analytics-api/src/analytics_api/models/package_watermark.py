@@ -0,0 +1,21 @@
+"""package_watermark model class.
+
+Manages how far each etl package has loaded and which run is loading it
+"""
+from datetime import datetime
+
+from .db import db
+
+
+class PackageWatermark(db.Model):  # pylint: disable=too-few-public-methods
+    """Definition of the package watermark entity."""
+
+    __tablename__ = 'package_watermark'
+
+    packagename = db.Column(db.String(100), primary_key=True)
+    last_runcycle_id = db.Column(db.Integer, comment='Last successful run cycle of the package.')
+    last_enddatetime = db.Column(db.DateTime, comment='End time of the last successful run cycle.')
+    change_log_horizon = db.Column(db.BigInteger, comment='met-api change_log horizon the package has loaded up to.')
+    running_runcycle_id = db.Column(db.Integer, comment='Run cycle currently loading the package.')
+    running_run_id = db.Column(db.String(64), comment='Dagster run currently loading the package.')
+    updated_date = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
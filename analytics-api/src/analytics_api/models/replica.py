@@ -0,0 +1,95 @@
+"""Route read-only queries to the read replica.
+
+Service methods marked with read_only run their queries on DATABASE_REPLICA_URL when it is set:
+
+    @staticmethod
+    @read_only()
+    def get_survey_result(engagement_id, can_view_all_survey_results):
+        ...
+
+Everything else, and every write, runs on the primary. Once a session has written, or while
+the replica is more than DB_REPLICA_MAX_LAG seconds behind the primary, read-only queries run
+on the primary too. Without a replica configured read_only changes nothing.
+"""
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Tuple
+
+from flask import Flask, current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import exc, text
+from sqlalchemy.engine import Engine
+
+
+REPLICA = 'replica'
+
+# Seconds the replica is behind the primary, 0 when it has replayed everything it received
+REPLICA_LAG_SQL = text(
+    'select case when not pg_is_in_recovery() or pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() then 0 '
+    'else coalesce(extract(epoch from now() - pg_last_xact_replay_timestamp()), 0) end'
+)
+
+_read_only: ContextVar[bool] = ContextVar('read_only', default=False)
+# When each replica engine's lag was last checked, and the lag found
+_lag_checks: Dict[Engine, Tuple[float, float]] = {}
+
+
+class RoutingSession(Session):  # pylint: disable=too-few-public-methods
+    """A session that runs the queries of read_only blocks on the replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """Return the replica engine for read-only queries, the primary otherwise."""
+        if bind is None and (self._flushing or getattr(clause, 'is_dml', False)):
+            # whether or not it ran in a read_only block, the rest of the session reads from the primary,
+            # where this write will be
+            self.info['wrote'] = True
+        elif bind is None and _read_only.get() and not self.info.get('wrote'):
+            engine = self._db.engines.get(REPLICA)
+            if engine is not None and replica_lag(engine) <= current_app.config['DB_REPLICA_MAX_LAG']:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@contextmanager
+def read_only() -> Iterator[None]:
+    """Run the queries of the block, or of the decorated function, on the replica if there is one."""
+    token = _read_only.set(True)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
+
+
+def replica_lag(engine: Engine) -> float:
+    """Return how many seconds the replica is behind, checked at most every DB_REPLICA_LAG_CHECK_INTERVAL seconds.
+
+    A replica that can't be reached counts as infinitely behind.
+    """
+    now = time.monotonic()
+    checked = _lag_checks.get(engine)
+    if checked is not None and now - checked[0] < current_app.config['DB_REPLICA_LAG_CHECK_INTERVAL']:
+        return checked[1]
+    try:
+        with engine.connect() as connection:
+            lag = float(connection.execute(REPLICA_LAG_SQL).scalar())
+    except exc.SQLAlchemyError as err:
+        current_app.logger.warning(f'Could not check the replica lag, reading from the primary: {err}')
+        lag = math.inf
+    if lag > current_app.config['DB_REPLICA_MAX_LAG']:
+        current_app.logger.warning(f'The replica is {lag:.1f}s behind, reading from the primary')
+    _lag_checks[engine] = (now, lag)
+    return lag
+
+
+def init_app(app: Flask):
+    """Register the replica bind when DATABASE_REPLICA_URL is set.
+
+    Must run before db.init_app, which creates the engines from this configuration.
+    """
+    replica_uri = app.config.get('DATABASE_REPLICA_URL')
+    if replica_uri:
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        binds.setdefault(REPLICA, {'url': replica_uri, 'pool_pre_ping': True})
+        app.config['SQLALCHEMY_BINDS'] = binds
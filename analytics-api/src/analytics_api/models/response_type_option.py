@@ -3,6 +3,7 @@
 Manages the responses for a option type questions on a survey
 """
 from .base_model import BaseModel
+from .db import db
 from .response_mixin import ResponseMixin
 
 
@@ -10,3 +11,9 @@ class ResponseTypeOption(BaseModel, ResponseMixin):  # pylint: disable=too-few-p
     """Definition of the Response Type Option entity."""
 
     __tablename__ = 'response_type_option'
+    # one active row per answer of a submission, the key the etl upserts on
+    __table_args__ = (db.Index('ux_response_type_option_submission_key', 'source_submission_id', 'request_key',
+                               db.text("md5(coalesce(value, ''))"), unique=True,
+                               postgresql_where=db.text('is_active')),)
+
+    source_submission_id = db.Column(db.Integer, index=True)
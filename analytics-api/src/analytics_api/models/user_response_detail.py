@@ -14,11 +14,15 @@ class UserResponseDetail(BaseModel):  # pylint: disable=too-few-public-methods
     """Definition of the User Response Detail entity."""
 
     __tablename__ = 'user_response_detail'
+    # one active row per submission, the key the etl upserts on
+    __table_args__ = (db.Index('ux_user_response_detail_source_submission_id', 'source_submission_id', unique=True,
+                               postgresql_where=db.text('is_active')),)
 
     id = db.Column(db.Integer, primary_key=True, nullable=False)
     survey_id = db.Column(db.Integer, ForeignKey('survey.id', ondelete='CASCADE'), nullable=False)
     engagement_id = db.Column(db.Integer)
     participant_id = db.Column(db.Integer)
+    source_submission_id = db.Column(db.Integer, index=True)
 
     @classmethod
     def get_response_count(
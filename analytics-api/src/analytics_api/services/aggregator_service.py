@@ -1,5 +1,6 @@
 """Service to get counts for dashboard."""
 from analytics_api.models.email_verification import EmailVerification as EmailVerificationModel
+from analytics_api.models.replica import read_only
 from analytics_api.models.user_response_detail import UserResponseDetail as UserResponseDetailModel
 from analytics_api.utils import engagement_access_validator
 
@@ -10,6 +11,7 @@ class AggregatorService:  # pylint: disable=too-few-public-methods
     otherdateformat = '%Y-%m-%d'
 
     @staticmethod
+    @read_only()
     def get_count(engagement_id, count_for=''):
         """Get total count for an engagement id."""
         if engagement_access_validator.check_engagement_access(engagement_id):
@@ -1,5 +1,6 @@
 """Service for engagement management."""
 from analytics_api.models.engagement import Engagement as EngagementModel
+from analytics_api.models.replica import read_only
 from analytics_api.schemas.engagement import EngagementSchema
 from analytics_api.schemas.map_data import MapDataSchema
 from analytics_api.utils import engagement_access_validator
@@ -11,6 +12,7 @@ class EngagementService:  # pylint: disable=too-few-public-methods
     otherdateformat = '%Y-%m-%d'
 
     @staticmethod
+    @read_only()
     def get_engagement(engagement_id) -> EngagementSchema:
         """Get Engagement by the id."""
         if engagement_access_validator.check_engagement_access(engagement_id):
@@ -20,6 +22,7 @@ class EngagementService:  # pylint: disable=too-few-public-methods
         return {}
 
     @staticmethod
+    @read_only()
     def get_engagement_map_data(engagement_id) -> MapDataSchema:
         """Get Map data by the engagement id."""
         if engagement_access_validator.check_engagement_access(engagement_id):
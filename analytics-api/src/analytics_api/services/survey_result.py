@@ -1,4 +1,5 @@
 """Service for survey result management."""
+from analytics_api.models.replica import read_only
 from analytics_api.models.request_type_option import RequestTypeOption as RequestTypeOptionModel
 from analytics_api.schemas.survey_result import SurveyResultSchema
 from analytics_api.utils import engagement_access_validator
@@ -10,6 +11,7 @@ class SurveyResultService:  # pylint: disable=too-few-public-methods
     otherdateformat = '%Y-%m-%d'
 
     @staticmethod
+    @read_only()
     def get_survey_result(engagement_id, can_view_all_survey_results) -> SurveyResultSchema:
         """Get Survey result by the engagement id."""
         if engagement_access_validator.check_engagement_access(engagement_id):
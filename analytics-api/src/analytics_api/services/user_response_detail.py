@@ -1,4 +1,5 @@
 """Service for user response detail management."""
+from analytics_api.models.replica import read_only
 from analytics_api.models.user_response_detail import UserResponseDetail as UserResponseDetailModel
 from analytics_api.utils import engagement_access_validator
 
@@ -9,6 +10,7 @@ class UserResponseDetailService:
     otherdateformat = '%Y-%m-%d'
 
     @staticmethod
+    @read_only()
     def get_response_count_by_created_month(engagement_id, search_options=None):
         """Get user response count for an engagement id grouped by created month."""
         if engagement_access_validator.check_engagement_access(engagement_id):
@@ -18,6 +20,7 @@ class UserResponseDetailService:
         return {}
 
     @staticmethod
+    @read_only()
     def get_response_count_by_created_week(engagement_id, search_options=None):
         """Get user response count for an engagement id grouped by created week."""
         if engagement_access_validator.check_engagement_access(engagement_id):
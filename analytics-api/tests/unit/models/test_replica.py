@@ -0,0 +1,83 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for routing read-only queries to the read replica."""
+from flask import Flask
+from sqlalchemy import select, update
+
+from analytics_api.models import db
+from analytics_api.models.engagement import Engagement as EngagementModel
+from analytics_api.models.replica import REPLICA, RoutingSession, init_app, read_only
+
+
+def _replica_app(app):
+    """Return an app whose replica is a second URI on the test database."""
+    replica_app = Flask(__name__)
+    replica_app.config.from_mapping(app.config)
+    replica_app.config['SQLALCHEMY_BINDS'] = {}
+    replica_app.config['DATABASE_REPLICA_URL'] = app.config['SQLALCHEMY_DATABASE_URI']
+    init_app(replica_app)
+    db.init_app(replica_app)
+    return replica_app
+
+
+def test_read_only_routing(app):
+    """Assert that read-only queries run on the replica until the session writes."""
+    with _replica_app(app).app_context():
+        session = RoutingSession(db)
+        query = select(EngagementModel)
+        try:
+            assert session.get_bind(clause=query) is db.engine
+            with read_only():
+                assert session.get_bind(clause=query) is db.engines[REPLICA]
+                assert session.get_bind(clause=update(EngagementModel).values(name='x')) is db.engine
+                # the session reads its own write from the primary
+                assert session.get_bind(clause=query) is db.engine
+        finally:
+            session.close()
+
+
+def test_read_only_after_write(app):
+    """Assert that read-only queries run on the primary once the session has written outside read_only."""
+    with _replica_app(app).app_context():
+        session = RoutingSession(db)
+        try:
+            assert session.get_bind(clause=update(EngagementModel).values(name='x')) is db.engine
+            with read_only():
+                assert session.get_bind(clause=select(EngagementModel)) is db.engine
+        finally:
+            session.close()
+
+
+def test_read_only_lagging_replica(app):
+    """Assert that read-only queries run on the primary while the replica lags too far behind."""
+    replica_app = _replica_app(app)
+    replica_app.config['DB_REPLICA_MAX_LAG'] = -1
+    with replica_app.app_context():
+        session = RoutingSession(db)
+        try:
+            with read_only():
+                assert session.get_bind(clause=select(EngagementModel)) is db.engine
+        finally:
+            session.close()
+
+
+def test_read_only_without_replica(app):
+    """Assert that read_only changes nothing when no replica is configured."""
+    with app.app_context():
+        session = RoutingSession(db)
+        try:
+            with read_only():
+                assert session.get_bind(clause=select(EngagementModel)) is db.engine
+        finally:
+            session.close()
@@ -1,4 +1,5 @@
 #!/bin/sh
 
 echo 'starting application'
-gunicorn --bind 0.0.0.0:8080 --timeout 60 --workers 3  wsgi:application
+export GUNICORN_PROCESSES="${GUNICORN_PROCESSES:-3}"
+gunicorn --config gunicorn_config.py --bind 0.0.0.0:8080 --timeout 60 wsgi:application
@@ -20,6 +20,27 @@ import os
 
 workers = int(os.environ.get('GUNICORN_PROCESSES', '1'))  # pylint: disable=invalid-name
 threads = int(os.environ.get('GUNICORN_THREADS', '1'))  # pylint: disable=invalid-name
+# gthread serves the threads of a worker; with a single thread the plain sync worker is enough
+DEFAULT_WORKER_CLASS = 'gthread' if threads > 1 else 'sync'
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', DEFAULT_WORKER_CLASS)  # pylint: disable=invalid-name
+
+# Create the app once in the master and fork the workers from it, sharing its memory. The
+# database pool is sized per worker from GUNICORN_THREADS, see DB_POOL_SIZE in config.py.
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'false').lower() == 'true'  # pylint: disable=invalid-name
 
 forwarded_allow_ips = '*'  # pylint: disable=invalid-name
 secure_scheme_headers = {'X-Forwarded-Proto': 'https'}  # pylint: disable=invalid-name
+
+
+def when_ready(server):
+    """Warm the preloaded app up before the first worker is forked."""
+    if preload_app:
+        from met_api.utils.prefork import warm_up  # pylint: disable=import-outside-toplevel
+        warm_up(server.app.wsgi())
+
+
+def post_fork(server, worker):  # pylint: disable=unused-argument
+    """Reopen the connections and pools a worker must not share with the master."""
+    if preload_app:
+        from met_api.utils.prefork import reinitialize_after_fork  # pylint: disable=import-outside-toplevel
+        reinitialize_after_fork(server.app.wsgi())
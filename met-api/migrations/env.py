@@ -81,6 +81,8 @@ def run_migrations_online():
         )
 
         with context.begin_transaction():
+            # index builds and table rewrites may outlast any statement timeout set for the app's requests
+            connection.exec_driver_sql('SET statement_timeout = 0')
             context.run_migrations()
 
 
@@ -0,0 +1,94 @@
+"""add_change_log
+
+A trigger-maintained log of inserts, updates and deletes on the tables the analytics
+ETL extracts. met-etl reads it incrementally instead of polling created_date and
+updated_date, so edits, review status changes and deletes reach analytics too.
+
+Changes to engagement_settings and widget_map are logged as updates of their
+engagement, since the ETL folds them into the engagement row.
+
+Revision ID: 4c2d8e61b9a0
+Revises: 9b3e4f2a7c15
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '4c2d8e61b9a0'
+down_revision = '9b3e4f2a7c15'
+branch_labels = None
+depends_on = None
+
+# table -> (entity type, column holding the entity id, logged as a change of its parent)
+TRACKED_TABLES = {
+    'participant': ('participant', 'id', False),
+    'engagement': ('engagement', 'id', False),
+    'engagement_settings': ('engagement', 'engagement_id', True),
+    'widget_map': ('engagement', 'engagement_id', True),
+    'survey': ('survey', 'id', False),
+    'report_setting': ('report_setting', 'id', False),
+    'submission': ('submission', 'id', False),
+    'email_verification': ('email_verification', 'id', False),
+}
+
+LOG_CHANGE_FUNCTION = """
+CREATE OR REPLACE FUNCTION log_entity_change() RETURNS trigger AS $$
+DECLARE
+    row_data jsonb;
+    entity_id integer;
+    operation varchar(6) := TG_OP;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row_data := to_jsonb(OLD);
+    ELSE
+        row_data := to_jsonb(NEW);
+        IF TG_OP = 'UPDATE' AND row_data = to_jsonb(OLD) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    entity_id := (row_data ->> TG_ARGV[1])::integer;
+    IF entity_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- any change to a child row is an update of the parent entity
+    IF TG_ARGV[2]::boolean THEN
+        operation := 'UPDATE';
+    END IF;
+
+    INSERT INTO change_log (entity_type, entity_id, operation) VALUES (TG_ARGV[0], entity_id, operation);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade():
+    op.create_table(
+        'change_log',
+        sa.Column('seq', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('entity_type', sa.String(length=50), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('operation', sa.String(length=6), nullable=False),
+        sa.Column('txid', sa.BigInteger(), server_default=sa.text('txid_current()'), nullable=False),
+        sa.Column('changed_date', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('seq'),
+    )
+    op.create_index('ix_change_log_entity_type_txid', 'change_log', ['entity_type', 'txid'], unique=False)
+
+    op.execute(sa.text(LOG_CHANGE_FUNCTION))
+    for table, (entity_type, id_column, is_child) in TRACKED_TABLES.items():
+        op.execute(sa.text(
+            f'CREATE TRIGGER {table}_change_log AFTER INSERT OR UPDATE OR DELETE ON {table} '
+            f"FOR EACH ROW EXECUTE PROCEDURE log_entity_change('{entity_type}', '{id_column}', '{is_child}')"))
+
+
+def downgrade():
+    for table in TRACKED_TABLES:
+        op.execute(sa.text(f'DROP TRIGGER IF EXISTS {table}_change_log ON {table}'))
+    op.execute(sa.text('DROP FUNCTION IF EXISTS log_entity_change()'))
+    op.drop_index('ix_change_log_entity_type_txid', table_name='change_log')
+    op.drop_table('change_log')
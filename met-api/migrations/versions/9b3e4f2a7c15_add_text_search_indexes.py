@@ -0,0 +1,59 @@
+"""add_text_search_indexes
+
+Trigram GIN indexes so the '%text%' ILIKE searches on comments, engagement names and
+project metadata can use an index instead of a sequential scan, and a stored tsvector
+on comment text for ranked full-text search.
+
+Revision ID: 9b3e4f2a7c15
+Revises: 538dd25f2a13
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '9b3e4f2a7c15'
+down_revision = '538dd25f2a13'
+branch_labels = None
+depends_on = None
+
+PROJECT_METADATA_KEYS = ('type', 'project_name', 'application_number', 'client_name')
+
+
+def _trigram_available(conn):
+    return conn.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar() is not None
+
+
+def upgrade():
+    conn = op.get_bind()
+    if _trigram_available(conn):
+        op.execute(sa.text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+        op.execute(sa.text(
+            'CREATE INDEX IF NOT EXISTS ix_comment_text_trgm ON comment USING gin (text gin_trgm_ops)'))
+        op.execute(sa.text(
+            'CREATE INDEX IF NOT EXISTS ix_engagement_name_trgm ON engagement USING gin (name gin_trgm_ops)'))
+        for key in PROJECT_METADATA_KEYS:
+            op.execute(sa.text(
+                f'CREATE INDEX IF NOT EXISTS ix_engagement_metadata_{key}_trgm ON engagement_metadata '
+                f"USING gin ((project_metadata ->> '{key}') gin_trgm_ops)"))
+
+    op.add_column('comment', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', coalesce(text, ''))", persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_comment_search_vector', 'comment', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_comment_search_vector', table_name='comment')
+    op.drop_column('comment', 'search_vector')
+    for key in PROJECT_METADATA_KEYS:
+        op.execute(sa.text(f'DROP INDEX IF EXISTS ix_engagement_metadata_{key}_trgm'))
+    op.execute(sa.text('DROP INDEX IF EXISTS ix_engagement_name_trgm'))
+    op.execute(sa.text('DROP INDEX IF EXISTS ix_comment_text_trgm'))
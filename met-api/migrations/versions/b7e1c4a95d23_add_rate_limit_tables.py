@@ -0,0 +1,42 @@
+"""add_rate_limit_tables
+
+Tables for the Postgres storage backend of the rate limiter, so the limits on public
+endpoints are shared by every worker and pod instead of being counted per process.
+
+Revision ID: b7e1c4a95d23
+Revises: 4c2d8e61b9a0
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b7e1c4a95d23'
+down_revision = '4c2d8e61b9a0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'rate_limit_hit',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('key', sa.Text(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_rate_limit_hit_key_expires_at', 'rate_limit_hit', ['key', 'expires_at'], unique=False)
+    op.create_table(
+        'rate_limit_counter',
+        sa.Column('key', sa.Text(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+
+
+def downgrade():
+    op.drop_table('rate_limit_counter')
+    op.drop_index('ix_rate_limit_hit_key_expires_at', table_name='rate_limit_hit')
+    op.drop_table('rate_limit_hit')
@@ -0,0 +1,38 @@
+"""add_engagement_job_result
+
+Per-engagement results of the closeout and publish jobs' EPIC updates and closeout emails,
+so the engagements that failed can be retried on the next run.
+
+Revision ID: d3a6f18c52e7
+Revises: b7e1c4a95d23
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd3a6f18c52e7'
+down_revision = 'b7e1c4a95d23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'engagement_job_result',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('job', sa.String(length=50), nullable=False),
+        sa.Column('engagement_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('updated_date', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['engagement_id'], ['engagement.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job', 'engagement_id', name='uq_engagement_job_result_job_engagement'),
+    )
+
+
+def downgrade():
+    op.drop_table('engagement_job_result')
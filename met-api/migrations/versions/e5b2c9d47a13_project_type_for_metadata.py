@@ -0,0 +1,26 @@
+"""project type for metadata
+
+Whether the engagement's EPIC project is a project or a project notification, saved the
+first time EPIC is asked so later syncs don't probe EPIC for it again.
+
+Revision ID: e5b2c9d47a13
+Revises: d3a6f18c52e7
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e5b2c9d47a13'
+down_revision = 'd3a6f18c52e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('engagement_metadata', sa.Column('project_type', sa.String(length=20), nullable=True))
+
+
+def downgrade():
+    op.drop_column('engagement_metadata', 'project_type')
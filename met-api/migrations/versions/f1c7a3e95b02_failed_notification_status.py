@@ -0,0 +1,27 @@
+"""failed notification status
+
+A terminal status for queued emails given up on, such as closeout emails whose retries ran out,
+so they can be told apart from the ones still being sent.
+
+Revision ID: f1c7a3e95b02
+Revises: e5b2c9d47a13
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f1c7a3e95b02'
+down_revision = 'e5b2c9d47a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE notificationstatus ADD VALUE IF NOT EXISTS 'FAILED'")
+
+
+def downgrade():
+    # Postgres can't drop an enum value, put the failed mails back in the queue instead
+    op.execute("UPDATE email_queue SET notification_status = NULL WHERE notification_status = 'FAILED'")
@@ -11,11 +11,11 @@ from werkzeug.middleware.proxy_fix import ProxyFix
 
 from met_api.auth import jwt
 from met_api.config import get_named_config
-from met_api.models import db, ma, migrate
+from met_api.models import db, engine_profiles, ma, migrate
 from met_api.models.tenant import Tenant as TenantModel
-from met_api.utils import constants
+from met_api.utils import constants, request_metrics
 from met_api.utils.cache import cache
-from met_api.utils.limiter import limiter
+from met_api.utils.limiter import init_limiter
 from met_api.utils.util import allowedorigins
 
 
@@ -63,7 +63,7 @@ def create_app(run_mode: str = None):
     CORS(app, origins=allowedorigins(), supports_credentials=True)
 
     # Rate limiting on public endpoints
-    limiter.init_app(app)
+    init_limiter(app)
 
     # Register blueprints
     app.register_blueprint(API_BLUEPRINT)
@@ -72,7 +72,8 @@ def create_app(run_mode: str = None):
     if os.getenv('FLASK_ENV', 'production') != 'testing':
         setup_jwt_manager(app, jwt)
 
-    # Database connection initialize
+    # Database connection initialize, with a pool for each engine profile
+    engine_profiles.init_app(app)
     db.init_app(app)
 
     # Database migrate initialize
@@ -81,6 +82,9 @@ def create_app(run_mode: str = None):
     # Marshmallow initialize
     ma.init_app(app)
 
+    # Per-request query and outbound call metrics, a no-op unless REQUEST_METRICS_ENABLED is set
+    request_metrics.init_app(app)
+
     # Initialize analytics
     from met_api.utils.analytics import init_analytics  # pylint: disable=import-outside-toplevel
     init_analytics(app)
@@ -117,6 +117,50 @@ class _Config():  # pylint: disable=too-few-public-methods
     )
     SQLALCHEMY_ECHO = False
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Connections per worker process: one for each gunicorn thread, plus overflow for the odd request
+    # that holds a second one
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', os.getenv('GUNICORN_THREADS', '1')))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '5'))
+    # Seconds before a pooled connection is replaced, so none outlives a server or proxy idle timeout
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    # Milliseconds a statement on the default engine may run before Postgres cancels it, 0 for no limit.
+    # Migrations run on this engine too, so keep it unlimited unless they set their own.
+    DB_STATEMENT_TIMEOUT = int(os.getenv('DB_STATEMENT_TIMEOUT', '0'))
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_pre_ping': True,
+        'pool_recycle': DB_POOL_RECYCLE,
+    }
+    # Optional read replica for the profiles below that have 'replica' set, the primary when empty
+    DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL', '')
+    # Seconds the replica may be behind the primary before its queries go to the primary instead,
+    # and how often each worker checks
+    DB_REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', '5'))
+    DB_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_LAG_CHECK_INTERVAL', '5'))
+    # Named engine profiles with their own pools and statement timeouts, see met_api.models.engine_profiles.
+    # The default engine above serves staff and write requests.
+    DB_ENGINE_PROFILES = {
+        'public_read': {
+            'pool_size': int(os.getenv('DB_PUBLIC_READ_POOL_SIZE', str(DB_POOL_SIZE))),
+            'max_overflow': int(os.getenv('DB_PUBLIC_READ_MAX_OVERFLOW', '5')),
+            'statement_timeout': int(os.getenv('DB_PUBLIC_READ_STATEMENT_TIMEOUT', '5000')),
+            'replica': True,
+        },
+        # read-only staff and public queries, see engine_profiles.read_only
+        'replica': {
+            'pool_size': int(os.getenv('DB_REPLICA_POOL_SIZE', str(DB_POOL_SIZE))),
+            'max_overflow': int(os.getenv('DB_REPLICA_MAX_OVERFLOW', '5')),
+            'statement_timeout': int(os.getenv('DB_REPLICA_STATEMENT_TIMEOUT', '30000')),
+            'replica': True,
+        },
+        'export': {
+            'pool_size': int(os.getenv('DB_EXPORT_POOL_SIZE', '1')),
+            'max_overflow': int(os.getenv('DB_EXPORT_MAX_OVERFLOW', '1')),
+            'statement_timeout': int(os.getenv('DB_EXPORT_STATEMENT_TIMEOUT', '300000')),
+            'replica': True,
+        },
+    }
 
     # JWT_OIDC Settings
     JWT_OIDC_WELL_KNOWN_CONFIG = os.getenv('JWT_OIDC_WELL_KNOWN_CONFIG')
@@ -196,9 +240,46 @@ class _Config():  # pylint: disable=too-few-public-methods
     CDOGS_SERVICE_CLIENT_SECRET = os.getenv('CDOGS_SERVICE_CLIENT_SECRET')
     CDOGS_TOKEN_URL = os.getenv('CDOGS_TOKEN_URL')
 
+    # Outbound HTTP integrations (see met_api.utils.http_client). Timeouts are seconds;
+    # an integration falls back to DEFAULT for any key it does not set.
+    HTTP_CLIENT_POOL_MAXSIZE = int(os.getenv('HTTP_CLIENT_POOL_MAXSIZE', '10'))
+    HTTP_CLIENT_CONFIG = {
+        'DEFAULT': {
+            'CONNECT_TIMEOUT': float(os.getenv('HTTP_CONNECT_TIMEOUT', '3.05')),
+            'READ_TIMEOUT': float(os.getenv('HTTP_READ_TIMEOUT', '30')),
+            'RETRIES': int(os.getenv('HTTP_RETRIES', '2')),
+            'BACKOFF': float(os.getenv('HTTP_BACKOFF', '0.25')),
+            # consecutive failures before failing fast, and seconds before trying again
+            'BREAKER_THRESHOLD': int(os.getenv('HTTP_BREAKER_THRESHOLD', '5')),
+            'BREAKER_RESET': float(os.getenv('HTTP_BREAKER_RESET', '30')),
+        },
+        'KEYCLOAK': {'READ_TIMEOUT': float(os.getenv('KEYCLOAK_HTTP_READ_TIMEOUT', '10'))},
+        'EPIC': {'READ_TIMEOUT': float(os.getenv('EPIC_HTTP_READ_TIMEOUT', '10'))},
+        'NOTIFY': {'READ_TIMEOUT': float(os.getenv('NOTIFY_HTTP_READ_TIMEOUT', '15'))},
+        # document rendering is genuinely slow
+        'CDOGS': {'READ_TIMEOUT': float(os.getenv('CDOGS_HTTP_READ_TIMEOUT', '60'))},
+        # fire-and-forget analytics; never hold a request up for it
+        'PENGUIN': {'READ_TIMEOUT': float(os.getenv('PENGUIN_HTTP_READ_TIMEOUT', '5')), 'RETRIES': 0},
+    }
+
     # just a temporary writable location to unzip the files.
     # This gets cleared after every shapefile conversion.
     SHAPEFILE_UPLOAD_FOLDER = os.getenv('SHAPEFILE_UPLOAD_FOLDER', '/tmp/uploads')
+    # Conversions run in a separate process pool; 0 workers runs them inline in the API worker.
+    SHAPEFILE_CONVERSION_WORKERS = int(os.getenv('SHAPEFILE_CONVERSION_WORKERS', '2'))
+    SHAPEFILE_CONVERSION_TASKS_PER_CHILD = int(os.getenv('SHAPEFILE_CONVERSION_TASKS_PER_CHILD', '20'))
+    SHAPEFILE_CONVERSION_TIMEOUT = int(os.getenv('SHAPEFILE_CONVERSION_TIMEOUT', '120'))  # seconds
+    SHAPEFILE_CACHE_TIMEOUT = int(os.getenv('SHAPEFILE_CACHE_TIMEOUT', '3600'))  # seconds
+    # Converted GeoJSON is cached on disk, shared by a pod's workers, up to this many bytes
+    SHAPEFILE_CACHE_FOLDER = os.getenv('SHAPEFILE_CACHE_FOLDER', '/tmp/shapefile-cache')
+    SHAPEFILE_CACHE_MAX_SIZE = int(os.getenv('SHAPEFILE_CACHE_MAX_SIZE', str(200 * 1024 * 1024)))
+    # Optional output reduction: simplification tolerance in degrees, and decimal places kept
+    SHAPEFILE_SIMPLIFY_TOLERANCE = float(os.getenv('SHAPEFILE_SIMPLIFY_TOLERANCE', '0'))
+    SHAPEFILE_COORDINATE_PRECISION = (int(os.getenv('SHAPEFILE_COORDINATE_PRECISION'))
+                                      if os.getenv('SHAPEFILE_COORDINATE_PRECISION') else None)
+
+    # How long a cursor-paginated listing reuses its COUNT(*) across pages.
+    PAGINATION_COUNT_CACHE_TIMEOUT = int(os.getenv('PAGINATION_COUNT_CACHE_TIMEOUT', '60'))  # seconds
 
     # Global cap on incoming request body size (bytes), enforced by Werkzeug before
     # a view even runs. Backstops any endpoint that accepts file uploads.
@@ -227,14 +308,32 @@ class _Config():  # pylint: disable=too-few-public-methods
     EPIC_URL = os.getenv('EPIC_URL')
     EPIC_MILESTONE = os.getenv('EPIC_MILESTONE')
     EPIC_KC_CLIENT_ID = os.getenv('EPIC_KC_CLIENT_ID')
+    # seconds a project notification is kept to fetch it again with If-None-Match
+    EPIC_NOTIFICATION_CACHE_TIMEOUT = int(os.getenv('EPIC_NOTIFICATION_CACHE_TIMEOUT', '3600'))
+    # eagle-api calls made at once when the closeout and publish jobs update EPIC
+    EPIC_UPDATE_WORKERS = int(os.getenv('EPIC_UPDATE_WORKERS', '4'))
+    # runs of the closeout and publish jobs that retry an engagement whose EPIC update or closeout email failed
+    ENGAGEMENT_JOB_MAX_ATTEMPTS = int(os.getenv('ENGAGEMENT_JOB_MAX_ATTEMPTS', '3'))
 
     # Timezone in BC
     LEGISLATIVE_TIMEZONE = os.getenv('LEGISLATIVE_TIMEZONE', 'America/Vancouver')
 
     # Rate limiting (Flask-Limiter) for public endpoints
     RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'True').lower() == 'true'
-    # memory:// keeps counters per pod; point at Redis (redis://...) to share limits across pods
+    # memory:// keeps counters per worker process. To share the limits across workers and pods use
+    # redis://... or memcached://... with their client installed, or postgresql+limits:// for tables in the
+    # app's database (see met_api.utils.rate_limit_storage). Each call to the Postgres storage is a primary
+    # database transaction: an advisory lock, a delete, a count and an insert.
     RATELIMIT_STORAGE_URI = os.getenv('RATELIMIT_STORAGE_URI', 'memory://')
+    RATELIMIT_STRATEGY = os.getenv('RATELIMIT_STRATEGY', 'moving-window')
+    # Answer from worker memory what it can, so a shared storage isn't called on every request: denied keys
+    # until their window frees up, and allowed ones from a lease on RATELIMIT_LEASE_FRACTION of the key's
+    # limit. With the default 0.1 a key's allowed requests call the shared storage about once every tenth of
+    # its limit per worker, and the limit can be exceeded by about a tenth. 0 calls it on every allowed request.
+    RATELIMIT_PRECHECK_ENABLED = os.getenv('RATELIMIT_PRECHECK_ENABLED', 'True').lower() == 'true'
+    RATELIMIT_LEASE_FRACTION = float(os.getenv('RATELIMIT_LEASE_FRACTION', '0.1'))
+    # Count per worker while the shared storage can't be reached, instead of failing the requests
+    RATELIMIT_IN_MEMORY_FALLBACK_ENABLED = True
     RATELIMIT_HEADERS_ENABLED = True
     # Per-IP limits for public (unauthenticated) endpoints. Deliberately lenient
     # to start; tighten once we have real traffic numbers to tune against.
@@ -242,6 +341,10 @@ class _Config():  # pylint: disable=too-few-public-methods
     RATELIMIT_PUBLIC_WRITE = os.getenv('RATELIMIT_PUBLIC_WRITE', '30 per minute')
     RATELIMIT_PUBLIC_READ = os.getenv('RATELIMIT_PUBLIC_READ', '60 per minute')
 
+    # Per-request query and outbound call metrics (see met_api.utils.request_metrics), returned in a
+    # Server-Timing header and logged per request
+    REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'False').lower() == 'true'
+
     # Analytics Configuration
     ANALYTICS_ENABLED = os.getenv('ANALYTICS_ENABLED', 'False').lower() == 'true'
 
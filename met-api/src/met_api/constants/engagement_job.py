@@ -0,0 +1,32 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Constants of the scheduled engagement jobs."""
+from enum import Enum
+
+
+class EngagementJob(Enum):
+    """Enum of the per-engagement steps whose results are recorded."""
+
+    CLOSEOUT_EPIC_UPDATE = 'closeout_epic_update'
+    CLOSEOUT_EMAIL = 'closeout_email'
+    PUBLISH_EPIC_UPDATE = 'publish_epic_update'
+
+
+class JobResultStatus(Enum):
+    """Enum of job result status."""
+
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    # no longer applies to the engagement, such as an EPIC update once the project id is removed
+    SKIPPED = 'skipped'
@@ -20,3 +20,5 @@ class NotificationStatus(IntEnum):
 
     PROCESSING = 1
     SENT = 2
+    # given up on, e.g. after the retries of a closeout email ran out
+    FAILED = 3
@@ -15,6 +15,7 @@
 """This exports all of the models and schemas used by the application."""
 
 from .cac_form import CACForm
+from .change_log import ChangeLog
 from .comment import Comment
 from .comment_status import CommentStatus
 from .contact import Contact
@@ -22,6 +23,7 @@ from .db import db, ma, migrate
 from .email_queue import EmailQueue
 from .email_verification import EmailVerification
 from .engagement import Engagement
+from .engagement_job_result import EngagementJobResult
 from .engagement_settings import EngagementSettingsModel
 from .engagement_slug import EngagementSlug
 from .engagement_status import EngagementStatus
@@ -33,6 +35,7 @@ from .generated_document_type import GeneratedDocumentType
 from .membership import Membership
 from .membership_status_code import MembershipStatusCode
 from .participant import Participant
+from .rate_limit import RateLimitCounter, RateLimitHit
 from .report_setting import ReportSetting
 from .settings import Settings
 from .staff_note import StaffNote
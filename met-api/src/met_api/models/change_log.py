@@ -0,0 +1,32 @@
+"""Change log model class.
+
+Rows are written by database triggers on the tables the analytics ETL extracts,
+never by the application, so met-etl can pick up inserts, updates and deletes
+incrementally instead of polling created/updated dates.
+"""
+from sqlalchemy import func
+
+from .db import db
+
+
+class ChangeLog(db.Model):  # pylint: disable=too-few-public-methods
+    """Definition of the change log entity."""
+
+    __tablename__ = 'change_log'
+
+    seq = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    entity_type = db.Column(db.String(50), nullable=False)  # engagement, survey, submission etc
+    entity_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.String(6), nullable=False)  # INSERT, UPDATE or DELETE
+    # id of the writing transaction, so a reader can tell which entries are final
+    txid = db.Column(db.BigInteger, nullable=False, server_default=func.txid_current())
+    changed_date = db.Column(db.DateTime, nullable=False, server_default=func.now())
+
+    @staticmethod
+    def delete_before(txid: int, session=None) -> int:
+        """Delete the entries written by transactions below txid, once every reader has read past it.
+
+        Takes the session to delete with, since met-etl prunes the log through its own.
+        """
+        session = session or db.session
+        return session.query(ChangeLog).filter(ChangeLog.txid < txid).delete(synchronize_session=False)
@@ -7,14 +7,16 @@ from __future__ import annotations
 from datetime import datetime
 from operator import or_
 
-from sqlalchemy import and_, asc, case, desc, func
-from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy import Computed, and_, asc, case, desc, func, select
+from sqlalchemy.dialects.postgresql import TSVECTOR, aggregate_order_by
 from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql.expression import true
 from sqlalchemy.sql.schema import ForeignKey
 
 from met_api.constants.comment_status import Status as CommentStatus
 from met_api.constants.engagement_status import Status as EngagementStatus
+from met_api.models import keyset_pagination, text_search
 from met_api.models.engagement import Engagement
 from met_api.models.engagement_settings import EngagementSettingsModel
 from met_api.models.pagination_options import PaginationOptions
@@ -42,6 +44,9 @@ class Comment(BaseModel):
     participant_id = db.Column(db.Integer, ForeignKey('participant.id', ondelete='SET NULL'), nullable=True)
     submission_id = db.Column(db.Integer, ForeignKey('submission.id', ondelete='SET NULL'), nullable=True)
     component_id = db.Column(db.String(10))
+    # Maintained by the database; only read when searching, so never loaded with the row.
+    search_vector = deferred(db.Column(
+        TSVECTOR, Computed(f"to_tsvector('{text_search.TEXT_SEARCH_CONFIG}', coalesce(text, ''))", persisted=True)))
 
     @hybrid_property
     def is_displayed(self):
@@ -75,19 +80,22 @@ class Comment(BaseModel):
                                       Comment.component_id == ReportSetting.question_key))\
             .filter(and_(Comment.survey_id == survey_id, ReportSetting.display == true()))
 
-        if search_text:
-            query = query.filter(Comment.text.ilike('%' + search_text + '%'))
+        query, order_by = cls._search(query, search_text, pagination_options)
+        if not order_by:
+            _sort_columns = {
+                'id': Comment.id,
+                'text': Comment.text,
+                'submission_date': Comment.submission_date,
+                'submission.id': Comment.submission_id,
+            }
+            col = _sort_columns.get(pagination_options.sort_key, Comment.id)
+            sort = asc(col) if pagination_options.sort_order == 'asc' else desc(col)
+            order_by = (sort, Comment.id.asc())
 
-        _sort_columns = {
-            'id': Comment.id,
-            'text': Comment.text,
-            'submission_date': Comment.submission_date,
-            'submission.id': Comment.submission_id,
-        }
-        col = _sort_columns.get(pagination_options.sort_key, Comment.id)
-        sort = asc(col) if pagination_options.sort_order == 'asc' else desc(col)
+        query = query.order_by(*order_by)
 
-        query = query.order_by(sort)
+        if keyset_pagination.use_keyset(pagination_options):
+            return keyset_pagination.paginate(query, order_by, pagination_options)
 
         no_pagination_options = not pagination_options or not pagination_options.page or not pagination_options.size
         if no_pagination_options:
@@ -123,10 +131,12 @@ class Comment(BaseModel):
                 EngagementSettingsModel.send_report.is_(True)
             )
 
-        if search_text:
-            query = query.filter(Comment.text.ilike('%' + search_text + '%'))
+        query, order_by = cls._search(query, search_text, pagination_options)
+        order_by = order_by or (Comment.id.asc(),)
+        query = query.order_by(*order_by)
 
-        query = query.order_by(Comment.id.asc())
+        if keyset_pagination.use_keyset(pagination_options):
+            return keyset_pagination.paginate(query, order_by, pagination_options)
 
         no_pagination_options = not pagination_options or not pagination_options.page or not pagination_options.size
         if no_pagination_options:
@@ -193,8 +203,11 @@ class Comment(BaseModel):
                          or_(Submission.reviewed_by != 'System', Submission.reviewed_by == null_value)))
 
         if search_text:
-            # Remove all non-digit characters from search text
-            query = query.filter(Submission.comments.any(Comment.text.ilike('%' + search_text + '%')))
+            # A plain IN over this survey's matching comments lets the trigram index on comment text do the work.
+            query = query.filter(Submission.id.in_(
+                select(Comment.submission_id)
+                .where(Comment.survey_id == survey_id, text_search.contains(Comment.text, search_text))
+            ))
 
         if advanced_search_filters:
             query = cls._filter_by_advanced_filters(query, advanced_search_filters)
@@ -222,7 +235,11 @@ class Comment(BaseModel):
         sort = asc(col) if pagination_options.sort_order == 'asc' else desc(col)
 
         # Secondary sort keeps rows with equal sort values stable across pages.
-        query = query.order_by(sort, Submission.id.asc())
+        order_by = (sort, Submission.id.asc())
+        query = query.order_by(*order_by)
+
+        if keyset_pagination.use_keyset(pagination_options):
+            return keyset_pagination.paginate(query, order_by, pagination_options)
 
         no_pagination_options = not pagination_options.page or not pagination_options.size
         if no_pagination_options:
@@ -233,6 +250,17 @@ class Comment(BaseModel):
 
         return page.items, page.total
 
+    @staticmethod
+    def _search(query, search_text, pagination_options: PaginationOptions):
+        """Filter comments by the search text; returns the relevance ordering when one was asked for."""
+        if not search_text:
+            return query, None
+        if pagination_options and pagination_options.sort_key == text_search.RELEVANCE_SORT_KEY:
+            relevance = text_search.rank(Comment.search_vector, search_text)
+            query = query.filter(text_search.matches(Comment.search_vector, search_text))
+            return query, (desc(relevance), Comment.id.asc())
+        return query.filter(text_search.contains(Comment.text, search_text)), None
+
     @staticmethod
     def __create_new_comment_entity(comment: CommentSchema):
         """Create new comment entity."""
@@ -7,10 +7,13 @@ from flask_marshmallow import Marshmallow
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
+from .engine_profiles import RoutingSession
+
 
 # DB initialize in __init__ file
 # db variable use for create models from here
-db = SQLAlchemy()
+# queries run on the engine of the active profile, see engine_profiles
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Migrate initialize in __init__ file
 # Migrate database config
@@ -4,6 +4,7 @@ Manages the Email queue
 """
 from __future__ import annotations
 
+from datetime import datetime
 from typing import List
 
 from sqlalchemy import and_, func
@@ -41,3 +42,28 @@ class EmailQueue(BaseModel):  # pylint: disable=too-few-public-methods
         if max_size != 0:
             query = query.limit(max_size)
         return query.all()
+
+    @staticmethod
+    def get_unprocessed_engagement_mails(action: str, max_size: int) -> List[EmailQueue]:
+        """Return a list of unprocessed emails queued for an engagement action."""
+        query = db.session.query(EmailQueue)\
+            .filter(and_(EmailQueue.notification_status.is_(None),
+                         EmailQueue.entity_type == SourceType.ENGAGEMENT.value,
+                         EmailQueue.action == action))\
+            .order_by(EmailQueue.id)
+        if max_size != 0:
+            query = query.limit(max_size)
+        return query.all()
+
+    @staticmethod
+    def release_stale_engagement_mails(action: str, processing_before: datetime) -> int:
+        """Put back in the queue the mails left processing since before the given time, by a run that died."""
+        released = db.session.query(EmailQueue)\
+            .filter(and_(EmailQueue.notification_status == NotificationStatus.PROCESSING,
+                         EmailQueue.entity_type == SourceType.ENGAGEMENT.value,
+                         EmailQueue.action == action,
+                         EmailQueue.updated_date < processing_before))\
+            .update({EmailQueue.notification_status: None, EmailQueue.updated_date: datetime.utcnow()},
+                    synchronize_session=False)
+        db.session.commit()
+        return released
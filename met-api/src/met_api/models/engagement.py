@@ -15,6 +15,7 @@ from sqlalchemy.sql.schema import ForeignKey
 from met_api.constants.engagement_status import EngagementDisplayStatus, Status
 from met_api.constants.engagement_visibility import Visibility
 from met_api.constants.user import SYSTEM_USER
+from met_api.models import keyset_pagination, text_search
 from met_api.models.engagement_metadata import EngagementMetadataModel
 from met_api.models.engagement_scope_options import EngagementScopeOptions
 from met_api.models.membership import Membership as MembershipModel
@@ -88,11 +89,15 @@ class Engagement(BaseModel):
                 query = cls._filter_by_statuses(query, statuses)
 
         sort = cls._get_sort_order(pagination_options)
+        # Engagement id breaks ties so rows with equal sort values keep a stable order across pages.
+        order_by = (*sort, Engagement.id.asc()) if isinstance(sort, tuple) else (sort, Engagement.id.asc())
+        query = query.order_by(*order_by)
 
-        if isinstance(sort, tuple):
-            query = query.order_by(*sort)
-        else:
-            query = query.order_by(sort)
+        if keyset_pagination.use_keyset(pagination_options):
+            if pagination_options.sort_key == 'display_status':
+                # the display status depends on the current time, so a row's sort value can change between pages
+                return keyset_pagination.paginate_by_offset(query, pagination_options)
+            return keyset_pagination.paginate(query, order_by, pagination_options)
 
         no_pagination_options = not pagination_options.page or not pagination_options.size
         if no_pagination_options:
@@ -149,6 +154,11 @@ class Engagement(BaseModel):
         """Return the tenant id for the engagement."""
         return db.session.query(cls.tenant_id).filter_by(id=engagement_id).scalar()
 
+    @classmethod
+    def find_by_ids(cls, engagement_ids) -> List[Engagement]:
+        """Return many engagements in one query."""
+        return cls.query.filter(cls.id.in_(engagement_ids)).order_by(cls.id).all()
+
     @classmethod
     def close_engagements_due(cls) -> List[Engagement]:
         """Update engagement to closed."""
@@ -164,12 +174,13 @@ class Engagement(BaseModel):
         query = Engagement.query \
             .filter(Engagement.status_id == Status.Published.value) \
             .filter(Engagement.end_date < date_due)
-        records = query.all()
-        if not records:
+        engagement_ids = [row.id for row in query.with_entities(Engagement.id)]
+        if not engagement_ids:
             return []
         query.update(update_fields)
         db.session.commit()
-        return records
+        # reload the engagements the commit expired in one query, rather than one refresh each
+        return cls.find_by_ids(engagement_ids)
 
     @classmethod
     def publish_scheduled_engagements_due(cls) -> List[Engagement]:
@@ -190,11 +201,12 @@ class Engagement(BaseModel):
         query = Engagement.query \
             .filter(Engagement.status_id == Status.Scheduled.value) \
             .filter(Engagement.scheduled_date < datetime_due)
-        records = query.all()
-        if records:
-            query.update(update_fields)
-            db.session.commit()
-        return records
+        engagement_ids = [row.id for row in query.with_entities(Engagement.id)]
+        if not engagement_ids:
+            return []
+        query.update(update_fields)
+        db.session.commit()
+        return cls.find_by_ids(engagement_ids)
 
     @staticmethod
     def _get_sort_order(pagination_options):
@@ -308,7 +320,7 @@ class Engagement(BaseModel):
     @staticmethod
     def _filter_by_search_text(query, search_options):
         if search_text := search_options.get('search_text'):
-            query = query.filter(Engagement.name.ilike('%' + search_text + '%'))
+            query = query.filter(text_search.contains(Engagement.name, search_text))
         return query
 
     @staticmethod
@@ -324,13 +336,14 @@ class Engagement(BaseModel):
     def _filter_by_project_metadata(query, search_options):
         query = query.outerjoin(EngagementMetadataModel, EngagementMetadataModel.engagement_id == Engagement.id)
 
+        metadata = EngagementMetadataModel.project_metadata
+
         if project_type := search_options.get('project_type'):
-            query = query.filter(EngagementMetadataModel.project_metadata['type'].astext.ilike(f'%{project_type}%')) \
+            query = query.filter(text_search.contains(metadata['type'].astext, project_type)) \
                 .params(val=project_type)
 
         if project_name := search_options.get('project_name'):
-            query = query.filter(EngagementMetadataModel.project_metadata['project_name']
-                                 .astext.ilike(f'%{project_name}%')) \
+            query = query.filter(text_search.contains(metadata['project_name'].astext, project_name)) \
                 .params(val=project_name)
 
         if project_id := search_options.get('project_id'):
@@ -338,13 +351,11 @@ class Engagement(BaseModel):
                 .params(val=project_id)
 
         if application_number := search_options.get('application_number'):
-            query = query.filter(EngagementMetadataModel.project_metadata['application_number']
-                                 .astext.ilike(f'%{application_number}%')) \
+            query = query.filter(text_search.contains(metadata['application_number'].astext, application_number)) \
                 .params(val=application_number)
 
         if client_name := search_options.get('client_name'):
-            query = query.filter(EngagementMetadataModel.project_metadata['client_name']
-                                 .astext.ilike(f'%{client_name}%')) \
+            query = query.filter(text_search.contains(metadata['client_name'].astext, client_name)) \
                 .params(val=client_name)
 
         return query
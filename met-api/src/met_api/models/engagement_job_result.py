@@ -0,0 +1,76 @@
+"""Engagement job result model class.
+
+Records how each engagement fared in the steps of the closeout and publish jobs, so the
+engagements that failed can be retried on the next run.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import case
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql.schema import ForeignKey
+
+from met_api.constants.engagement_job import JobResultStatus
+from .db import db
+
+
+class EngagementJobResult(db.Model):  # pylint: disable=too-few-public-methods
+    """The latest result of a job step for an engagement."""
+
+    __tablename__ = 'engagement_job_result'
+    __table_args__ = (db.UniqueConstraint('job', 'engagement_id', name='uq_engagement_job_result_job_engagement'),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    job = db.Column(db.String(50), nullable=False)
+    engagement_id = db.Column(db.Integer, ForeignKey('engagement.id', ondelete='CASCADE'), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    error = db.Column(db.Text, nullable=True)
+    # tries of the step so far, counting from the first failure after a success
+    attempts = db.Column(db.Integer, nullable=False, default=1)
+    updated_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    @classmethod
+    def record_results(cls, job: str, results: Dict[int, Optional[str]]) -> None:
+        """Record each engagement's error, or None for success, in one statement."""
+        if not results:
+            return
+        now = datetime.utcnow()
+        statement = insert(cls).values([{
+            'job': job,
+            'engagement_id': engagement_id,
+            'status': (JobResultStatus.FAILED if error else JobResultStatus.SUCCEEDED).value,
+            'error': error,
+            'attempts': 1,
+            'updated_date': now,
+        } for engagement_id, error in results.items()])
+        statement = statement.on_conflict_do_update(constraint='uq_engagement_job_result_job_engagement', set_={
+            'status': statement.excluded.status,
+            'error': statement.excluded.error,
+            'attempts': case((cls.status == JobResultStatus.FAILED.value, cls.attempts + 1), else_=1),
+            'updated_date': now,
+        })
+        db.session.execute(statement)
+        db.session.commit()
+
+    @classmethod
+    def record_skipped(cls, job: str, engagement_ids: List[int]) -> None:
+        """Mark the engagements' failed results as skipped, so they are no longer retried."""
+        if not engagement_ids:
+            return
+        db.session.execute(
+            db.update(cls)
+            .where(cls.job == job, cls.engagement_id.in_(engagement_ids), cls.status == JobResultStatus.FAILED.value)
+            .values(status=JobResultStatus.SKIPPED.value, error=None, updated_date=datetime.utcnow())
+        )
+        db.session.commit()
+
+    @classmethod
+    def find_retryable(cls, job: str, max_attempts: int) -> List[int]:
+        """Return the ids of the engagements the job step failed for fewer than max_attempts times."""
+        return db.session.scalars(
+            db.select(cls.engagement_id)
+            .where(cls.job == job, cls.status == JobResultStatus.FAILED.value, cls.attempts < max_attempts)
+            .order_by(cls.engagement_id)
+        ).all()
@@ -5,7 +5,7 @@ Manages the engagement
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql.schema import ForeignKey
@@ -22,12 +22,19 @@ class EngagementMetadataModel(BaseModel):
     project_id = db.Column(db.String(50), unique=False, nullable=True)
     project_metadata = db.Column(postgresql.JSONB(astext_type=db.Text()), unique=False, nullable=True)
     project_tracking_id = db.Column(db.String(100), unique=False, nullable=True)
+    # 'project' or 'notification', as EPIC answered for project_id
+    project_type = db.Column(db.String(20), unique=False, nullable=True)
 
     @classmethod
     def find_by_engagement_id(cls, engagement_id):
         """Return engagement slug by engagement id."""
         return cls.query.filter_by(engagement_id=engagement_id).first()
 
+    @classmethod
+    def find_by_engagement_ids(cls, engagement_ids) -> List[EngagementMetadataModel]:
+        """Return the metadata of many engagements in one query."""
+        return cls.query.filter(cls.engagement_id.in_(engagement_ids)).all()
+
     @classmethod
     def update(cls, engagement_metadata_data: dict) -> Optional[EngagementMetadataModel]:
         """Update engagement."""
@@ -36,13 +43,17 @@ class EngagementMetadataModel(BaseModel):
         engagement_metadata: EngagementMetadataModel = query.first()
         if not engagement_metadata:
             return None
+        project_id = engagement_metadata_data.get('project_id', engagement_metadata.project_id)
         update_fields = {
-            'project_id': engagement_metadata_data.get('project_id', engagement_metadata.project_id),
+            'project_id': project_id,
             'project_metadata': {
                 **engagement_metadata.project_metadata,
                 **engagement_metadata_data.get('project_metadata', {}),
             },
         }
+        if project_id != engagement_metadata.project_id:
+            # the type EPIC answered was for the old project
+            update_fields['project_type'] = None
         query.update(update_fields)
         db.session.commit()
         return engagement_metadata
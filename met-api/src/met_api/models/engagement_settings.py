@@ -5,7 +5,7 @@ Manages the engagement
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 
 from sqlalchemy.sql.schema import ForeignKey
 
@@ -20,6 +20,11 @@ class EngagementSettingsModel(BaseModel):
     engagement_id = db.Column(db.Integer, ForeignKey('engagement.id', ondelete='CASCADE'), primary_key=True)
     send_report = db.Column(db.Boolean, nullable=False)
 
+    @classmethod
+    def find_by_engagement_ids(cls, engagement_ids) -> List[EngagementSettingsModel]:
+        """Return the settings of many engagements in one query."""
+        return cls.query.filter(cls.engagement_id.in_(engagement_ids)).all()
+
     @classmethod
     def update(cls, engagement_id, engagement_settings_data: dict) -> Optional[EngagementSettingsModel]:
         """Update engagement."""
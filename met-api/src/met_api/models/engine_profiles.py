@@ -0,0 +1,207 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Named database engine profiles, each with its own connection pool and statement timeout.
+
+The default engine serves staff and write requests. The profiles in DB_ENGINE_PROFILES are
+registered as Flask-SQLAlchemy binds on the same database, or on DATABASE_REPLICA_URL for the
+profiles that read from the replica, so a long export holds a connection of the export pool
+instead of one the public pages need:
+
+    @use_engine_profile(EXPORT)
+    def export_comments(survey_id):
+        ...
+
+Inside the block every query of the session runs on the profile's engine. Flushes and DML
+statements always go to the default engine, so a profile can never send a write to a replica.
+Once the session has written, its queries stay on the default engine's connection, where they
+see the writes whether committed or only flushed.
+
+Read-only service methods that may be answered from the replica are marked with read_only, and
+flows that must read what they have just written with use_primary:
+
+    @read_only()
+    def get_engagement(engagement_id):
+        ...
+
+When a replica is configured, each profile that reads from it also gets a twin on the primary,
+with the same pool settings and timeout. Its queries go to that twin while the replica lags
+behind the primary by more than DB_REPLICA_MAX_LAG seconds.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import math
+import time
+from typing import ContextManager, Dict, Iterator, Optional, Tuple
+
+from flask import Flask, current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import exc, text
+from sqlalchemy.engine import Engine, make_url
+
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_READ = 'public_read'
+EXPORT = 'export'
+REPLICA = 'replica'
+# Suffix of the bind on the primary that stands in for a profile reading from the replica
+PRIMARY_SUFFIX = '_primary'
+
+# Seconds the replica is behind the primary, 0 when it has replayed everything it received
+REPLICA_LAG_SQL = text(
+    'select case when not pg_is_in_recovery() or pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() then 0 '
+    'else coalesce(extract(epoch from now() - pg_last_xact_replay_timestamp()), 0) end'
+)
+
+# The profile of the block being run, None for the default engine
+_active_profile: ContextVar[Optional[str]] = ContextVar('engine_profile', default=None)
+# When each replica engine's lag was last checked, and the lag found
+_lag_checks: Dict[Engine, Tuple[float, float]] = {}
+
+
+class RoutingSession(Session):
+    """A session that runs queries on the engine of the active profile."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """Return the active profile's engine for reads, the default engine otherwise."""
+        if bind is None and (self._flushing or getattr(clause, 'is_dml', False)):
+            # the rest of the session reads on the connection of this write, which sees it before the commit
+            self.info['wrote'] = True
+        profile = _active_profile.get()
+        if bind is not None or profile is None or self.info.get('wrote'):
+            return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+        engines = self._db.engines
+        engine = engines.get(profile)
+        if engine is None:
+            return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        primary = engines.get(profile + PRIMARY_SUFFIX)
+        if primary is not None and replica_lag(engine) > current_app.config['DB_REPLICA_MAX_LAG']:
+            return primary
+        return engine
+
+
+@contextmanager
+def use_engine_profile(profile: str) -> Iterator[None]:
+    """Run the queries of the block, or of the decorated function, on the named profile's engine."""
+    token = _active_profile.set(profile)
+    try:
+        yield
+    finally:
+        _active_profile.reset(token)
+
+
+def read_only() -> ContextManager[None]:
+    """Run the queries of the block, or of the decorated function, on the read replica if there is one."""
+    return use_engine_profile(REPLICA)
+
+
+def use_primary() -> ContextManager[None]:
+    """Run the queries of the block, or of the decorated function, on the default engine.
+
+    For flows that read what they have just written, and call read_only methods to do it.
+    """
+    return use_engine_profile(None)
+
+
+def replica_lag(engine: Engine) -> float:
+    """Return how many seconds the replica is behind, checked at most every DB_REPLICA_LAG_CHECK_INTERVAL seconds.
+
+    A replica that can't be reached counts as infinitely behind.
+    """
+    now = time.monotonic()
+    checked = _lag_checks.get(engine)
+    if checked is not None and now - checked[0] < current_app.config['DB_REPLICA_LAG_CHECK_INTERVAL']:
+        return checked[1]
+    try:
+        with engine.connect() as connection:
+            lag = float(connection.execute(REPLICA_LAG_SQL).scalar())
+    except exc.SQLAlchemyError as err:
+        logger.warning('Could not check the replica lag, reading from the primary: %s', err)
+        lag = math.inf
+    if lag > current_app.config['DB_REPLICA_MAX_LAG']:
+        logger.warning('The replica is %.1fs behind, reading from the primary', lag)
+    _lag_checks[engine] = (now, lag)
+    return lag
+
+
+def active_profile() -> Optional[str]:
+    """Return the profile of the block being run, None for the default engine."""
+    return _active_profile.get()
+
+
+def init_app(app: Flask):
+    """Configure the default engine and register a bind for each profile.
+
+    Must run before db.init_app, which creates the engines from this configuration.
+    """
+    database_uri = app.config['SQLALCHEMY_DATABASE_URI']
+    engine_options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    engine_options['connect_args'] = _connect_args(database_uri, app.config.get('DB_STATEMENT_TIMEOUT', 0))
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    replica_uri = app.config.get('DATABASE_REPLICA_URL')
+    for name, profile in app.config.get('DB_ENGINE_PROFILES', {}).items():
+        if replica_uri and profile.get('replica'):
+            binds.setdefault(name, _bind_options(replica_uri, profile, engine_options))
+            binds.setdefault(name + PRIMARY_SUFFIX, _bind_options(database_uri, profile, engine_options))
+        else:
+            binds.setdefault(name, _bind_options(database_uri, profile, engine_options))
+    app.config['SQLALCHEMY_BINDS'] = binds
+
+
+def pool_status(engines) -> Dict[str, dict]:
+    """Return how many connections each engine's pool holds and lends, keyed by profile."""
+    status = {}
+    for name, engine in engines.items():
+        pool = engine.pool
+        if not hasattr(pool, 'checkedout'):
+            continue
+        size = pool.size()
+        checked_out = pool.checkedout()
+        # pool._max_overflow is not public, a negative value means no limit
+        limit = size + pool._max_overflow if pool._max_overflow >= 0 else None  # pylint: disable=protected-access
+        status[name or 'default'] = {
+            'size': size,
+            'checked_in': pool.checkedin(),
+            'checked_out': checked_out,
+            'overflow': max(pool.overflow(), 0),
+            'limit': limit,
+            'saturation': round(checked_out / limit, 2) if limit else None,
+        }
+    return status
+
+
+def _bind_options(url: str, profile: dict, engine_options: dict) -> dict:
+    # binds don't inherit SQLALCHEMY_ENGINE_OPTIONS, pre-ping and recycle are copied over
+    return {
+        **engine_options,
+        'url': url,
+        'pool_size': profile['pool_size'],
+        'max_overflow': profile['max_overflow'],
+        'connect_args': _connect_args(url, profile.get('statement_timeout', 0)),
+    }
+
+
+def _connect_args(database_uri: str, statement_timeout: int) -> dict:
+    """Add the statement timeout to the libpq options already on the URI, such as the search path.
+
+    connect_args replace the URI's query parameters rather than merging with them.
+    """
+    options = make_url(database_uri).query.get('options', '')
+    if statement_timeout:
+        options = f'{options} -c statement_timeout={int(statement_timeout)}'.strip()
+    return {'options': options} if options else {}
@@ -0,0 +1,188 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Keyset (cursor) pagination for listing queries.
+
+OFFSET pagination makes the database walk and discard every row before the
+requested page, so deep pages get slower the further in they are. Keyset
+pagination instead remembers the sort values of the last row returned and asks
+for rows strictly after them, which costs the same on page N as on page 1.
+
+The cursor is an opaque, url-safe token holding those sort values. The sort
+passed in must end with a unique column (normally the primary key) so rows with
+equal sort values are never skipped or repeated between pages.
+"""
+import base64
+from datetime import date, datetime
+import hashlib
+from http import HTTPStatus
+import json
+from typing import List, Optional, Sequence, Tuple
+
+from flask import current_app
+from sqlalchemy import and_, false, or_, tuple_
+from sqlalchemy.sql import operators
+
+from met_api.exceptions.business_exception import BusinessException
+from met_api.models.pagination_options import PaginationOptions
+from met_api.utils.cache import cache
+from .db import db
+
+
+def use_keyset(pagination_options: Optional[PaginationOptions]) -> bool:
+    """Return True if the caller asked for cursor pagination."""
+    return bool(pagination_options and pagination_options.cursor is not None and pagination_options.size)
+
+
+def paginate(query, order_by: Sequence, pagination_options: PaginationOptions) -> Tuple[list, Optional[int]]:
+    """Return one page of the query after the cursor, and the total (None if not requested).
+
+    ``order_by`` is the same list of ``asc()``/``desc()`` clauses the query is
+    sorted by. ``pagination_options.next_cursor`` is set for the following page.
+    """
+    keys = [(clause.element, clause.modifier is operators.desc_op) for clause in order_by]
+    labels = [f'keyset_{index}' for index in range(len(keys))]
+
+    page_query = query.order_by(None).order_by(*order_by)\
+        .add_columns(*[expression.label(label) for (expression, _), label in zip(keys, labels)])
+    if pagination_options.cursor:
+        values = _decode_cursor(pagination_options.cursor, pagination_options, len(keys))
+        page_query = page_query.filter(_after(keys, values))
+
+    # Read one extra row to find out whether there is a next page without counting.
+    rows = page_query.limit(pagination_options.size + 1).all()
+    has_next = len(rows) > pagination_options.size
+    rows = rows[:pagination_options.size]
+
+    pagination_options.next_cursor = None
+    if has_next:
+        last = rows[-1]
+        pagination_options.next_cursor = _encode_cursor(
+            [getattr(last, label) for label in labels], pagination_options)
+
+    total = _cached_count(query) if pagination_options.include_total else None
+    return [row[0] for row in rows], total
+
+
+def paginate_by_offset(query, pagination_options: PaginationOptions) -> Tuple[list, Optional[int]]:
+    """Return one page of the query for a cursor request, paging by offset instead of by sort values.
+
+    For sorts on expressions that are not stored, such as a status derived from the current time,
+    whose value for a row can change between two requests. The cursor holds the offset of the next
+    page, so such listings keep the cursor interface with the guarantees of offset paging.
+    """
+    offset = 0
+    if pagination_options.cursor:
+        offset = _decode_cursor(pagination_options.cursor, pagination_options, 1)[0]
+        if not isinstance(offset, int) or offset < 0:
+            raise BusinessException('Invalid pagination cursor.', HTTPStatus.BAD_REQUEST)
+
+    rows = query.offset(offset).limit(pagination_options.size + 1).all()
+    has_next = len(rows) > pagination_options.size
+    rows = rows[:pagination_options.size]
+
+    pagination_options.next_cursor = None
+    if has_next:
+        pagination_options.next_cursor = _encode_cursor([offset + pagination_options.size], pagination_options)
+
+    total = _cached_count(query) if pagination_options.include_total else None
+    return rows, total
+
+
+def _after(keys: List[tuple], values: list):
+    """Build the filter for rows that sort strictly after ``values``.
+
+    Postgres sorts NULLs last ascending and first descending, so nullable keys
+    need their own comparisons; a row-value comparison is used when it can be.
+    """
+    nullable = any(_is_nullable(expression) for expression, _ in keys)
+    directions = {descending for _, descending in keys}
+    if not nullable and None not in values and len(directions) == 1:
+        row = tuple_(*[expression for expression, _ in keys])
+        return row < tuple_(*values) if directions.pop() else row > tuple_(*values)
+
+    clauses = []
+    for index, (expression, descending) in enumerate(keys):
+        equal_so_far = [_equal(key, value) for (key, _), value in zip(keys[:index], values[:index])]
+        clauses.append(and_(*equal_so_far, _greater(expression, descending, values[index])))
+    return or_(*clauses)
+
+
+def _greater(expression, descending: bool, value):
+    if descending:
+        return expression.isnot(None) if value is None else expression < value
+    if value is None:
+        return false()
+    if _is_nullable(expression):
+        return or_(expression > value, expression.is_(None))
+    return expression > value
+
+
+def _equal(expression, value):
+    return expression.is_(None) if value is None else expression == value
+
+
+def _is_nullable(expression) -> bool:
+    # Plain columns know their nullability; computed expressions are assumed nullable.
+    return getattr(expression, 'nullable', True)
+
+
+def _cached_count(query) -> int:
+    """Count the query once and reuse it across pages for PAGINATION_COUNT_CACHE_TIMEOUT seconds."""
+    statement = query.order_by(None).statement.compile(dialect=db.session.get_bind().dialect)
+    digest = hashlib.sha256(f'{statement}|{sorted(statement.params.items(), key=str)}'.encode()).hexdigest()
+    cache_key = f'keyset_count_{digest}'
+    total = cache.get(cache_key)
+    if total is None:
+        total = query.order_by(None).count()
+        cache.set(cache_key, total, timeout=current_app.config.get('PAGINATION_COUNT_CACHE_TIMEOUT', 60))
+    return total
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+    return value
+
+
+def _encode_cursor(values: list, pagination_options: PaginationOptions) -> str:
+    payload = {
+        'k': pagination_options.sort_key,
+        'o': pagination_options.sort_order,
+        'v': [_encode_value(value) for value in values],
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+
+def _decode_cursor(cursor: str, pagination_options: PaginationOptions, key_count: int) -> list:
+    """Return the sort values held in the cursor, rejecting one issued for a different sort."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        values = [_decode_value(value) for value in payload['v']]
+        sort = (payload['k'], payload['o'])
+    except (ValueError, TypeError, KeyError) as err:
+        raise BusinessException('Invalid pagination cursor.', HTTPStatus.BAD_REQUEST) from err
+    if sort != (pagination_options.sort_key, pagination_options.sort_order) or len(values) != key_count:
+        raise BusinessException('Pagination cursor does not match the requested sort.', HTTPStatus.BAD_REQUEST)
+    return values
@@ -1,13 +1,23 @@
 """This module holds data classes."""
 
+from typing import Optional
+
 from attr import dataclass
 
 
 @dataclass
 class PaginationOptions:  # pylint: disable=too-many-instance-attributes
-    """Used to store pagination options."""
+    """Used to store pagination options.
+
+    Setting ``cursor`` (an empty string for the first page) switches a listing from
+    page/offset to keyset pagination; ``next_cursor`` is filled in with the cursor
+    for the following page, or left as None on the last one.
+    """
 
     page: int
     size: int
     sort_key: int
     sort_order: str
+    cursor: Optional[str] = None
+    include_total: bool = True
+    next_cursor: Optional[str] = None
@@ -0,0 +1,28 @@
+"""Rate limit models.
+
+Rows are written by met_api.utils.rate_limit_storage, the Postgres storage backend of the rate
+limiter, over its own connection rather than the request session, so every worker and pod
+counts against the same limits.
+"""
+from .db import db
+
+
+class RateLimitHit(db.Model):  # pylint: disable=too-few-public-methods
+    """A request counted by a moving window limit, until it expires out of the window."""
+
+    __tablename__ = 'rate_limit_hit'
+    __table_args__ = (db.Index('ix_rate_limit_hit_key_expires_at', 'key', 'expires_at'),)
+
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    key = db.Column(db.Text, nullable=False)
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False)
+
+
+class RateLimitCounter(db.Model):  # pylint: disable=too-few-public-methods
+    """The requests counted by a fixed window limit in its current window."""
+
+    __tablename__ = 'rate_limit_counter'
+
+    key = db.Column(db.Text, primary_key=True)
+    count = db.Column(db.Integer, nullable=False)
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False)
@@ -0,0 +1,53 @@
+"""This module holds data classes."""
+
+from typing import Optional
+
+from attr import dataclass
+from sqlalchemy import and_, or_
+
+from ..utils.tenant_validator import get_authorized_tenant_id
+from .db import db
+from .engagement import Engagement
+from .engagement_settings import EngagementSettingsModel
+from .survey import Survey
+from .tenant import Tenant
+
+
+@dataclass
+class SubmissionContext:
+    """The survey being submitted to, with its engagement, engagement settings and tenant.
+
+    Loaded in one joined query and handed through validation, comment extraction and the
+    confirmation email, so the submission path doesn't look each of them up again.
+    """
+
+    survey: Survey
+    engagement: Optional[Engagement] = None
+    settings: Optional[EngagementSettingsModel] = None
+    tenant: Optional[Tenant] = None
+
+    @classmethod
+    def load(cls, survey_id) -> Optional['SubmissionContext']:
+        """Load the context of a survey, or None when the survey doesn't exist.
+
+        The survey and the engagement are scoped to the authorized tenant the same way find_by_id
+        scopes them, an engagement of another tenant comes back as None.
+        """
+        engagement_join = Engagement.id == Survey.engagement_id
+        survey_filters = [Survey.id == survey_id]
+        tenant_id = get_authorized_tenant_id()
+        if tenant_id:
+            survey_filters.append(or_(Survey.tenant_id == tenant_id, Survey.tenant_id.is_(None)))
+            engagement_join = and_(engagement_join,
+                                   or_(Engagement.tenant_id == tenant_id, Engagement.tenant_id.is_(None)))
+
+        row = (db.session.query(Survey, Engagement, EngagementSettingsModel, Tenant)
+               .outerjoin(Engagement, engagement_join)
+               .outerjoin(EngagementSettingsModel, EngagementSettingsModel.engagement_id == Engagement.id)
+               .outerjoin(Tenant, Tenant.id == Engagement.tenant_id)
+               .filter(*survey_filters)
+               .one_or_none())
+        if row is None:
+            return None
+        survey, engagement, settings, tenant = row
+        return cls(survey=survey, engagement=engagement, settings=settings, tenant=tenant)
@@ -0,0 +1,46 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Text search filters shared by the listing queries.
+
+Substring search stays an ILIKE, which the pg_trgm GIN indexes on the searched
+columns can serve. Comment text additionally has a stored ``tsvector`` for ranked
+full-text search.
+"""
+from sqlalchemy import Float, cast, func
+
+
+TEXT_SEARCH_CONFIG = 'english'
+# Sort key that asks a comment listing for best matches first.
+RELEVANCE_SORT_KEY = 'relevance'
+
+
+def contains(expression, search_text: str):
+    """Return a case-insensitive substring match, treating % and _ in the search text literally."""
+    escaped = search_text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return expression.ilike(f'%{escaped}%', escape='\\')
+
+
+def matches(vector, search_text: str):
+    """Return a full-text match against a tsvector, using web-search syntax for the query."""
+    return vector.op('@@')(_query(search_text))
+
+
+def rank(vector, search_text: str):
+    """Return the relevance of a tsvector to the search text, for ordering best matches first."""
+    # ts_rank_cd is a real; widen it so a rank held in a pagination cursor compares equal on the way back.
+    return cast(func.ts_rank_cd(vector, _query(search_text)), Float)
+
+
+def _query(search_text: str):
+    return func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, search_text)
@@ -20,6 +20,7 @@ from flask_cors import cross_origin
 from flask_restx import Namespace, Resource
 
 from met_api.auth import auth
+from met_api.exceptions.business_exception import BusinessException
 from met_api.models.pagination_options import PaginationOptions
 from met_api.services.comment_service import CommentService
 from met_api.utils.dashboard_visibility import include_hidden_questions
@@ -51,6 +52,8 @@ class SurveyComments(Resource):
                 size=args.get('size', None, int),
                 sort_key=args.get('sort_key', 'id', str),
                 sort_order=args.get('sort_order', 'asc', str),
+                cursor=args.get('cursor', None, str),
+                include_total=args.get('include_total', default=True, type=lambda v: v.lower() == 'true'),
             )
             comment_records = CommentService()\
                 .get_comments_paginated(
@@ -59,6 +62,8 @@ class SurveyComments(Resource):
                     args.get('search_text', '', str),
             )
             return comment_records, HTTPStatus.OK
+        except BusinessException as err:
+            return {'message': err.error}, err.status_code
         except ValueError as err:
             return str(err), HTTPStatus.INTERNAL_SERVER_ERROR
 
@@ -22,6 +22,7 @@ from marshmallow import ValidationError
 
 from met_api.auth import auth
 from met_api.auth import jwt as _jwt
+from met_api.exceptions.business_exception import BusinessException
 from met_api.models.pagination_options import PaginationOptions
 from met_api.schemas.engagement import EngagementSchema
 from met_api.services.engagement_service import EngagementService
@@ -91,6 +92,8 @@ class Engagements(Resource):
                 size=args.get('size', None, int),
                 sort_key=args.get('sort_key', 'name', str),
                 sort_order=args.get('sort_order', 'asc', str),
+                cursor=args.get('cursor', None, str),
+                include_total=args.get('include_total', default=True, type=lambda v: v.lower() == 'true'),
             )
 
             exclude_internal = None
@@ -132,6 +135,8 @@ class Engagements(Resource):
             )
 
             return engagement_records, HTTPStatus.OK
+        except BusinessException as err:
+            return {'message': err.error}, err.status_code
         except ValueError as err:
             return str(err), HTTPStatus.INTERNAL_SERVER_ERROR
 
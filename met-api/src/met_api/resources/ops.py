@@ -17,6 +17,8 @@ from flask_restx import Namespace, Resource, cors
 from sqlalchemy import exc, text
 
 from met_api.models import db
+from met_api.models.engine_profiles import pool_status
+from met_api.utils import http_client
 
 API = Namespace('', description='MET API operational endpoints')
 
@@ -48,3 +50,14 @@ class Ready(Resource):
     def get():
         """Return a ready response for readiness probes."""
         return {'message': 'api is ready'}, 200
+
+
+@API.route('/metrics')
+class Metrics(Resource):
+    """Exposes per-process operational metrics."""
+
+    @staticmethod
+    @cors.crossdomain(origin='*')
+    def get():
+        """Return outbound integration metrics and database pool usage for this worker."""
+        return {'outbound': http_client.get_metrics(), 'db_pools': pool_status(db.engines)}, 200
@@ -20,6 +20,7 @@ from flask_cors import cross_origin
 from flask_restx import Namespace, Resource
 
 from met_api.auth import jwt as _jwt
+from met_api.exceptions.business_exception import BusinessException
 from met_api.models.pagination_options import PaginationOptions
 from met_api.schemas import utils as schema_utils
 from met_api.schemas.submission import SubmissionSchema
@@ -138,6 +139,8 @@ class SurveySubmissions(Resource):
                 size=args.get('size', None, int),
                 sort_key=args.get('sort_key', 'submission.id', str),
                 sort_order=args.get('sort_order', 'asc', str),
+                cursor=args.get('cursor', None, str),
+                include_total=args.get('include_total', default=True, type=lambda v: v.lower() == 'true'),
             )
             advanced_search_filters = {
                 'status': args.get('status', None, int),
@@ -156,5 +159,7 @@ class SurveySubmissions(Resource):
                     advanced_search_filters
             )
             return submission_page, HTTPStatus.OK
+        except BusinessException as err:
+            return {'message': err.error}, err.status_code
         except ValueError as err:
             return str(err), HTTPStatus.INTERNAL_SERVER_ERROR
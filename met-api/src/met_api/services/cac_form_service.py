@@ -5,6 +5,7 @@ from typing import Optional
 from met_api.constants.subscribe_types import SubscribeTypes
 from met_api.models import CACForm as CACFormModel
 from met_api.models.engagement import Engagement as EngagementModel
+from met_api.models.engine_profiles import EXPORT, use_engine_profile
 from met_api.models.widget import Widget as WidgetModal
 from met_api.models.widgets_subscribe import WidgetSubscribe as WidgetSubscribeModel
 from met_api.services import authorization
@@ -49,6 +50,7 @@ class CACFormService:
         }
 
     @classmethod
+    @use_engine_profile(EXPORT)
     def export_cac_form_submissions_to_spread_sheet(cls, engagement_id):
         """Export comments to spread sheet."""
         engagement: Optional[EngagementModel] = EngagementModel.find_by_id(engagement_id)
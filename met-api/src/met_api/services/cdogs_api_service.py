@@ -21,9 +21,10 @@ import os
 import re
 
 from flask import current_app
-import requests
 
 from met_api.config import _Config
+from met_api.utils import http_client
+from met_api.utils.enums import OutboundIntegration
 
 
 class CdogsApiService:
@@ -53,8 +54,7 @@ class CdogsApiService:
 
     @staticmethod
     def _post_generate_document(json_request_body, headers, url):
-        timeout = current_app.config.get('CONNECT_TIMEOUT', 60)
-        response = requests.post(url, data=json_request_body, headers=headers, timeout=timeout)
+        response = http_client.post(OutboundIntegration.CDOGS, url, data=json_request_body, headers=headers)
         return response
 
     def upload_template(self, template_file_path):
@@ -94,8 +94,7 @@ class CdogsApiService:
 
     @staticmethod
     def _post_upload_template(headers, url, template):
-        timeout = current_app.config.get('CONNECT_TIMEOUT', 60)
-        response = requests.post(url, headers=headers, files=template, timeout=timeout)
+        response = http_client.post(OutboundIntegration.CDOGS, url, headers=headers, files=template)
         return response
 
     def check_template_cached(self, template_hash_code: str):
@@ -103,11 +102,9 @@ class CdogsApiService:
         headers = {
             'Authorization': f'Bearer {self.access_token}'
         }
-        timeout = current_app.config.get('CONNECT_TIMEOUT', 60)
-
         url = f'{_Config.CDOGS_BASE_URL}/api/v2/template/{template_hash_code}'
 
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = http_client.get(OutboundIntegration.CDOGS, url, headers=headers)
         return response.status_code == HTTPStatus.OK
 
     @staticmethod
@@ -115,19 +112,18 @@ class CdogsApiService:
         token_url = _Config.CDOGS_TOKEN_URL
         service_client = _Config.CDOGS_SERVICE_CLIENT
         service_client_secret = _Config.CDOGS_SERVICE_CLIENT_SECRET
-        timeout = current_app.config.get('CONNECT_TIMEOUT', 60)
 
         basic_auth_encoded = base64.b64encode(
             bytes(f'{service_client}:{service_client_secret}', 'utf-8')).decode('utf-8')
         data = 'grant_type=client_credentials'
-        response = requests.post(
+        response = http_client.post(
+            OutboundIntegration.CDOGS,
             token_url,
             data=data,
             headers={
                 'Authorization': f'Basic {basic_auth_encoded}',
                 'Content-Type': 'application/x-www-form-urlencoded'
-            },
-            timeout=timeout
+            }
         )
 
         response_json = response.json()
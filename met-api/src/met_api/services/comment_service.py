@@ -5,6 +5,7 @@ from met_api.constants.membership_type import MembershipType
 from met_api.models import Survey as SurveyModel
 from met_api.models.comment import Comment
 from met_api.models.engagement_metadata import EngagementMetadataModel
+from met_api.models.engine_profiles import EXPORT, PUBLIC_READ, use_engine_profile
 from met_api.models.membership import Membership as MembershipModel
 from met_api.models.pagination_options import PaginationOptions
 from met_api.models.staff_user import StaffUser as StaffUserModel
@@ -77,6 +78,7 @@ class CommentService:
         return False
 
     @classmethod
+    @use_engine_profile(PUBLIC_READ)
     def get_comments_paginated(cls, survey_id, pagination_options: PaginationOptions, search_text=''):
         """Get comments paginated."""
         can_view_all_comments = CommentService.can_view_unapproved_comments(survey_id)
@@ -84,12 +86,16 @@ class CommentService:
         comment_schema = CommentSchema(many=True, only=('text', 'submission_date', 'label', 'submission_id'))
         items, total = Comment.get_accepted_comments_by_survey_id_paginated(
             survey_id, pagination_options, search_text, can_view_all_comments)
-        return {
+        page = {
             'items': comment_schema.dump(items),
             'total': total
         }
+        if pagination_options.cursor is not None:
+            page['next_cursor'] = pagination_options.next_cursor
+        return page
 
     @classmethod
+    @use_engine_profile(PUBLIC_READ)
     def get_comments_grouped_by_question(cls, survey_id, include_hidden=False):
         """Get free-text comments grouped by question."""
         can_view_all_comments = CommentService.can_view_unapproved_comments(survey_id)
@@ -164,6 +170,7 @@ class CommentService:
         return comments
 
     @classmethod
+    @use_engine_profile(EXPORT)
     def export_comments_to_spread_sheet_staff(cls, survey_id):
         """Export comments to spread sheet."""
         survey = SurveyModel.find_by_id(survey_id)
@@ -259,6 +266,7 @@ class CommentService:
         return ', '.join(rejection_note)
 
     @classmethod
+    @use_engine_profile(EXPORT)
     def export_comments_to_spread_sheet_proponent(cls, survey_id):
         """Export comments to spread sheet."""
         survey = SurveyModel.find_by_id(survey_id)
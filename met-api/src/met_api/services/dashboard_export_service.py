@@ -21,14 +21,12 @@ sheets, zebra striping or colour coding.
 """
 from __future__ import annotations
 
+from functools import lru_cache
 from io import BytesIO
 from typing import NamedTuple
 
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-from openpyxl.utils import get_column_letter
-
 from met_api.constants.report_setting_type import FormIoComponentType
+from met_api.models.engine_profiles import EXPORT, use_engine_profile
 from met_api.models.submission import Submission as SubmissionModel
 from met_api.models.survey import Survey as SurveyModel
 from met_api.utils.datetime import utc_datetime
@@ -40,12 +38,17 @@ from met_api.utils.export_styles import (
     RESPONDENT_TYPE_COLOUR, RESPONDENT_TYPE_FONT_COLOUR, get_page_colours,
     get_question_type_colours, get_question_type_label, get_respondent_zebra_colour,
     get_zebra_colour, mute_colour)
+from met_api.utils.lazy_import import lazy_module
 from met_api.utils.survey_export_aggregates import build_aggregate_rows
 from met_api.utils.survey_export_columns import (
     FREE_TEXT_TYPES, QUANTITATIVE_TYPES, build_export_columns, build_respondent_rows,
     filter_respondents_with_comments, format_respondent_id)
 
 
+# Imported on the first export rather than in every worker at startup
+openpyxl = lazy_module('openpyxl')
+
+
 # Types whose answer is a number rather than an option label
 NUMERIC_ANSWER_TYPES = {FormIoComponentType.SURVEY.value, FormIoComponentType.RANKING.value}
 
@@ -109,16 +112,35 @@ AGGREGATE_COLUMNS = (
 # Indexes into AGGREGATE_COLUMNS holding a fraction rather than a plain number.
 AGGREGATE_PERCENTAGE_COLUMNS = (4, 9)
 
-_CENTERED = Alignment(horizontal='center', vertical='center', wrap_text=True)
-_LEFT = Alignment(horizontal='left', vertical='center')
-_CELL_EDGE = Side(style='thin', color=CELL_BORDER_COLOUR)
-_THIN_BORDER = Border(left=_CELL_EDGE, right=_CELL_EDGE, top=_CELL_EDGE, bottom=_CELL_EDGE)
+
+class _CellStyles(NamedTuple):
+    """The cell styles shared by every sheet, built once openpyxl has been imported."""
+
+    centered: object
+    left: object
+    thin_border: object
+
+
+@lru_cache(maxsize=None)
+def _cell_styles() -> _CellStyles:
+    styles = openpyxl.styles
+    edge = styles.Side(style='thin', color=CELL_BORDER_COLOUR)
+    return _CellStyles(
+        centered=styles.Alignment(horizontal='center', vertical='center', wrap_text=True),
+        left=styles.Alignment(horizontal='left', vertical='center'),
+        thin_border=styles.Border(left=edge, right=edge, top=edge, bottom=edge),
+    )
+
+
+def _column_letter(index: int) -> str:
+    return openpyxl.utils.get_column_letter(index)
 
 
 class DashboardExportService:  # pylint: disable=too-few-public-methods
     """Dashboard export management service."""
 
     @classmethod
+    @use_engine_profile(EXPORT)
     def export_dashboard_data_to_spread_sheet(cls, survey_id) -> tuple:
         """Build the internal dashboard export workbook for a survey.
 
@@ -128,7 +150,7 @@ class DashboardExportService:  # pylint: disable=too-few-public-methods
         if not survey:
             raise KeyError(f'Survey with id {survey_id} not found')
 
-        workbook = Workbook()
+        workbook = openpyxl.Workbook()
 
         workbook.remove(workbook.active)
 
@@ -164,9 +186,9 @@ class DashboardExportService:  # pylint: disable=too-few-public-methods
         cls._write_question_headers(worksheet, columns)
         cls._write_respondent_rows(worksheet, columns, respondents)
 
-        worksheet.column_dimensions[get_column_letter(RESPONDENT_COLUMN)].width = RESPONDENT_COLUMN_WIDTH
+        worksheet.column_dimensions[_column_letter(RESPONDENT_COLUMN)].width = RESPONDENT_COLUMN_WIDTH
         for offset, column in enumerate(columns):
-            letter = get_column_letter(FIRST_QUESTION_COLUMN + offset)
+            letter = _column_letter(FIRST_QUESTION_COLUMN + offset)
             worksheet.column_dimensions[letter].width = (
                 COMMENT_COLUMN_WIDTH if column.component_type in FREE_TEXT_TYPES
                 else QUESTION_COLUMN_WIDTH
@@ -184,7 +206,7 @@ class DashboardExportService:  # pylint: disable=too-few-public-methods
                 font_colour='FFFFFF',
                 bold=True,
             )
-            worksheet.column_dimensions[get_column_letter(index + 1)].width = AGGREGATE_COLUMN_WIDTH
+            worksheet.column_dimensions[_column_letter(index + 1)].width = AGGREGATE_COLUMN_WIDTH
 
         row_number = AGGREGATE_HEADER_ROW + 1
         current_page = None
@@ -237,7 +259,7 @@ class DashboardExportService:  # pylint: disable=too-few-public-methods
                 bold=True,
             )
         worksheet.cell(row=QUESTION_TITLE_ROW, column=RESPONDENT_COLUMN, value='Respondent ID')
-        worksheet.column_dimensions[get_column_letter(RESPONDENT_COLUMN)].width = RESPONDENT_COLUMN_WIDTH
+        worksheet.column_dimensions[_column_letter(RESPONDENT_COLUMN)].width = RESPONDENT_COLUMN_WIDTH
 
         cls._write_page_banners(worksheet, columns)
         for offset, column in enumerate(columns):
@@ -248,7 +270,7 @@ class DashboardExportService:  # pylint: disable=too-few-public-methods
                 font_colour='FFFFFF',
                 bold=True,
             )
-            worksheet.column_dimensions[get_column_letter(index)].width = COMMENT_COLUMN_WIDTH
+            worksheet.column_dimensions[_column_letter(index)].width = COMMENT_COLUMN_WIDTH
 
         commenters = filter_respondents_with_comments(respondents, columns)
         for row_index, (respondent_index, submission) in enumerate(commenters):
@@ -280,18 +302,18 @@ class DashboardExportService:  # pylint: disable=too-few-public-methods
     def _write_aggregate_banner(cls, worksheet, row: int, text: str, fill: str, font_colour: str):
         """Write a full-width banner row, left aligned so long titles stay readable."""
         cell = worksheet.cell(row=row, column=1, value=text)
-        cell.fill = PatternFill('solid', fgColor=fill)
-        cell.font = Font(color=font_colour, bold=True, size=9)
-        cell.border = _THIN_BORDER
-        cell.alignment = _LEFT
+        cell.fill = openpyxl.styles.PatternFill('solid', fgColor=fill)
+        cell.font = openpyxl.styles.Font(color=font_colour, bold=True, size=9)
+        cell.border = _cell_styles().thin_border
+        cell.alignment = _cell_styles().left
         worksheet.merge_cells(
             start_row=row, start_column=1, end_row=row, end_column=len(AGGREGATE_COLUMNS)
         )
         # merge_cells styles only the top-left cell; fill the rest to keep a solid bar.
         for column in range(2, len(AGGREGATE_COLUMNS) + 1):
             filler = worksheet.cell(row=row, column=column)
-            filler.fill = PatternFill('solid', fgColor=fill)
-            filler.border = _THIN_BORDER
+            filler.fill = openpyxl.styles.PatternFill('solid', fgColor=fill)
+            filler.border = _cell_styles().thin_border
 
     @classmethod
     def _write_aggregate_row(cls, worksheet, row: int, entry, striped_index: int):
@@ -446,19 +468,19 @@ class DashboardExportService:  # pylint: disable=too-few-public-methods
     @staticmethod
     def _style_header_cell(cell, fill: str, font_colour: str, bold: bool = False, italic: bool = False):
         """Style a cell in the header block. Every header row is centered."""
-        cell.fill = PatternFill('solid', fgColor=fill)
-        cell.font = Font(color=font_colour, bold=bold, italic=italic, size=9)
-        cell.border = _THIN_BORDER
-        cell.alignment = _CENTERED
+        cell.fill = openpyxl.styles.PatternFill('solid', fgColor=fill)
+        cell.font = openpyxl.styles.Font(color=font_colour, bold=bold, italic=italic, size=9)
+        cell.border = _cell_styles().thin_border
+        cell.alignment = _cell_styles().centered
         return cell
 
     @staticmethod
     def _style_data_cell(cell, fill: str, font_colour: str):
         """Style a respondent's answer cell, left aligned so long labels stay readable."""
-        cell.fill = PatternFill('solid', fgColor=fill)
-        cell.font = Font(color=font_colour, size=9)
-        cell.border = _THIN_BORDER
-        cell.alignment = _LEFT
+        cell.fill = openpyxl.styles.PatternFill('solid', fgColor=fill)
+        cell.font = openpyxl.styles.Font(color=font_colour, size=9)
+        cell.border = _cell_styles().thin_border
+        cell.alignment = _cell_styles().left
         return cell
 
     @staticmethod
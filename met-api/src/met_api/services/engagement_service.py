@@ -5,16 +5,19 @@ from http import HTTPStatus
 from flask import current_app
 
 from met_api.config import get_gc_notify_config
+from met_api.constants.engagement_job import EngagementJob
 from met_api.constants.engagement_status import Status
 from met_api.constants.engagement_visibility import Visibility
 from met_api.constants.membership_type import MembershipType
 from met_api.exceptions.business_exception import BusinessException
 from met_api.models import Tenant as TenantModel
 from met_api.models.engagement import Engagement as EngagementModel
+from met_api.models.engagement_job_result import EngagementJobResult as EngagementJobResultModel
 from met_api.models.engagement_scope_options import EngagementScopeOptions
 from met_api.models.engagement_settings import EngagementSettingsModel
 from met_api.models.engagement_slug import EngagementSlug as EngagementSlugModel
 from met_api.models.engagement_status_block import EngagementStatusBlock as EngagementStatusBlockModel
+from met_api.models.engine_profiles import PUBLIC_READ, read_only, use_engine_profile
 from met_api.models.pagination_options import PaginationOptions
 from met_api.models.submission import Submission as SubmissionModel
 from met_api.schemas.engagement import EngagementSchema
@@ -40,6 +43,7 @@ class EngagementService:
         """Initialize."""
         self.object_storage = ObjectStorageService()
 
+    @read_only()
     def get_engagement(self, engagement_id) -> EngagementSchema:
         """Get Engagement by the id."""
         engagement_model: EngagementModel = EngagementModel.find_by_id(engagement_id)
@@ -63,6 +67,7 @@ class EngagementService:
         engagement['banner_url'] = self.object_storage.get_url(engagement['banner_filename'])
         return engagement
 
+    @use_engine_profile(PUBLIC_READ)
     def get_engagements_paginated(
             self,
             external_user_id,
@@ -85,10 +90,13 @@ class EngagementService:
 
         if include_banner_url:
             engagements = self._attach_banner_url(engagements)
-        return {
+        page = {
             'items': engagements,
             'total': total
         }
+        if pagination_options.cursor is not None:
+            page['next_cursor'] = pagination_options.next_cursor
+        return page
 
     def _attach_banner_url(self, engagements: list):
         for engagement in engagements:
@@ -132,15 +140,21 @@ class EngagementService:
 
     @staticmethod
     def close_engagements_due():
-        """Close published engagements that are due for a closeout."""
+        """Close published engagements that are due for a closeout.
+
+        The closeout emails are queued for met-cron to send, and EPIC is updated for the whole batch
+        at once, along with the engagements whose closeout update failed on earlier runs.
+        """
         engagements = EngagementModel.close_engagements_due()
-        for engagement in engagements:
-            engagement_settings: EngagementSettingsModel =\
-                EngagementSettingsModel.find_by_id(engagement.id)
-            if engagement_settings:
-                if engagement_settings.send_report:
-                    EngagementService._send_closeout_emails(engagement)
-            ProjectService.update_project_info(engagement.id)
+        engagement_ids = [engagement.id for engagement in engagements]
+        if engagement_ids:
+            engagement_settings = EngagementSettingsModel.find_by_engagement_ids(engagement_ids)
+            for settings in engagement_settings:
+                if settings.send_report:
+                    email_util.publish_to_email_queue(SourceType.ENGAGEMENT.value, settings.engagement_id,
+                                                      SourceAction.CLOSED.value)
+            EngagementSettingsModel.commit()
+        EngagementService._update_epic(EngagementJob.CLOSEOUT_EPIC_UPDATE, engagement_ids)
 
     @staticmethod
     def publish_scheduled_engagements():
@@ -151,11 +165,27 @@ class EngagementService:
             # Only add to email queue if engagement is public.
             if engagement.visibility == Visibility.Public.value:
                 email_util.publish_to_email_queue(SourceType.ENGAGEMENT.value, engagement.id,
-                                                  SourceAction.PUBLISHED.value, True)
+                                                  SourceAction.PUBLISHED.value)
                 print('Engagements published added to email queue: ', engagement.id)
-            ProjectService.update_project_info(engagement.id)
+        EngagementModel.commit()
+        EngagementService._update_epic(EngagementJob.PUBLISH_EPIC_UPDATE,
+                                       [engagement.id for engagement in engagements])
         return engagements
 
+    @staticmethod
+    def _update_epic(job: EngagementJob, engagement_ids):
+        """Update EPIC for the engagements in one batch, retrying the ones the job failed for before.
+
+        A failed engagement that is no longer sent to EPIC, such as one whose project id was removed,
+        is marked skipped so it leaves the retry queue.
+        """
+        max_attempts = current_app.config['ENGAGEMENT_JOB_MAX_ATTEMPTS']
+        retry_ids = EngagementJobResultModel.find_retryable(job.value, max_attempts)
+        results = ProjectService.update_projects_info([*engagement_ids, *retry_ids])
+        EngagementJobResultModel.record_results(job.value, results)
+        EngagementJobResultModel.record_skipped(
+            job.value, [engagement_id for engagement_id in retry_ids if engagement_id not in results])
+
     @staticmethod
     def create_engagement(request_json: dict):
         """Create engagement."""
@@ -275,8 +305,8 @@ class EngagementService:
             raise ValueError('Some required fields are empty')
 
     @staticmethod
-    def _send_closeout_emails(engagement: EngagementModel) -> None:
-        """Send the engagement closeout emails.Throws error if fails."""
+    def send_closeout_emails(engagement: EngagementModel) -> None:
+        """Send the engagement closeout emails to its participants. Throws error if fails."""
         subject, body, args = EngagementService._render_email_template(engagement)
         participants = SubmissionModel.get_engaged_participants(engagement.id)
         template_id = current_app.config.get('ENGAGEMENT_CLOSEOUT_EMAIL_TEMPLATE_ID', None)
@@ -18,10 +18,10 @@ from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 from flask import current_app
-import requests
 
+from met_api.utils import http_client
 from met_api.utils.cache import cache
-from met_api.utils.enums import ContentType
+from met_api.utils.enums import ContentType, OutboundIntegration
 
 
 class KeycloakService:  # pylint: disable=too-few-public-methods
@@ -32,7 +32,6 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
         """Get user group from Keycloak by userid."""
         base_url = current_app.config.get('KEYCLOAK_BASE_URL')
         realm = current_app.config.get('KEYCLOAK_REALMNAME')
-        timeout = current_app.config.get('CONNECT_TIMEOUT', 60)
         admin_token = KeycloakService._get_admin_token()
         headers = {
             'Content-Type': ContentType.JSON.value,
@@ -41,7 +40,7 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
 
         # Get the user and return
         query_user_url = f'{base_url}/auth/admin/realms/{realm}/users/{user_id}/groups'
-        response = requests.get(query_user_url, headers=headers, timeout=timeout)
+        response = http_client.get(OutboundIntegration.KEYCLOAK, query_user_url, headers=headers)
         response.raise_for_status()
         return response.json()
 
@@ -52,18 +51,17 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
         if not base_url:
             return {}
         realm = current_app.config.get('KEYCLOAK_REALMNAME')
-        timeout = current_app.config.get('CONNECT_TIMEOUT', 60)
         admin_token = KeycloakService._get_admin_token()
         headers = {
             'Content-Type': ContentType.JSON.value,
             'Authorization': f'Bearer {admin_token}'
         }
 
-        groups_response = requests.get(
+        groups_response = http_client.get(
+            OutboundIntegration.KEYCLOAK,
             f'{base_url}/auth/admin/realms/{realm}/groups',
             params={'max': 1000},
             headers=headers,
-            timeout=timeout,
         )
         if groups_response.status_code != 200:
             return {}
@@ -72,11 +70,11 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
 
         def _fetch_members(group_id_name):
             gid, gname = group_id_name
-            resp = requests.get(
+            resp = http_client.get(
+                OutboundIntegration.KEYCLOAK,
                 f'{base_url}/auth/admin/realms/{realm}/groups/{gid}/members',
                 params={'max': 1000},
                 headers=headers,
-                timeout=timeout,
             )
             return gname, resp.json() if resp.status_code == 200 else []
 
@@ -106,13 +104,12 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
         config = current_app.config
         base_url = config.get('KEYCLOAK_BASE_URL')
         realm = config.get('KEYCLOAK_REALMNAME')
-        timeout = config.get('CONNECT_TIMEOUT', 60)
         get_group_url = f'{base_url}/auth/admin/realms/{realm}/groups?search={group_name}'
         headers = {
             'Content-Type': ContentType.JSON.value,
             'Authorization': f'Bearer {admin_token}'
         }
-        response = requests.get(get_group_url, headers=headers, timeout=timeout)
+        response = http_client.get(OutboundIntegration.KEYCLOAK, get_group_url, headers=headers)
         return KeycloakService._find_group_or_subgroup_id(response.json(), group_name)
 
     @staticmethod
@@ -137,16 +134,14 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
         realm = config.get('KEYCLOAK_REALMNAME')
         admin_client_id = config.get('KEYCLOAK_ADMIN_USERNAME')
         admin_secret = config.get('KEYCLOAK_ADMIN_SECRET')
-        timeout = config.get('CONNECT_TIMEOUT', 60)
         headers = {
             'Content-Type': 'application/x-www-form-urlencoded'
         }
         token_url = f'{base_url}/auth/realms/{realm}/protocol/openid-connect/token'
 
-        response = requests.post(token_url,
-                                 data=f'client_id={admin_client_id}&grant_type=client_credentials'
-                                 f'&client_secret={admin_secret}', headers=headers,
-                                 timeout=timeout)
+        response = http_client.post(OutboundIntegration.KEYCLOAK, token_url,
+                                    data=f'client_id={admin_client_id}&grant_type=client_credentials'
+                                    f'&client_secret={admin_secret}', headers=headers)
         token = response.json().get('access_token')
         # Cache for 55 s — Keycloak client-credentials tokens typically live 60 s
         cache.set('keycloak_admin_token', token, timeout=55)
@@ -158,7 +153,6 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
         config = current_app.config
         base_url = config.get('KEYCLOAK_BASE_URL')
         realm = config.get('KEYCLOAK_REALMNAME')
-        timeout = config.get('CONNECT_TIMEOUT', 60)
         # Create an admin token
         admin_token = KeycloakService._get_admin_token()
         # Get the '$group_name' group
@@ -170,8 +164,7 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
             'Authorization': f'Bearer {admin_token}'
         }
         remove_group_url = f'{base_url}/auth/admin/realms/{realm}/users/{user_id}/groups/{group_id}'
-        response = requests.delete(remove_group_url, headers=headers,
-                                   timeout=timeout)
+        response = http_client.delete(OutboundIntegration.KEYCLOAK, remove_group_url, headers=headers)
         response.raise_for_status()
 
     @staticmethod
@@ -180,7 +173,6 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
         config = current_app.config
         base_url = config.get('KEYCLOAK_BASE_URL')
         realm = config.get('KEYCLOAK_REALMNAME')
-        timeout = config.get('CONNECT_TIMEOUT', 60)
         # Create an admin token
         admin_token = KeycloakService._get_admin_token()
         # Get the '$group_name' group
@@ -192,8 +184,7 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
             'Authorization': f'Bearer {admin_token}'
         }
         add_to_group_url = f'{base_url}/auth/admin/realms/{realm}/users/{user_id}/groups/{group_id}'
-        response = requests.put(add_to_group_url, headers=headers,
-                                timeout=timeout)
+        response = http_client.put(OutboundIntegration.KEYCLOAK, add_to_group_url, headers=headers)
         response.raise_for_status()
 
     @staticmethod
@@ -202,7 +193,6 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
         config = current_app.config
         base_url = config.get('KEYCLOAK_BASE_URL')
         realm = config.get('KEYCLOAK_REALMNAME')
-        timeout = config.get('CONNECT_TIMEOUT', 60)
         admin_token = KeycloakService._get_admin_token()
 
         tenant_attributes = {
@@ -211,10 +201,10 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
 
         user_url = f'{base_url}/auth/admin/realms/{realm}/users/{user_id}'
         headers = {'Authorization': f'Bearer {admin_token}'}
-        response = requests.get(user_url, headers=headers, timeout=timeout)
+        response = http_client.get(OutboundIntegration.KEYCLOAK, user_url, headers=headers)
         user_data = response.json()
         user_data.setdefault('attributes', {}).update(tenant_attributes)
-        requests.put(user_url, json=user_data, headers=headers, timeout=timeout)
+        http_client.put(OutboundIntegration.KEYCLOAK, user_url, json=user_data, headers=headers)
         response.raise_for_status()
 
     @staticmethod
@@ -223,7 +213,6 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
         config = current_app.config
         base_url = config.get('KEYCLOAK_BASE_URL')
         realm = config.get('KEYCLOAK_REALMNAME')
-        timeout = config.get('CONNECT_TIMEOUT', 60)
         # Create an admin token
         admin_token = KeycloakService._get_admin_token()
         # Get the '$group_name' group
@@ -235,7 +224,7 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
             'Authorization': f'Bearer {admin_token}'
         }
         remove_from_group_url = f'{base_url}/auth/admin/realms/{realm}/users/{user_id}/groups/{group_id}'
-        response = requests.delete(remove_from_group_url, headers=headers, timeout=timeout)
+        response = http_client.delete(OutboundIntegration.KEYCLOAK, remove_from_group_url, headers=headers)
         response.raise_for_status()
 
     @staticmethod
@@ -247,7 +236,6 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
 
         base_url = config.get('KEYCLOAK_BASE_URL')
         realm = config.get('KEYCLOAK_REALMNAME')
-        timeout = config.get('CONNECT_TIMEOUT', 60)
 
         # Add user to the keycloak group '$group_name'
         headers = {
@@ -256,8 +244,8 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
         }
 
         add_user_url = f'{base_url}/auth/admin/realms/{realm}/users'
-        response = requests.post(add_user_url, data=json.dumps(user), headers=headers,
-                                 timeout=timeout)
+        response = http_client.post(OutboundIntegration.KEYCLOAK, add_user_url, data=json.dumps(user),
+                                    headers=headers)
         response.raise_for_status()
 
         return KeycloakService.get_user_by_username(user.get('username'), admin_token)
@@ -267,7 +255,6 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
         """Get user from Keycloak by username."""
         base_url = current_app.config.get('KEYCLOAK_BASE_URL')
         realm = current_app.config.get('KEYCLOAK_REALMNAME')
-        timeout = current_app.config.get('CONNECT_TIMEOUT', 60)
         if not admin_token:
             admin_token = KeycloakService._get_admin_token()
 
@@ -278,7 +265,7 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
 
         # Get the user and return
         query_user_url = f'{base_url}/auth/admin/realms/{realm}/users?username={username}'
-        response = requests.get(query_user_url, headers=headers, timeout=timeout)
+        response = http_client.get(OutboundIntegration.KEYCLOAK, query_user_url, headers=headers)
         return response.json()[0]
 
     @staticmethod
@@ -286,7 +273,6 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
         """Toggle the enabled status of a user in Keycloak."""
         base_url = current_app.config.get('KEYCLOAK_BASE_URL')
         realm = current_app.config.get('KEYCLOAK_REALMNAME')
-        timeout = current_app.config.get('CONNECT_TIMEOUT', 60)
         admin_token = KeycloakService._get_admin_token()
         headers = {
             'Content-Type': ContentType.JSON.value,
@@ -299,5 +285,5 @@ class KeycloakService:  # pylint: disable=too-few-public-methods
 
         # Update the user's enabled status
         update_user_url = f'{base_url}/auth/admin/realms/{realm}/users/{user_id}'
-        response = requests.put(update_user_url, json=user_data, headers=headers, timeout=timeout)
+        response = http_client.put(OutboundIntegration.KEYCLOAK, update_user_url, json=user_data, headers=headers)
         response.raise_for_status()
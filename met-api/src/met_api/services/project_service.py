@@ -1,9 +1,11 @@
 """Service for project management."""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from http import HTTPStatus
 import logging
+from typing import Dict, Iterable, Optional, Tuple
 
-from flask import current_app
-import requests
+from flask import Flask, current_app
 
 from met_api.constants.engagement_status import Status
 from met_api.models.engagement import Engagement as EngagementModel
@@ -11,19 +13,39 @@ from met_api.models.engagement_metadata import EngagementMetadataModel
 from met_api.services.email_verification_service import EmailVerificationService
 from met_api.services.object_storage_service import ObjectStorageService
 from met_api.services.rest_service import RestService
-from met_api.utils import notification
+from met_api.utils import http_client, notification
+from met_api.utils.cache import cache
 from met_api.utils.datetime import convert_and_format_to_utc_str, local_datetime
+from met_api.utils.enums import OutboundIntegration
 
 # Statuses where the engagement should not be publicly visible in EPIC.
 _NON_PUBLIC_STATUSES = {Status.Draft.value, Status.Unpublished.value}
+PROJECT = 'project'
+NOTIFICATION = 'notification'
+
+
+@dataclass
+class _EpicUpdate:
+    """What is sent to EPIC for one engagement, prepared before the eagle-api calls."""
+
+    engagement_id: int
+    project_id: str
+    project_tracking_id: Optional[str]
+    project_type: Optional[str]
+    is_published: bool
+    comment_period: dict
+    notification_fields: dict
 
 
 class ProjectService:
     """Project management service."""
 
     @staticmethod
-    def _get_project_type(project_id: str, token: str) -> str:
-        """Determine whether the project_id is a standard Project or a ProjectNotification."""
+    def _get_project_type(project_id: str, token: str, default: Optional[str] = PROJECT) -> Optional[str]:
+        """Determine whether the project_id is a standard Project or a ProjectNotification.
+
+        Returns default when EPIC knows the project_id as neither.
+        """
         epic_url = current_app.config.get('EPIC_URL')
         base_url = epic_url.rsplit('/', 1)[0]
 
@@ -32,40 +54,110 @@ class ProjectService:
         # Check standard project
         project_url = f'{base_url}/project/{project_id}'
         try:
-            response = requests.get(project_url, headers=headers, timeout=10)
+            response = http_client.get(OutboundIntegration.EPIC, project_url, headers=headers)
             if response.status_code == HTTPStatus.OK:
-                return 'project'
+                return PROJECT
         except Exception:  # noqa: B902 # pylint:disable=broad-except
             pass
 
         # Check project notification
         notification_url = f'{base_url}/projectNotification/{project_id}'
         try:
-            response = requests.get(notification_url, headers=headers, timeout=10)
+            response = http_client.get(OutboundIntegration.EPIC, notification_url, headers=headers)
             if response.status_code == HTTPStatus.OK:
-                return 'notification'
+                return NOTIFICATION
         except Exception:  # noqa: B902 # pylint:disable=broad-except
             pass
 
-        return 'project'  # Default to project for backward compatibility
+        return default  # Default to project for backward compatibility
 
     @staticmethod
-    def _update_project_notification(engagement, project_id, token, engagement_metadata):
-        base_url = current_app.config.get('EPIC_URL').rsplit('/', 1)[0]
+    def _resolve_project_type(engagement_metadata, project_id: str, token: str) -> str:
+        """Return the project type saved on the metadata, asking EPIC the first time and setting its answer.
+
+        A project's type never changes, so EPIC is only probed again once project_id does. The caller
+        commits the metadata.
+        """
+        if engagement_metadata.project_type and project_id == engagement_metadata.project_id:
+            return engagement_metadata.project_type
+        project_type = ProjectService._get_project_type(project_id, token, default=None)
+        if project_type is None:
+            return PROJECT
+        if project_id == engagement_metadata.project_id:
+            engagement_metadata.project_type = project_type
+        return project_type
 
-        response = requests.get(
-            f'{base_url}/projectNotification/{project_id}',
-            headers={'Authorization': f'Bearer {token}'},
-            timeout=10
-        )
-        if response.status_code != HTTPStatus.OK:
-            return
+    @staticmethod
+    def _get_project_notification(notification_url: str, token: str) -> Optional[Tuple[dict, Optional[str]]]:
+        """Return the project notification and its ETag, or None if EPIC doesn't have it.
 
+        The last version seen is cached with its ETag and fetched with If-None-Match, so EPIC only
+        sends the notification again when it changed.
+        """
+        headers = {'Authorization': f'Bearer {token}'}
+        cached = cache.get(_notification_cache_key(notification_url))
+        if cached:
+            headers['If-None-Match'] = cached[0]
+        response = http_client.get(OutboundIntegration.EPIC, notification_url, headers=headers)
+        if cached and response.status_code == HTTPStatus.NOT_MODIFIED:
+            return dict(cached[1]), cached[0]
+        if response.status_code != HTTPStatus.OK:
+            return None
         notification_data = response.json()
+        _cache_notification(notification_url, response.headers.get('ETag'), notification_data)
+        return notification_data, response.headers.get('ETag')
+
+    @staticmethod
+    def _put_project_notification(project_id: str, token: str, fields: dict, publish: bool,
+                                  raise_for_status: bool = False) -> bool:
+        """Merge the fields into the project notification and PUT it back, returning False if there is none.
+
+        The PUT carries If-Match with the ETag of the version the fields were merged into, so an edit
+        made in EPIC in between is fetched and merged again rather than overwritten.
+        """
+        notification_url = f'{current_app.config.get("EPIC_URL").rsplit("/", 1)[0]}/projectNotification/{project_id}'
+        for _ in range(2):
+            fetched = ProjectService._get_project_notification(notification_url, token)
+            if fetched is None:
+                return False
+            notification_data, etag = fetched
+            notification_data.update(fields)
+            response = RestService.put(
+                endpoint=f'{notification_url}?publish={"true" if publish else "false"}',
+                token=token,
+                data=notification_data,
+                additional_headers={'If-Match': etag} if etag else {},
+                raise_for_status=False,
+                integration=OutboundIntegration.EPIC
+            )
+            if response.status_code != HTTPStatus.PRECONDITION_FAILED:
+                break
+            cache.delete(_notification_cache_key(notification_url))
+
+        if raise_for_status:
+            response.raise_for_status()
+        if response.status_code == HTTPStatus.OK:
+            # EPIC answers with the updated notification, the version the next sync will find
+            _cache_notification(notification_url, response.headers.get('ETag'), response.json())
+        else:
+            cache.delete(_notification_cache_key(notification_url))
+        return True
+
+    @staticmethod
+    def _update_project_notification(engagement, project_id, token, engagement_metadata):
         is_pub = engagement.status_id not in _NON_PUBLIC_STATUSES
+        if not ProjectService._put_project_notification(
+                project_id, token, ProjectService._construct_notification_fields(engagement), is_pub):
+            return
 
+        if not engagement_metadata.project_tracking_id:
+            engagement_metadata.project_tracking_id = project_id
+
+    @staticmethod
+    def _construct_notification_fields(engagement) -> dict:
+        """Return the comment period fields MET sets on a project notification."""
         now = local_datetime().replace(tzinfo=None)
-        if not is_pub:
+        if engagement.status_id in _NON_PUBLIC_STATUSES:
             pcp = 'none'
         elif engagement.start_date and now < engagement.start_date:
             pcp = 'pending'
@@ -74,7 +166,7 @@ class ProjectService:
         else:
             pcp = 'open'
 
-        notification_data.update({
+        return {
             'dateStarted': convert_and_format_to_utc_str(engagement.start_date) if engagement.start_date else None,
             'dateCompleted': convert_and_format_to_utc_str(engagement.end_date) if engagement.end_date else None,
             'pcp': pcp,
@@ -83,43 +175,17 @@ class ProjectService:
                 f'{notification.get_tenant_site_url(engagement.tenant_id)}'
                 f'{EmailVerificationService.get_engagement_path(engagement, is_public_url=True)}'
             )
-        })
-
-        RestService.put(
-            endpoint=f'{base_url}/projectNotification/{project_id}?publish={"true" if is_pub else "false"}',
-            token=token,
-            data=notification_data,
-            raise_for_status=False
-        )
-
-        if not engagement_metadata.project_tracking_id:
-            engagement_metadata.project_tracking_id = project_id
-            engagement_metadata.commit()
+        }
 
     @staticmethod
     def _delete_project_notification(project_id, token):
-        base_url = current_app.config.get('EPIC_URL').rsplit('/', 1)[0]
-
-        response = requests.get(
-            f'{base_url}/projectNotification/{project_id}',
-            headers={'Authorization': f'Bearer {token}'},
-            timeout=10
-        )
-        if response.status_code == HTTPStatus.OK:
-            notification_data = response.json()
-            notification_data.update({
-                'dateStarted': None,
-                'dateCompleted': None,
-                'pcp': 'none',
-                'isMet': False,
-                'metURL': ''
-            })
-            RestService.put(
-                endpoint=f'{base_url}/projectNotification/{project_id}?publish=false',
-                token=token,
-                data=notification_data,
-                raise_for_status=False
-            )
+        ProjectService._put_project_notification(project_id, token, {
+            'dateStarted': None,
+            'dateCompleted': None,
+            'pcp': 'none',
+            'isMet': False,
+            'metURL': ''
+        }, publish=False)
 
     @staticmethod
     def update_project_info(eng_id: str) -> None:
@@ -138,10 +204,12 @@ class ProjectService:
                 logger.debug('No project Id, skipping EPIC update.')
                 return
 
+            saved = (engagement_metadata.project_type, engagement_metadata.project_tracking_id)
             eao_service_account_token = ProjectService._get_eao_service_account_token()
-            project_type = ProjectService._get_project_type(project_id, eao_service_account_token)
+            project_type = ProjectService._resolve_project_type(
+                engagement_metadata, project_id, eao_service_account_token)
 
-            if project_type == 'notification':
+            if project_type == NOTIFICATION:
                 ProjectService._update_project_notification(
                     engagement, project_id, eao_service_account_token, engagement_metadata
                 )
@@ -151,24 +219,131 @@ class ProjectService:
                 if engagement_metadata.project_tracking_id:
                     update_url = f'{current_app.config.get("EPIC_URL")}/{engagement_metadata.project_tracking_id}'
                     RestService.put(endpoint=update_url, token=eao_service_account_token,
-                                    data=epic_comment_period_payload, raise_for_status=False)
+                                    data=epic_comment_period_payload, raise_for_status=False,
+                                    integration=OutboundIntegration.EPIC)
 
                 else:
                     create_url = current_app.config.get('EPIC_URL')
                     api_response = RestService.post(endpoint=create_url, token=eao_service_account_token,
-                                                    data=epic_comment_period_payload, raise_for_status=False)
+                                                    data=epic_comment_period_payload, raise_for_status=False,
+                                                    integration=OutboundIntegration.EPIC)
 
                     if api_response.status_code == HTTPStatus.OK:
-                        response_data = api_response.json()
                         # Eagle-API returns the created MongoDB document; the PK field is '_id'.
-                        tracking_number = str(response_data.get('_id', ''))
+                        tracking_number = str(api_response.json().get('_id', ''))
                         if tracking_number:
                             engagement_metadata.project_tracking_id = tracking_number
-                            engagement_metadata.commit()
+
+            if (engagement_metadata.project_type, engagement_metadata.project_tracking_id) != saved:
+                engagement_metadata.commit()
 
         except Exception as e:  # NOQA # pylint:disable=broad-except
             logger.error('Error in update_project_info: %s', str(e))
 
+    @staticmethod
+    def update_projects_info(eng_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+        """Create or update the CommentPeriods in EPIC of many engagements, EPIC_UPDATE_WORKERS at a time.
+
+        The engagements and their metadata are loaded in one query each and the service account token
+        is fetched once for the batch. Only the eagle-api calls run on the worker threads; the tracking
+        ids they get back are saved here, in one commit. Returns the error of each engagement sent to
+        EPIC, None for the ones updated; engagements without a project id are left out.
+        """
+        logger = logging.getLogger(__name__)
+        if not current_app.config.get('IS_EAO_ENVIRONMENT'):
+            return {}
+
+        metadata_by_engagement = {
+            engagement_metadata.engagement_id: engagement_metadata
+            for engagement_metadata in EngagementMetadataModel.find_by_engagement_ids(list(eng_ids))
+            if engagement_metadata.project_id
+        }
+        if not metadata_by_engagement:
+            return {}
+
+        results: Dict[int, Optional[str]] = {}
+        updates = []
+        for engagement in EngagementModel.find_by_ids(list(metadata_by_engagement)):
+            try:
+                updates.append(ProjectService._prepare_epic_update(
+                    engagement, metadata_by_engagement[engagement.id]))
+            except Exception as e:  # NOQA # pylint:disable=broad-except
+                logger.error('Error preparing the EPIC update of engagement %s: %s', engagement.id, str(e))
+                results[engagement.id] = str(e)
+
+        try:
+            eao_service_account_token = ProjectService._get_eao_service_account_token()
+        except Exception as e:  # NOQA # pylint:disable=broad-except
+            logger.error('Error getting the EPIC service account token: %s', str(e))
+            results.update({update.engagement_id: str(e) for update in updates})
+            return results
+
+        with ThreadPoolExecutor(max_workers=current_app.config.get('EPIC_UPDATE_WORKERS', 4)) as executor:
+            futures = {
+                update.engagement_id: executor.submit(
+                    ProjectService._send_epic_update,
+                    current_app._get_current_object(),  # pylint: disable=protected-access
+                    update, eao_service_account_token)
+                for update in updates
+            }
+
+        for engagement_id, future in futures.items():
+            try:
+                tracking_id, project_type = future.result()
+            except Exception as e:  # NOQA # pylint:disable=broad-except
+                logger.error('Error in the EPIC update of engagement %s: %s', engagement_id, str(e))
+                results[engagement_id] = str(e) or e.__class__.__name__
+                continue
+            results[engagement_id] = None
+            engagement_metadata = metadata_by_engagement[engagement_id]
+            if tracking_id and not engagement_metadata.project_tracking_id:
+                engagement_metadata.project_tracking_id = tracking_id
+            if project_type and not engagement_metadata.project_type:
+                engagement_metadata.project_type = project_type
+        EngagementMetadataModel.commit()
+        return results
+
+    @staticmethod
+    def _prepare_epic_update(engagement, engagement_metadata) -> _EpicUpdate:
+        """Build both kinds of EPIC payload, since the project type is only known once EPIC is asked."""
+        return _EpicUpdate(
+            engagement_id=engagement.id,
+            project_id=engagement_metadata.project_id,
+            project_tracking_id=engagement_metadata.project_tracking_id,
+            project_type=engagement_metadata.project_type,
+            is_published=engagement.status_id not in _NON_PUBLIC_STATUSES,
+            comment_period=ProjectService._construct_epic_payload(engagement, engagement_metadata.project_id),
+            notification_fields=ProjectService._construct_notification_fields(engagement),
+        )
+
+    @staticmethod
+    def _send_epic_update(app: Flask, update: _EpicUpdate, token: str) -> Tuple[Optional[str], Optional[str]]:
+        """Send one engagement's update to eagle-api, raising if EPIC refused it.
+
+        Runs on a worker thread, so it makes no database calls; returns the tracking id and the
+        project type for the caller to save.
+        """
+        with app.app_context():
+            epic_url = current_app.config.get('EPIC_URL')
+            project_type = update.project_type or ProjectService._get_project_type(update.project_id, token,
+                                                                                   default=None)
+
+            if project_type == NOTIFICATION:
+                if not ProjectService._put_project_notification(update.project_id, token, update.notification_fields,
+                                                                update.is_published, raise_for_status=True):
+                    raise ValueError(f'Project notification {update.project_id} not found in EPIC')
+                return update.project_id, project_type
+
+            if update.project_tracking_id:
+                RestService.put(endpoint=f'{epic_url}/{update.project_tracking_id}', token=token,
+                                data=update.comment_period, integration=OutboundIntegration.EPIC)
+                return update.project_tracking_id, project_type
+
+            response = RestService.post(endpoint=epic_url, token=token, data=update.comment_period,
+                                        integration=OutboundIntegration.EPIC)
+            # Eagle-API returns the created MongoDB document; the PK field is '_id'.
+            return str(response.json().get('_id', '')) or None, project_type
+
     @staticmethod
     def delete_from_epic(eng_id: str) -> None:
         """Delete the CommentPeriod in EPIC that corresponds to the given engagement."""
@@ -186,13 +361,18 @@ class ProjectService:
             eao_service_account_token = ProjectService._get_eao_service_account_token()
             project_id = engagement_metadata.project_id or engagement_metadata.project_tracking_id
 
-            project_type = ProjectService._get_project_type(project_id, eao_service_account_token)
+            saved_project_type = engagement_metadata.project_type
+            project_type = ProjectService._resolve_project_type(
+                engagement_metadata, project_id, eao_service_account_token)
+            if engagement_metadata.project_type != saved_project_type:
+                engagement_metadata.commit()
 
-            if project_type == 'notification':
+            if project_type == NOTIFICATION:
                 ProjectService._delete_project_notification(project_id, eao_service_account_token)
             else:
                 delete_url = f'{current_app.config.get("EPIC_URL")}/{engagement_metadata.project_tracking_id}'
-                RestService.delete(endpoint=delete_url, token=eao_service_account_token, raise_for_status=False)
+                RestService.delete(endpoint=delete_url, token=eao_service_account_token, raise_for_status=False,
+                                   integration=OutboundIntegration.EPIC)
 
         except Exception as e:  # NOQA # pylint:disable=broad-except
             logger.error('Error in delete_from_epic: %s', str(e))
@@ -238,3 +418,14 @@ class ProjectService:
         issuer_url = current_app.config.get('EPIC_JWT_OIDC_ISSUER')
         client_id = current_app.config.get('EPIC_KC_CLIENT_ID')
         return RestService.get_access_token_with_password(kc_service_id, kc_secret, client_id, issuer_url)
+
+
+def _notification_cache_key(notification_url: str) -> str:
+    return f'epic_project_notification:{notification_url}'
+
+
+def _cache_notification(notification_url: str, etag: Optional[str], notification_data: dict):
+    """Keep the notification for If-None-Match, when EPIC sent an ETag for it."""
+    if etag:
+        cache.set(_notification_cache_key(notification_url), (etag, notification_data),
+                  timeout=current_app.config.get('EPIC_NOTIFICATION_CACHE_TIMEOUT', 3600))
@@ -16,12 +16,12 @@ import json
 from typing import Iterable
 
 from flask import current_app, request
-import requests
 from requests.exceptions import ConnectTimeout, HTTPError
 # pylint:disable=ungrouped-imports
 from requests.exceptions import ConnectionError as ReqConnectionError
 
-from met_api.utils.enums import AuthHeaderType, ContentType
+from met_api.utils import http_client
+from met_api.utils.enums import AuthHeaderType, ContentType, OutboundIntegration
 
 
 class RestServiceConnectionError(RuntimeError):
@@ -46,6 +46,7 @@ class RestService:
         additional_headers: dict = kwargs.get('additional_headers', {})
         generate_token: bool = kwargs.get('generate_token', True)
         endpoint: str = kwargs.get('endpoint')
+        integration: OutboundIntegration = kwargs.get('integration', OutboundIntegration.DEFAULT)
 
         current_app.logger.debug(f'<_invoke-{rest_method}')
 
@@ -67,11 +68,7 @@ class RestService:
 
         response = None
         try:
-            invoke_rest_method = getattr(requests, rest_method)
-            response = invoke_rest_method(
-                endpoint, data=data, headers=headers,
-                timeout=current_app.config.get('CONNECT_TIMEOUT', 60)
-            )
+            response = http_client.request(integration, rest_method, endpoint, data=data, headers=headers)
             if raise_for_status:
                 response.raise_for_status()
         except (ReqConnectionError, ConnectTimeout) as exc:
@@ -130,12 +127,12 @@ class RestService:
             raise ValueError('Missing required parameters')
 
         token_url = issuer_url + '/protocol/openid-connect/token'
-        auth_response = requests.post(
+        auth_response = http_client.post(
+            OutboundIntegration.KEYCLOAK,
             token_url,
             auth=(kc_service_id, kc_secret),
             headers={'Content-Type': ContentType.FORM_URL_ENCODED.value},
-            data='grant_type=client_credentials',
-            timeout=current_app.config.get('CONNECT_TIMEOUT', 60)
+            data='grant_type=client_credentials'
         )
         auth_response.raise_for_status()
         return auth_response.json().get('access_token')
@@ -156,9 +153,7 @@ class RestService:
             'client_id': client_id
         }
 
-        auth_response = requests.post(
-            token_url, headers=headers, data=data, timeout=current_app.config.get('CONNECT_TIMEOUT', 60)
-        )
+        auth_response = http_client.post(OutboundIntegration.KEYCLOAK, token_url, headers=headers, data=data)
         auth_response.raise_for_status()
 
         return auth_response.json().get('access_token')
@@ -13,19 +13,206 @@
 # limitations under the License.
 
 
-"""Service for shapefile service."""
+"""Service for shapefile service.
+
+Shapefile conversion (geopandas/pyproj) is CPU and memory heavy, so it runs in a small,
+separate process pool rather than inside the API worker, and results are cached on disk by the
+SHA-256 of the uploaded zip so re-uploading the same file is free. The results can be several MB, so
+they are kept out of the in-memory cache every worker holds; the disk cache is shared by the workers
+of a pod and trimmed to SHAPEFILE_CACHE_MAX_SIZE, oldest first. A file that times out is remembered
+in the in-memory cache, so re-uploading it fails straight away instead of taking up the pool again.
+"""
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
 from http import HTTPStatus
+import io
 import json
+import multiprocessing
 import os
 import shutil
 import tempfile
+import threading
+import time
 import zipfile
 
 from flask import current_app
-import geopandas as gpd
 from werkzeug.utils import secure_filename
 
 from met_api.exceptions.business_exception import BusinessException
+from met_api.utils.cache import cache
+from met_api.utils.lazy_import import lazy_module
+
+
+# Imported on the first conversion, in whichever process runs it
+gpd = lazy_module('geopandas')
+
+
+_executor = None  # pylint: disable=invalid-name
+_executor_lock = threading.Lock()
+# The queue each pool's processes report their pid on when they start, and the pids reported so far
+_worker_pids = {}  # pylint: disable=invalid-name
+
+
+def _report_pid(pid_queue):
+    """Run in each new pool process, so the pool's processes can be stopped if it gets stuck."""
+    pid_queue.put(os.getpid())
+
+
+def _get_executor():
+    """Return the shared conversion pool, or None when conversions should run inline."""
+    global _executor  # pylint: disable=global-statement
+    max_workers = current_app.config.get('SHAPEFILE_CONVERSION_WORKERS', 0)
+    if not max_workers:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            # spawn, not fork: the API process is multi-threaded, and recycling children
+            # hands the memory geopandas grabs for a large file back to the OS.
+            context = multiprocessing.get_context('spawn')
+            pid_queue = context.SimpleQueue()
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=context,
+                max_tasks_per_child=current_app.config.get('SHAPEFILE_CONVERSION_TASKS_PER_CHILD', 20),
+                initializer=_report_pid,
+                initargs=(pid_queue,))
+            _worker_pids[_executor] = (pid_queue, set())
+        else:
+            # read the pids of recycled processes as they come, so the queue never fills up
+            _worker_processes(_executor)
+        return _executor
+
+
+def _worker_processes(executor):
+    """Return the pool's running processes. Call with _executor_lock held."""
+    pid_queue, pids = _worker_pids.get(executor, (None, set()))
+    while pid_queue is not None and not pid_queue.empty():
+        pids.add(pid_queue.get())
+    children = {process.pid: process for process in multiprocessing.active_children()}
+    # processes recycled by the pool have exited, and their pids may since belong to others
+    pids.intersection_update(children)
+    return [children[pid] for pid in pids]
+
+
+def _discard_executor(executor):
+    """Stop a broken or stuck pool and its processes, so the next conversion starts a new one.
+
+    Shutting the pool down alone would leave a stuck conversion running, holding its process.
+    Conversions still running on the pool fail and can be retried.
+    """
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+        processes = _worker_processes(executor)
+        _worker_pids.pop(executor, None)
+    for process in processes:
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def reset_executor():
+    """Forget the conversion pool without shutting it down.
+
+    Called in a forked worker: a pool inherited from the parent belongs to the parent, and the
+    worker starts its own on its first conversion.
+    """
+    global _executor, _executor_lock, _worker_pids  # pylint: disable=global-statement
+    _executor = None
+    _executor_lock = threading.Lock()
+    _worker_pids = {}
+
+
+def _cache_path(cache_key):
+    return os.path.join(current_app.config.get('SHAPEFILE_CACHE_FOLDER'), f'{cache_key}.geojson')
+
+
+def _get_cached_geojson(cache_key):
+    """Return the cached conversion for the key, or None if there is none or it has expired."""
+    path = _cache_path(cache_key)
+    try:
+        if time.time() - os.path.getmtime(path) > current_app.config.get('SHAPEFILE_CACHE_TIMEOUT', 3600):
+            return None
+        with open(path, encoding='utf-8') as cached_file:
+            return cached_file.read()
+    except FileNotFoundError:
+        # not cached, or removed by another worker trimming the cache
+        return None
+
+
+def _cache_geojson(cache_key, geojson_string):
+    """Write a conversion to the disk cache, then trim the cache back to its size limit."""
+    cache_folder = current_app.config.get('SHAPEFILE_CACHE_FOLDER')
+    os.makedirs(cache_folder, exist_ok=True)
+    # written aside and renamed, so other workers never read a partly written file
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=cache_folder, suffix='.tmp',
+                                     delete=False) as cache_file:
+        cache_file.write(geojson_string)
+    os.replace(cache_file.name, _cache_path(cache_key))
+    _trim_cache(cache_folder)
+
+
+def _trim_cache(cache_folder):
+    """Remove expired conversions, then the oldest ones until the folder fits SHAPEFILE_CACHE_MAX_SIZE."""
+    config = current_app.config
+    expires_before = time.time() - config.get('SHAPEFILE_CACHE_TIMEOUT', 3600)
+    max_size = config.get('SHAPEFILE_CACHE_MAX_SIZE', 0)
+    entries = []
+    for entry in os.scandir(cache_folder):
+        if not entry.name.endswith('.geojson'):
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total_size = sum(size for _, size, _ in entries)
+    for modified, size, path in sorted(entries):
+        if modified >= expires_before and total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
+
+
+def _convert_shapefiles(shapefile_paths, simplify_tolerance=0, precision=None):
+    """Read, reproject and merge shapefiles into one GeoJSON FeatureCollection string.
+
+    Runs in the conversion pool, so it must stay a picklable module-level function.
+    Features are written out one at a time rather than building the whole collection
+    as a dict first. Returns None if none of the shapefiles contain any features.
+    """
+    output = io.StringIO()
+    output.write('{"type": "FeatureCollection", "features": [')
+    render_index = 0
+
+    for shapefile_index, shapefile_path in enumerate(shapefile_paths):
+        gdf = gpd.read_file(shapefile_path)
+
+        # Check if the GeoDataFrame's CRS is not EPSG:4326, if so transform it to EPSG:4326
+        if gdf.crs and gdf.crs.to_epsg() != 4326:
+            gdf = gdf.to_crs(epsg=4326)
+
+        if simplify_tolerance:
+            gdf.geometry = gdf.geometry.simplify(simplify_tolerance, preserve_topology=True)
+        if precision is not None:
+            gdf.geometry = gdf.geometry.set_precision(10 ** -precision)
+
+        for feature in gdf.iterfeatures(na='null'):
+            feature['properties']['shape_group_index'] = shapefile_index
+            feature['properties']['shape_render_index'] = render_index
+            if render_index:
+                output.write(', ')
+            output.write(json.dumps(feature, default=str))
+            render_index += 1
+
+    if not render_index:
+        return None
+    output.write(']}')
+    return output.getvalue()
 
 
 class ShapefileService:   # pylint: disable=too-few-public-methods
@@ -38,59 +225,70 @@ class ShapefileService:   # pylint: disable=too-few-public-methods
     @staticmethod
     def convert_to_geojson(file):
         """Convert to Geojson."""
-        base_folder = current_app.config.get('SHAPEFILE_UPLOAD_FOLDER')
+        config = current_app.config
+        simplify_tolerance = config.get('SHAPEFILE_SIMPLIFY_TOLERANCE', 0)
+        precision = config.get('SHAPEFILE_COORDINATE_PRECISION')
+
+        base_folder = config.get('SHAPEFILE_UPLOAD_FOLDER')
         os.makedirs(base_folder, exist_ok=True)
         upload_folder = tempfile.mkdtemp(dir=base_folder)
         try:
-            shapefile_paths = ShapefileService._unzip_file(file, upload_folder)
-            geojson_string = ShapefileService._get_geojson(shapefile_paths)
+            file_path, content_hash = ShapefileService._save_upload(file, upload_folder)
+            cache_key = f'shapefile_geojson_{content_hash}_{simplify_tolerance}_{precision}'
+            geojson_string = _get_cached_geojson(cache_key)
+            if geojson_string is None:
+                if cache.get(f'{cache_key}_timed_out'):
+                    raise ShapefileService._too_complex()
+                shapefile_paths = ShapefileService._unzip_file(file_path, upload_folder)
+                geojson_string = ShapefileService._get_geojson(shapefile_paths, simplify_tolerance, precision,
+                                                               timed_out_key=f'{cache_key}_timed_out')
+                _cache_geojson(cache_key, geojson_string)
         finally:
             # Clean up uploaded files, even if extraction or parsing failed
             shutil.rmtree(upload_folder, ignore_errors=True)
         return geojson_string
 
     @staticmethod
-    def _get_geojson(shapefile_paths):
+    def _get_geojson(shapefile_paths, simplify_tolerance=0, precision=None, timed_out_key=None):
         if isinstance(shapefile_paths, str):
             shapefile_paths = [shapefile_paths]
 
-        merged_geojson = {
-            'type': 'FeatureCollection',
-            'features': [],
-        }
-        render_index = 0
-
-        for shapefile_index, shapefile_path in enumerate(shapefile_paths):
-            gdf = gpd.read_file(shapefile_path)
-
-            # Check if the GeoDataFrame's CRS is not EPSG:4326, if so transform it to EPSG:4326
-            if gdf.crs and gdf.crs.to_epsg() != 4326:
-                gdf = gdf.to_crs(epsg=4326)
-
-            geojson_dict = json.loads(gdf.to_json())
-            features = geojson_dict.get('features', [])
-
-            if not features:
-                continue
-
-            for feature in features:
-                properties = feature.setdefault('properties', {})
-                properties['shape_group_index'] = shapefile_index
-                properties['shape_render_index'] = render_index
-
-                merged_geojson['features'].append(feature)
-                render_index += 1
+        executor = _get_executor()
+        if executor is None:
+            geojson_string = _convert_shapefiles(shapefile_paths, simplify_tolerance, precision)
+        else:
+            try:
+                future = executor.submit(_convert_shapefiles, shapefile_paths, simplify_tolerance, precision)
+                geojson_string = future.result(timeout=current_app.config.get('SHAPEFILE_CONVERSION_TIMEOUT'))
+            except FutureTimeoutError as exc:
+                # the conversion would keep its process busy until done, for every re-upload of the file too
+                _discard_executor(executor)
+                if timed_out_key:
+                    cache.set(timed_out_key, True, timeout=current_app.config.get('SHAPEFILE_CACHE_TIMEOUT', 3600))
+                raise ShapefileService._too_complex() from exc
+            except BrokenProcessPool as exc:
+                # a conversion process died, most likely killed for running out of memory
+                _discard_executor(executor)
+                raise BusinessException(
+                    error='Shapefile conversion failed, the file may be too large. Try again or simplify it.',
+                    status_code=HTTPStatus.SERVICE_UNAVAILABLE) from exc
 
-        if not merged_geojson.get('features'):
+        if geojson_string is None:
             raise BusinessException(
                 error='No Valid shapefile found.',
                 status_code=HTTPStatus.BAD_REQUEST)
 
-        geojson_string = json.dumps(merged_geojson)
         return geojson_string
 
     @staticmethod
-    def _unzip_file(file, upload_folder):
+    def _too_complex():
+        return BusinessException(
+            error='Shapefile is too complex to convert. Try simplifying it.',
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY)
+
+    @staticmethod
+    def _save_upload(file, upload_folder):
+        """Save the upload to disk, returning its path and the SHA-256 of its content."""
         filename = secure_filename(file.filename)
         file_path = os.path.join(upload_folder, filename)
         file.save(file_path)
@@ -100,6 +298,14 @@ class ShapefileService:   # pylint: disable=too-few-public-methods
                 error='Uploaded zip file is too large.',
                 status_code=HTTPStatus.BAD_REQUEST)
 
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as saved_file:
+            for chunk in iter(lambda: saved_file.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return file_path, digest.hexdigest()
+
+    @staticmethod
+    def _unzip_file(file_path, upload_folder):
         with zipfile.ZipFile(file_path, 'r') as zip_ref:
             ShapefileService._safe_extract(zip_ref, upload_folder)
             shapefile_names = ShapefileService._get_shapefile_names(zip_ref)
@@ -13,17 +13,18 @@ from met_api.constants.membership_type import MembershipType
 from met_api.constants.staff_note_type import StaffNoteType
 from met_api.exceptions.business_exception import BusinessException
 from met_api.models import Engagement as EngagementModel
-from met_api.models import EngagementSettingsModel
 from met_api.models import Survey as SurveyModel
 from met_api.models import Tenant as TenantModel
 from met_api.models.comment import Comment
 from met_api.models.comment_status import CommentStatus
 from met_api.models.db import session_scope
 from met_api.models.engagement_slug import EngagementSlug as EngagementSlugModel
+from met_api.models.engine_profiles import read_only, use_primary
 from met_api.models.pagination_options import PaginationOptions
 from met_api.models.participant import Participant as ParticipantModel
 from met_api.models.staff_note import StaffNote
 from met_api.models.submission import Submission as SubmissionModel
+from met_api.models.submission_context import SubmissionContext
 from met_api.models.submission_version import SubmissionVersion
 from met_api.schemas.submission import PublicSubmissionSchema, SubmissionSchema
 from met_api.services import authorization
@@ -76,14 +77,19 @@ class SubmissionService:
         return PublicSubmissionSchema().dump(submission)
 
     @classmethod
+    @use_primary()
     def create(cls, token, submission: SubmissionSchema):
         """Create submission."""
-        cls._validate_fields(submission)
         survey_id = submission.get('survey_id')
-        survey = SurveyService.get(survey_id)
-        engagement_id = survey.get('engagement_id')
+        # survey, engagement, settings and tenant are read once here and reused for the whole submission
+        context = SubmissionContext.load(survey_id)
+        if not context:
+            raise KeyError(f'Survey with id {survey_id} not found')
+        cls._validate_fields(submission, context)
+        SurveyService.check_access(context.survey, context.engagement)
+        engagement_id = context.survey.engagement_id
         # Restrict submission on unpublished engagement
-        if SubmissionService.is_unpublished(engagement_id):
+        if context.engagement.status_id == EngagementStatus.Unpublished.value:
             return {}
 
         # Creates a scoped session that will be committed when disposed or rolledback if a exception occurs
@@ -98,14 +104,12 @@ class SubmissionService:
             submission_result = SubmissionModel.create(submission, session)
             submission['id'] = submission_result.id
             comments = CommentService.extract_comments_from_survey(
-                submission, survey)
+                submission, {'id': context.survey.id, 'form_json': context.survey.form_json})
             CommentService().create_comments(comments, session)
 
-            engagement_settings: EngagementSettingsModel =\
-                EngagementSettingsModel.find_by_id(engagement_id)
-            if engagement_settings:
-                if engagement_settings.send_report:
-                    SubmissionService._send_submission_response_email(participant_id, engagement_id)
+            if context.settings and context.settings.send_report:
+                SubmissionService._send_submission_response_email(participant_id, context.engagement,
+                                                                  context.tenant)
         return submission_result
 
     @classmethod
@@ -144,13 +148,16 @@ class SubmissionService:
             return comments_result
 
     @staticmethod
-    def _validate_fields(submission):
+    def _validate_fields(submission, context: SubmissionContext = None):
         # TODO: Validate against survey form_json
         """Validate all fields."""
-        survey_id = submission.get('survey_id', None)
-        survey: SurveyModel = SurveyModel.find_by_id(survey_id)
-        engagement: EngagementModel = EngagementModel.find_by_id(
-            survey.engagement_id)
+        if context:
+            engagement = context.engagement
+        else:
+            survey_id = submission.get('survey_id', None)
+            survey: SurveyModel = SurveyModel.find_by_id(survey_id)
+            engagement: EngagementModel = EngagementModel.find_by_id(
+                survey.engagement_id)
         if not engagement:
             raise ValueError('Survey not linked to an Engagement')
 
@@ -310,6 +317,7 @@ class SubmissionService:
         return False
 
     @classmethod
+    @read_only()
     def get_paginated(
             cls,
             survey_id,
@@ -334,10 +342,13 @@ class SubmissionService:
             advanced_search_filters if any(
                 advanced_search_filters.values()) else None
         )
-        return {
+        page = {
             'items': SubmissionSchema(many=True, exclude=['submission_json']).dump(items),
             'total': total
         }
+        if pagination_options.cursor is not None:
+            page['next_cursor'] = pagination_options.next_cursor
+        return page
 
     @staticmethod
     def _send_rejected_email(staff_review_details: dict, submission: SubmissionModel, review_note, token) -> None:
@@ -413,11 +424,11 @@ class SubmissionService:
         return template_id, subject, body, args
 
     @staticmethod
-    def _send_submission_response_email(participant_id, engagement_id) -> None:
+    def _send_submission_response_email(participant_id, engagement: EngagementModel, tenant: TenantModel) -> None:
         """Send response to survey submission."""
         participant = ParticipantModel.find_by_id(participant_id)
         template_id = get_gc_notify_config('SUBMISSION_RESPONSE_EMAIL_TEMPLATE_ID')
-        subject, body, args = SubmissionService._render_submission_response_email_template(engagement_id)
+        subject, body, args = SubmissionService._render_submission_response_email_template(engagement, tenant)
         try:
             notification.send_email(subject=subject,
                                     email=ParticipantModel.decode_email(
@@ -433,15 +444,13 @@ class SubmissionService:
                 status_code=HTTPStatus.INTERNAL_SERVER_ERROR) from exc
 
     @staticmethod
-    def _render_submission_response_email_template(engagement_id):
-        engagement: EngagementModel = EngagementModel.find_by_id(engagement_id)
+    def _render_submission_response_email_template(engagement: EngagementModel, tenant: TenantModel):
         template = Template.get_template('submission_response.html')
         subject = get_gc_notify_config('SUBMISSION_RESPONSE_EMAIL_SUBJECT')
         dashboard_path = SubmissionService._get_dashboard_path(engagement)
-        engagement_url = notification.get_tenant_site_url(engagement.tenant_id, dashboard_path)
+        engagement_url = notification.get_tenant_site_url(engagement.tenant_id, dashboard_path, tenant)
         email_environment = get_gc_notify_config('EMAIL_ENVIRONMENT')
-        tenant_name = SubmissionService._get_tenant_name(
-            engagement.tenant_id)
+        tenant_name = tenant.name
         args = {
             'engagement_url': engagement_url,
             'engagement_time': get_gc_notify_config('ENGAGEMENT_END_TIME'),
@@ -37,6 +37,20 @@ class SurveyService:
         survey_model = SurveyModel.find_by_id(survey_id)
         if not survey_model:
             raise KeyError(f'Survey with id {survey_id} not found')
+        engagement_model = None
+        if not survey_model.is_hidden and survey_model.engagement_id:
+            engagement_model = EngagementModel.find_by_id(survey_model.engagement_id)
+        cls.check_access(survey_model, engagement_model)
+
+        survey = SurveySchema().dump(survey_model)
+        # The builder's report settings tab groups conditional follow-ups under the question that
+        # triggers them.
+        survey['conditional_links'] = extract_conditional_links(survey_model.form_json)
+        return survey
+
+    @staticmethod
+    def check_access(survey_model: SurveyModel, engagement_model: EngagementModel = None):
+        """Check the user can see the survey, given the engagement it belongs to."""
         eng_id = None
         one_of_roles = (Role.VIEW_SURVEYS.value,)
         skip_auth = False
@@ -44,34 +58,26 @@ class SurveyService:
         if survey_model.is_hidden:
             # Only Admins can view hidden surveys.
             one_of_roles = (Role.VIEW_ALL_SURVEYS.value,)
-        elif survey_model.engagement_id:
-            engagement_model = EngagementModel.find_by_id(survey_model.engagement_id)
-            if engagement_model:
-                eng_id = engagement_model.id
-                # Calculate the threshold time (8 hours after the end_date)
-                extended_end_date = engagement_model.end_date + timedelta(days=1, hours=8)
-                # Get the current local datetime
-                current_datetime = local_datetime().replace(tzinfo=None)
-                if ((engagement_model.status_id == Status.Published.value) or
-                        (engagement_model.status_id == Status.Closed.value and current_datetime <= extended_end_date)):
-                    # Published Engagement anyone can access.
-                    skip_auth = True
-                else:
-                    one_of_roles = (
-                        MembershipType.TEAM_MEMBER.name,
-                        MembershipType.REVIEWER.name,
-                        Role.VIEW_SURVEYS.value
-                    )
+        elif engagement_model:
+            eng_id = engagement_model.id
+            # Calculate the threshold time (8 hours after the end_date)
+            extended_end_date = engagement_model.end_date + timedelta(days=1, hours=8)
+            # Get the current local datetime
+            current_datetime = local_datetime().replace(tzinfo=None)
+            if ((engagement_model.status_id == Status.Published.value) or
+                    (engagement_model.status_id == Status.Closed.value and current_datetime <= extended_end_date)):
+                # Published Engagement anyone can access.
+                skip_auth = True
+            else:
+                one_of_roles = (
+                    MembershipType.TEAM_MEMBER.name,
+                    MembershipType.REVIEWER.name,
+                    Role.VIEW_SURVEYS.value
+                )
 
         if not skip_auth:
             authorization.check_auth(one_of_roles=one_of_roles, engagement_id=eng_id)
 
-        survey = SurveySchema().dump(survey_model)
-        # The builder's report settings tab groups conditional follow-ups under the question that
-        # triggers them.
-        survey['conditional_links'] = extract_conditional_links(survey_model.form_json)
-        return survey
-
     @classmethod
     def get_open(cls, survey_id):
         """Get survey by the id."""
@@ -95,6 +95,7 @@ class SourceAction(Enum):
 
     CREATED = 'created'
     PUBLISHED = 'published'
+    CLOSED = 'closed'
 
 
 class UserStatus(IntEnum):
@@ -102,3 +103,14 @@ class UserStatus(IntEnum):
 
     ACTIVE = 1
     INACTIVE = 2
+
+
+class OutboundIntegration(Enum):
+    """External systems met-api calls out to; each gets its own timeouts, retries and circuit breaker."""
+
+    DEFAULT = 'default'
+    KEYCLOAK = 'keycloak'
+    EPIC = 'epic'
+    NOTIFY = 'notify'
+    CDOGS = 'cdogs'
+    PENGUIN = 'penguin'
@@ -0,0 +1,300 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Shared client for every outbound HTTP call made by met-api.
+
+Keycloak, EPIC, GC Notify, CDOGS and Penguin analytics are all
+called through here instead of the module-level ``requests`` functions, so that:
+
+* connections are pooled and kept alive per host rather than paying a new
+  TCP + TLS handshake on every call,
+* each integration gets its own connect/read timeouts (``HTTP_CLIENT_CONFIG``),
+* idempotent calls are retried on transient failures with jittered backoff,
+* a per-integration circuit breaker fails fast while a dependency is down, so a
+  slow Keycloak or EPIC doesn't pin every gunicorn worker,
+* latency and error counts per integration are available from ``get_metrics()``.
+"""
+from http.cookiejar import DefaultCookiePolicy
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from flask import current_app, has_app_context
+import requests
+from requests.adapters import HTTPAdapter
+
+from met_api.config import _Config
+from met_api.utils import request_metrics
+from met_api.utils.enums import OutboundIntegration
+
+
+logger = logging.getLogger(__name__)
+
+# Only these are safe to replay after a failure; POSTs are never retried.
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+RETRY_STATUSES = frozenset({502, 503, 504})
+MAX_BACKOFF_SECONDS = 5
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without touching the network while an integration's circuit breaker is open.
+
+    Subclasses ``requests.exceptions.ConnectionError`` so existing handlers for
+    connection failures treat a short-circuited call the same way.
+    """
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Opens after ``threshold`` failures in a row. Once ``reset_after`` seconds have
+    passed a single trial call is let through (half-open); its outcome either
+    closes the circuit again or re-opens it for another ``reset_after`` seconds.
+    """
+
+    def __init__(self):
+        """Initialize a closed breaker."""
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open."""
+        if self._opened_at is None:
+            return 'closed'
+        return 'half_open' if self._trial_in_flight else 'open'
+
+    def allow(self, reset_after: float) -> bool:
+        """Return True if a call may be attempted now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if not self._trial_in_flight and time.monotonic() - self._opened_at >= reset_after:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """Close the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self, threshold: int):
+        """Count a failure, opening the circuit once the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= threshold:
+                self._opened_at = time.monotonic()
+
+
+class _Metrics:
+    """Per-integration call counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[str, dict] = {}
+
+    def _entry(self, name: str) -> dict:
+        return self._data.setdefault(name, {
+            'calls': 0, 'errors': 0, 'retries': 0, 'rejected': 0, 'total_ms': 0.0, 'max_ms': 0.0
+        })
+
+    def record_call(self, name: str, elapsed_ms: float, failed: bool):
+        """Record one attempt and its latency."""
+        with self._lock:
+            entry = self._entry(name)
+            entry['calls'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            if failed:
+                entry['errors'] += 1
+
+    def increment(self, name: str, counter: str):
+        """Bump a single counter."""
+        with self._lock:
+            self._entry(name)[counter] += 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Return a copy of all counters."""
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._data.items()}
+
+    def clear(self):
+        """Forget all counters."""
+        with self._lock:
+            self._data.clear()
+
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+_metrics = _Metrics()
+
+
+def _settings(integration: OutboundIntegration) -> dict:
+    """Return the effective settings for an integration, falling back to DEFAULT per key."""
+    if has_app_context():
+        client_config = current_app.config.get('HTTP_CLIENT_CONFIG', _Config.HTTP_CLIENT_CONFIG)
+    else:
+        client_config = _Config.HTTP_CLIENT_CONFIG
+    return {**client_config['DEFAULT'], **client_config.get(integration.name, {})}
+
+
+def _pool_maxsize() -> int:
+    if has_app_context():
+        return current_app.config.get('HTTP_CLIENT_POOL_MAXSIZE', _Config.HTTP_CLIENT_POOL_MAXSIZE)
+    return _Config.HTTP_CLIENT_POOL_MAXSIZE
+
+
+def _get_session(url: str) -> requests.Session:
+    """Return the pooled session for the url's scheme and host, creating it on first use."""
+    parts = urlsplit(url)
+    key = f'{parts.scheme}://{parts.netloc}'
+    session = _sessions.get(key)
+    if session is not None:
+        return session
+    with _sessions_lock:
+        if key not in _sessions:
+            session = requests.Session()
+            # Sessions are shared by every request a worker serves; never carry cookies between them.
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_pool_maxsize(), max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _sessions[key] = session
+        return _sessions[key]
+
+
+def _get_breaker(name: str) -> CircuitBreaker:
+    with _breakers_lock:
+        return _breakers.setdefault(name, CircuitBreaker())
+
+
+def _backoff(base: float, attempt: int) -> float:
+    """Full-jitter exponential backoff, so retrying workers don't stampede a recovering dependency."""
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, base * 2 ** attempt))
+
+
+def request(integration: OutboundIntegration, method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request to an external integration.
+
+    Accepts the same keyword arguments as ``requests.request``. ``timeout`` defaults
+    to the integration's configured ``(connect, read)`` pair.
+    """
+    settings = _settings(integration)
+    name = integration.value
+    method = method.upper()
+    kwargs.setdefault('timeout', (settings['CONNECT_TIMEOUT'], settings['READ_TIMEOUT']))
+    retries = settings['RETRIES'] if method in IDEMPOTENT_METHODS else 0
+    breaker = _get_breaker(name)
+    session = _get_session(url)
+
+    attempt = 0
+    while True:
+        if not breaker.allow(settings['BREAKER_RESET']):
+            _metrics.increment(name, 'rejected')
+            raise CircuitOpenError(f'{name} circuit breaker is open; not calling {method} {url}')
+
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+            _record_call(name, (time.perf_counter() - started) * 1000, failed=True)
+            breaker.record_failure(settings['BREAKER_THRESHOLD'])
+            if attempt >= retries:
+                raise
+            logger.warning('%s %s to %s failed (%s); retrying', name, method, url, exc)
+        except Exception:  # noqa: B902
+            # Not worth a retry, but it still has to settle the call, or a half-open trial would stay in flight
+            # and keep the circuit from ever closing.
+            _record_call(name, (time.perf_counter() - started) * 1000, failed=True)
+            breaker.record_failure(settings['BREAKER_THRESHOLD'])
+            raise
+        else:
+            # 4xx responses are the caller's problem, not a sign the dependency is unhealthy.
+            failed = response.status_code >= 500
+            _record_call(name, (time.perf_counter() - started) * 1000, failed=failed)
+            if not failed:
+                breaker.record_success()
+                return response
+            breaker.record_failure(settings['BREAKER_THRESHOLD'])
+            if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                return response
+            logger.warning('%s %s to %s returned %s; retrying', name, method, url, response.status_code)
+            response.close()
+
+        attempt += 1
+        _metrics.increment(name, 'retries')
+        time.sleep(_backoff(settings['BACKOFF'], attempt))
+
+
+def _record_call(name: str, elapsed_ms: float, failed: bool):
+    """Record a call attempt in the process-wide metrics and in the current request's."""
+    _metrics.record_call(name, elapsed_ms, failed)
+    request_metrics.record_outbound(name, elapsed_ms)
+
+
+def get(integration: OutboundIntegration, url: str, **kwargs) -> requests.Response:
+    """Send a GET request."""
+    return request(integration, 'GET', url, **kwargs)
+
+
+def post(integration: OutboundIntegration, url: str, **kwargs) -> requests.Response:
+    """Send a POST request."""
+    return request(integration, 'POST', url, **kwargs)
+
+
+def put(integration: OutboundIntegration, url: str, **kwargs) -> requests.Response:
+    """Send a PUT request."""
+    return request(integration, 'PUT', url, **kwargs)
+
+
+def delete(integration: OutboundIntegration, url: str, **kwargs) -> requests.Response:
+    """Send a DELETE request."""
+    return request(integration, 'DELETE', url, **kwargs)
+
+
+def get_metrics() -> Dict[str, dict]:
+    """Return latency, error and circuit state per integration for this process."""
+    snapshot = _metrics.snapshot()
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    for name, entry in snapshot.items():
+        entry['avg_ms'] = round(entry['total_ms'] / entry['calls'], 2) if entry['calls'] else 0.0
+        entry['total_ms'] = round(entry['total_ms'], 2)
+        entry['max_ms'] = round(entry['max_ms'], 2)
+        entry['circuit'] = breakers[name].state if name in breakers else 'closed'
+    return snapshot
+
+
+def reset():
+    """Drop pooled sessions, breaker state and metrics.
+
+    Used by tests, and after a fork so a child never shares sockets with its parent.
+    """
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+    with _breakers_lock:
+        _breakers.clear()
+    _metrics.clear()
@@ -0,0 +1,97 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Defer importing heavy dependencies until they are first used.
+
+Shapefile conversion (geopandas, pandas, pyproj, shapely) and the dashboard export (openpyxl) are
+rare staff operations, and the Snowplow tracker is only needed when analytics are enabled, but
+importing their libraries at module level makes every worker pay for them at startup and carry
+them in memory. A module bound with ``lazy_module`` is imported on the
+first attribute access instead:
+
+    gpd = lazy_module('geopandas')
+    ...
+    gpd.read_file(path)  # geopandas is imported here, once per process
+
+Modules listed in HEAVY_MODULES must only be imported this way; a test fails when creating the
+app with the default configuration imports one of them, or takes longer than the import budget.
+"""
+import importlib
+import logging
+import threading
+import time
+from types import ModuleType
+from typing import Dict, List
+
+
+logger = logging.getLogger(__name__)
+
+# Optional dependencies that must not be imported while the app starts.
+HEAVY_MODULES = ('geopandas', 'pandas', 'pyproj', 'shapely', 'fiona', 'pyogrio', 'openpyxl', 'snowplow_tracker')
+
+_import_lock = threading.Lock()
+# Seconds each lazy module took to import, for diagnostics.
+_load_times: Dict[str, float] = {}
+# Every stand-in created, so a preloading server can import them all before forking.
+_lazy_modules: List['LazyModule'] = []
+
+
+class LazyModule(ModuleType):
+    """A stand-in for a module that imports the real one on first attribute access."""
+
+    def __init__(self, name: str):
+        """Bind the stand-in to a module name without importing it."""
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+        _lazy_modules.append(self)
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with _import_lock:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self.__name__)
+                    _load_times[self.__name__] = time.perf_counter() - started
+                    logger.info('Lazily imported %s in %.2fs', self.__name__, _load_times[self.__name__])
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attribute):
+        """Import the module if needed and read the attribute from it."""
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        """List the real module's attributes."""
+        return dir(self._load())
+
+
+def lazy_module(name: str) -> ModuleType:
+    """Return a stand-in for the named module that imports it when first used."""
+    return LazyModule(name)
+
+
+def load_all():
+    """Import every lazily bound module now.
+
+    Used when gunicorn preloads the app, so the modules are imported once in the master and
+    shared copy-on-write by the workers instead of being imported by each of them.
+    """
+    for module in list(_lazy_modules):
+        module._load()  # pylint: disable=protected-access
+
+
+def load_times() -> Dict[str, float]:
+    """Return how long each lazily imported module took to import, in seconds."""
+    return dict(_load_times)
@@ -12,10 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Bring in the common rate limiter."""
-from flask import current_app
+from flask import Flask, current_app
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
+# registers the shared storage schemes with the limits library
+from met_api.utils.rate_limit_storage import DATABASE_SCHEME, PRECHECK_SCHEME
+
 
 # Per-IP limits for public (unauthenticated) endpoints. The values live in the
 # Flask config (see _Config) so they can be tuned per environment via the
@@ -39,3 +42,22 @@ def public_read_limit():
 
 # lower case name as used by convention in most Flask apps
 limiter = Limiter(key_func=get_remote_address)  # pylint: disable=invalid-name
+
+
+def init_limiter(app: Flask):
+    """Resolve the storage configuration and initialize the limiter.
+
+    postgresql+limits:// on its own points the Postgres storage at the app's database, and a
+    shared storage is put behind the in-memory precheck when RATELIMIT_PRECHECK_ENABLED is on.
+    """
+    storage_uri = app.config.get('RATELIMIT_STORAGE_URI', 'memory://')
+    if storage_uri == f'{DATABASE_SCHEME}://':
+        database_uri = app.config['SQLALCHEMY_DATABASE_URI']
+        storage_uri = DATABASE_SCHEME + database_uri[database_uri.index('://'):]
+    if app.config.get('RATELIMIT_PRECHECK_ENABLED') and not storage_uri.startswith('memory://'):
+        app.config['RATELIMIT_STORAGE_OPTIONS'] = {**app.config.get('RATELIMIT_STORAGE_OPTIONS', {}),
+                                                   'shared_storage_uri': storage_uri,
+                                                   'lease_fraction': app.config.get('RATELIMIT_LEASE_FRACTION', 0)}
+        storage_uri = f'{PRECHECK_SCHEME}://'
+    app.config['RATELIMIT_STORAGE_URI'] = storage_uri
+    limiter.init_app(app)
@@ -4,20 +4,25 @@ import json
 import re
 
 from flask import current_app
-import requests
 
 from met_api.models.tenant import Tenant
 from met_api.services.rest_service import RestService
+from met_api.utils import http_client
+from met_api.utils.enums import OutboundIntegration
 
 
-def get_tenant_site_url(tenant_id, path=''):
-    """Get the tenant specific site url (domain / tenant / path)."""
+def get_tenant_site_url(tenant_id, path='', tenant: Tenant = None):
+    """Get the tenant specific site url (domain / tenant / path).
+
+    A caller that already has the tenant loaded can pass it to skip looking it up again.
+    """
     is_single_tenant_environment = current_app.config.get('IS_SINGLE_TENANT_ENVIRONMENT', False)
     site_url = current_app.config.get('SITE_URL', '')
     if not is_single_tenant_environment:
         if tenant_id is None:
             raise ValueError('Missing tenant id.')
-        tenant: Tenant = Tenant.find_by_id(tenant_id)
+        if tenant is None or tenant.id != tenant_id:
+            tenant = Tenant.find_by_id(tenant_id)
         return site_url + f'/{tenant.short_name}' + path
     else:
         return site_url + path
@@ -42,11 +47,12 @@ def send_email(subject, email, html_body, args, template_id, reference=None):
     }
     if reference is not None:
         payload['reference'] = str(reference)
-    response = requests.post(send_email_endpoint,
-                             headers={
-                                 'Content-Type': 'application/json',
-                                 'Authorization': f'Bearer {service_account_token}'},
-                             data=json.dumps(payload))
+    response = http_client.post(OutboundIntegration.NOTIFY,
+                                send_email_endpoint,
+                                headers={
+                                    'Content-Type': 'application/json',
+                                    'Authorization': f'Bearer {service_account_token}'},
+                                data=json.dumps(payload))
     response.raise_for_status()
 
 
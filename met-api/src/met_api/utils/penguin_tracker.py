@@ -29,7 +29,9 @@ import uuid
 from flask import request
 import requests
 
+from met_api.utils import http_client
 from met_api.utils.analytics import AnalyticsEvent, BaseAnalyticsProvider
+from met_api.utils.enums import OutboundIntegration
 
 
 logger = logging.getLogger(__name__)
@@ -50,7 +52,6 @@ class PenguinTracker(BaseAnalyticsProvider):
     _enabled: bool = False
     _api_url: Optional[str] = None
     _source_app: str = 'met-web'
-    _timeout: int = 5  # seconds
 
     def __new__(cls):
         """Ensure only one instance of PenguinTracker exists."""
@@ -150,10 +151,10 @@ class PenguinTracker(BaseAnalyticsProvider):
                 'properties': properties or {}
             }
 
-            response = requests.post(
+            response = http_client.post(
+                OutboundIntegration.PENGUIN,
                 self._api_url,
                 json=payload,
-                timeout=self._timeout,
                 headers={'Content-Type': 'application/json'}
             )
 
@@ -0,0 +1,69 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Support for running the app preloaded in the gunicorn master.
+
+With GUNICORN_PRELOAD set, gunicorn_config.py creates the app once in the master, warms it with
+warm_up and forks the workers from it, so they share its memory copy-on-write rather than each
+building their own app. Whatever the master opened that must not be shared - database
+connections, HTTP connection pools, the shapefile conversion pool, the analytics emitters - is
+reopened in each worker by reinitialize_after_fork.
+"""
+import gc
+import logging
+
+from flask import Flask
+
+from met_api.models import db
+from met_api.services import shapefile_service
+from met_api.utils import http_client, lazy_import
+from met_api.utils.template import ENV as TEMPLATE_ENV
+
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up(app: Flask):
+    """Do the work every worker would otherwise repeat, once, in the master.
+
+    Compiles the email templates and imports the lazily bound libraries. The tenant cache is
+    already filled by create_app. Finally freezes the objects created so far, so the garbage
+    collector in the workers doesn't touch, and so copy, the pages they share with the master.
+    """
+    with app.app_context():
+        for template_name in TEMPLATE_ENV.list_templates():
+            TEMPLATE_ENV.get_template(template_name)
+        lazy_import.load_all()
+        # the master must not hand its connections to the workers
+        for engine in db.engines.values():
+            engine.dispose()
+    http_client.reset()
+
+    gc.collect()
+    gc.freeze()
+    logger.info('Warmed up the app before forking: %s templates, lazily imported %s',
+                len(TEMPLATE_ENV.list_templates()), ', '.join(lazy_import.load_times()) or 'nothing')
+
+
+def reinitialize_after_fork(app: Flask):
+    """Reopen, in a freshly forked worker, what must not be shared with the master."""
+    with app.app_context():
+        # close=False leaves the master's connections, if any, to the master
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+        from met_api.utils.analytics import init_analytics  # pylint: disable=import-outside-toplevel
+        init_analytics(app)
+
+    http_client.reset()
+    shapefile_service.reset_executor()
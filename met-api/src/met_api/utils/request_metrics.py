@@ -0,0 +1,177 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Per-request SQL and outbound call instrumentation.
+
+When ``REQUEST_METRICS_ENABLED`` is set, every request counts the SQL statements it runs
+and the time spent in them, and the time spent calling each outbound integration. The
+totals are returned in a ``Server-Timing`` header and written as one structured log line.
+
+When it is off the SQLAlchemy listeners are never installed and the request hooks return
+straight away, so the only cost is a config lookup per request.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import json
+import logging
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from flask import Flask, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger(__name__)
+
+_listeners_lock = threading.Lock()
+_listeners_installed = False  # pylint: disable=invalid-name
+# query counters opened by count_queries, regardless of the config flag
+_counters: List['QueryCounter'] = []
+
+
+@dataclass
+class QueryCounter:
+    """The SQL statements run while a counter was open."""
+
+    count: int = 0
+    elapsed_ms: float = 0
+    statements: List[str] = field(default_factory=list)
+
+    def record(self, statement: str, elapsed_ms: float):
+        """Add one executed statement."""
+        self.count += 1
+        self.elapsed_ms += elapsed_ms
+        self.statements.append(statement)
+
+
+@dataclass
+class RequestMetrics:
+    """Query and outbound call totals of the current request."""
+
+    started: float = field(default_factory=time.perf_counter)
+    db_count: int = 0
+    db_ms: float = 0
+    outbound: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    def record_query(self, elapsed_ms: float):
+        """Add one executed statement."""
+        self.db_count += 1
+        self.db_ms += elapsed_ms
+
+    def record_outbound(self, integration: str, elapsed_ms: float):
+        """Add one outbound call attempt to an integration."""
+        totals = self.outbound.setdefault(integration, {'count': 0, 'ms': 0.0})
+        totals['count'] += 1
+        totals['ms'] += elapsed_ms
+
+    def server_timing(self, total_ms: float) -> str:
+        """Format the totals as a Server-Timing header value."""
+        entries = [f'db;dur={self.db_ms:.1f};desc="{self.db_count} queries"']
+        for integration, totals in self.outbound.items():
+            entries.append(f'{integration.lower()};dur={totals["ms"]:.1f};desc="{totals["count"]} calls"')
+        entries.append(f'total;dur={total_ms:.1f}')
+        return ', '.join(entries)
+
+
+def init_app(app: Flask):
+    """Register the request hooks that collect and report the metrics."""
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+
+def current() -> Optional[RequestMetrics]:
+    """Return the metrics of the current request, or None when they aren't being collected."""
+    if not has_request_context():
+        return None
+    return g.get('request_metrics')
+
+
+def record_outbound(integration: str, elapsed_ms: float):
+    """Add an outbound call to the current request's metrics, if they are being collected."""
+    metrics = current()
+    if metrics is not None:
+        metrics.record_outbound(integration, elapsed_ms)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Count the SQL statements run inside the block, whether or not request metrics are enabled."""
+    _install_listeners()
+    counter = QueryCounter()
+    _counters.append(counter)
+    try:
+        yield counter
+    finally:
+        _counters.remove(counter)
+
+
+def _start_request():
+    if not current_app.config.get('REQUEST_METRICS_ENABLED'):
+        return
+    _install_listeners()
+    g.request_metrics = RequestMetrics()
+
+
+def _finish_request(response):
+    metrics = current()
+    if metrics is None:
+        return response
+    total_ms = (time.perf_counter() - metrics.started) * 1000
+    response.headers['Server-Timing'] = metrics.server_timing(total_ms)
+    logger.info(json.dumps({
+        'event': 'request_metrics',
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'duration_ms': round(total_ms, 1),
+        'db_queries': metrics.db_count,
+        'db_ms': round(metrics.db_ms, 1),
+        'outbound': {name: {'count': totals['count'], 'ms': round(totals['ms'], 1)}
+                     for name, totals in metrics.outbound.items()},
+    }))
+    return response
+
+
+def _install_listeners():
+    """Listen to statements on every engine, once per process and only after metrics are first needed."""
+    global _listeners_installed  # pylint: disable=global-statement
+    if _listeners_installed:
+        return
+    with _listeners_lock:
+        if not _listeners_installed:
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            _listeners_installed = True
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # pylint: disable=too-many-arguments,too-many-positional-arguments,unused-argument
+    # a statement that fails never reaches after_cursor_execute, the next one overwrites its start time
+    conn.info['request_metrics_started'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # pylint: disable=too-many-arguments,too-many-positional-arguments,unused-argument
+    started = conn.info.pop('request_metrics_started', None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    metrics = current()
+    if metrics is not None:
+        metrics.record_query(elapsed_ms)
+    for counter in _counters:
+        counter.record(statement, elapsed_ms)
@@ -22,11 +22,14 @@ import logging
 from typing import Any, Dict, Optional
 
 from flask import current_app, g, request
-from snowplow_tracker import Emitter, SelfDescribingJson, Subject, Tracker
 
 from met_api.utils.analytics import AnalyticsEvent, BaseAnalyticsProvider
+from met_api.utils.lazy_import import lazy_module
 
 
+# Imported when a tracker is first enabled, a disabled provider never needs it
+snowplow = lazy_module('snowplow_tracker')
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,7 +37,7 @@ class SnowplowTracker(BaseAnalyticsProvider):
     """Snowplow analytics provider with server-side event tracking."""
 
     _instance: Optional['SnowplowTracker'] = None
-    _tracker: Optional[Tracker] = None
+    _tracker: Optional['snowplow.Tracker'] = None
     _enabled: bool = False
 
     def __new__(cls):
@@ -111,7 +114,7 @@ class SnowplowTracker(BaseAnalyticsProvider):
 
             # Create emitter (sends events to collector)
             # Use GET for simple events, batch_size=1 for immediate sending
-            emitter = Emitter(
+            emitter = snowplow.Emitter(
                 collector_uri,
                 protocol='https',
                 method='post',
@@ -120,7 +123,7 @@ class SnowplowTracker(BaseAnalyticsProvider):
             )
 
             # Create tracker
-            self._tracker = Tracker(
+            self._tracker = snowplow.Tracker(
                 emitters=emitter,
                 namespace=namespace,
                 app_id=app_id,
@@ -141,10 +144,10 @@ class SnowplowTracker(BaseAnalyticsProvider):
         for failure in failures:
             logger.debug(f'Failed event: {failure}')
 
-    def _create_subject(self) -> Optional[Subject]:
+    def _create_subject(self) -> Optional['snowplow.Subject']:
         """Create a Subject with user context from the request."""
         try:
-            subject = Subject()
+            subject = snowplow.Subject()
 
             # Add IP address if available
             if request and hasattr(request, 'remote_addr'):
@@ -178,7 +181,7 @@ class SnowplowTracker(BaseAnalyticsProvider):
             tenant_name = g.get('tenant_name')
             tenant_id = g.get('tenant_id')
             if tenant_name or tenant_id:
-                tenant_context = SelfDescribingJson(
+                tenant_context = snowplow.SelfDescribingJson(
                     'iglu:ca.bc.gov.met/tenant/jsonschema/1-0-0',
                     {
                         'tenant_short_name': tenant_name,
@@ -191,7 +194,7 @@ class SnowplowTracker(BaseAnalyticsProvider):
             token_info = g.get('token_info', {})
             if token_info:
                 # Extract relevant JWT claims
-                jwt_context = SelfDescribingJson(
+                jwt_context = snowplow.SelfDescribingJson(
                     'iglu:ca.bc.gov.met/jwt_context/jsonschema/1-0-0',
                     {
                         'user_id': token_info.get('sub'),
@@ -204,7 +207,7 @@ class SnowplowTracker(BaseAnalyticsProvider):
 
             # Add request context
             if request:
-                request_context = SelfDescribingJson(
+                request_context = snowplow.SelfDescribingJson(
                     'iglu:ca.bc.gov.met/api_request/jsonschema/1-0-0',
                     {
                         'method': request.method,
@@ -241,7 +244,7 @@ class SnowplowTracker(BaseAnalyticsProvider):
 
         try:
             # Create event JSON
-            event_json = SelfDescribingJson(schema, data)
+            event_json = snowplow.SelfDescribingJson(schema, data)
 
             # Build context entities
             contexts = context or []
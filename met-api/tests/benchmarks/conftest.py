@@ -0,0 +1,29 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Fixtures shared by the benchmarks."""
+import pytest
+
+from tests.utilities.large_survey_factory import factory_large_survey
+
+
+@pytest.fixture
+def large_survey(session):  # pylint: disable=unused-argument
+    """Return a survey with tens of thousands of submissions and comments."""
+    return factory_large_survey()
+
+
+@pytest.fixture
+def export_survey(session):  # pylint: disable=unused-argument
+    """Return a survey sized for the spreadsheet export, which writes every answer to a cell."""
+    return factory_large_survey(submissions=1000, pages=5)
@@ -0,0 +1,48 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for listing and formatting the comments of a large survey."""
+import copy
+
+from met_api.models.comment import Comment as CommentModel
+from met_api.services.comment_service import CommentService
+from met_api.utils.enums import ContentType
+from tests.utilities.factory_scenarios import TestJwtClaims
+from tests.utilities.factory_utils import factory_auth_header
+
+
+def test_format_comments(benchmark, large_survey):
+    """Benchmark laying out every public comment of a large survey as proponent sheet rows."""
+    comments = CommentModel.get_public_viewable_comments_by_survey_id(large_survey.survey.id)
+    assert len(comments) == large_survey.comment_count
+
+    # format_comments consumes its input, so every round gets its own copy
+    rows = benchmark.pedantic(CommentService.format_comments, setup=lambda: ((copy.deepcopy(comments),), {}),
+                              rounds=3, iterations=1)
+    assert rows
+
+
+def test_get_comments_paginated(benchmark, client, jwt, large_survey):
+    """Benchmark the staff comment listing, first page and a deep page, through the API."""
+    headers = factory_auth_header(jwt=jwt, claims=TestJwtClaims.staff_admin_role)
+    last_page = large_survey.comment_count // 50
+
+    def list_comments():
+        for page in (1, last_page):
+            rv = client.get(f'/api/comments/survey/{large_survey.survey.id}?page={page}&size=50',
+                            headers=headers, content_type=ContentType.JSON.value)
+            assert rv.status_code == 200
+        return rv
+
+    rv = benchmark.pedantic(list_comments, rounds=3, iterations=1)
+    assert rv.json['total'] == large_survey.comment_count
@@ -0,0 +1,36 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for the engagement listing."""
+from met_api.utils.enums import ContentType
+from tests.utilities.factory_scenarios import TestJwtClaims
+from tests.utilities.factory_utils import factory_auth_header
+from tests.utilities.large_survey_factory import factory_engagements, scaled
+
+
+def test_get_engagements_paginated(benchmark, client, jwt, session):  # pylint:disable=unused-argument
+    """Benchmark a page of the engagement listing, public and staff, over thousands of engagements."""
+    engagement_count = scaled(5000)
+    factory_engagements(engagement_count)
+    headers = factory_auth_header(jwt=jwt, claims=TestJwtClaims.staff_admin_role)
+
+    def list_engagements():
+        rv = client.get('/api/engagements/?page=1&size=50', content_type=ContentType.JSON.value)
+        assert rv.status_code == 200
+        rv = client.get('/api/engagements/?page=2&size=50&search_text=Benchmark&has_team_access=true',
+                        headers=headers, content_type=ContentType.JSON.value)
+        assert rv.status_code == 200
+        return rv
+
+    rv = benchmark.pedantic(list_engagements, rounds=5, iterations=1)
+    assert rv.json['total'] == engagement_count
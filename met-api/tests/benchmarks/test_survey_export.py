@@ -0,0 +1,52 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for the dashboard export and the form parsing behind it."""
+from met_api.models.submission import Submission as SubmissionModel
+from met_api.services.dashboard_export_service import DashboardExportService
+from met_api.utils.survey_conditional_logic import extract_conditional_links
+from met_api.utils.survey_export_aggregates import build_aggregate_rows
+from met_api.utils.survey_export_columns import (
+    FREE_TEXT_TYPES, QUANTITATIVE_TYPES, build_export_columns, build_respondent_rows)
+from tests.utilities.large_survey_factory import build_large_form_json
+
+
+def test_extract_conditional_links(benchmark):
+    """Benchmark resolving the follow-ups of a 50 page form."""
+    form_json = build_large_form_json(pages=50)
+    links = benchmark(extract_conditional_links, form_json)
+    # a Likert row and a Radio option follow-up on every page
+    assert len(links) == 100
+
+
+def test_build_export_columns(benchmark):
+    """Benchmark flattening a 50 page form into export columns."""
+    form_json = build_large_form_json(pages=50)
+    columns = benchmark(build_export_columns, form_json, QUANTITATIVE_TYPES | FREE_TEXT_TYPES)
+    assert columns
+
+
+def test_build_aggregate_rows(benchmark, large_survey):
+    """Benchmark tallying every answer of a large survey."""
+    respondents = build_respondent_rows(SubmissionModel.get_by_survey_id(large_survey.survey.id))
+    rows = benchmark.pedantic(build_aggregate_rows, args=(large_survey.survey.form_json, respondents),
+                              rounds=3, iterations=1)
+    assert rows
+
+
+def test_export_dashboard_data(app, benchmark, export_survey):
+    """Benchmark building the whole dashboard export workbook."""
+    with app.test_request_context():
+        stream, _ = benchmark.pedantic(DashboardExportService.export_dashboard_data_to_spread_sheet,
+                                       args=(export_survey.survey.id,), rounds=3, iterations=1)
+    assert stream.getbuffer().nbytes
@@ -0,0 +1,67 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the change log triggers.
+
+Test suite to ensure that changes to the extracted tables are recorded for the analytics ETL.
+"""
+from met_api.models import db
+from met_api.models.change_log import ChangeLog as ChangeLogModel
+from tests.utilities.factory_utils import (
+    factory_engagement_setting_model, factory_participant_model, factory_submission_model, factory_survey_and_eng_model)
+
+
+def _changes(entity_type, entity_id):
+    return [change.operation for change in ChangeLogModel.query.filter(
+        ChangeLogModel.entity_type == entity_type, ChangeLogModel.entity_id == entity_id
+    ).order_by(ChangeLogModel.seq)]
+
+
+def test_submission_changes_logged(session):  # pylint:disable=unused-argument
+    """Assert that inserts, real updates and deletes of a submission are logged, and no-op updates are not."""
+    survey, eng = factory_survey_and_eng_model()
+    participant = factory_participant_model()
+    submission = factory_submission_model(survey.id, eng.id, participant.id)
+    submission_id = submission.id
+
+    submission.comment_status_id = 2
+    db.session.commit()
+    # rewriting the same value doesn't change the row
+    db.session.execute(db.text('UPDATE submission SET comment_status_id = 2 WHERE id = :id'), {'id': submission_id})
+    db.session.delete(submission)
+    db.session.commit()
+
+    assert _changes('submission', submission_id) == ['INSERT', 'UPDATE', 'DELETE']
+
+
+def test_child_changes_logged_against_engagement(session):  # pylint:disable=unused-argument
+    """Assert that a change to the engagement settings is logged as an update of the engagement."""
+    _, eng = factory_survey_and_eng_model()
+    factory_engagement_setting_model(eng.id, send_report=True)
+
+    assert _changes('engagement', eng.id) == ['INSERT', 'UPDATE']
+    assert ChangeLogModel.query.filter(ChangeLogModel.entity_type == 'engagement_settings').count() == 0
+
+
+def test_delete_before(session):  # pylint:disable=unused-argument
+    """Assert that only the entries of transactions below the given one are deleted."""
+    # the test runs in a single transaction, so give the entries transaction ids of their own
+    db.session.add_all([ChangeLogModel(entity_type='participant', entity_id=entity_id, operation='UPDATE', txid=txid)
+                        for entity_id, txid in ((-1, 100), (-2, 199), (-3, 200), (-4, 300))])
+    db.session.commit()
+
+    assert ChangeLogModel.delete_before(200) == 2
+    db.session.commit()
+
+    remaining = ChangeLogModel.query.filter(ChangeLogModel.entity_id < 0).order_by(ChangeLogModel.entity_id)
+    assert [change.txid for change in remaining] == [300, 200]
@@ -0,0 +1,156 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the Comment model.
+
+Test suite to ensure that the Comment model routines are working as expected.
+"""
+import pytest
+
+from met_api.exceptions.business_exception import BusinessException
+from met_api.models.comment import Comment as CommentModel
+from met_api.models.pagination_options import PaginationOptions
+from tests.utilities.factory_scenarios import TestSubmissionInfo
+from tests.utilities.factory_utils import (
+    factory_comment_model, factory_engagement_setting_model, factory_participant_model, factory_submission_model,
+    factory_survey_and_eng_model, factory_survey_report_setting_model)
+
+
+def _review_queue(survey_id, cursor, size=2, include_total=True):
+    pagination_options = PaginationOptions(
+        page=None,
+        size=size,
+        sort_key='comment_status_id',
+        sort_order='asc',
+        cursor=cursor,
+        include_total=include_total,
+    )
+    items, total = CommentModel.get_by_survey_id_paginated(survey_id, pagination_options)
+    return items, total, pagination_options.next_cursor
+
+
+def test_review_queue_cursor_pagination(session):
+    """Assert that walking the review queue by cursor returns every submission once, in offset order."""
+    survey, eng = factory_survey_and_eng_model()
+    participant = factory_participant_model()
+    for submission_info in (TestSubmissionInfo.approved_submission, TestSubmissionInfo.submission1,
+                            TestSubmissionInfo.rejected_submission, TestSubmissionInfo.submission1,
+                            TestSubmissionInfo.approved_submission):
+        factory_submission_model(survey.id, eng.id, participant.id, submission_info)
+
+    expected, _ = CommentModel.get_by_survey_id_paginated(
+        survey.id, PaginationOptions(page=None, size=None, sort_key='comment_status_id', sort_order='asc'))
+
+    walked = []
+    cursor = ''
+    while cursor is not None:
+        items, total, cursor = _review_queue(survey.id, cursor)
+        assert total == 5
+        walked.extend(items)
+
+    assert [item.id for item in walked] == [item.id for item in expected]
+
+
+def test_review_queue_cursor_total_optional(session):
+    """Assert that the count is skipped when the caller doesn't ask for it."""
+    survey, eng = factory_survey_and_eng_model()
+    participant = factory_participant_model()
+    factory_submission_model(survey.id, eng.id, participant.id)
+
+    items, total, next_cursor = _review_queue(survey.id, '', include_total=False)
+    assert len(items) == 1
+    assert total is None
+    assert next_cursor is None
+
+
+def test_review_queue_rejects_foreign_cursor(session):
+    """Assert that a cursor issued for a different sort is refused rather than silently misapplied."""
+    survey, eng = factory_survey_and_eng_model()
+    participant = factory_participant_model()
+    for _ in range(3):
+        factory_submission_model(survey.id, eng.id, participant.id)
+
+    _, _, next_cursor = _review_queue(survey.id, '')
+    pagination_options = PaginationOptions(page=None, size=2, sort_key='created_date', sort_order='asc',
+                                           cursor=next_cursor)
+    with pytest.raises(BusinessException):
+        CommentModel.get_by_survey_id_paginated(survey.id, pagination_options)
+
+    with pytest.raises(BusinessException):
+        _review_queue(survey.id, 'not-a-cursor')
+
+
+def _survey_with_comments(texts):
+    """Build a survey with one approved, reportable comment per text."""
+    participant = factory_participant_model()
+    survey, eng = factory_survey_and_eng_model()
+    factory_engagement_setting_model(eng.id, send_report=True)
+    factory_survey_report_setting_model({
+        'survey_id': survey.id,
+        'question_key': 'simpletextarea1',
+        'question_type': 'simpletextarea',
+        'question': 'What do you think of the project?',
+        'display': True,
+    })
+    for text in texts:
+        submission = factory_submission_model(survey.id, eng.id, participant.id, TestSubmissionInfo.approved_submission)
+        factory_comment_model(survey.id, submission.id, comment_info={
+            'text': text, 'component_id': 'simpletextarea1', 'submission_date': None,
+        })
+    return survey
+
+
+def test_comment_search_treats_wildcards_literally(session):
+    """Assert that % and _ in the search text match themselves rather than anything."""
+    survey = _survey_with_comments(['Support is at 100% here', 'Not in favour', 'snake_case works'])
+    pagination_options = PaginationOptions(page=None, size=None, sort_key='id', sort_order='asc')
+
+    items, total = CommentModel.get_accepted_comments_by_survey_id_paginated(survey.id, pagination_options, '100%')
+    assert total == 1
+    assert items[0].text == 'Support is at 100% here'
+
+    items, _ = CommentModel.get_accepted_comments_by_survey_id_paginated(survey.id, pagination_options, 'e_c')
+    assert [item.text for item in items] == ['snake_case works']
+
+    _, total = CommentModel.get_by_survey_id_paginated(survey.id, pagination_options, 'favour')
+    assert total == 1
+
+
+def test_comment_search_ranked_by_relevance(session):
+    """Assert that relevance search matches word forms and returns the best match first."""
+    survey = _survey_with_comments([
+        'The road is fine.',
+        'Worried about traffic on the road, traffic is already heavy and traffic noise keeps growing.',
+        'Some traffic concerns.',
+        'Nothing to add.',
+    ])
+    pagination_options = PaginationOptions(page=None, size=None, sort_key='relevance', sort_order='desc')
+
+    items, total = CommentModel.get_accepted_comments_by_survey_id_paginated(survey.id, pagination_options, 'traffic')
+    assert total == 2
+    assert items[0].text.startswith('Worried about traffic')
+
+    pagination_options = PaginationOptions(page=None, size=None, sort_key='relevance', sort_order='desc')
+    items, _ = CommentModel.get_accepted_comments_by_survey_id_paginated(survey.id, pagination_options, 'roads')
+    assert len(items) == 2
+
+    # Cursor pages follow the same relevance order.
+    walked = []
+    cursor = ''
+    while cursor is not None:
+        pagination_options = PaginationOptions(page=None, size=1, sort_key='relevance', sort_order='desc',
+                                               cursor=cursor)
+        page, _ = CommentModel.get_accepted_comments_by_survey_id_paginated(survey.id, pagination_options, 'roads')
+        walked.extend(page)
+        cursor = pagination_options.next_cursor
+    assert [item.id for item in walked] == [item.id for item in items]
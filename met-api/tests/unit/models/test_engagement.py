@@ -155,3 +155,27 @@ def test_get_engagements_paginated_status_search(session):
     )
     assert count == 13
     assert len(result) == 2
+
+
+def test_get_engagements_cursor_pagination(session):
+    """Assert that cursor pages line up with the offset listing, including nullable and composite sorts."""
+    for status in (Status.Published.value, Status.Draft.value, Status.Closed.value, Status.Published.value,
+                   Status.Draft.value, Status.Scheduled.value, Status.Published.value):
+        factory_engagement_model(status=status)
+
+    scope_options = EngagementScopeOptions(restricted=False)
+    for sort_key, sort_order in (('name', 'asc'), ('published_date', 'desc'), ('display_status', 'asc')):
+        expected, _ = EngagementModel.get_engagements_paginated(
+            None, PaginationOptions(page=None, size=None, sort_key=sort_key, sort_order=sort_order), scope_options)
+
+        walked = []
+        cursor = ''
+        while cursor is not None:
+            pagination_options = PaginationOptions(
+                page=None, size=3, sort_key=sort_key, sort_order=sort_order, cursor=cursor)
+            items, total = EngagementModel.get_engagements_paginated(None, pagination_options, scope_options)
+            assert total == len(expected)
+            walked.extend(items)
+            cursor = pagination_options.next_cursor
+
+        assert [item.id for item in walked] == [item.id for item in expected]
@@ -0,0 +1,143 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the database engine profiles."""
+from flask import Flask
+from sqlalchemy import select, text, update
+
+from met_api.models import db, engine_profiles
+from met_api.models.engagement import Engagement as EngagementModel
+from met_api.models.tenant import Tenant as TenantModel
+from met_api.models.engine_profiles import (
+    EXPORT, PRIMARY_SUFFIX, PUBLIC_READ, REPLICA, RoutingSession, read_only, use_engine_profile, use_primary)
+
+
+def _replica_app(app):
+    """Return an app whose replica is a second URI on the test database."""
+    replica_app = Flask(__name__)
+    replica_app.config.from_mapping(app.config)
+    replica_app.config['SQLALCHEMY_BINDS'] = {}
+    replica_app.config['DATABASE_REPLICA_URL'] = app.config['SQLALCHEMY_DATABASE_URI']
+    engine_profiles.init_app(replica_app)
+    db.init_app(replica_app)
+    return replica_app
+
+
+def test_routing_session(app):
+    """Assert that reads run on the active profile's engine and writes on the default engine."""
+    with app.app_context():
+        session = RoutingSession(db)
+        query = select(EngagementModel)
+        dml = update(EngagementModel).values(name='x')
+        try:
+            assert session.get_bind(clause=query) is db.engine
+            with use_engine_profile(EXPORT):
+                assert session.get_bind(clause=query) is db.engines[EXPORT]
+
+            @use_engine_profile(PUBLIC_READ)
+            def read():
+                return session.get_bind(clause=query)
+
+            assert read() is db.engines[PUBLIC_READ]
+            assert session.get_bind(clause=query) is db.engine
+
+            with use_engine_profile(EXPORT):
+                assert session.get_bind(clause=dml) is db.engine
+                # once written, reads stay on the connection of the write
+                assert session.get_bind(clause=query) is db.engine
+        finally:
+            session.close()
+
+
+def test_profile_statement_timeouts(app):
+    """Assert that each profile's connections get its own statement timeout."""
+    with app.app_context():
+        timeouts = {}
+        for name, engine in db.engines.items():
+            with engine.connect() as connection:
+                timeouts[name] = connection.execute(text('show statement_timeout')).scalar()
+
+    assert timeouts[None] == '0'
+    assert timeouts[PUBLIC_READ] == '5s'
+    assert timeouts[EXPORT] == '5min'
+
+
+def test_pool_status(client):
+    """Assert that the metrics endpoint reports each pool's usage."""
+    rv = client.get('/api/metrics')
+
+    pools = rv.json['db_pools']
+    assert set(pools) >= {'default', PUBLIC_READ, EXPORT}
+    assert pools[EXPORT]['limit'] == 2
+    assert set(pools['default']) == {'size', 'checked_in', 'checked_out', 'overflow', 'limit', 'saturation'}
+
+
+def test_read_only_routing(app):
+    """Assert that read-only queries run on the replica until the session writes."""
+    with _replica_app(app).app_context():
+        assert db.engines[REPLICA] is not db.engines[REPLICA + PRIMARY_SUFFIX]
+        session = RoutingSession(db)
+        query = select(EngagementModel)
+        try:
+            with read_only():
+                assert session.get_bind(clause=query) is db.engines[REPLICA]
+                with use_primary():
+                    assert session.get_bind(clause=query) is db.engine
+                assert session.get_bind(clause=update(EngagementModel).values(name='x')) is db.engine
+                # the session reads its own write on the connection it wrote with
+                assert session.get_bind(clause=query) is db.engine
+        finally:
+            session.close()
+
+
+def test_read_only_lagging_replica(app):
+    """Assert that read-only queries run on the primary while the replica lags too far behind."""
+    replica_app = _replica_app(app)
+    replica_app.config['DB_REPLICA_MAX_LAG'] = -1
+    with replica_app.app_context():
+        session = RoutingSession(db)
+        try:
+            with use_engine_profile(EXPORT):
+                assert session.get_bind(clause=select(EngagementModel)) is db.engines[EXPORT + PRIMARY_SUFFIX]
+        finally:
+            session.close()
+
+
+def test_read_your_flushed_writes(app):
+    """Assert that a session reads back rows it has flushed but not committed, inside read_only."""
+    with _replica_app(app).app_context():
+        session = RoutingSession(db)
+        try:
+            with read_only():
+                tenant = TenantModel(short_name='RYW', name='Read your writes', title='Read your writes')
+                session.add(tenant)
+                session.flush()
+                assert session.scalars(select(TenantModel.id).where(TenantModel.short_name == 'RYW')).one() == \
+                    tenant.id
+        finally:
+            session.rollback()
+            session.close()
+
+
+def test_profile_reads_flushed_writes(app):
+    """Assert that a profile without a replica reads back rows the session has flushed, through autoflush too."""
+    with app.app_context():
+        session = RoutingSession(db)
+        try:
+            session.add(TenantModel(short_name='RYW', name='Read your writes', title='Read your writes'))
+            with use_engine_profile(PUBLIC_READ):
+                # the pending tenant is autoflushed just before the query
+                assert session.scalars(select(TenantModel).where(TenantModel.short_name == 'RYW')).one()
+        finally:
+            session.rollback()
+            session.close()
@@ -15,14 +15,23 @@
 
 Test suite to ensure that the Engagement service routines are working as expected.
 """
+from datetime import datetime, timedelta
 from unittest.mock import patch
 
 from faker import Faker
 
+from met_api.constants.engagement_job import EngagementJob, JobResultStatus
+from met_api.constants.engagement_status import Status
+from met_api.constants.notification_status import NotificationStatus
+from met_api.models.email_queue import EmailQueue as EmailQueueModel
+from met_api.models.engagement_job_result import EngagementJobResult as EngagementJobResultModel
 from met_api.services import authorization
 from met_api.services.engagement_service import EngagementService
+from met_api.services.project_service import ProjectService
+from met_api.utils.enums import SourceAction, SourceType
 from tests.utilities.factory_scenarios import TestEngagementInfo, TestJwtClaims
-from tests.utilities.factory_utils import factory_engagement_model, factory_staff_user_model, patch_token_info
+from tests.utilities.factory_utils import (
+    factory_engagement_model, factory_engagement_setting_model, factory_staff_user_model, patch_token_info)
 
 
 fake = Faker()
@@ -94,3 +103,71 @@ def test_patch_engagement(session, monkeypatch):  # pylint:disable=unused-argume
         assert updated_engagement_record.description == engagement_edits.get('description')
         assert updated_engagement_record.content == engagement_edits.get('content')
         assert updated_engagement_record.created_date.strftime(date_format) == engagement_edits.get('created_date')
+
+
+def test_close_engagements_due(session):  # pylint:disable=unused-argument
+    """Assert that the closeout queues the emails, updates EPIC in one batch and retries the failed updates."""
+    end_date = (datetime.now() - timedelta(days=2)).strftime(date_format)
+    eng_info = {**TestEngagementInfo.engagement1, 'end_date': end_date}
+    reported = factory_engagement_model(eng_info, status=Status.Published.value)
+    unreported = factory_engagement_model(eng_info, status=Status.Published.value)
+    factory_engagement_setting_model(reported.id, send_report=True)
+    factory_engagement_setting_model(unreported.id, send_report=False)
+    job = EngagementJob.CLOSEOUT_EPIC_UPDATE.value
+
+    with patch.object(ProjectService, 'update_projects_info',
+                      return_value={reported.id: None, unreported.id: 'Bad Gateway'}) as update_projects_info:
+        EngagementService.close_engagements_due()
+
+    update_projects_info.assert_called_once()
+    assert set(update_projects_info.call_args[0][0]) >= {reported.id, unreported.id}
+    queued = EmailQueueModel.query.filter_by(action=SourceAction.CLOSED.value).all()
+    assert [mail.entity_id for mail in queued] == [reported.id]
+    failed = EngagementJobResultModel.query.filter_by(job=job, engagement_id=unreported.id).one()
+    assert (failed.status, failed.error, failed.attempts) == (JobResultStatus.FAILED.value, 'Bad Gateway', 1)
+
+    # nothing else is due, the failed update is retried on the next run
+    with patch.object(ProjectService, 'update_projects_info',
+                      return_value={unreported.id: None}) as update_projects_info:
+        EngagementService.close_engagements_due()
+
+    assert update_projects_info.call_args[0][0] == [unreported.id]
+    session.refresh(failed)
+    assert (failed.status, failed.error, failed.attempts) == (JobResultStatus.SUCCEEDED.value, None, 2)
+
+
+def test_close_engagements_due_skips_removed_projects(session):  # pylint:disable=unused-argument
+    """Assert that a failed EPIC update no longer sent to EPIC leaves the retry queue."""
+    engagement = factory_engagement_model(status=Status.Closed.value)
+    job = EngagementJob.CLOSEOUT_EPIC_UPDATE.value
+    EngagementJobResultModel.record_results(job, {engagement.id: 'Bad Gateway'})
+
+    # the project id was removed, so the engagement is left out of the EPIC results
+    with patch.object(ProjectService, 'update_projects_info', return_value={}) as update_projects_info:
+        EngagementService.close_engagements_due()
+
+    assert update_projects_info.call_args[0][0] == [engagement.id]
+    result = EngagementJobResultModel.query.filter_by(job=job, engagement_id=engagement.id).one()
+    assert (result.status, result.error) == (JobResultStatus.SKIPPED.value, None)
+
+    with patch.object(ProjectService, 'update_projects_info', return_value={}) as update_projects_info:
+        EngagementService.close_engagements_due()
+
+    assert update_projects_info.call_args[0][0] == []
+
+
+def test_release_stale_closeout_mails(session):  # pylint:disable=unused-argument
+    """Assert that only the closeout emails left processing past the cutoff are queued again."""
+    now = datetime.utcnow()
+    mails = [EmailQueueModel(entity_id=entity_id, entity_type=SourceType.ENGAGEMENT.value,
+                             action=SourceAction.CLOSED.value, notification_status=status, updated_date=updated)
+             for entity_id, status, updated in ((1, NotificationStatus.PROCESSING, now - timedelta(hours=2)),
+                                                (2, NotificationStatus.PROCESSING, now),
+                                                (3, NotificationStatus.FAILED, now - timedelta(hours=2)))]
+    session.add_all(mails)
+    session.commit()
+
+    assert EmailQueueModel.release_stale_engagement_mails(SourceAction.CLOSED.value, now - timedelta(hours=1)) == 1
+
+    unprocessed = EmailQueueModel.get_unprocessed_engagement_mails(SourceAction.CLOSED.value, 0)
+    assert [mail.entity_id for mail in unprocessed] == [1]
@@ -0,0 +1,72 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for ObjectStorageService request signing."""
+from unittest.mock import patch
+
+from aws_requests_auth.aws_auth import AWSRequestsAuth
+from freezegun import freeze_time
+import requests
+
+from met_api.services.object_storage_service import ObjectStorageService
+
+
+S3_CONFIG = {
+    'S3_BUCKET': 'met-bucket',
+    'S3_ACCESS_KEY_ID': 'access-key',
+    'S3_SECRET_ACCESS_KEY': 'secret-key',
+    'S3_HOST': 's3.test',
+    'S3_REGION': 'us-east-1',
+    'S3_SERVICE': 's3',
+}
+
+
+def _service(app):
+    with app.app_context(), \
+            patch('met_api.services.object_storage_service.get_s3_config', side_effect=S3_CONFIG.get):
+        return ObjectStorageService()
+
+
+@freeze_time('2026-01-15 18:30:00')
+def test_get_auth_headers_signs_batch_locally(app):
+    """Every document in a batch is signed without any request reaching object storage."""
+    service = _service(app)
+    documents = [{'filename': f'document-{i}.pdf'} for i in range(25)]
+    documents.append({'filename': 'existing.png', 's3sourceuri': 'https://s3.test/met-bucket/existing.png'})
+
+    with patch.object(requests.Session, 'send') as mock_send:
+        signed = service.get_auth_headers(documents)
+
+    mock_send.assert_not_called()
+    assert len(signed) == 26
+    for document in signed:
+        assert document['authheader'].startswith('AWS4-HMAC-SHA256 Credential=access-key/20260115/')
+        assert document['amzdate'] == '20260115T183000Z'
+    assert signed[0]['uniquefilename'].endswith('.pdf')
+    assert signed[0]['filepath'] == f'https://s3.test/met-bucket/{signed[0]["uniquefilename"]}'
+    assert signed[-1]['uniquefilename'] == ''
+    assert signed[-1]['filepath'] == 'https://s3.test/met-bucket/existing.png'
+
+
+@freeze_time('2026-01-15 18:30:00')
+def test_get_auth_headers_matches_signed_request(app):
+    """The locally computed signature is the one AWSRequestsAuth puts on a real request."""
+    service = _service(app)
+    signed = service.get_auth_headers([{'filename': 'document.pdf'}])[0]
+
+    auth = AWSRequestsAuth(aws_access_key='access-key', aws_secret_access_key='secret-key',
+                           aws_host='s3.test', aws_region='us-east-1', aws_service='s3')
+    prepared = requests.Request('PUT', signed['filepath'], auth=auth).prepare()
+
+    assert signed['authheader'] == prepared.headers['Authorization']
+    assert signed['amzdate'] == prepared.headers['x-amz-date']
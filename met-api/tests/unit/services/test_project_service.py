@@ -19,6 +19,8 @@ import pytest
 
 from met_api.constants.engagement_status import Status
 from met_api.services.project_service import ProjectService
+from met_api.utils.cache import cache
+from met_api.utils.enums import OutboundIntegration
 
 
 PROJECT_ID = 'abc123projectid'
@@ -29,6 +31,7 @@ def _make_metadata(project_id=PROJECT_ID, tracking_id=None):
     meta = MagicMock()
     meta.project_id = project_id
     meta.project_tracking_id = tracking_id
+    meta.project_type = None
     return meta
 
 
@@ -174,7 +177,7 @@ def test_delete_from_epic_calls_rest_delete(app):
 
             expected_url = f'https://eagle-dev/api/commentperiod/{TRACKING_ID}'
             mock_rest.delete.assert_called_once_with(
-                endpoint=expected_url, token='token', raise_for_status=False
+                endpoint=expected_url, token='token', raise_for_status=False, integration=OutboundIntegration.EPIC
             )
 
 
@@ -201,7 +204,7 @@ def test_update_project_info_project_notification(app):
              patch.object(ProjectService, '_get_eao_service_account_token', return_value='token'), \
              patch('met_api.services.project_service.notification') as mock_notif, \
              patch('met_api.services.project_service.EmailVerificationService') as mock_evs, \
-             patch('met_api.services.project_service.requests.get') as mock_get, \
+             patch('met_api.services.project_service.http_client.get') as mock_get, \
              patch('met_api.services.project_service.RestService') as mock_rest:
 
             app.config['IS_EAO_ENVIRONMENT'] = True
@@ -221,6 +224,7 @@ def test_update_project_info_project_notification(app):
             # Mock GET response returning existing project notification
             mock_resp = MagicMock()
             mock_resp.status_code = HTTPStatus.OK
+            mock_resp.headers = {}
             mock_resp.json.return_value = {'_id': PROJECT_ID, 'name': 'Notification Name'}
             mock_get.return_value = mock_resp
 
@@ -228,9 +232,9 @@ def test_update_project_info_project_notification(app):
 
             # verify get was called with correct URL
             mock_get.assert_called_once_with(
+                OutboundIntegration.EPIC,
                 'https://eagle-dev/api/projectNotification/abc123projectid',
-                headers={'Authorization': 'Bearer token'},
-                timeout=10
+                headers={'Authorization': 'Bearer token'}
             )
 
             # verify RestService.put was called with correct payload and publish query param
@@ -248,7 +252,7 @@ def test_delete_from_epic_project_notification(app):
         with patch('met_api.services.project_service.EngagementMetadataModel') as mock_meta_model, \
              patch.object(ProjectService, '_get_project_type', return_value='notification'), \
              patch.object(ProjectService, '_get_eao_service_account_token', return_value='token'), \
-             patch('met_api.services.project_service.requests.get') as mock_get, \
+             patch('met_api.services.project_service.http_client.get') as mock_get, \
              patch('met_api.services.project_service.RestService') as mock_rest:
 
             app.config['IS_EAO_ENVIRONMENT'] = True
@@ -259,6 +263,7 @@ def test_delete_from_epic_project_notification(app):
 
             mock_resp = MagicMock()
             mock_resp.status_code = HTTPStatus.OK
+            mock_resp.headers = {}
             mock_resp.json.return_value = {'_id': PROJECT_ID, 'name': 'Notification Name'}
             mock_get.return_value = mock_resp
 
@@ -272,3 +277,116 @@ def test_delete_from_epic_project_notification(app):
             assert kwargs['data']['isMet'] is False
             assert kwargs['data']['metURL'] == ''
             mock_rest.delete.assert_not_called()
+
+
+def test_update_projects_info_batch(app):
+    """One token for the batch, tracking ids saved from the worker results, and each failure reported."""
+    created, updated, failed = _make_engagement(), _make_engagement(), _make_engagement()
+    created.id, updated.id, failed.id = 1, 2, 3
+    metadata = [_make_metadata(), _make_metadata(tracking_id=TRACKING_ID), _make_metadata(),
+                _make_metadata(project_id=None)]
+    for engagement_id, meta in enumerate(metadata, start=1):
+        meta.engagement_id = engagement_id
+
+    def post(endpoint, **kwargs):
+        if kwargs['data']['engagement_id'] == failed.id:
+            raise ConnectionError('eagle-api is down')
+        response = MagicMock()
+        response.json.return_value = {'_id': 'new-tracking-id'}
+        return response
+
+    with app.app_context():
+        with patch('met_api.services.project_service.EngagementModel') as mock_eng_model, \
+             patch('met_api.services.project_service.EngagementMetadataModel') as mock_meta_model, \
+             patch.object(ProjectService, '_get_project_type', return_value='project'), \
+             patch.object(ProjectService, '_construct_epic_payload',
+                          side_effect=lambda engagement, project_id: {'engagement_id': engagement.id}), \
+             patch.object(ProjectService, '_construct_notification_fields', return_value={}), \
+             patch.object(ProjectService, '_get_eao_service_account_token', return_value='token') as mock_token, \
+             patch('met_api.services.project_service.RestService') as mock_rest:
+
+            app.config['IS_EAO_ENVIRONMENT'] = True
+            app.config['EPIC_URL'] = 'https://eagle-dev/api/commentperiod'
+            mock_meta_model.find_by_engagement_ids.return_value = metadata
+            mock_eng_model.find_by_ids.return_value = [created, updated, failed]
+            mock_rest.post.side_effect = post
+
+            results = ProjectService.update_projects_info([1, 2, 3, 4])
+
+            mock_eng_model.find_by_ids.assert_called_once_with([1, 2, 3])
+            mock_token.assert_called_once()
+            mock_rest.put.assert_called_once()
+            assert mock_rest.put.call_args[1]['endpoint'] == f'https://eagle-dev/api/commentperiod/{TRACKING_ID}'
+            assert results == {1: None, 2: None, 3: 'eagle-api is down'}
+            assert metadata[0].project_tracking_id == 'new-tracking-id'
+            assert metadata[2].project_tracking_id is None
+            assert metadata[0].project_type == 'project'
+            mock_meta_model.commit.assert_called_once()
+
+
+def test_update_project_info_saves_project_type(app):
+    """EPIC is only asked for the project type until the answer is saved on the metadata."""
+    with app.app_context():
+        with patch('met_api.services.project_service.EngagementModel') as mock_eng_model, \
+             patch('met_api.services.project_service.EngagementMetadataModel') as mock_meta_model, \
+             patch.object(ProjectService, '_get_project_type', return_value='project') as mock_get_type, \
+             patch.object(ProjectService, '_construct_epic_payload', return_value={}), \
+             patch.object(ProjectService, '_get_eao_service_account_token', return_value='token'), \
+             patch('met_api.services.project_service.RestService'):
+
+            app.config['IS_EAO_ENVIRONMENT'] = True
+            app.config['EPIC_URL'] = 'https://eagle-dev/api/commentperiod'
+            mock_eng_model.find_by_id.return_value = _make_engagement()
+            mock_meta = _make_metadata(tracking_id=TRACKING_ID)
+            mock_meta_model.find_by_engagement_id.return_value = mock_meta
+
+            ProjectService.update_project_info(1)
+            ProjectService.update_project_info(1)
+
+            mock_get_type.assert_called_once_with(PROJECT_ID, 'token', default=None)
+            assert mock_meta.project_type == 'project'
+            mock_meta.commit.assert_called_once()
+
+
+def test_project_notification_conditional_requests(app):
+    """The notification is fetched with If-None-Match and put with If-Match, and fetched again on a conflict."""
+    notification_url = f'https://eagle-dev/api/projectNotification/{PROJECT_ID}'
+
+    def response(status_code, etag=None, body=None):
+        resp = MagicMock()
+        resp.status_code = status_code
+        resp.headers = {'ETag': etag} if etag else {}
+        resp.json.return_value = body
+        return resp
+
+    with app.app_context():
+        with patch('met_api.services.project_service.http_client.get') as mock_get, \
+             patch('met_api.services.project_service.RestService') as mock_rest:
+            app.config['EPIC_URL'] = 'https://eagle-dev/api/commentperiod'
+            cache.clear()
+            try:
+                mock_get.return_value = response(HTTPStatus.OK, 'W/"1"', {'name': 'Notification Name'})
+                mock_rest.put.return_value = response(HTTPStatus.OK, 'W/"2"', {'name': 'Notification Name',
+                                                                               'pcp': 'open'})
+                assert ProjectService._put_project_notification(PROJECT_ID, 'token', {'pcp': 'open'}, True)
+                assert mock_rest.put.call_args[1]['additional_headers'] == {'If-Match': 'W/"1"'}
+
+                # the notification is unchanged since the last PUT
+                mock_get.side_effect = [response(HTTPStatus.NOT_MODIFIED),
+                                        response(HTTPStatus.OK, 'W/"3"', {'name': 'Edited Name'})]
+                mock_rest.put.side_effect = [response(HTTPStatus.PRECONDITION_FAILED),
+                                             response(HTTPStatus.OK)]
+                assert ProjectService._put_project_notification(PROJECT_ID, 'token', {'pcp': 'closed'}, True)
+                assert mock_get.call_args_list[1][1]['headers']['If-None-Match'] == 'W/"2"'
+                first_put = mock_rest.put.call_args_list[1][1]
+                assert first_put['additional_headers'] == {'If-Match': 'W/"2"'}
+                assert first_put['data'] == {'name': 'Notification Name', 'pcp': 'closed'}
+
+                # edited in EPIC in between, so it is fetched again without the stale ETag
+                assert 'If-None-Match' not in mock_get.call_args_list[2][1]['headers']
+                assert mock_get.call_args_list[2][0][1] == notification_url
+                second_put = mock_rest.put.call_args_list[2][1]
+                assert second_put['additional_headers'] == {'If-Match': 'W/"3"'}
+                assert second_put['data'] == {'name': 'Edited Name', 'pcp': 'closed'}
+            finally:
+                cache.clear()
@@ -22,13 +22,13 @@ def test_delete_does_not_send_null_body(app):
         mock_response.status_code = 200
         mock_response.headers = {'Content-Type': 'application/json'}
 
-        with patch('met_api.services.rest_service.requests') as mock_requests:
-            mock_requests.delete.return_value = mock_response
+        with patch('met_api.services.rest_service.http_client') as mock_client:
+            mock_client.request.return_value = mock_response
             from met_api.services.rest_service import RestService
             RestService.delete(endpoint='https://example.com/api/resource/1',
                                token='test-token', raise_for_status=False)
 
-            _, call_kwargs = mock_requests.delete.call_args
+            _, call_kwargs = mock_client.request.call_args
             # data must be None (no body), not the string 'null'
             assert call_kwargs.get('data') is None, \
                 'DELETE must not send null body — eagle-api returns 400 when body is JSON null'
@@ -16,10 +16,14 @@
 Test suite to ensure that the Shapefile Service safely extracts uploaded zip
 archives (rejecting zip-slip/zip-bomb payloads) and produces valid GeoJSON.
 """
+import json
 import os
 import tempfile
 import zipfile
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
+from unittest.mock import MagicMock
 
 import geopandas as gpd
 import pytest
@@ -27,7 +31,9 @@ from shapely.geometry import Point
 from werkzeug.datastructures import FileStorage
 
 from met_api.exceptions.business_exception import BusinessException
-from met_api.services.shapefile_service import ShapefileService
+from met_api.services import shapefile_service
+from met_api.services.shapefile_service import ShapefileService, _convert_shapefiles
+from met_api.utils.cache import cache
 
 
 def _build_shapefile_zip():
@@ -61,12 +67,13 @@ def _malicious_zip_file_storage(entry_name, content=b'malicious', filename='evil
 
 @pytest.fixture
 def shapefile_upload_folder(app, tmp_path):
-    """Point SHAPEFILE_UPLOAD_FOLDER at an isolated tmp directory for the test."""
-    original = app.config.get('SHAPEFILE_UPLOAD_FOLDER')
+    """Point SHAPEFILE_UPLOAD_FOLDER and SHAPEFILE_CACHE_FOLDER at isolated tmp directories for the test."""
+    original = app.config.get('SHAPEFILE_UPLOAD_FOLDER'), app.config.get('SHAPEFILE_CACHE_FOLDER')
     upload_folder = str(tmp_path / 'shapefile-uploads')
     app.config['SHAPEFILE_UPLOAD_FOLDER'] = upload_folder
+    app.config['SHAPEFILE_CACHE_FOLDER'] = str(tmp_path / 'shapefile-cache')
     yield upload_folder
-    app.config['SHAPEFILE_UPLOAD_FOLDER'] = original
+    app.config['SHAPEFILE_UPLOAD_FOLDER'], app.config['SHAPEFILE_CACHE_FOLDER'] = original
 
 
 def test_convert_to_geojson_success(app, shapefile_upload_folder):  # pylint: disable=redefined-outer-name
@@ -209,3 +216,122 @@ def test_convert_to_geojson_no_shapefile_found(app, shapefile_upload_folder):  #
             ShapefileService.convert_to_geojson(file)
 
         assert os.listdir(shapefile_upload_folder) == []
+
+
+def test_convert_to_geojson_cached_by_content(  # pylint: disable=redefined-outer-name
+    app, shapefile_upload_folder, monkeypatch,
+):
+    """Uploading the same zip again is served from the cache without re-converting."""
+    with app.app_context():
+        zip_bytes = _build_shapefile_zip().getvalue()
+        first = ShapefileService.convert_to_geojson(_zip_file_storage(BytesIO(zip_bytes)))
+
+        def fail_conversion(*args, **kwargs):
+            raise AssertionError('conversion should have been served from cache')
+
+        monkeypatch.setattr(ShapefileService, '_get_geojson', fail_conversion)
+        second = ShapefileService.convert_to_geojson(_zip_file_storage(BytesIO(zip_bytes)))
+
+        assert second == first
+        assert os.listdir(shapefile_upload_folder) == []
+
+
+def test_geojson_cache_trimmed_to_max_size(app, tmp_path, monkeypatch):
+    """The disk cache drops the oldest conversions once it outgrows its limit, and expired ones regardless."""
+    cache_folder = tmp_path / 'shapefile-cache'
+    monkeypatch.setitem(app.config, 'SHAPEFILE_CACHE_FOLDER', str(cache_folder))
+    monkeypatch.setitem(app.config, 'SHAPEFILE_CACHE_MAX_SIZE', 25)
+    with app.app_context():
+        for index, key in enumerate(('a', 'b', 'c')):
+            shapefile_service._cache_geojson(key, '0123456789')  # pylint: disable=protected-access
+            os.utime(cache_folder / f'{key}.geojson', (1000 + index, 1000 + index))
+        shapefile_service._cache_geojson('d', '0123456789')  # pylint: disable=protected-access
+
+        # a, b and c have expired; d alone fits
+        assert sorted(os.listdir(cache_folder)) == ['d.geojson']
+
+        monkeypatch.setitem(app.config, 'SHAPEFILE_CACHE_TIMEOUT', 10 ** 10)
+        for key in ('e', 'f'):
+            shapefile_service._cache_geojson(key, '0123456789')  # pylint: disable=protected-access
+            os.utime(cache_folder / f'{key}.geojson', (2000, 2000) if key == 'e' else None)
+
+        assert sorted(os.listdir(cache_folder)) == ['d.geojson', 'f.geojson']
+        assert shapefile_service._get_cached_geojson('f') == '0123456789'  # pylint: disable=protected-access
+        assert shapefile_service._get_cached_geojson('e') is None  # pylint: disable=protected-access
+
+
+def test_convert_shapefiles_reduces_precision(tmp_path):
+    """Coordinates are snapped to the configured number of decimal places."""
+    gdf = gpd.GeoDataFrame({'name': ['a']}, geometry=[Point(1.123456789, 2.987654321)], crs='EPSG:4326')
+    shp_path = str(tmp_path / 'test.shp')
+    gdf.to_file(shp_path)
+
+    geojson = json.loads(_convert_shapefiles([shp_path], precision=3))
+
+    feature = geojson['features'][0]
+    assert feature['geometry']['coordinates'] == pytest.approx([1.123, 2.988])
+    assert feature['properties'] == {'name': 'a', 'shape_group_index': 0, 'shape_render_index': 0}
+
+
+def test_convert_shapefiles_returns_none_without_features(tmp_path):
+    """An empty shapefile yields no GeoJSON so the caller can reject the upload."""
+    gdf = gpd.GeoDataFrame({'name': []}, geometry=[], crs='EPSG:4326')
+    shp_path = str(tmp_path / 'empty.shp')
+    gdf.to_file(shp_path)
+
+    assert _convert_shapefiles([shp_path]) is None
+
+
+def _failing_executor(monkeypatch, error):
+    """Install a conversion pool whose conversions raise the error, with one reported process."""
+    executor = MagicMock()
+    executor.submit.return_value.result.side_effect = error
+    process = MagicMock(pid=1)
+    pid_queue = MagicMock()
+    pid_queue.empty.side_effect = [False, True]
+    pid_queue.get.return_value = process.pid
+    monkeypatch.setattr(shapefile_service, '_worker_pids', {executor: (pid_queue, set())})
+    monkeypatch.setattr(shapefile_service.multiprocessing, 'active_children', lambda: [process, MagicMock(pid=2)])
+    executor.process = process
+    monkeypatch.setattr(shapefile_service, '_executor', executor)
+    monkeypatch.setattr(shapefile_service, '_get_executor', lambda: executor)
+    return executor
+
+
+def test_convert_to_geojson_broken_pool(  # pylint: disable=redefined-outer-name,unused-argument
+    app, shapefile_upload_folder, monkeypatch,
+):
+    """A conversion process dying fails the upload clearly and drops the pool, so the next upload gets a new one."""
+    with app.app_context():
+        executor = _failing_executor(monkeypatch, BrokenProcessPool('killed'))
+
+        with pytest.raises(BusinessException, match='Shapefile conversion failed') as exc_info:
+            ShapefileService.convert_to_geojson(_zip_file_storage(_build_shapefile_zip()))
+
+        assert exc_info.value.status_code == 503
+        assert shapefile_service._executor is None  # pylint: disable=protected-access
+        executor.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+
+def test_convert_to_geojson_timeout(  # pylint: disable=redefined-outer-name
+    app, shapefile_upload_folder, monkeypatch,
+):
+    """A timed out conversion is stopped, and re-uploading the file fails without converting it again."""
+    with app.app_context():
+        executor = _failing_executor(monkeypatch, FutureTimeoutError())
+        zip_bytes = _build_shapefile_zip().getvalue()
+
+        with pytest.raises(BusinessException, match='too complex'):
+            ShapefileService.convert_to_geojson(_zip_file_storage(BytesIO(zip_bytes)))
+
+        executor.process.terminate.assert_called_once()
+        assert shapefile_service._executor is None  # pylint: disable=protected-access
+
+        def fail_conversion(*args, **kwargs):
+            raise AssertionError('a file that timed out should not be converted again')
+
+        monkeypatch.setattr(ShapefileService, '_get_geojson', fail_conversion)
+        with pytest.raises(BusinessException, match='too complex'):
+            ShapefileService.convert_to_geojson(_zip_file_storage(BytesIO(zip_bytes)))
+        assert os.listdir(shapefile_upload_folder) == []
+        cache.clear()
@@ -17,15 +17,19 @@ Test suite to ensure that the Submission service routines are working as expecte
 """
 from unittest.mock import patch
 
+from flask import current_app
+
 from met_api.constants.comment_status import Status
+from met_api.models.submission_context import SubmissionContext
 from met_api.schemas.submission import SubmissionSchema
 from met_api.services import authorization
 from met_api.services.comment_service import CommentService
 from met_api.services.email_verification_service import EmailVerificationService
 from met_api.services.submission_service import SubmissionService
+from met_api.utils import notification
 from tests.utilities.factory_utils import (
     factory_comment_model, factory_email_verification, factory_engagement_setting_model, factory_participant_model,
-    factory_staff_user_model, factory_submission_model, factory_survey_and_eng_model)
+    factory_staff_user_model, factory_submission_model, factory_survey_and_eng_model, factory_tenant_model)
 
 
 def test_create_submission(session):  # pylint:disable=unused-argument
@@ -49,6 +53,50 @@ def test_create_submission(session):  # pylint:disable=unused-argument
     assert actual_email_verification['is_active'] is False
 
 
+def test_create_submission_sends_response_email(session, monkeypatch):  # pylint:disable=unused-argument
+    """Assert that the submission response email is built from the loaded submission context."""
+    monkeypatch.setitem(current_app.config, 'SITE_URL', 'https://met.example')
+    survey, eng = factory_survey_and_eng_model()
+    tenant = factory_tenant_model()
+    eng.tenant_id = tenant.id
+    eng.save()
+    email_verification = factory_email_verification(survey.id)
+    participant = factory_participant_model()
+    email_verification.participant_id = participant.id
+    email_verification.save()
+    factory_engagement_setting_model(eng.id, send_report=True)
+    submission_request: SubmissionSchema = {
+        'submission_json': '{ "test_question": "test answer"}',
+        'survey_id': survey.id,
+        'participant_id': participant.id,
+        'verification_token': email_verification.verification_token,
+    }
+    with patch.object(notification, 'send_email') as mock_send_email:
+        SubmissionService().create(email_verification.verification_token, submission_request)
+
+    mock_send_email.assert_called_once()
+    args = mock_send_email.call_args.kwargs['args']
+    assert args['tenant_name'] == tenant.name
+    assert f'/{tenant.short_name}/' in args['engagement_url']
+
+
+def test_submission_context_load(session):  # pylint:disable=unused-argument
+    """Assert that the survey, engagement and settings of a submission are loaded together."""
+    survey, eng = factory_survey_and_eng_model()
+    tenant = factory_tenant_model()
+    eng.tenant_id = tenant.id
+    eng.save()
+    factory_engagement_setting_model(eng.id, send_report=True)
+
+    context = SubmissionContext.load(survey.id)
+
+    assert context.survey.id == survey.id
+    assert context.engagement.id == eng.id
+    assert context.settings.send_report is True
+    assert context.tenant.id == tenant.id
+    assert SubmissionContext.load(survey.id + 1000) is None
+
+
 def test_create_submission_rollback(session):  # pylint:disable=unused-argument
     """Assert that a submission failure will rollback changes to email verification."""
     survey, _ = factory_survey_and_eng_model()
@@ -0,0 +1,145 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the shared outbound HTTP client."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from met_api.utils import http_client
+from met_api.utils.enums import OutboundIntegration
+
+
+URL = 'https://epic.test/api/project/1'
+
+
+@pytest.fixture(autouse=True)
+def reset_client():
+    """Start every test with no pooled sessions, breaker state or metrics."""
+    http_client.reset()
+    with patch('met_api.utils.http_client.time.sleep'):
+        yield
+    http_client.reset()
+
+
+def _response(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    return response
+
+
+def test_sessions_are_pooled_per_host():
+    """The same session is reused for a host, and hosts don't share one."""
+    first = http_client._get_session('https://epic.test/a')
+    assert http_client._get_session('https://epic.test/b') is first
+    assert http_client._get_session('https://keycloak.test/a') is not first
+
+
+def test_default_timeout_comes_from_integration(app):
+    """Calls get the integration's (connect, read) timeout unless the caller overrides it."""
+    with app.app_context():
+        with patch.object(requests.Session, 'request', return_value=_response(200)) as mock_request:
+            http_client.get(OutboundIntegration.EPIC, URL)
+            settings = http_client._settings(OutboundIntegration.EPIC)
+            assert mock_request.call_args[1]['timeout'] == (settings['CONNECT_TIMEOUT'], settings['READ_TIMEOUT'])
+
+            http_client.get(OutboundIntegration.EPIC, URL, timeout=1)
+            assert mock_request.call_args[1]['timeout'] == 1
+
+
+def test_idempotent_call_retried_on_gateway_error(app):
+    """A GET that hits a 503 is retried and the recovered response returned."""
+    with app.app_context():
+        with patch.object(requests.Session, 'request',
+                          side_effect=[_response(503), _response(200)]) as mock_request:
+            response = http_client.get(OutboundIntegration.EPIC, URL)
+
+        assert response.status_code == 200
+        assert mock_request.call_count == 2
+        metrics = http_client.get_metrics()['epic']
+        assert metrics['calls'] == 2
+        assert metrics['errors'] == 1
+        assert metrics['retries'] == 1
+
+
+def test_post_not_retried(app):
+    """A POST that fails to connect is raised straight away rather than replayed."""
+    with app.app_context():
+        with patch.object(requests.Session, 'request',
+                          side_effect=requests.exceptions.ConnectionError()) as mock_request:
+            with pytest.raises(requests.exceptions.ConnectionError):
+                http_client.post(OutboundIntegration.NOTIFY, 'https://notify.test/email')
+
+        assert mock_request.call_count == 1
+
+
+def test_client_errors_do_not_trip_breaker(app):
+    """4xx responses are returned as-is and don't count against the dependency."""
+    with app.app_context():
+        with patch.object(requests.Session, 'request', return_value=_response(404)):
+            for _ in range(10):
+                assert http_client.get(OutboundIntegration.EPIC, URL).status_code == 404
+
+        assert http_client.get_metrics()['epic']['circuit'] == 'closed'
+
+
+def test_breaker_opens_and_fails_fast(app):
+    """Once the failure threshold is hit, calls are rejected without touching the network."""
+    with app.app_context():
+        original_config = app.config['HTTP_CLIENT_CONFIG']
+        app.config['HTTP_CLIENT_CONFIG'] = {
+            **original_config,
+            'KEYCLOAK': {'RETRIES': 0, 'BREAKER_THRESHOLD': 2, 'BREAKER_RESET': 60},
+        }
+        try:
+            with patch.object(requests.Session, 'request',
+                              side_effect=requests.exceptions.ReadTimeout()) as mock_request:
+                for _ in range(2):
+                    with pytest.raises(requests.exceptions.Timeout):
+                        http_client.get(OutboundIntegration.KEYCLOAK, 'https://keycloak.test/token')
+
+                with pytest.raises(http_client.CircuitOpenError):
+                    http_client.get(OutboundIntegration.KEYCLOAK, 'https://keycloak.test/token')
+
+            assert mock_request.call_count == 2
+            metrics = http_client.get_metrics()['keycloak']
+            assert metrics['rejected'] == 1
+            assert metrics['circuit'] == 'open'
+        finally:
+            app.config['HTTP_CLIENT_CONFIG'] = original_config
+
+
+def test_unexpected_error_ends_breaker_trial(app):
+    """A trial call failing with any other error re-opens the circuit instead of leaving it half-open."""
+    with app.app_context():
+        original_config = app.config['HTTP_CLIENT_CONFIG']
+        app.config['HTTP_CLIENT_CONFIG'] = {
+            **original_config,
+            'KEYCLOAK': {'RETRIES': 0, 'BREAKER_THRESHOLD': 1, 'BREAKER_RESET': 0},
+        }
+        try:
+            with patch.object(requests.Session, 'request', side_effect=requests.exceptions.ReadTimeout()):
+                with pytest.raises(requests.exceptions.Timeout):
+                    http_client.get(OutboundIntegration.KEYCLOAK, 'https://keycloak.test/token')
+
+            with patch.object(requests.Session, 'request', side_effect=requests.exceptions.TooManyRedirects()):
+                with pytest.raises(requests.exceptions.TooManyRedirects):
+                    http_client.get(OutboundIntegration.KEYCLOAK, 'https://keycloak.test/token')
+            assert http_client.get_metrics()['keycloak']['circuit'] == 'open'
+
+            with patch.object(requests.Session, 'request', return_value=_response(200)):
+                assert http_client.get(OutboundIntegration.KEYCLOAK, 'https://keycloak.test/token').status_code == 200
+            assert http_client.get_metrics()['keycloak']['circuit'] == 'closed'
+        finally:
+            app.config['HTTP_CLIENT_CONFIG'] = original_config
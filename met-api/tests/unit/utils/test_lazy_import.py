@@ -0,0 +1,58 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for lazy imports and the app's import-time budget."""
+import json
+import os
+import subprocess
+import sys
+
+from met_api.utils import lazy_import
+
+
+# Seconds a fresh process may take to import met_api and create the app
+IMPORT_TIME_BUDGET = float(os.getenv('IMPORT_TIME_BUDGET', '5'))
+
+STARTUP_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from met_api import create_app
+create_app('testing')
+elapsed = time.perf_counter() - started
+from met_api.utils.lazy_import import HEAVY_MODULES
+print(json.dumps({'seconds': elapsed, 'heavy': [name for name in HEAVY_MODULES if name in sys.modules]}))
+"""
+
+
+def test_lazy_module_imports_on_first_use():
+    """Assert that a lazy module is only imported once an attribute is read from it."""
+    sys.modules.pop('colorsys', None)
+    colorsys = lazy_import.lazy_module('colorsys')
+    assert 'colorsys' not in sys.modules
+
+    assert colorsys.rgb_to_hsv(1, 0, 0) == (0, 1, 1)
+    assert 'colorsys' in sys.modules
+    assert 'colorsys' in lazy_import.load_times()
+
+
+def test_app_startup_skips_heavy_modules_within_budget():
+    """Assert that creating the app imports none of the heavy modules and stays within the import budget."""
+    env = {**os.environ, 'FLASK_ENV': 'testing'}
+    result = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], env=env, capture_output=True, text=True,
+                            check=True)
+    startup = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert startup['heavy'] == [], f'imported at startup, load them with lazy_module instead: {startup["heavy"]}'
+    assert startup['seconds'] <= IMPORT_TIME_BUDGET, (
+        f'importing met_api and creating the app took {startup["seconds"]:.2f}s, '
+        f'over the {IMPORT_TIME_BUDGET}s budget')
@@ -0,0 +1,48 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for warming the app up before forking and reinitializing it after."""
+import gc
+from unittest.mock import patch
+
+from met_api.services import shapefile_service
+from met_api.utils import http_client, lazy_import, prefork
+from met_api.utils.template import ENV as TEMPLATE_ENV
+
+
+def test_warm_up(app):
+    """Assert that warming up compiles the templates, imports the lazy modules and drops pooled connections."""
+    http_client._get_session('https://epic.test/a')  # pylint: disable=protected-access
+    try:
+        prefork.warm_up(app)
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+    cached_templates = {name for (_, name) in TEMPLATE_ENV.cache.keys()}
+    assert set(TEMPLATE_ENV.list_templates()) <= cached_templates
+    assert 'openpyxl' in lazy_import.load_times()
+    assert not http_client._sessions  # pylint: disable=protected-access
+
+
+def test_reinitialize_after_fork(app):
+    """Assert that a forked worker gets its own pools and analytics providers."""
+    shapefile_service._executor = object()  # pylint: disable=protected-access
+    http_client._get_session('https://epic.test/a')  # pylint: disable=protected-access
+
+    with patch('met_api.utils.analytics.init_analytics') as init_analytics:
+        prefork.reinitialize_after_fork(app)
+
+    init_analytics.assert_called_once_with(app)
+    assert shapefile_service._executor is None  # pylint: disable=protected-access
+    assert not http_client._sessions  # pylint: disable=protected-access
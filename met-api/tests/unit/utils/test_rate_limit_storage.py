@@ -0,0 +1,116 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the shared rate limit storages."""
+import time
+from unittest.mock import patch
+
+from flask import Flask
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import MovingWindowRateLimiter
+
+from met_api.utils import limiter as limiter_module
+from met_api.utils.rate_limit_storage import DatabaseStorage, PrecheckStorage
+
+
+def _database_storage(app):
+    database_uri = app.config['SQLALCHEMY_DATABASE_URI']
+    return storage_from_string('postgresql+limits' + database_uri[database_uri.index('://'):])
+
+
+def test_database_moving_window(app, db):  # pylint: disable=unused-argument
+    """Assert that the Postgres storage allows the limit within a moving window and no more."""
+    storage = _database_storage(app)
+    assert isinstance(storage, DatabaseStorage)
+    rate_limiter = MovingWindowRateLimiter(storage)
+    limit = parse('3/minute')
+    try:
+        assert [rate_limiter.hit(limit, 'test', '10.0.0.1') for _ in range(4)] == [True, True, True, False]
+        assert rate_limiter.hit(limit, 'test', '10.0.0.2')
+
+        reset_at, remaining = rate_limiter.get_window_stats(limit, 'test', '10.0.0.1')
+        assert remaining == 0
+        assert time.time() < reset_at <= time.time() + 60
+    finally:
+        storage.reset()
+    assert rate_limiter.hit(limit, 'test', '10.0.0.1')
+    storage.reset()
+
+
+def test_database_fixed_window(app, db):  # pylint: disable=unused-argument
+    """Assert that the Postgres storage counts fixed windows."""
+    storage = _database_storage(app)
+    try:
+        assert storage.incr('fixed', 60) == 1
+        assert storage.incr('fixed', 60, amount=2) == 3
+        assert storage.get('fixed') == 3
+        assert time.time() < storage.get_expiry('fixed') <= time.time() + 60
+        storage.clear('fixed')
+        assert storage.get('fixed') == 0
+    finally:
+        storage.reset()
+
+
+def test_precheck_denies_without_shared_storage():
+    """Assert that once the shared storage denies a key, the precheck denies it until the window frees up."""
+    storage = storage_from_string('precheck://', shared_storage_uri='memory://')
+    assert isinstance(storage, PrecheckStorage)
+    rate_limiter = MovingWindowRateLimiter(storage)
+    limit = parse('2/minute')
+    # another worker has used the limit up
+    storage.shared.acquire_entry(limit.key_for('test'), 2, 60, amount=2)
+
+    with patch.object(storage.shared, 'acquire_entry', wraps=storage.shared.acquire_entry) as shared_acquire:
+        assert not rate_limiter.hit(limit, 'test')
+        assert not rate_limiter.hit(limit, 'test')
+        assert not rate_limiter.hit(limit, 'test')
+    assert shared_acquire.call_count == 1
+
+    storage.clear(limit.key_for('test'))
+    assert rate_limiter.hit(limit, 'test')
+
+
+def test_precheck_leases_from_shared_storage():
+    """Assert that allowed requests are served from a lease on a slice of the limit, not the shared storage."""
+    storage = storage_from_string('precheck://', shared_storage_uri='memory://', lease_fraction=0.25)
+    rate_limiter = MovingWindowRateLimiter(storage)
+    limit = parse('8/minute')
+
+    with patch.object(storage.shared, 'acquire_entry', wraps=storage.shared.acquire_entry) as shared_acquire:
+        assert [rate_limiter.hit(limit, 'test') for _ in range(4)] == [True] * 4
+        assert shared_acquire.call_count == 2
+        # the shared window counts both leases, the headers report it from the lease
+        assert storage.shared.get_moving_window(limit.key_for('test'), 8, 60)[1] == 4
+        assert rate_limiter.get_window_stats(limit, 'test')[1] == 4
+
+        # another worker has used up the rest, this one can't lease any more
+        storage.shared.acquire_entry(limit.key_for('test'), 8, 60, amount=4)
+        assert not rate_limiter.hit(limit, 'test')
+
+
+def test_init_limiter_storage():
+    """Assert that a shared storage is put behind the precheck, on the app's database when none is named."""
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI='postgresql://met:secret@db:5432/met', RATELIMIT_PRECHECK_ENABLED=True,
+                      RATELIMIT_STORAGE_URI='postgresql+limits://')
+    with patch.object(limiter_module.limiter, 'init_app'):
+        limiter_module.init_limiter(app)
+    assert app.config['RATELIMIT_STORAGE_URI'] == 'precheck://'
+    assert app.config['RATELIMIT_STORAGE_OPTIONS'] == {
+        'shared_storage_uri': 'postgresql+limits://met:secret@db:5432/met', 'lease_fraction': 0}
+
+    app.config.update(RATELIMIT_STORAGE_URI='memory://', RATELIMIT_STORAGE_OPTIONS={})
+    with patch.object(limiter_module.limiter, 'init_app'):
+        limiter_module.init_limiter(app)
+    assert app.config['RATELIMIT_STORAGE_URI'] == 'memory://'
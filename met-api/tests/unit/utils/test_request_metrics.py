@@ -0,0 +1,91 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the per-request query and outbound call metrics."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from met_api.utils import http_client
+from met_api.utils.enums import ContentType, OutboundIntegration
+from tests.utilities.factory_scenarios import TestJwtClaims
+from tests.utilities.factory_utils import (
+    factory_auth_header, factory_comment_model, factory_participant_model, factory_submission_model,
+    factory_survey_and_eng_model)
+from tests.utilities.query_assertions import assert_max_queries
+
+
+@pytest.fixture
+def metrics_enabled(app):
+    """Turn request metrics on for one test."""
+    app.config['REQUEST_METRICS_ENABLED'] = True
+    yield
+    app.config['REQUEST_METRICS_ENABLED'] = False
+
+
+def _survey_with_comments(comment_count):
+    participant = factory_participant_model()
+    survey, eng = factory_survey_and_eng_model()
+    for _ in range(comment_count):
+        submission = factory_submission_model(survey.id, eng.id, participant.id)
+        factory_comment_model(survey.id, submission.id)
+    return survey
+
+
+def _get_comments(client, jwt, survey):
+    headers = factory_auth_header(jwt=jwt, claims=TestJwtClaims.public_user_role)
+    return client.get(f'/api/comments/survey/{survey.id}', headers=headers, content_type=ContentType.JSON.value)
+
+
+def test_server_timing_header(client, jwt, session, metrics_enabled):  # pylint:disable=unused-argument
+    """Assert that the query count and time of a request come back in the Server-Timing header."""
+    rv = _get_comments(client, jwt, _survey_with_comments(1))
+    assert rv.status_code == 200
+    timing = rv.headers['Server-Timing']
+    assert timing.startswith('db;dur=')
+    assert 'queries"' in timing
+    assert 'total;dur=' in timing
+
+
+def test_no_server_timing_header_when_disabled(client, jwt, session):  # pylint:disable=unused-argument
+    """Assert that nothing is collected or returned while request metrics are off."""
+    rv = _get_comments(client, jwt, _survey_with_comments(1))
+    assert rv.status_code == 200
+    assert 'Server-Timing' not in rv.headers
+
+
+def test_outbound_calls_are_timed_per_integration(app, metrics_enabled):  # pylint:disable=unused-argument
+    """Assert that outbound calls made during a request are added to that request's metrics."""
+    response = MagicMock()
+    response.status_code = 200
+    http_client.reset()
+    with app.test_request_context('/'):
+        app.preprocess_request()
+        with patch.object(requests.Session, 'request', return_value=response):
+            http_client.get(OutboundIntegration.EPIC, 'https://epic.test/api/project/1')
+            http_client.get(OutboundIntegration.EPIC, 'https://epic.test/api/project/2')
+        timing = app.process_response(app.response_class()).headers['Server-Timing']
+    http_client.reset()
+    assert f'{OutboundIntegration.EPIC.value.lower()};dur=' in timing
+    assert 'desc="2 calls"' in timing
+
+
+def test_comment_queries_do_not_grow_with_comments(client, jwt, session):  # pylint:disable=unused-argument
+    """Assert that listing comments runs a bounded number of queries, however many comments there are."""
+    one_comment = _survey_with_comments(1)
+    five_comments = _survey_with_comments(5)
+    with assert_max_queries(10) as counted:
+        assert _get_comments(client, jwt, one_comment).status_code == 200
+    with assert_max_queries(counted.count):
+        assert _get_comments(client, jwt, five_comments).status_code == 200
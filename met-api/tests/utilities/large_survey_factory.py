@@ -0,0 +1,250 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Generators for large synthetic surveys, used by the benchmark suite.
+
+Builds wizard forms with many pages of Radio, Drop-down, Checkbox, Likert matrix and Rank order
+questions, each page with free-text follow-ups conditional on a Likert row and on a Radio option,
+and bulk inserts tens of thousands of submissions and comments against them. Everything is drawn
+from a seeded random generator, so two runs load the same data and their timings compare.
+"""
+from datetime import datetime, timedelta
+import os
+import random
+from typing import NamedTuple
+
+from sqlalchemy import insert
+
+from met_api.constants.comment_status import Status as CommentStatus
+from met_api.constants.engagement_status import Status as EngagementStatus
+from met_api.constants.engagement_visibility import Visibility
+from met_api.models import db
+from met_api.models.comment import Comment as CommentModel
+from met_api.models.engagement import Engagement as EngagementModel
+from met_api.models.engagement_settings import EngagementSettingsModel
+from met_api.models.participant import Participant as ParticipantModel
+from met_api.models.report_setting import ReportSetting as ReportSettingModel
+from met_api.models.submission import Submission as SubmissionModel
+from met_api.models.survey import Survey as SurveyModel
+from tests.utilities.factory_scenarios import TestEngagementInfo
+
+
+# Multiplies every generated row count, e.g. BENCHMARK_SCALE=0.1 for a quick local run
+BENCHMARK_SCALE = float(os.getenv('BENCHMARK_SCALE', '1'))
+
+SEED = 20260101
+INSERT_BATCH_SIZE = 2000
+
+LIKERT_SCALE = [
+    {'value': 'stronglyDisagree', 'label': 'Strongly Disagree'},
+    {'value': 'disagree', 'label': 'Disagree'},
+    {'value': 'neutral', 'label': 'Neutral'},
+    {'value': 'agree', 'label': 'Agree'},
+    {'value': 'stronglyAgree', 'label': 'Strongly Agree'},
+]
+WORDS = ('the project should protect water air quality access trail traffic noise local business housing '
+         'wildlife community concerns support more less parking safety schedule fish habitat jobs').split()
+
+
+class LargeSurvey(NamedTuple):
+    """A generated survey and the number of rows loaded against it."""
+
+    survey: SurveyModel
+    engagement: EngagementModel
+    submission_count: int
+    comment_count: int
+
+
+def scaled(count: int) -> int:
+    """Apply BENCHMARK_SCALE to a row count, never going below one."""
+    return max(1, int(count * BENCHMARK_SCALE))
+
+
+def _options(prefix: str, count: int) -> list:
+    return [{'value': f'{prefix}{index}', 'label': f'Option {index + 1}'} for index in range(count)]
+
+
+def _page(page: int, matrix_rows: int, options: int) -> dict:
+    likert_key = f'l{page}'
+    radio_key = f'r{page}'
+    return {
+        'key': f'page{page}',
+        'title': f'Page {page + 1}',
+        'type': 'panel',
+        'components': [
+            {'key': radio_key, 'type': 'simpleradios', 'label': f'Radio question {page + 1}',
+             'values': _options('opt', options)},
+            {'key': f's{page}', 'type': 'simpleselect', 'label': f'Drop-down question {page + 1}',
+             'values': _options('sel', options)},
+            {'key': f'c{page}', 'type': 'simplecheckboxes', 'label': f'Checkbox question {page + 1}',
+             'values': _options('chk', options)},
+            {'key': likert_key, 'type': 'simplesurvey', 'label': f'Likert matrix {page + 1}',
+             'questions': [{'value': f'row{row}', 'label': f'Statement {row + 1}'} for row in range(matrix_rows)],
+             'values': LIKERT_SCALE},
+            {'key': f'k{page}', 'type': 'simpleranking', 'label': f'Rank order {page + 1}',
+             'statements': [{'id': f'st{row}', 'label': f'Priority {row + 1}'} for row in range(options)]},
+            {'key': f'fl{page}', 'type': 'simpletextarea', 'label': 'Why do you disagree?',
+             'customConditional': (f"show = data.{likert_key} && (data.{likert_key}.row0 === 'disagree' || "
+                                   f"data.{likert_key}.row0 === 'stronglyDisagree');")},
+            {'key': f'fr{page}', 'type': 'simpletextarea', 'label': 'Tell us more',
+             'conditional': {'show': True, 'when': radio_key, 'eq': f'opt{options - 1}'}},
+            {'key': f't{page}', 'type': 'simpletextfield', 'label': f'Anything else about page {page + 1}?'},
+        ],
+    }
+
+
+def build_large_form_json(pages: int = 20, matrix_rows: int = 8, options: int = 6) -> dict:
+    """Build a wizard form with every question type on each page, and conditional follow-ups."""
+    return {'display': 'wizard', 'components': [_page(page, matrix_rows, options) for page in range(pages)]}
+
+
+def text_question_keys(form_json: dict) -> list:
+    """Return the keys of the form's free-text questions, in form order."""
+    return [component['key'] for page in form_json['components'] for component in page['components']
+            if component['type'] in ('simpletextarea', 'simpletextfield')]
+
+
+def _sentence(rng: random.Random) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 40)))
+
+
+def build_submission_json(form_json: dict, rng: random.Random) -> dict:
+    """Answer a generated form the way a respondent might, skipping some questions."""
+    answers = {}
+    for page in form_json['components']:
+        for component in page['components']:
+            key = component['key']
+            component_type = component['type']
+            if rng.random() < 0.1:
+                continue
+            if component_type in ('simpleradios', 'simpleselect'):
+                answers[key] = rng.choice(component['values'])['value']
+            elif component_type == 'simplecheckboxes':
+                answers[key] = {option['value']: rng.random() < 0.4 for option in component['values']}
+            elif component_type == 'simplesurvey':
+                answers[key] = {row['value']: rng.choice(component['values'])['value']
+                                for row in component['questions']}
+            elif component_type == 'simpleranking':
+                ranks = list(range(1, len(component['statements']) + 1))
+                rng.shuffle(ranks)
+                answers[key] = {statement['id']: rank for statement, rank in zip(component['statements'], ranks)}
+            elif rng.random() < 0.3:
+                answers[key] = _sentence(rng)
+    return answers
+
+
+def _insert(model, rows: list, returning=None) -> list:
+    """Insert rows in batches, returning the generated ids when asked to."""
+    ids = []
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        batch = rows[start:start + INSERT_BATCH_SIZE]
+        if returning is None:
+            db.session.execute(insert(model), batch)
+        else:
+            ids.extend(db.session.scalars(insert(model).returning(returning, sort_by_parameter_order=True), batch))
+    return ids
+
+
+def factory_engagements(count: int, name_prefix: str = 'Benchmark') -> list:
+    """Bulk insert published engagements, each with settings and a small survey, and return their ids."""
+    info = TestEngagementInfo.engagement1
+    now = datetime.utcnow()
+    engagement_ids = _insert(EngagementModel, [
+        {
+            'name': f'{name_prefix} {index}',
+            'description': info['description'],
+            'rich_description': info['rich_description'],
+            'content': info['content'],
+            'rich_content': info['rich_content'],
+            'start_date': now - timedelta(days=index % 30),
+            'end_date': now + timedelta(days=30),
+            'status_id': EngagementStatus.Published.value,
+            'visibility': Visibility.Public.value,
+            'created_date': now,
+            'updated_date': now,
+        }
+        for index in range(count)
+    ], returning=EngagementModel.id)
+    _insert(EngagementSettingsModel, [{'engagement_id': engagement_id, 'send_report': True}
+                                      for engagement_id in engagement_ids])
+    form_json = build_large_form_json(pages=1, matrix_rows=3, options=3)
+    _insert(SurveyModel, [
+        {'name': f'{name_prefix} survey {index}', 'form_json': form_json, 'engagement_id': engagement_id,
+         'is_hidden': False, 'is_template': False, 'created_date': now, 'updated_date': now}
+        for index, engagement_id in enumerate(engagement_ids)
+    ])
+    return engagement_ids
+
+
+def factory_large_survey(submissions: int = 20000, pages: int = 20, participants: int = None,
+                         seed: int = SEED) -> LargeSurvey:
+    """Bulk insert a large survey with its engagement, submissions and approved comments.
+
+    A share of the respondents resubmit, so the export has earlier submissions to drop. Every
+    free-text answer becomes a comment, and every free-text question is shown on the dashboard.
+    """
+    rng = random.Random(seed)
+    submissions = scaled(submissions)
+    participants = participants or max(1, int(submissions * 0.8))
+    now = datetime.utcnow()
+
+    engagement_id = factory_engagements(1, name_prefix='Large survey')[0]
+    engagement = db.session.get(EngagementModel, engagement_id)
+    survey = db.session.query(SurveyModel).filter(SurveyModel.engagement_id == engagement_id).one()
+    survey.form_json = build_large_form_json(pages=pages)
+    db.session.flush()
+
+    _insert(ReportSettingModel, [
+        {'survey_id': survey.id, 'question_key': key, 'question_id': key, 'question_type': 'simpletextarea',
+         'question': key, 'display': True, 'created_date': now, 'updated_date': now}
+        for key in text_question_keys(survey.form_json)
+    ])
+
+    participant_ids = _insert(ParticipantModel, [{'email_address': f'respondent{index}@example.com'}
+                                                 for index in range(participants)], returning=ParticipantModel.id)
+    answers = [build_submission_json(survey.form_json, rng) for _ in range(submissions)]
+    submission_ids = _insert(SubmissionModel, [
+        {
+            'survey_id': survey.id,
+            'engagement_id': engagement_id,
+            'participant_id': participant_ids[index % participants],
+            'submission_json': submission_json,
+            'comment_status_id': CommentStatus.Approved.value,
+            'reviewed_by': 'Benchmark reviewer',
+            'created_date': now,
+            'updated_date': now,
+        }
+        for index, submission_json in enumerate(answers)
+    ], returning=SubmissionModel.id)
+
+    text_keys = text_question_keys(survey.form_json)
+    comments = [
+        {
+            'survey_id': survey.id,
+            'submission_id': submission_id,
+            'participant_id': participant_ids[index % participants],
+            'component_id': key,
+            'text': submission_json[key],
+            'submission_date': now,
+            'created_date': now,
+            'updated_date': now,
+        }
+        for index, (submission_id, submission_json) in enumerate(zip(submission_ids, answers))
+        for key in text_keys if key in submission_json
+    ]
+    _insert(CommentModel, comments)
+    db.session.expire_all()
+
+    return LargeSurvey(survey=survey, engagement=engagement, submission_count=submissions,
+                       comment_count=len(comments))
@@ -0,0 +1,30 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utilities to assert on the SQL an endpoint runs.
+
+Test helper to put an upper bound on the queries a block runs, so N+1 regressions fail a test.
+"""
+from contextlib import contextmanager
+
+from met_api.utils.request_metrics import count_queries
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """Do assertion that the block runs at most limit SQL statements, listing them when it doesn't."""
+    with count_queries() as counter:
+        yield counter
+    assert counter.count <= limit, (
+        f'expected at most {limit} queries, ran {counter.count}:\n' + '\n'.join(counter.statements))
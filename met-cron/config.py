@@ -165,6 +165,21 @@ class _Config():  # pylint: disable=too-few-public-methods
     # config for email queue
     MAIL_BATCH_SIZE = os.getenv('MAIL_BATCH_SIZE', 10)
 
+    # EAO EPIC configs, for the closeout and publish jobs' EPIC updates
+    IS_EAO_ENVIRONMENT = os.getenv('IS_EAO_ENVIRONMENT', 'False').lower() == 'true'
+    EPIC_KEYCLOAK_SERVICE_ACCOUNT_ID = os.getenv('EPIC_KEYCLOAK_SERVICE_ACCOUNT_ID')
+    EPIC_KEYCLOAK_SERVICE_ACCOUNT_SECRET = os.getenv('EPIC_KEYCLOAK_SERVICE_ACCOUNT_SECRET')
+    EPIC_JWT_OIDC_ISSUER = os.getenv('EPIC_JWT_OIDC_ISSUER')
+    EPIC_URL = os.getenv('EPIC_URL')
+    EPIC_MILESTONE = os.getenv('EPIC_MILESTONE')
+    EPIC_KC_CLIENT_ID = os.getenv('EPIC_KC_CLIENT_ID')
+    # eagle-api calls made at once when the closeout and publish jobs update EPIC
+    EPIC_UPDATE_WORKERS = int(os.getenv('EPIC_UPDATE_WORKERS', '4'))
+    # runs that retry an engagement whose EPIC update or closeout email failed
+    ENGAGEMENT_JOB_MAX_ATTEMPTS = int(os.getenv('ENGAGEMENT_JOB_MAX_ATTEMPTS', '3'))
+    # minutes after which a closeout email still processing is taken for a crashed run and queued again
+    CLOSEOUT_EMAIL_PROCESSING_TIMEOUT = int(os.getenv('CLOSEOUT_EMAIL_PROCESSING_TIMEOUT', '60'))
+
     # config for offset days to send reminder emails
     OFFSET_DAYS = os.getenv('OFFSET_DAYS', 2)
 
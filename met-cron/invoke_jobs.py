@@ -28,6 +28,7 @@ setup_logging(os.path.join(os.path.abspath(os.path.dirname(__file__)), 'logging.
 
 def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
     """Return a configured Flask App using the Factory method."""
+    from met_api.utils.cache import cache
     from met_cron.models import db, ma
 
     app = Flask(__name__)
@@ -39,6 +40,8 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
     app.logger.info(f'<<<< Starting Jobs >>>>')
     db.init_app(app)
     ma.init_app(app)
+    # the EPIC updates keep the project notifications they fetch, to fetch them again conditionally
+    cache.init_app(app)
 
     register_shellcontext(app)
 
@@ -58,6 +61,7 @@ def register_shellcontext(app):
 
 
 def run(job_name):
+    from tasks.closeout_mailer import EngagementCloseoutMailer
     from tasks.closing_soon_mailer import EngagementClosingSoonMailer
     from tasks.met_closeout import MetEngagementCloseout
     from tasks.met_publish import MetEngagementPublish
@@ -83,6 +87,9 @@ def run(job_name):
         elif job_name == 'PUBLISH_EMAIL':
             SubscriptionMailer.do_email()
             application.logger.info('<<<< Completed MET PUBLISH_EMAIL >>>>')
+        elif job_name == 'CLOSEOUT_EMAIL':
+            EngagementCloseoutMailer.do_email()
+            application.logger.info('<<<< Completed MET CLOSEOUT_EMAIL >>>>')
         elif job_name == 'CLOSING_SOON_EMAIL':
             EngagementClosingSoonMailer.do_email()
             application.logger.info('<<<< Completed MET CLOSING_SOON_EMAIL >>>>')
@@ -0,0 +1,3 @@
+#! /bin/sh
+echo 'run invoke_jobs.py CLOSEOUT_EMAIL'
+python3 invoke_jobs.py CLOSEOUT_EMAIL
\ No newline at end of file
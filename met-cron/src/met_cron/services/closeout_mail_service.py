@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from met_api.constants.engagement_job import EngagementJob
+from met_api.constants.notification_status import NotificationStatus
+from met_api.models.email_queue import EmailQueue as EmailQueueModel
+from met_api.models.engagement import Engagement as EngagementModel
+from met_api.models.engagement_job_result import EngagementJobResult as EngagementJobResultModel
+from met_api.services.engagement_service import EngagementService
+from met_api.utils.enums import SourceAction
+
+
+class CloseoutEmailService:  # pylint: disable=too-few-public-methods
+    """Mail for closed engagements."""
+
+    @staticmethod
+    def do_mail(max_size: int = None):
+        """Send the closeout emails queued by the engagement closeout, MAIL_BATCH_SIZE unless max_size is given.
+
+            1. Queue again the closeout records left processing by a run that died, after
+               CLOSEOUT_EMAIL_PROCESSING_TIMEOUT minutes
+            2. Get N number of unprocessed closeout records from the email_queue table
+            3. Send each engagement's closeout email to its participants
+            4. Record each engagement's result, and put the failed ones back in the queue
+               until they have been tried ENGAGEMENT_JOB_MAX_ATTEMPTS times, marking them failed after that
+
+        Progress is not kept per participant: a retried or requeued engagement is mailed to all of its
+        participants again, including the ones the earlier attempt had reached.
+        """
+        email_batch_size: int = int(current_app.config.get('MAIL_BATCH_SIZE')) if max_size is None else max_size
+        max_attempts: int = int(current_app.config.get('ENGAGEMENT_JOB_MAX_ATTEMPTS'))
+        processing_timeout: int = int(current_app.config.get('CLOSEOUT_EMAIL_PROCESSING_TIMEOUT'))
+        EmailQueueModel.release_stale_engagement_mails(
+            SourceAction.CLOSED.value, datetime.utcnow() - timedelta(minutes=processing_timeout))
+        mails = EmailQueueModel.get_unprocessed_engagement_mails(SourceAction.CLOSED.value, email_batch_size)
+        if not mails:
+            return
+        engagements = {engagement.id: engagement
+                       for engagement in EngagementModel.find_by_ids([mail.entity_id for mail in mails])}
+        for mail in mails:
+            mail.notification_status = NotificationStatus.PROCESSING.value
+            mail.updated_date = datetime.utcnow()
+        EmailQueueModel.commit()
+
+        results = {}
+        for mail in mails:
+            engagement = engagements.get(mail.entity_id)
+            if engagement is None:
+                # deleted since it was queued, there is nothing to send nor a job result to keep
+                current_app.logger.error(f'Closeout email of engagement {mail.entity_id} dropped, '
+                                         'the engagement no longer exists')
+                mail.notification_status = NotificationStatus.FAILED.value
+            else:
+                try:
+                    EngagementService.send_closeout_emails(engagement)
+                    results[mail.entity_id] = None
+                    mail.notification_status = NotificationStatus.SENT.value
+                except Exception as exc:  # noqa: B902 # pylint: disable=broad-except
+                    current_app.logger.error(f'Closeout email of engagement {mail.entity_id} failed: {exc}')
+                    results[mail.entity_id] = str(exc) or exc.__class__.__name__
+            mail.updated_date = datetime.utcnow()
+        EmailQueueModel.commit()
+
+        if not results:
+            return
+        EngagementJobResultModel.record_results(EngagementJob.CLOSEOUT_EMAIL.value, results)
+        retry_ids = set(EngagementJobResultModel.find_retryable(EngagementJob.CLOSEOUT_EMAIL.value, max_attempts))
+        for mail in mails:
+            if results.get(mail.entity_id) is None:
+                continue
+            mail.notification_status = None if mail.entity_id in retry_ids else NotificationStatus.FAILED.value
+        EmailQueueModel.commit()
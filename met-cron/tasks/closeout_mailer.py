@@ -0,0 +1,28 @@
+# Copyright © 2026 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""MET Engagement Closeout Emailer."""
+from datetime import datetime
+
+from met_cron.services.closeout_mail_service import CloseoutEmailService
+
+
+class EngagementCloseoutMailer:  # pylint:disable=too-few-public-methods
+    """Task to handle the engagement closeout emails."""
+
+    @classmethod
+    def do_email(cls):
+        """Email the participants of closed engagements."""
+        print('Starting EngagementCloseoutMailer ------------------------', datetime.now())
+
+        CloseoutEmailService.do_mail()
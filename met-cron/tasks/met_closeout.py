@@ -16,6 +16,8 @@ from datetime import datetime
 
 from met_api.services.engagement_service import EngagementService
 
+from met_cron.services.closeout_mail_service import CloseoutEmailService
+
 
 class MetEngagementCloseout:  # pylint:disable=too-few-public-methods
     """Task to handles Engagement due closure."""
@@ -26,3 +28,5 @@ class MetEngagementCloseout:  # pylint:disable=too-few-public-methods
         print('Starting Met Engagement Closeout at------------------------', datetime.now())
 
         EngagementService.close_engagements_due()
+        # send every closeout email queued, the ones that fail are retried by CLOSEOUT_EMAIL
+        CloseoutEmailService.do_mail(max_size=0)
@@ -1,4 +1,6 @@
-from dagster import job
+import os
+
+from dagster import job, multiprocess_executor
 from ops.engagement_etl_service import load_engagement,get_engagement_last_run_cycle_time,extract_engagement,engagement_end_run_cycle
 from ops.user_etl_service import load_user,get_user_last_run_cycle_time,extract_participant,user_end_run_cycle
 
@@ -10,11 +12,22 @@ from ops.submission_etl_service import get_submission_last_run_cycle_time, extra
     load_user_response_details, submission_end_run_cycle
 from ops.email_verification_etl_service import get_email_ver_last_run_cycle_time, extract_email_ver, load_email_ver, \
     email_ver_end_run_cycle
+from ops.change_log_etl_service import prune_change_log
 
 from resources.db import met_db_session, met_etl_db_session
 
 
-@job(resource_defs={"met_db_session": met_db_session, "met_etl_db_session": met_etl_db_session})
+# tag used by the run coordinator's tag_concurrency_limits (dagster.yaml) to allow only one run at a time
+MET_DATA_INGESTION_CONCURRENCY_TAG = {"met-etl/concurrency": "met_data_ingestion"}
+
+
+# the pipelines below only wait on the steps whose data they actually read:
+# engagement -> survey -> (report setting, submission). user and email verification don't depend on
+# anything in the analytics database, so they run alongside the rest.
+@job(resource_defs={"met_db_session": met_db_session, "met_etl_db_session": met_etl_db_session},
+     executor_def=multiprocess_executor.configured(
+         {"max_concurrent": int(os.getenv("MET_ETL_MAX_CONCURRENT_OPS") or 4)}),
+     tags=MET_DATA_INGESTION_CONCURRENCY_TAG)
 def met_data_ingestion():
 
     # etl for user
@@ -31,13 +44,12 @@ def met_data_ingestion():
 
 
     # etl for engagement
-    engagement_last_run_cycle_time, engagement_new_runcycleid_created = get_engagement_last_run_cycle_time(
-                                                                                    flag_to_run_step_after_user)
-    new_engagements, updated_engagement, engagement_new_runcycleid_passed_to_load = extract_engagement(
-                                                                                    engagement_last_run_cycle_time,
-                                                                                    engagement_new_runcycleid_created)
+    engagement_last_run_cycle_time, engagement_new_runcycleid_created = get_engagement_last_run_cycle_time()
+    new_engagements, updated_engagement, deleted_engagement_ids, engagement_new_runcycleid_passed_to_load = \
+        extract_engagement(engagement_last_run_cycle_time, engagement_new_runcycleid_created)
     engagement_new_runcycleid_passed_to_end = load_engagement(new_engagements, updated_engagement,
-                                                                                    engagement_new_runcycleid_passed_to_load)
+                                                              deleted_engagement_ids,
+                                                              engagement_new_runcycleid_passed_to_load)
 
     flag_to_run_step_after_engagement = engagement_end_run_cycle(engagement_new_runcycleid_passed_to_end)
 
@@ -46,10 +58,11 @@ def met_data_ingestion():
     survey_last_run_cycle_time, survey_new_runcycleid_created = get_survey_last_run_cycle_time(
                                                                                     flag_to_run_step_after_engagement)
 
-    new_survey, updated_survey, survey_new_runcycleid_passed_to_load = extract_survey(survey_last_run_cycle_time,
-                                                                                      survey_new_runcycleid_created)
+    new_survey, updated_survey, deleted_survey_ids, survey_new_runcycleid_passed_to_load = extract_survey(
+        survey_last_run_cycle_time,
+        survey_new_runcycleid_created)
 
-    survey_new_runcycleid_passed_to_end = load_survey(new_survey, updated_survey,
+    survey_new_runcycleid_passed_to_end = load_survey(new_survey, updated_survey, deleted_survey_ids,
                                                       survey_new_runcycleid_passed_to_load)
 
     flag_to_run_step_after_survey = survey_end_run_cycle(survey_new_runcycleid_passed_to_end)
@@ -69,32 +82,37 @@ def met_data_ingestion():
     flag_to_run_step_after_setting = setting_end_run_cycle(setting_new_runcycleid_passed_to_end)
 
 
-    # etl run for submissions
+    # etl run for submissions, needs the surveys loaded but not the report settings
     submission_last_run_cycle_time, submission_new_runcycleid_created = get_submission_last_run_cycle_time(
-        flag_to_run_step_after_setting)
+        flag_to_run_step_after_survey)
 
-    new_submission, updated_submission, submission_new_runcycleid_passed_to_load = extract_submission(
-        submission_last_run_cycle_time,
-        submission_new_runcycleid_created)
+    new_submission, updated_submission, deleted_submission_ids, submission_new_runcycleid_passed_to_load = \
+        extract_submission(submission_last_run_cycle_time, submission_new_runcycleid_created)
 
     submission_new_runcycleid_passed_to_load_response = load_submission(new_submission, updated_submission,
+                                                                       deleted_submission_ids,
                                                                        submission_new_runcycleid_passed_to_load)
 
     submission_new_runcycleid_passed_to_end = load_user_response_details(new_submission, updated_submission,
+                                                                         deleted_submission_ids,
                                                                          submission_new_runcycleid_passed_to_load_response)
 
     flag_to_run_step_after_submission = submission_end_run_cycle(submission_new_runcycleid_passed_to_end)
 
 
     # etl run for email verification
-    email_ver_last_run_cycle_time, email_ver_new_runcycleid_created = get_email_ver_last_run_cycle_time(
-        flag_to_run_step_after_submission)
+    email_ver_last_run_cycle_time, email_ver_new_runcycleid_created = get_email_ver_last_run_cycle_time()
 
-    new_email_ver, updated_email_ver, email_ver_new_runcycleid_passed_to_load = extract_email_ver(
-        email_ver_last_run_cycle_time,
-        email_ver_new_runcycleid_created)
+    new_email_ver, updated_email_ver, deleted_email_ver_ids, email_ver_new_runcycleid_passed_to_load = \
+        extract_email_ver(email_ver_last_run_cycle_time, email_ver_new_runcycleid_created)
 
-    email_ver_new_runcycleid_passed_to_end = load_email_ver(new_email_ver, updated_email_ver,
-                                                                       email_ver_new_runcycleid_passed_to_load)
+    email_ver_new_runcycleid_passed_to_end = load_email_ver(new_email_ver, updated_email_ver, deleted_email_ver_ids,
+                                                            email_ver_new_runcycleid_passed_to_load)
 
     flag_to_run_step_after_email_ver = email_ver_end_run_cycle(email_ver_new_runcycleid_passed_to_end)
+
+
+    # delete the change log entries every package has read
+    prune_change_log(flag_to_run_step_after_user, flag_to_run_step_after_engagement, flag_to_run_step_after_survey,
+                     flag_to_run_step_after_setting, flag_to_run_step_after_submission,
+                     flag_to_run_step_after_email_ver)
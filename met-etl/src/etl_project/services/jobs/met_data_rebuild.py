@@ -0,0 +1,33 @@
+from dagster import StaticPartitionsDefinition, job
+from jobs.met_data_ingestion import MET_DATA_INGESTION_CONCURRENCY_TAG
+from ops.rebuild_etl_service import prepare_rebuild, rebuild_submission_partition, swap_rebuilt_tables
+from utils.rebuild import REBUILD_PARTITION_COUNT
+
+from resources.db import met_db_session, met_etl_db_session
+
+
+# one partition per engagement bucket, a backfill over all of them loads the whole rebuild
+rebuild_partitions = StaticPartitionsDefinition([str(partition) for partition in range(REBUILD_PARTITION_COUNT)])
+
+# partitions only write to the staging tables, so they run alongside met_data_ingestion and each other,
+# up to the limit set for this tag in dagster.yaml
+MET_DATA_REBUILD_CONCURRENCY_TAG = {"met-etl/concurrency": "met_data_rebuild"}
+
+
+@job(resource_defs={"met_db_session": met_db_session, "met_etl_db_session": met_etl_db_session})
+def met_data_rebuild_prepare():
+    prepare_rebuild()
+
+
+@job(resource_defs={"met_db_session": met_db_session, "met_etl_db_session": met_etl_db_session},
+     partitions_def=rebuild_partitions,
+     tags=MET_DATA_REBUILD_CONCURRENCY_TAG)
+def met_data_rebuild():
+    rebuild_submission_partition()
+
+
+# the swap replaces tables met_data_ingestion loads into, so it never runs at the same time as an ingestion run
+@job(resource_defs={"met_etl_db_session": met_etl_db_session},
+     tags=MET_DATA_INGESTION_CONCURRENCY_TAG)
+def met_data_rebuild_swap():
+    swap_rebuilt_tables()
@@ -0,0 +1,19 @@
+from dagster import op
+
+from utils.change_log import prune_changes
+
+
+# once every package of the run has loaded, delete the change log entries all of them have read
+@op(required_resource_keys={"met_db_session", "met_etl_db_session"})
+def prune_change_log(context, flag_to_run_step_after_user, flag_to_run_step_after_engagement,
+                     flag_to_run_step_after_survey, flag_to_run_step_after_setting,
+                     flag_to_run_step_after_submission, flag_to_run_step_after_email_ver):
+    met_db_session = context.resources.met_db_session
+    met_etl_db_session = context.resources.met_etl_db_session
+
+    deleted = prune_changes(met_db_session, met_etl_db_session)
+
+    context.log.info(f"deleted {deleted} change log entries every package has read")
+
+    met_db_session.close()
+    met_etl_db_session.close()
@@ -1,12 +1,12 @@
 from dagster import Out, Output, op
-from sqlalchemy import func
 from datetime import datetime
 
 from met_api.models.comment import Comment as MetCommentModel
 from met_api.constants.comment_status import Status as CommentStatus
 from analytics_api.models.user_feedback import UserFeedback as UserFeedbackModel
 from analytics_api.models.survey import Survey as EtlSurveyModel
-from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from utils.batch_load import chunked, insert_rows, lookup
+from utils.run_cycle import end_package_run, start_package_run
 
 
 # get the last run cycle id for comments etl
@@ -16,22 +16,9 @@ def get_comments_last_run_cycle_time(context, flag_to_trigger_comments_etl):
     met_etl_db_session = context.resources.met_etl_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
 
-    comments_last_run_cycle_datetime = met_etl_db_session.query(
-        func.coalesce(func.max(EtlRunCycleModel.enddatetime), default_datetime)).filter(
-        EtlRunCycleModel.packagename == 'userfeedback', EtlRunCycleModel.success == True).first()
-
-    max_run_cycle_id = met_etl_db_session.query(func.coalesce(func.max(EtlRunCycleModel.id), 0)).first()
-
-    for last_run_cycle_time in comments_last_run_cycle_datetime:
-
-        for run_cycle_id in max_run_cycle_id:
-            new_run_cycle_id = run_cycle_id + 1
-            met_etl_db_session.add(
-                EtlRunCycleModel(id=new_run_cycle_id, packagename='userfeedback', startdatetime=datetime.utcnow(),
-                                 enddatetime=None, description='started the load for table user_feedback',
-                                 success=False))
-
-            met_etl_db_session.commit()
+    last_enddatetime, new_run_cycle_id = start_package_run(context, met_etl_db_session, 'userfeedback',
+                                                           'started the load for table user_feedback')
+    comments_last_run_cycle_datetime = (last_enddatetime or default_datetime,)
 
     met_etl_db_session.close()
 
@@ -71,27 +58,31 @@ def load_comments(context, new_comments, comments_new_run_cycle_id):
 
         context.log.info("loading new comments")
 
-        for comment in new_comments:
+        for comments in chunked(new_comments):
 
-            etl_survey_id = session.query(EtlSurveyModel.id).filter(EtlSurveyModel.source_survey_id == comment.survey_id,
-                                                                    EtlSurveyModel.is_active == True).scalar()
+            etl_surveys = lookup(session, EtlSurveyModel.source_survey_id,
+                                 [comment.survey_id for comment in comments],
+                                 filters=[EtlSurveyModel.is_active == True])
 
-            if etl_survey_id:
-                context.log.info('Survey id in Analytics DB: %s  for Comment: %s with source survey id:%s:', comment.id,
-                                 etl_survey_id, comment.survey_id)
+            user_feedback_rows = []
+            for comment in comments:
+                etl_survey = etl_surveys.get(comment.survey_id)
 
-                user_feedback_model = UserFeedbackModel(survey_id=etl_survey_id,
-                                                        user_id=comment.user_id,
-                                                        comment=comment.text,
-                                                        source_comment_id=comment.id,
-                                                        is_active=True,
-                                                        created_date=comment.submission_date,
-                                                        updated_date=None,
-                                                        runcycle_id=comments_new_run_cycle_id)
+                if etl_survey:
+                    context.log.debug('Survey id in Analytics DB: %s  for Comment: %s with source survey id:%s:',
+                                      etl_survey.id, comment.id, comment.survey_id)
 
-                session.add(user_feedback_model)
+                    user_feedback_rows.append(dict(survey_id=etl_survey.id,
+                                                   user_id=comment.user_id,
+                                                   comment=comment.text,
+                                                   source_comment_id=comment.id,
+                                                   is_active=True,
+                                                   created_date=comment.submission_date,
+                                                   updated_date=None,
+                                                   runcycle_id=comments_new_run_cycle_id))
 
-                session.commit()
+            insert_rows(session, UserFeedbackModel, user_feedback_rows)
+            session.commit()
 
     yield Output(comments_new_run_cycle_id, "comments_new_run_cycle_id")
 
@@ -105,15 +96,11 @@ def load_comments(context, new_comments, comments_new_run_cycle_id):
 def comments_end_run_cycle(context, comments_new_run_cycle_id):
     met_etl_db_session = context.resources.met_etl_db_session
 
-    met_etl_db_session.query(EtlRunCycleModel).filter(
-        EtlRunCycleModel.id == comments_new_run_cycle_id, EtlRunCycleModel.packagename == 'userfeedback',
-        EtlRunCycleModel.success == False).update(
-        {'success': True, 'enddatetime': datetime.utcnow(), 'description': 'ended the load for table user_feedback'})
+    end_package_run(met_etl_db_session, 'userfeedback', comments_new_run_cycle_id,
+                    'ended the load for table user_feedback')
 
     context.log.info("run cycle ended for comments table")
 
     yield Output("userfeedback", "flag_to_run_step_after_comments")
 
-    met_etl_db_session.commit()
-
     met_etl_db_session.close()
@@ -5,33 +5,23 @@ from met_api.models.engagement_settings import EngagementSettingsModel
 from met_api.models.engagement_status import EngagementStatus as EngagementStatusModel
 from met_api.models.widget_map import WidgetMap as MetWidgetMap
 from analytics_api.models.engagement import Engagement as EtlEngagementModel
-from sqlalchemy import func
 from datetime import datetime
-from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from utils.batch_load import chunked, deactivate, insert_rows, lookup, unique_by_id
+from utils.change_log import fetch_changed, read_changes
+from utils.op_metrics import op_metrics
+from utils.run_cycle import end_package_run, start_package_run
 
 
 # get the last run cycle id for engagement etl
 @op(required_resource_keys={"met_db_session", "met_etl_db_session"},
     out={"engagement_last_run_cycle_datetime": Out(), "engagement_new_run_cycle_id": Out()})
-def get_engagement_last_run_cycle_time(context, flag_to_run_step_after_user):
+def get_engagement_last_run_cycle_time(context):
     met_etl_db_session = context.resources.met_etl_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
 
-    engagement_last_run_cycle_datetime = met_etl_db_session.query(
-        func.coalesce(func.max(EtlRunCycleModel.enddatetime), default_datetime)).filter(
-        EtlRunCycleModel.packagename == 'engagement', EtlRunCycleModel.success == True).first()
-
-    max_run_cycle_id = met_etl_db_session.query(func.coalesce(func.max(EtlRunCycleModel.id), 0)).first()
-
-    for last_run_cycle_time in engagement_last_run_cycle_datetime:
-
-        for run_cycle_id in max_run_cycle_id:
-            new_run_cycle_id = run_cycle_id + 1
-            met_etl_db_session.add(
-                EtlRunCycleModel(id=new_run_cycle_id, packagename='engagement', startdatetime=datetime.utcnow(),
-                                 enddatetime=None, description='started the load for table engagement',
-                                 success=False))
-            met_etl_db_session.commit()
+    last_enddatetime, new_run_cycle_id = start_package_run(context, met_etl_db_session, 'engagement',
+                                                           'started the load for table engagement')
+    engagement_last_run_cycle_datetime = (last_enddatetime or default_datetime,)
 
     met_etl_db_session.close()
 
@@ -40,96 +30,120 @@ def get_engagement_last_run_cycle_time(context, flag_to_run_step_after_user):
     yield Output(new_run_cycle_id, "engagement_new_run_cycle_id")
 
 
-# extract the engagement that have been created or updated after the last run
+# extract the engagement that have been created, updated or deleted after the last run
 @op(required_resource_keys={"met_db_session", "met_etl_db_session"},
-    out={"new_engagements": Out(), "updated_engagements": Out(), "eng_new_runcycleid": Out()})
+    out={"new_engagements": Out(), "updated_engagements": Out(), "deleted_engagement_ids": Out(),
+         "eng_new_runcycleid": Out()})
 def extract_engagement(context, eng_last_run_cycle_time, eng_new_runcycleid):
     session = context.resources.met_db_session
+    met_etl_db_session = context.resources.met_etl_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
     new_engagements = []
     updated_engagements = []
+    deleted_engagement_ids = []
+
+    with op_metrics(context, 'engagement', eng_new_runcycleid) as metrics:
+        changes = read_changes(session, met_etl_db_session, 'engagement', 'engagement', eng_new_runcycleid)
+
+        if changes is not None:
+            context.log.info("started extracting changed data from engagement table")
+            changed_engagements, deleted_engagement_ids = fetch_changed(session, MetEngagementModel, *changes)
+            updated_engagements = [engagement for engagement in changed_engagements
+                                   if engagement.status_id != MetEngagementStatus.Draft.value]
+
+            context.log.info(len(updated_engagements))
+            context.log.info(len(deleted_engagement_ids))
+        else:
+            for last_run_cycle_time in eng_last_run_cycle_time:
+                context.log.info("started extracting new data from engagement table")
+                new_engagements = session.query(MetEngagementModel).filter(
+                    MetEngagementModel.created_date > last_run_cycle_time,
+                    MetEngagementModel.status_id != MetEngagementStatus.Draft.value).all()
 
-    for last_run_cycle_time in eng_last_run_cycle_time:
-        context.log.info("started extracting new data from engagement table")
-        new_engagements = session.query(MetEngagementModel).filter(
-            MetEngagementModel.created_date > last_run_cycle_time,
-            MetEngagementModel.status_id != MetEngagementStatus.Draft.value).all()
-        
-        context.log.info(last_run_cycle_time)	
-        context.log.info(len(new_engagements))
+                context.log.info(last_run_cycle_time)
+                context.log.info(len(new_engagements))
 
-        if last_run_cycle_time > default_datetime:
-            updated_engagements = session.query(MetEngagementModel).filter(
-				MetEngagementModel.updated_date > last_run_cycle_time,
-				MetEngagementModel.status_id != MetEngagementStatus.Draft.value).all()
+                if last_run_cycle_time > default_datetime:
+                    updated_engagements = session.query(MetEngagementModel).filter(
+                        MetEngagementModel.updated_date > last_run_cycle_time,
+                        MetEngagementModel.status_id != MetEngagementStatus.Draft.value).all()
 
-        context.log.info(len(updated_engagements))
+                context.log.info(len(updated_engagements))
+
+        metrics.rows_out = len(new_engagements) + len(updated_engagements) + len(deleted_engagement_ids)
 
     yield Output(new_engagements, "new_engagements")
 	
     yield Output(updated_engagements, "updated_engagements")
 
-    yield Output(eng_new_runcycleid, "eng_new_runcycleid")
+    yield Output(deleted_engagement_ids, "deleted_engagement_ids")
+
+    yield Output(eng_new_runcycleid, "eng_new_runcycleid", metadata=metrics.metadata)
 
     context.log.info("completed extracting data from engagement table")
 
     session.commit()
 
     session.close()
+    met_etl_db_session.close()
 
 
 # load the engagement created or updated after last run to the analytics database
 @op(required_resource_keys={"met_db_session", "met_etl_db_session"}, out={"engagement_new_runcycleid": Out()})
-def load_engagement(context, new_engagements, updated_engagements, engagement_new_runcycleid):
+def load_engagement(context, new_engagements, updated_engagements, deleted_engagement_ids, engagement_new_runcycleid):
     met_session = context.resources.met_db_session
     session = context.resources.met_etl_db_session
-    all_engagements = new_engagements + updated_engagements
-    if len(all_engagements) > 0:
-
-        context.log.info("loading new engagement")
-        for engagement in all_engagements:
-            session.query(EtlEngagementModel).filter(EtlEngagementModel.source_engagement_id == engagement.id).update(
-                {'is_active': False})
-            
-            # extract map data
-            latitude=None
-            longitude=None
-            geojson=None
-            marker_label=None
-            map_widget = met_session.query(MetWidgetMap).filter(
-                MetWidgetMap.engagement_id == engagement.id).order_by(MetWidgetMap.created_date.desc()).first()
-            if map_widget:
-                latitude=map_widget.latitude
-                longitude=map_widget.longitude
-                geojson=map_widget.geojson
-                marker_label=map_widget.marker_label
-
-            engagement_status = met_session.query(EngagementStatusModel).filter(
-                EngagementStatusModel.id == engagement.status_id).first()
-            
-            engagement_send_report = met_session.query(EngagementSettingsModel).filter(
-                EngagementSettingsModel.engagement_id == engagement.id).first()
-
-            engagement_model = EtlEngagementModel(name=engagement.name,
-                                                  source_engagement_id=engagement.id,
-                                                  start_date=engagement.start_date,
-                                                  end_date=engagement.end_date,
-                                                  is_active=True,
-                                                  published_date=engagement.published_date,
-                                                  runcycle_id=engagement_new_runcycleid,
-                                                  created_date=engagement.created_date,
-                                                  updated_date=engagement.updated_date,
-                                                  latitude=latitude,
-                                                  longitude=longitude,
-                                                  geojson=geojson,
-                                                  marker_label=marker_label,
-                                                  status_name=engagement_status.status_name,
-                                                  send_report=engagement_send_report.send_report
-                                                  )
-            session.add(engagement_model)
+    all_engagements = unique_by_id(new_engagements, updated_engagements)
+
+    with op_metrics(context, 'engagement', engagement_new_runcycleid) as metrics:
+        metrics.rows_in = len(all_engagements) + len(deleted_engagement_ids)
+
+        if len(deleted_engagement_ids) > 0:
+            context.log.info("deactivating deleted engagements")
+            deactivate(session, EtlEngagementModel.source_engagement_id, deleted_engagement_ids)
             session.commit()
 
-    yield Output(engagement_new_runcycleid, "engagement_new_runcycleid")
+        if len(all_engagements) > 0:
+
+            context.log.info("loading new engagement")
+            for engagements in chunked(all_engagements):
+                engagement_ids = [engagement.id for engagement in engagements]
+
+                # latest map widget, status and settings of every engagement in the chunk
+                map_widgets = lookup(met_session, MetWidgetMap.engagement_id, engagement_ids,
+                                     order_by=[MetWidgetMap.created_date.desc()])
+                engagement_statuses = lookup(met_session, EngagementStatusModel.id,
+                                             [engagement.status_id for engagement in engagements])
+                engagement_settings = lookup(met_session, EngagementSettingsModel.engagement_id, engagement_ids)
+
+                engagement_rows = []
+                for engagement in engagements:
+                    map_widget = map_widgets.get(engagement.id)
+                    engagement_rows.append(dict(name=engagement.name,
+                                                source_engagement_id=engagement.id,
+                                                start_date=engagement.start_date,
+                                                end_date=engagement.end_date,
+                                                is_active=True,
+                                                published_date=engagement.published_date,
+                                                runcycle_id=engagement_new_runcycleid,
+                                                created_date=engagement.created_date,
+                                                updated_date=engagement.updated_date,
+                                                latitude=getattr(map_widget, 'latitude', None),
+                                                longitude=getattr(map_widget, 'longitude', None),
+                                                geojson=getattr(map_widget, 'geojson', None),
+                                                marker_label=getattr(map_widget, 'marker_label', None),
+                                                status_name=engagement_statuses[engagement.status_id].status_name,
+                                                send_report=getattr(engagement_settings.get(engagement.id),
+                                                                    'send_report', None)
+                                                ))
+
+                deactivate(session, EtlEngagementModel.source_engagement_id, engagement_ids)
+                insert_rows(session, EtlEngagementModel, engagement_rows)
+                metrics.rows_out += len(engagement_rows)
+                session.commit()
+
+
+    yield Output(engagement_new_runcycleid, "engagement_new_runcycleid", metadata=metrics.metadata)
 
     context.log.info("completed loading engagement table")
 
@@ -142,15 +156,11 @@ def load_engagement(context, new_engagements, updated_engagements, engagement_ne
 def engagement_end_run_cycle(context, engagement_new_runcycleid):
     met_etl_db_session = context.resources.met_etl_db_session
 
-    met_etl_db_session.query(EtlRunCycleModel).filter(
-        EtlRunCycleModel.id == engagement_new_runcycleid, EtlRunCycleModel.packagename == 'engagement',
-        EtlRunCycleModel.success == False).update(
-        {'success': True, 'enddatetime': datetime.utcnow(), 'description': 'ended the load for table engagement'})
+    end_package_run(met_etl_db_session, 'engagement', engagement_new_runcycleid,
+                    'ended the load for table engagement')
 
     context.log.info("run cycle ended for Engagement table")
 
-    met_etl_db_session.commit()
-
     met_etl_db_session.close()
 
     yield Output("engagement", "flag_to_run_step_after_engagement")
@@ -0,0 +1,140 @@
+from dagster import Failure, Out, Output, op
+from datetime import datetime
+from sqlalchemy import delete, insert
+
+from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from met_api.models.submission import Submission as MetSubmissionModel
+from ops.submission_etl_service import build_response_rows, build_user_response_detail_row, lookup_surveys
+from resources.db import stream, transaction
+from utils.batch_load import chunked
+from utils.change_log import current_horizon
+from utils.op_metrics import op_metrics
+from utils.rebuild import (PARTITION_PACKAGE_NAME, PREPARE_PACKAGE_NAME, REBUILD_PARTITION_COUNT, SWAP_PACKAGE_NAME,
+                           EtlResponseTypeOptionModel, EtlUserResponseDetailModel, latest_rebuild,
+                           partition_package_name, prepare_staging, staging_table, swap_staging)
+from utils.run_cycle import lock_watermark, start_run_cycle
+
+
+# Rebuild the submission derived tables (responses and user response details) from scratch.
+# 1.Create empty staging copies of the tables.
+# 2.Load the submissions of each engagement bucket into them, one partition run per bucket. a failed bucket is
+#   run again on its own.
+# 3.Swap the staging tables in for the live ones in one transaction, once every bucket has been loaded.
+
+
+# create the empty staging tables and remember the change log horizon the rebuild started from
+@op(required_resource_keys={"met_db_session", "met_etl_db_session"}, out={"rebuild_runcycleid": Out()})
+def prepare_rebuild(context):
+    met_etl_db_session = context.resources.met_etl_db_session
+
+    run_cycle_id = start_run_cycle(met_etl_db_session, PREPARE_PACKAGE_NAME,
+                                   'started preparing the staging tables for a rebuild')
+
+    # every submission change below the horizon is in what the partitions read. the changes after it are
+    # replayed by the submission load once the rebuilt tables are swapped in.
+    horizon = current_horizon(context.resources.met_db_session)
+
+    with transaction(met_etl_db_session):
+        prepare_staging(met_etl_db_session)
+        met_etl_db_session.query(EtlRunCycleModel).filter(EtlRunCycleModel.id == run_cycle_id).update(
+            {'success': True, 'enddatetime': datetime.utcnow(), 'change_log_horizon': horizon,
+             'description': f'prepared the staging tables for a rebuild of {REBUILD_PARTITION_COUNT} partitions'})
+
+    context.log.info("staging tables are ready for the rebuild")
+
+    yield Output(run_cycle_id, "rebuild_runcycleid")
+
+
+# load the submissions of the run's engagement bucket into the staging tables. rows a failed earlier attempt of
+# the same bucket left behind are replaced chunk by chunk, so retrying a bucket is always safe.
+@op(required_resource_keys={"met_db_session", "met_etl_db_session"}, out={"rebuild_runcycleid": Out()})
+def rebuild_submission_partition(context):
+    metsession = context.resources.met_db_session
+    met_etl_session = context.resources.met_etl_db_session
+    partition = int(context.partition_key)
+
+    run_cycle_id = start_run_cycle(met_etl_session, partition_package_name(partition),
+                                   f'started the rebuild of partition {partition} of {REBUILD_PARTITION_COUNT}')
+
+    response_table = staging_table(EtlResponseTypeOptionModel)
+    user_response_detail_table = staging_table(EtlUserResponseDetailModel)
+    extractors = {}
+
+    with op_metrics(context, PARTITION_PACKAGE_NAME, run_cycle_id) as metrics:
+        submissions = stream(metsession.query(MetSubmissionModel).filter(
+            MetSubmissionModel.engagement_id % REBUILD_PARTITION_COUNT == partition).order_by(MetSubmissionModel.id))
+
+        for submissions_chunk in chunked(submissions):
+            metrics.rows_in += len(submissions_chunk)
+            submission_ids = [submission.id for submission in submissions_chunk]
+            met_surveys, etl_surveys = lookup_surveys(metsession, met_etl_session, submissions_chunk)
+
+            response_rows = []
+            user_response_detail_rows = []
+            for submission in submissions_chunk:
+                met_survey = met_surveys.get(submission.survey_id)
+                etl_survey = etl_surveys.get(submission.survey_id)
+                if not etl_survey or not met_survey:
+                    continue
+
+                response_rows.extend(build_response_rows(extractors, submission, met_survey, etl_survey,
+                                                         run_cycle_id))
+                user_response_detail_rows.append(build_user_response_detail_row(submission, met_survey, etl_survey,
+                                                                                run_cycle_id))
+
+            with transaction(met_etl_session):
+                for table, rows in ((response_table, response_rows),
+                                    (user_response_detail_table, user_response_detail_rows)):
+                    met_etl_session.execute(delete(table).where(table.c.source_submission_id.in_(submission_ids)))
+                    if rows:
+                        met_etl_session.execute(insert(table), rows)
+
+            metrics.rows_out += len(response_rows) + len(user_response_detail_rows)
+
+        met_etl_session.query(EtlRunCycleModel).filter(EtlRunCycleModel.id == run_cycle_id).update(
+            {'success': True, 'enddatetime': datetime.utcnow(),
+             'description': f'rebuilt partition {partition} of {REBUILD_PARTITION_COUNT}'})
+        met_etl_session.commit()
+
+    context.log.info(f"partition {partition}: loaded {metrics.rows_out} rows from {metrics.rows_in} submissions")
+
+    yield Output(run_cycle_id, "rebuild_runcycleid", metadata=metrics.metadata)
+
+
+# swap the staging tables in once every partition of the latest prepared rebuild has been loaded
+@op(required_resource_keys={"met_etl_db_session"})
+def swap_rebuilt_tables(context):
+    met_etl_db_session = context.resources.met_etl_db_session
+
+    prepared, swapped = latest_rebuild(met_etl_db_session)
+    if prepared is None:
+        raise Failure(description="no rebuild has been prepared, run met_data_rebuild_prepare first")
+    if swapped:
+        raise Failure(description="the latest rebuild has already been swapped in, prepare a new one first")
+
+    package_names = {partition_package_name(partition): partition for partition in range(REBUILD_PARTITION_COUNT)}
+    rebuilt = {packagename for (packagename,) in met_etl_db_session.query(EtlRunCycleModel.packagename).filter(
+        EtlRunCycleModel.packagename.in_(package_names), EtlRunCycleModel.success == True,
+        EtlRunCycleModel.id > prepared.id)}
+    missing = [partition for packagename, partition in package_names.items() if packagename not in rebuilt]
+    if missing:
+        raise Failure(description=f"partitions {missing} of the rebuild haven't been loaded yet")
+
+    run_cycle_id = start_run_cycle(met_etl_db_session, SWAP_PACKAGE_NAME,
+                                   f'started swapping in the rebuild prepared by run cycle {prepared.id}')
+
+    with transaction(met_etl_db_session):
+        swap_staging(met_etl_db_session)
+
+        # make the next submission load replay every change since the rebuild started, so the submissions
+        # loaded to the old tables in the meantime aren't lost
+        watermark = lock_watermark(met_etl_db_session, 'submission')
+        if watermark.change_log_horizon is not None and prepared.change_log_horizon is not None:
+            watermark.change_log_horizon = min(watermark.change_log_horizon, prepared.change_log_horizon)
+
+        # the successful swap run cycle marks the prepared rebuild as used, it can only be swapped in once
+        met_etl_db_session.query(EtlRunCycleModel).filter(EtlRunCycleModel.id == run_cycle_id).update(
+            {'success': True, 'enddatetime': datetime.utcnow(),
+             'description': f'swapped in the rebuild prepared by run cycle {prepared.id}'})
+
+    context.log.info("rebuilt tables are live")
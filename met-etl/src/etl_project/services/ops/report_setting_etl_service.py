@@ -1,8 +1,9 @@
 from dagster import Out, Output, op
-from sqlalchemy import func
 from datetime import datetime
 
-from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from utils.change_log import fetch_changed, read_changes
+from utils.op_metrics import op_metrics
+from utils.run_cycle import end_package_run, start_package_run
 from analytics_api.models.request_type_option import RequestTypeOption as EtlRequestTypeOptionModel
 from analytics_api.models.survey import Survey as EtlSurveyModel
 from met_api.models.report_setting import ReportSetting as MetReportSettingModel
@@ -15,22 +16,9 @@ def get_setting_last_run_cycle_time(context, flag_to_run_step_after_survey):
     met_etl_db_session = context.resources.met_etl_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
 
-    setting_last_run_cycle_datetime = met_etl_db_session.query(
-        func.coalesce(func.max(EtlRunCycleModel.enddatetime), default_datetime)).filter(
-        EtlRunCycleModel.packagename == 'report_setting', EtlRunCycleModel.success == True).first()
-
-    max_run_cycle_id = met_etl_db_session.query(func.coalesce(func.max(EtlRunCycleModel.id), 0)).first()
-
-    for last_run_cycle_time in setting_last_run_cycle_datetime:
-
-        for run_cycle_id in max_run_cycle_id:
-            new_run_cycle_id = run_cycle_id + 1
-            met_etl_db_session.add(
-                EtlRunCycleModel(id=new_run_cycle_id, packagename='report_setting',
-                                 startdatetime=datetime.utcnow(),
-                                 enddatetime=None, description='started the load for table report_setting',
-                                 success=False))
-            met_etl_db_session.commit()
+    last_enddatetime, new_run_cycle_id = start_package_run(context, met_etl_db_session, 'report_setting',
+                                                           'started the load for table report_setting')
+    setting_last_run_cycle_datetime = (last_enddatetime or default_datetime,)
 
     met_etl_db_session.close()
 
@@ -44,32 +32,44 @@ def get_setting_last_run_cycle_time(context, flag_to_run_step_after_survey):
     out={"new_setting": Out(), "updated_setting": Out(), "setting_new_runcycleid": Out()})
 def extract_setting(context, setting_last_run_cycle_time, setting_new_runcycleid):
     session = context.resources.met_db_session
+    met_etl_db_session = context.resources.met_etl_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
     new_setting = []
     updated_setting = []
 
-    for last_run_cycle_time in setting_last_run_cycle_time:
-        context.log.info("started extracting new data from report setting table")
-        new_setting = session.query(MetReportSettingModel).filter(
-            MetReportSettingModel.created_date > last_run_cycle_time).all()
+    with op_metrics(context, 'report_setting', setting_new_runcycleid) as metrics:
+        changes = read_changes(session, met_etl_db_session, 'report_setting', 'report_setting', setting_new_runcycleid)
+
+        if changes is not None:
+            # a removed setting goes with its question, which the survey load already deactivates
+            context.log.info("started extracting changed data from report setting table")
+            updated_setting, _ = fetch_changed(session, MetReportSettingModel, *changes)
+        else:
+            for last_run_cycle_time in setting_last_run_cycle_time:
+                context.log.info("started extracting new data from report setting table")
+                new_setting = session.query(MetReportSettingModel).filter(
+                    MetReportSettingModel.created_date > last_run_cycle_time).all()
+
+                if last_run_cycle_time > default_datetime:
+                    context.log.info("started extracting updated data from report setting table")
+                    updated_setting = session.query(MetReportSettingModel).filter(
+                        MetReportSettingModel.updated_date > last_run_cycle_time,
+                        MetReportSettingModel.updated_date != MetReportSettingModel.created_date).all()
 
-        if last_run_cycle_time > default_datetime:
-            context.log.info("started extracting updated data from report setting table")
-            updated_setting = session.query(MetReportSettingModel).filter(
-				MetReportSettingModel.updated_date > last_run_cycle_time,
-                MetReportSettingModel.updated_date != MetReportSettingModel.created_date).all()
+        metrics.rows_out = len(new_setting) + len(updated_setting)
 
     yield Output(new_setting, "new_setting")
 	
     yield Output(updated_setting, "updated_setting")
 
-    yield Output(setting_new_runcycleid, "setting_new_runcycleid")
+    yield Output(setting_new_runcycleid, "setting_new_runcycleid", metadata=metrics.metadata)
 
     context.log.info("completed extracting data from report setting table")
 
     session.commit()
 
     session.close()
+    met_etl_db_session.close()
 
 
 # load the report setting created or updated after last run to the analytics database
@@ -77,23 +77,28 @@ def extract_setting(context, setting_last_run_cycle_time, setting_new_runcycleid
 def load_setting(context, new_setting, updated_setting, setting_new_runcycleid):
     met_etl_db_session = context.resources.met_etl_db_session
     all_settings = new_setting + updated_setting
-    if len(all_settings) > 0:
-
-        context.log.info("loading new inputs")
-        for setting in all_settings:
-            # get the survey id from analytics database based on the source system survey id
-            analytics_survey_data= met_etl_db_session.query(EtlSurveyModel)\
-            .filter(EtlSurveyModel.source_survey_id == setting.survey_id,
-                    EtlSurveyModel.is_active == True).first()
+    with op_metrics(context, 'report_setting', setting_new_runcycleid) as metrics:
+        metrics.rows_in = len(all_settings)
+
+        if len(all_settings) > 0:
+
+            context.log.info("loading new inputs")
+            for setting in all_settings:
+                # get the survey id from analytics database based on the source system survey id
+                analytics_survey_data= met_etl_db_session.query(EtlSurveyModel)\
+                .filter(EtlSurveyModel.source_survey_id == setting.survey_id,
+                        EtlSurveyModel.is_active == True).first()
             
-            # update the display flag for the report setting question key and survey id fetched above
-            met_etl_db_session.query(EtlRequestTypeOptionModel)\
-            .filter(EtlRequestTypeOptionModel.key == setting.question_key,
-                    EtlRequestTypeOptionModel.survey_id == analytics_survey_data.id,
-                    EtlRequestTypeOptionModel.is_active == True).update({'display': setting.display})
-            met_etl_db_session.commit()
+                # update the display flag for the report setting question key and survey id fetched above
+                met_etl_db_session.query(EtlRequestTypeOptionModel)\
+                .filter(EtlRequestTypeOptionModel.key == setting.question_key,
+                        EtlRequestTypeOptionModel.survey_id == analytics_survey_data.id,
+                        EtlRequestTypeOptionModel.is_active == True).update({'display': setting.display})
+                met_etl_db_session.commit()
 
-    yield Output(setting_new_runcycleid, "setting_new_runcycleid")
+        metrics.rows_out = len(all_settings)
+
+    yield Output(setting_new_runcycleid, "setting_new_runcycleid", metadata=metrics.metadata)
 
     context.log.info("completed loading report setting table")
 
@@ -105,15 +110,11 @@ def load_setting(context, new_setting, updated_setting, setting_new_runcycleid):
 def setting_end_run_cycle(context, setting_new_runcycleid):
     met_etl_db_session = context.resources.met_etl_db_session
 
-    met_etl_db_session.query(EtlRunCycleModel).filter(
-        EtlRunCycleModel.id == setting_new_runcycleid, EtlRunCycleModel.packagename == 'report_setting',
-        EtlRunCycleModel.success == False).update(
-        {'success': True, 'enddatetime': datetime.utcnow(), 'description': 'ended the load for table report_setting'})
+    end_package_run(met_etl_db_session, 'report_setting', setting_new_runcycleid,
+                    'ended the load for table report_setting')
 
     context.log.info("run cycle ended for report setting table")
 
-    met_etl_db_session.commit()
-
     met_etl_db_session.close()
 
     yield Output("report_setting", "flag_to_run_step_after_setting")
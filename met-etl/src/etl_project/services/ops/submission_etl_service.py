@@ -2,48 +2,34 @@ from dagster import Out, Output, op
 from sqlalchemy import func
 from datetime import datetime
 
-from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from utils.batch_load import chunked, deactivate, lookup, unique_by_id, upsert_rows
+from utils.change_log import fetch_changed, read_changes
+from utils.response_extractor import compile_extractor, extract_responses
+from utils.op_metrics import op_metrics
+from utils.run_cycle import end_package_run, start_package_run
 from met_api.models.submission import Submission as MetSubmissionModel
 from met_api.models.survey import Survey as MetSurveyModel
-from met_api.models.participant import Participant as MetParticipantModel
 from analytics_api.models.response_type_option import ResponseTypeOption as EtlResponseTypeOptionModel
 from analytics_api.models.user_response_detail import UserResponseDetail as EtlUserResponseDetailModel
 from analytics_api.models.survey import Survey as EtlSurveyModel
-from analytics_api.utils.util import FormIoComponentType
 
 
 # Perform the ETL on submissions.
 # 1.Extract data out of submission.
-# 2.Iterate form_json.components.
-# 3.Check Type and save to db
+# 2.Compile the questions in form_json.components once per survey.
+# 3.Flatten each submission's answers with it and save to db in batches
 
 # get the last run cycle id for submission etl
 @op(required_resource_keys={"met_db_session", "met_etl_db_session"},
     out={"submission_last_run_cycle_time": Out(), "submission_new_runcycleid": Out()})
-def get_submission_last_run_cycle_time(context, flag_to_run_step_after_setting):
+def get_submission_last_run_cycle_time(context, flag_to_run_step_after_survey):
     met_etl_db_session = context.resources.met_etl_db_session
     # default date to load the whole data on first run
     default_datetime = datetime(2022, 8, 1, 0, 0, 0, 0)
 
-    submission_last_run_cycle_time = met_etl_db_session.query(
-        func.coalesce(func.max(EtlRunCycleModel.enddatetime), default_datetime)).filter(
-        EtlRunCycleModel.packagename == 'submission', EtlRunCycleModel.success == True).first()
-
-    # get the latest record id from the run cycle table, in case of first run its considered as zero
-    max_run_cycle_id = met_etl_db_session.query(func.coalesce(func.max(EtlRunCycleModel.id), 0)).first()
-
-    for last_run_cycle_time in submission_last_run_cycle_time:
-
-        for run_cycle_id in max_run_cycle_id:
-            # insert the current run cycle details to the table with the success status as false. 
-            # This will be set to true once the job completes
-            new_run_cycle_id = run_cycle_id + 1
-            met_etl_db_session.add(
-                EtlRunCycleModel(id=new_run_cycle_id, packagename='submission', startdatetime=datetime.utcnow(),
-                                 enddatetime=None,
-                                 description='started the load for tables user response detail and responses',
-                                 success=False))
-            met_etl_db_session.commit()
+    last_enddatetime, new_run_cycle_id = start_package_run(
+        context, met_etl_db_session, 'submission', 'started the load for tables user response detail and responses')
+    submission_last_run_cycle_time = (last_enddatetime or default_datetime,)
 
     met_etl_db_session.close()
 
@@ -52,369 +38,220 @@ def get_submission_last_run_cycle_time(context, flag_to_run_step_after_setting):
     yield Output(new_run_cycle_id, "submission_new_runcycleid")
 
 
-# extract the submissions that have been created or updated after the last run
+# extract the submissions that have been created, updated or deleted after the last run
 @op(required_resource_keys={"met_db_session", "met_etl_db_session"},
-    out={"new_submission": Out(), "updated_submission": Out(), "submission_new_runcycleid": Out()})
+    out={"new_submission": Out(), "updated_submission": Out(), "deleted_submission_ids": Out(),
+         "submission_new_runcycleid": Out()})
 def extract_submission(context, submission_last_run_cycle_time, submission_new_runcycleid):
     session = context.resources.met_db_session
-    default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
+    met_etl_db_session = context.resources.met_etl_db_session
     new_submission = []
     updated_submission = []
+    deleted_submission_ids = []
 
-    for last_run_cycle_time in submission_last_run_cycle_time:
+    with op_metrics(context, 'submission', submission_new_runcycleid) as metrics:
+        changes = read_changes(session, met_etl_db_session, 'submission', 'submission', submission_new_runcycleid)
 
-        context.log.info("started extracting new data from submission table")
-        new_submission = session.query(MetSubmissionModel).filter(
-            MetSubmissionModel.created_date > last_run_cycle_time).all()
+        if changes is not None:
+            # edits, resubmissions and review status changes are reloaded, replacing the rows loaded before
+            context.log.info("started extracting changed data from submission table")
+            updated_submission, deleted_submission_ids = fetch_changed(session, MetSubmissionModel, *changes)
+        else:
+            for last_run_cycle_time in submission_last_run_cycle_time:
 
-# commenting out the logic for updated submission, this is not needed as of now
-#       if last_run_cycle_time > default_datetime:
-#           context.log.info("started extracting updated data from submission table")
-#           updated_submission = session.query(MetSubmissionModel).filter(MetSubmissionModel.updated_date >
-#                                                                         last_run_cycle_time,
-#                                                                         MetSubmissionModel.updated_date != MetSubmissionModel.created_date).all()
+                context.log.info("started extracting new data from submission table")
+                new_submission = session.query(MetSubmissionModel).filter(
+                    MetSubmissionModel.created_date > last_run_cycle_time).all()
+
+        metrics.rows_out = len(new_submission) + len(updated_submission) + len(deleted_submission_ids)
 
     yield Output(new_submission, "new_submission")
 
     yield Output(updated_submission, "updated_submission")
 
-    yield Output(submission_new_runcycleid, "submission_new_runcycleid")
+    yield Output(deleted_submission_ids, "deleted_submission_ids")
+
+    yield Output(submission_new_runcycleid, "submission_new_runcycleid", metadata=metrics.metadata)
 
     context.log.info("completed extracting data from submission table")
 
     session.commit()
 
     session.close()
+    met_etl_db_session.close()
 
 
 # load the sumissions created or updated after last run to the analytics database
 @op(required_resource_keys={"met_db_session", "met_etl_db_session"}, out={"submission_new_runcycleid": Out()})
-def load_submission(context, new_submission, updated_submission, submission_new_runcycleid):
-    all_submissions = new_submission + updated_submission
+def load_submission(context, new_submission, updated_submission, deleted_submission_ids, submission_new_runcycleid):
+    all_submissions = unique_by_id(new_submission, updated_submission)
     metsession = context.resources.met_db_session
     met_etl_session = context.resources.met_etl_db_session
-    # check if there are any new or updated records
-    if len(all_submissions) > 0:
-
-        context.log.info("loading new submissions")
-        # go thru each submission.
-        for submission in all_submissions:
-
-            met_survey = metsession.query(MetSurveyModel).filter(MetSurveyModel.id == submission.survey_id).first()
-            etl_survey = met_etl_session.query(EtlSurveyModel).filter(
-                EtlSurveyModel.source_survey_id == submission.survey_id,
-                EtlSurveyModel.is_active == True).first()
-
-            context.log.info(
-                '<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<Extraction starting for Submission id %s . Survey : %s.',
-                submission.id, met_survey.id)
-
-            if not etl_survey or not met_survey:
-                context.log.info(
-                    '<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<Skipping Extraction  for Submission id %s . Survey Not Found in Analytics DB : %s.Probably a very old survey',
-                    submission.id,
-                    met_survey.id)
-                continue
-
-            form_type = met_survey.form_json.get('display', None)
-
-            # check and load data for single page survey.
-            if form_type == 'form':
-                form_questions = met_survey.form_json.get('components', None)
-                _extract_submission(form_questions, met_survey, metsession, submission, met_etl_session, context,
-                                    submission_new_runcycleid, etl_survey)
-
-            # check and load data for multi page survey.
-            if form_type == 'wizard':
-                pages = met_survey.form_json.get('components', None)
-                for page in pages:
-                    form_questions = page.get('components', None)
-                    _extract_submission(form_questions, met_survey, metsession, submission, met_etl_session, context,
-                                        submission_new_runcycleid, etl_survey)
-
-    metsession.close()
-
-    met_etl_session.close()
-
-    yield Output(submission_new_runcycleid, "submission_new_runcycleid")
-
-
-# load data to table response_type_textarea
-def _extract_submission(form_questions, met_survey, metsession, submission, met_etl_session, context,
-                        submission_new_runcycleid, etl_survey):
-            if (form_questions) is None:
-                # throw error or notify by logging
-                context.log.info(
-                    'Survey Found without any component in form_json: %s.Skipping it',
-                    met_survey.id)
-                return
-
-            user = metsession.query(MetParticipantModel).filter(MetParticipantModel.id == submission.participant_id).first()
-
-            context.log.info('User : %s Found for submission id : %s with mappedd user id %s', user,
-                             submission.id, submission.participant_id)
-
-            for component in form_questions:
-                # go thru each component type and check for answer in the submission_json.
-                # instead of going through each answer and iterate , we find the questions from the form and try to get the answer.
-                answer_key = submission.submission_json.get(component['key'])
-
-                # skip if answer is not present or no option was selected (eg. in radio buttons or dropdown)
-                if answer_key is None or answer_key == '':
-                    continue
-
-                # TODO comments related to category type question has a different format in the source system
-                # TODO the key needs to be finalized in the source system before doing a fix on the ETL.
-                # for now excluding the comment for a category type question as we are not using this data for analytics.
-                if component['key'] == 'categorycommentcontainer':
-                    continue
 
-                component_type = component['type'].lower()
-                context.log.info('Type for submission id : %s. is %s ', submission.id, component_type)
-
-                if component_type == FormIoComponentType.RADIO.value:
-                    _save_radio(met_etl_session, context, answer_key, component, etl_survey, user, submission,
-                                submission_new_runcycleid)
-                elif component_type == FormIoComponentType.CHECKBOX.value:
-                    _save_checkbox(met_etl_session, context, answer_key, component, etl_survey, user, submission,
-                                   submission_new_runcycleid)
-                elif component_type == FormIoComponentType.SELECTLIST.value:
-                    _save_select(met_etl_session, context, answer_key, component, etl_survey, user, submission,
-                                   submission_new_runcycleid)
-                elif component_type == FormIoComponentType.SURVEY.value:
-                    _save_survey(met_etl_session, context, answer_key, component, etl_survey, user, submission,
-                                   submission_new_runcycleid)
-                elif component_type == FormIoComponentType.RANKING.value:
-                    _save_ranking(met_etl_session, context, answer_key, component, etl_survey, user, submission,
-                                   submission_new_runcycleid)
-                else:
-                    context.log.info('No Mapping Found for .Type for submission id : %s. is %s .Skipping',
-                                     submission.id, component_type)
-                context.log.info(
-                    '>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>Extraction Done for Submission id %s . Survey : %s.',
-                    submission.id, met_survey.id)
-
-                met_etl_session.commit()
+    with op_metrics(context, 'submission', submission_new_runcycleid) as metrics:
+        metrics.rows_in = len(all_submissions) + len(deleted_submission_ids)
 
+        # responses loaded earlier for a changed or deleted submission are replaced or dropped
+        stale_submission_ids = [submission.id for submission in updated_submission] + list(deleted_submission_ids)
+        if len(stale_submission_ids) > 0:
+            deactivate(met_etl_session, EtlResponseTypeOptionModel.source_submission_id, stale_submission_ids)
+            met_etl_session.commit()
 
-# load responses for a radio type question
-def _save_radio(met_etl_session, context, answer_key, component, survey, participant, submission, submission_new_runcycleid):
-    # radio responses just has the key to the value selected, so value has to be found from question
-    context.log.info('Input type Radio is created:survey id: %s. request_key is %s ',
-                     survey.id, component['key'])
-    answer_key_str = str(answer_key)
-    answer = next((x for x in component.get('values') if x.get('value') == answer_key_str), None)
+        # check if there are any new or updated records
+        if len(all_submissions) > 0:
 
-    if not answer:
-        return
+            context.log.info("loading new submissions")
+            # one compiled extractor per survey version, shared by all of its submissions
+            extractors = {}
 
-    answer_value = answer.get('label')
-    context.log.info('Input type Radio is created:survey id: %s. request_key is %s value:%s request_id:%s',
-                     survey.id, component['key'], answer_value, component['id'])
+            for submissions in chunked(all_submissions):
+                met_surveys, etl_surveys = lookup_surveys(metsession, met_etl_session, submissions)
 
-    _save_options(met_etl_session, survey, component, answer_value, getattr(participant, 'id', None),
-                  submission_new_runcycleid, submission)
+                response_rows = []
+                skipped_submissions = 0
+                for submission in submissions:
+                    met_survey = met_surveys.get(submission.survey_id)
+                    etl_survey = etl_surveys.get(submission.survey_id)
 
+                    if not etl_survey or not met_survey:
+                        context.log.debug('Skipping Extraction for Submission id %s . Survey Not Found in Analytics DB : %s.'
+                                          'Probably a very old survey', submission.id, submission.survey_id)
+                        skipped_submissions += 1
+                        continue
 
-# load responses for a checkbox type question
-def _save_checkbox(met_etl_session, context, answer_key, component, survey, participant, submission, submission_new_runcycleid):
-    # checkbox responses just has the key to the value selected, so value has to be found from question
-    context.log.info('Input type Selectbox is created:survey id: %s. request_key is %s  Answer Key %s',
-                     survey.id, component['key'], answer_key)
+                    response_rows.extend(build_response_rows(extractors, submission, met_survey, etl_survey,
+                                                             submission_new_runcycleid))
 
-    selectbox_mapping = {}
+                upsert_responses(met_etl_session, response_rows)
+                metrics.rows_out += len(response_rows)
+                met_etl_session.commit()
 
-    if component.get('values') is not None:
-        for item in component.get('values'):
-            selectbox_mapping[item.get('value')] = item.get('label')
+                context.log.info('Loaded %s responses from %s submissions, skipped %s submissions without a survey',
+                                 len(response_rows), len(submissions) - skipped_submissions, skipped_submissions)
 
-    if answer_key is not None:
-        for key, value in answer_key.items():
-            # each answer is a row for simplecheckboxes. It belongs to answer in a multiple checkbox
-            is_yes = _is_truthy(value)
+        metsession.close()
 
-            if is_yes:
-                # need to find the label of the drop down.
-                answer_label = selectbox_mapping.get(key)
+        met_etl_session.close()
 
-                context.log.info('Input type Selectbox is created:survey id: %s. '
-                                 'request_key is %s value:%s request_id:%s', survey.id, component['key'],
-                                 answer_label,
-                                 component['id'])
 
-                _save_options(met_etl_session, survey, component, answer_label, getattr(participant, 'id', None),
-                              submission_new_runcycleid, submission)
+    yield Output(submission_new_runcycleid, "submission_new_runcycleid", metadata=metrics.metadata)
 
 
-# load responses for a select type question
-def _save_select(met_etl_session, context, answer_key, component, survey, participant, submission, submission_new_runcycleid):
-    # selected responses just has the key to the value selected, so value has to be found from question
-    context.log.info('Input type Select is created:survey id: %s. request_key is %s ',
-                     survey.id, component['key'])
-    answer_key_str = str(answer_key)
-    component_data = component.get('data')
-    answer = next((x for x in component_data.get('values') if x.get('value') == answer_key_str), None)
+# the met survey and the active analytics survey of every submission in the chunk, by source survey id
+def lookup_surveys(metsession, met_etl_session, submissions):
+    survey_ids = [submission.survey_id for submission in submissions]
+    met_surveys = lookup(metsession, MetSurveyModel.id, survey_ids)
+    etl_surveys = lookup(met_etl_session, EtlSurveyModel.source_survey_id, survey_ids,
+                         filters=[EtlSurveyModel.is_active == True])
+    return met_surveys, etl_surveys
 
-    if not answer:
-        return
 
-    answer_value = answer.get('label')
-    context.log.info('Input type Select is created:survey id: %s. request_key is %s value:%s request_id:%s',
-                     survey.id, component['key'], answer_value, component['id'])
+# the response_type_option rows of one submission. extractors caches the compiled extractor of each survey
+# version, so it's compiled once and shared by all of its submissions.
+def build_response_rows(extractors, submission, met_survey, etl_survey, run_cycle_id):
+    survey_version = (met_survey.id, met_survey.updated_date)
+    if survey_version not in extractors:
+        extractors[survey_version] = compile_extractor(met_survey.form_json)
 
-    _save_options(met_etl_session, survey, component, answer_value, getattr(participant, 'id', None),
-                  submission_new_runcycleid, submission)
+    # two options of a question with the same label flatten to the same answer, it's loaded once. the unique
+    # index compares coalesce(value, ''), so an option without a label and one with a blank label are one answer
+    # too; upserting both in a statement would make postgres reject the whole chunk.
+    responses = {}
+    for request_key, value, request_id in extract_responses(extractors[survey_version], submission.submission_json):
+        responses.setdefault((request_key, '' if value is None else value), (value, request_id))
 
+    return [dict(survey_id=etl_survey.id,
+                 request_key=request_key,
+                 value=value,
+                 request_id=request_id,
+                 participant_id=submission.participant_id,
+                 source_submission_id=submission.id,
+                 is_active=True,
+                 runcycle_id=run_cycle_id,
+                 created_date=submission.created_date,
+                 updated_date=submission.updated_date)
+            for (request_key, _), (value, request_id) in responses.items()]
 
-# load responses for a survey type question
-def _save_survey(met_etl_session, context, answer_key, component, survey, participant, submission, submission_new_runcycleid):
-    # selected survey just has the key to the value selected, so value has to be found from question
-    context.log.info('Input type Survey is created:survey id: %s. request_key is %s ',
-                     survey.id, component['key'])
 
-    survey_mapping = {}
+# rows already loaded for the same submission answer (or submission) by a run that failed part way are updated
+# in place rather than duplicated, see the unique keys on the analytics models
+def upsert_responses(session, response_rows):
+    upsert_rows(session, EtlResponseTypeOptionModel, response_rows,
+                index_elements=[EtlResponseTypeOptionModel.source_submission_id,
+                                EtlResponseTypeOptionModel.request_key,
+                                func.md5(func.coalesce(EtlResponseTypeOptionModel.value, ''))],
+                index_where=EtlResponseTypeOptionModel.is_active,
+                update_columns=['survey_id', 'request_id', 'participant_id', 'runcycle_id', 'created_date',
+                                'updated_date'])
 
-    if component.get('values') is not None:
-        for item in component.get('values'):
-            survey_mapping[item.get('value')] = item.get('label')
 
-    if answer_key is not None:
-        for key, value in answer_key.items():
-            answer_label = survey_mapping.get(value)
+def upsert_user_response_details(session, user_response_detail_rows):
+    upsert_rows(session, EtlUserResponseDetailModel, user_response_detail_rows,
+                index_elements=[EtlUserResponseDetailModel.source_submission_id],
+                index_where=EtlUserResponseDetailModel.is_active,
+                update_columns=['survey_id', 'engagement_id', 'participant_id', 'runcycle_id', 'created_date',
+                                'updated_date'])
 
-            context.log.info('Input type Survey is created:survey id: %s. '
-                             'request_key is %s value:%s request_id:%s', survey.id, component['key'],
-                             answer_label, component['id'])
 
-            # id for survey type question is same for all sub questions so request id is a combination of 
-            # id and the key
-            radio_response = EtlResponseTypeOptionModel(
-                survey_id=survey.id,
-                request_key=component['key']+'-'+key,
-                value=answer_label,
-                request_id=component['id']+'-'+key,
-                participant_id=getattr(participant, 'id', None),
+# the user_response_detail row of one submission
+def build_user_response_detail_row(submission, met_survey, etl_survey, run_cycle_id):
+    return dict(survey_id=etl_survey.id,
+                engagement_id=met_survey.engagement_id,
+                participant_id=submission.participant_id,
+                source_submission_id=submission.id,
                 is_active=True,
-                runcycle_id=submission_new_runcycleid,
+                runcycle_id=run_cycle_id,
                 created_date=submission.created_date,
-                updated_date=submission.updated_date
-            )
-
-            met_etl_session.add(radio_response)
-
-
-# load responses for a ranking type question
-def _save_ranking(met_etl_session, context, answer_key, component, survey, participant, submission, submission_new_runcycleid):
-    """Save ranking responses.
-    
-    answer_key is an array of objects: [{statementId, statement, rank}, ...]
-    Each item represents a statement and the rank assigned by the user.
-    """
-    context.log.info('Input type Ranking is created:survey id: %s. request_key is %s ',
-                     survey.id, component['key'])
-
-    if answer_key is None or not isinstance(answer_key, list):
-        return
-
-    for item in answer_key:
-        statement_id = str(item.get('statementId', ''))
-        rank = item.get('rank')
-        
-        if not statement_id or rank is None or rank == '':
-            continue
-        
-        context.log.info('Input type Ranking is created:survey id: %s. '
-                         'request_key is %s value:%s request_id:%s', survey.id, 
-                         component['key'] + '-' + statement_id,
-                         str(rank), component['id'] + '-' + statement_id)
-
-        ranking_response = EtlResponseTypeOptionModel(
-            survey_id=survey.id,
-            request_key=component['key'] + '-' + statement_id,
-            value=str(rank),
-            request_id=component['id'] + '-' + statement_id,
-            participant_id=getattr(participant, 'id', None),
-            is_active=True,
-            runcycle_id=submission_new_runcycleid,
-            created_date=submission.created_date,
-            updated_date=submission.updated_date
-        )
-
-        met_etl_session.add(ranking_response)
-
-
-def _save_options(met_etl_session, survey, component, value, participant, submission_new_runcycleid, submission):
-    radio_response = EtlResponseTypeOptionModel(
-        survey_id=survey.id,
-        request_key=component['key'],
-        value=value,
-        request_id=component['id'],
-        participant_id=getattr(participant, 'id', None),
-        is_active=True,
-        runcycle_id=submission_new_runcycleid,
-        created_date=submission.created_date,
-        updated_date=submission.updated_date
-    )
-
-    met_etl_session.add(radio_response)
-
-
-def _is_truthy(answer):
-    if type(answer) == 'str':
-        is_yes = answer.casefold() == 'yes' or answer.casefold() == 'true'
-    else:
-        is_yes = answer is True
-    return is_yes
+                updated_date=submission.updated_date)
 
 
 # load the sumissions created or updated after last run to the user response details in analytics database
 @op(required_resource_keys={"met_db_session", "met_etl_db_session"}, out={"submission_new_runcycleid": Out()})
-def load_user_response_details(context, new_submission, updated_submission, submission_new_runcycleid):
+def load_user_response_details(context, new_submission, updated_submission, deleted_submission_ids,
+                               submission_new_runcycleid):
     session = context.resources.met_etl_db_session
 
     metsession = context.resources.met_db_session
 
-    all_submissions = new_submission + updated_submission
+    all_submissions = unique_by_id(new_submission, updated_submission)
 
-    if len(all_submissions) > 0:
+    with op_metrics(context, 'submission', submission_new_runcycleid) as metrics:
+        metrics.rows_in = len(all_submissions) + len(deleted_submission_ids)
 
-        for submission in all_submissions:
+        stale_submission_ids = [submission.id for submission in updated_submission] + list(deleted_submission_ids)
+        if len(stale_submission_ids) > 0:
+            deactivate(session, EtlUserResponseDetailModel.source_submission_id, stale_submission_ids)
+            session.commit()
 
-            met_survey = metsession.query(MetSurveyModel).filter(MetSurveyModel.id == submission.survey_id).first()
-            etl_survey = session.query(EtlSurveyModel).filter(EtlSurveyModel.source_survey_id == submission.survey_id,
-                                                              EtlSurveyModel.is_active == True).first()
-            context.log.info(
-                '<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<User Response Detail Extraction starting for Submission id %s . Survey : %s.',
-                submission.id, met_survey.id)
-            # submission without survey is probably an old updated survey not beiing loaded to analytics db.Wont happen in prod
-            if not etl_survey or not met_survey:
-                context.log.info(
-                    '<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<Skipping User Response Detail Extraction  for Submission id %s . Survey Not Found in Analytics DB : %s.Probably a very old survey',
-                    submission.id,
-                    met_survey.id)
-                continue
+        for submissions in chunked(all_submissions):
+            met_surveys, etl_surveys = lookup_surveys(metsession, session, submissions)
 
-            context.log.info('Creating new EtlUserResponseDetailModel in Analytics DB: %s.', submission.id)
+            user_response_detail_rows = []
+            for submission in submissions:
+                met_survey = met_surveys.get(submission.survey_id)
+                etl_survey = etl_surveys.get(submission.survey_id)
 
-            user_response_detail = EtlUserResponseDetailModel(
-                survey_id=etl_survey.id,
-                engagement_id=met_survey.engagement_id,
-                participant_id=submission.participant_id,
-                is_active=True,
-                runcycle_id=submission_new_runcycleid,
-                created_date=submission.created_date,
-                updated_date=submission.updated_date
-            )
+                # submission without survey is probably an old updated survey not beiing loaded to analytics db.Wont happen in prod
+                if not etl_survey or not met_survey:
+                    context.log.debug('Skipping User Response Detail Extraction for Submission id %s . Survey Not Found '
+                                      'in Analytics DB : %s.Probably a very old survey', submission.id, submission.survey_id)
+                    continue
 
-            session.add(user_response_detail)
+                user_response_detail_rows.append(build_user_response_detail_row(submission, met_survey, etl_survey,
+                                                                                submission_new_runcycleid))
 
+            upsert_user_response_details(session, user_response_detail_rows)
+            metrics.rows_out += len(user_response_detail_rows)
             session.commit()
 
-    metsession.close()
+            context.log.info('Loaded %s user response details', len(user_response_detail_rows))
 
-    session.close()
+        metsession.close()
 
-    yield Output(submission_new_runcycleid, "submission_new_runcycleid")
+        session.close()
+
+
+    yield Output(submission_new_runcycleid, "submission_new_runcycleid", metadata=metrics.metadata)
 
 
 # update the status for submission etl in run cycle table as successful
@@ -422,15 +259,11 @@ def load_user_response_details(context, new_submission, updated_submission, subm
 def submission_end_run_cycle(context, submission_new_runcycleid):
     met_etl_db_session = context.resources.met_etl_db_session
 
-    met_etl_db_session.query(EtlRunCycleModel).filter(
-        EtlRunCycleModel.id == submission_new_runcycleid, EtlRunCycleModel.packagename == 'submission',
-        EtlRunCycleModel.success == False).update({'success': True, 'enddatetime': datetime.utcnow(),
-                                                   'description': 'ended the load for tables user response detail and responses'})
+    end_package_run(met_etl_db_session, 'submission', submission_new_runcycleid,
+                    'ended the load for tables user response detail and responses')
 
     context.log.info("run cycle ended for submission table")
 
-    met_etl_db_session.commit()
-
     met_etl_db_session.close()
 
     yield Output("submission", "flag_to_run_step_after_submission")
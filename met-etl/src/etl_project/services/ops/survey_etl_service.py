@@ -1,5 +1,10 @@
 from analytics_api.models.available_response_option import AvailableResponseOption as EtlAvailableResponseOption
-from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from resources.db import transaction
+from utils.batch_load import deactivate, insert_rows
+from utils.change_log import fetch_changed, read_changes
+from utils.op_metrics import op_metrics
+from utils.response_extractor import form_components
+from utils.run_cycle import end_package_run, start_package_run
 from analytics_api.models.request_type_option import RequestTypeOption as EtlRequestTypeOption
 from analytics_api.models.response_type_option import ResponseTypeOption as EtlResponseTypeOptionModel
 from analytics_api.models.survey import Survey as EtlSurveyModel
@@ -7,7 +12,6 @@ from analytics_api.utils.util import FormIoComponentType
 from dagster import Out, Output, op
 from datetime import datetime
 from met_api.models.survey import Survey as MetSurveyModel
-from sqlalchemy import func
 
 
 # get the last run cycle id for survey etl
@@ -17,21 +21,9 @@ def get_survey_last_run_cycle_time(context, flag_to_run_step_after_engagement):
     met_etl_db_session = context.resources.met_etl_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
 
-    survey_last_run_cycle_time = met_etl_db_session.query(
-        func.coalesce(func.max(EtlRunCycleModel.enddatetime), default_datetime)).filter(
-        EtlRunCycleModel.packagename == 'survey', EtlRunCycleModel.success == True).first()
-
-    max_run_cycle_id = met_etl_db_session.query(func.coalesce(func.max(EtlRunCycleModel.id), 0)).first()
-
-    for last_run_cycle_time in survey_last_run_cycle_time:
-
-        for run_cycle_id in max_run_cycle_id:
-            new_run_cycle_id = run_cycle_id + 1
-            met_etl_db_session.add(
-                EtlRunCycleModel(id=new_run_cycle_id, packagename='survey', startdatetime=datetime.utcnow(),
-                                 enddatetime=None, description='started the load for tables survey and requests',
-                                 success=False))
-            met_etl_db_session.commit()
+    last_enddatetime, new_run_cycle_id = start_package_run(context, met_etl_db_session, 'survey',
+                                                           'started the load for tables survey and requests')
+    survey_last_run_cycle_time = (last_enddatetime or default_datetime,)
 
     met_etl_db_session.close()
 
@@ -40,116 +32,127 @@ def get_survey_last_run_cycle_time(context, flag_to_run_step_after_engagement):
     yield Output(new_run_cycle_id, "survey_new_runcycleid")
 
 
-# extract the surveys that have been created or updated after the last run
+# extract the surveys that have been created, updated or deleted after the last run
 @op(required_resource_keys={"met_db_session", "met_etl_db_session"},
-    out={"new_survey": Out(), "updated_survey": Out(), "survey_new_runcycleid": Out()})
+    out={"new_survey": Out(), "updated_survey": Out(), "deleted_survey_ids": Out(), "survey_new_runcycleid": Out()})
 def extract_survey(context, survey_last_run_cycle_time, survey_new_runcycleid):
     session = context.resources.met_db_session
+    met_etl_db_session = context.resources.met_etl_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
     new_survey = []
     updated_survey = []
+    deleted_survey_ids = []
+
+    with op_metrics(context, 'survey', survey_new_runcycleid) as metrics:
+        changes = read_changes(session, met_etl_db_session, 'survey', 'survey', survey_new_runcycleid)
 
-    for last_run_cycle_time in survey_last_run_cycle_time:
+        if changes is not None:
+            context.log.info("started extracting changed data from survey table")
+            updated_survey, deleted_survey_ids = fetch_changed(session, MetSurveyModel, *changes)
+        else:
+            for last_run_cycle_time in survey_last_run_cycle_time:
 
-        context.log.info("started extracting new data from survey table")
-        new_survey = session.query(MetSurveyModel).filter(MetSurveyModel.created_date > last_run_cycle_time).all()
+                context.log.info("started extracting new data from survey table")
+                new_survey = session.query(MetSurveyModel).filter(MetSurveyModel.created_date > last_run_cycle_time).all()
 
-        if last_run_cycle_time > default_datetime:
-            context.log.info("started extracting updated data from survey table")
-            updated_survey = session.query(MetSurveyModel).filter(MetSurveyModel.updated_date > last_run_cycle_time,
-                                                                  MetSurveyModel.updated_date != MetSurveyModel.created_date).all()
+                if last_run_cycle_time > default_datetime:
+                    context.log.info("started extracting updated data from survey table")
+                    updated_survey = session.query(MetSurveyModel).filter(MetSurveyModel.updated_date > last_run_cycle_time,
+                                                                          MetSurveyModel.updated_date != MetSurveyModel.created_date).all()
+
+        metrics.rows_out = len(new_survey) + len(updated_survey) + len(deleted_survey_ids)
 
     yield Output(new_survey, "new_survey")
 
     yield Output(updated_survey, "updated_survey")
 
-    yield Output(survey_new_runcycleid, "survey_new_runcycleid")
+    yield Output(deleted_survey_ids, "deleted_survey_ids")
+
+    yield Output(survey_new_runcycleid, "survey_new_runcycleid", metadata=metrics.metadata)
 
     context.log.info("completed extracting data from survey table")
 
     session.commit()
 
     session.close()
+    met_etl_db_session.close()
 
 
 # load the surveys created or updated after last run to the analytics database
 @op(required_resource_keys={"met_db_session", "met_etl_db_session"}, out={"survey_new_runcycleid": Out()})
-def load_survey(context, new_survey, updated_survey, survey_new_runcycleid):
+def load_survey(context, new_survey, updated_survey, deleted_survey_ids, survey_new_runcycleid):
     session = context.resources.met_etl_db_session
     all_surveys = new_survey + updated_survey
 
-    if len(all_surveys) > 0:
+    with op_metrics(context, 'survey', survey_new_runcycleid) as metrics:
+        metrics.rows_in = len(all_surveys) + len(deleted_survey_ids)
 
-        context.log.info("loading new survey")
-        for survey in all_surveys:
-
-            _do_etl_survey_data(session, survey, survey_new_runcycleid)
+        if len(deleted_survey_ids) > 0:
+            context.log.info("deactivating deleted surveys")
+            session.query(EtlSurveyModel).filter(EtlSurveyModel.source_survey_id.in_(deleted_survey_ids)).update(
+                {'is_active': False}, synchronize_session=False)
+            session.commit()
 
-            _update_survey_responses_with_active_survey_id(session, survey)
+        if len(all_surveys) > 0:
 
-            if survey.form_json is None:
-                context.log.info('Survey Found without form_json: %s. Skipping it', survey.id)
-                continue
+            context.log.info("loading new survey")
+            for survey in all_surveys:
+                # each survey, with its questions and options, is loaded in one transaction
+                with transaction(session):
+                    survey_id = _load_survey_row(session, survey, survey_new_runcycleid)
 
-            form_type = survey.form_json.get('display', None)
+                    if survey.form_json is None:
+                        context.log.info('Survey Found without form_json: %s. Skipping it', survey.id)
+                        continue
 
-            page_position = 0  # Initialize the page-level position
+                    questions, options = _form_rows(context, survey)
+                    question_changes = _sync_questions(session, survey_id, questions, survey_new_runcycleid)
+                    option_changes = _sync_options(session, survey_id, options, survey_new_runcycleid)
 
-            # check and load data for single page survey.
-            if form_type == 'form':
-                form_components = survey.form_json.get('components', None)
-                page_position = extract_survey_components(context, session, survey, survey_new_runcycleid,
-                                                          form_components, page_position)
+                context.log.info('Survey %s: questions %s, options %s (inserted, updated, deactivated)',
+                                 survey.id, question_changes, option_changes)
 
-            # check and load data for multi page survey.
-            if form_type == 'wizard':
-                pages = survey.form_json.get('components', None)
-                for page in pages:
-                    form_components = page.get('components', None)
-                    page_position = extract_survey_components(context, session, survey, survey_new_runcycleid,
-                                                              form_components, page_position)
+        metrics.rows_out = len(all_surveys)
 
-    yield Output(survey_new_runcycleid, "survey_new_runcycleid")
+    yield Output(survey_new_runcycleid, "survey_new_runcycleid", metadata=metrics.metadata)
 
     context.log.info("completed loading survey table")
 
     session.close()
 
 
-# extract components within a survey
-def extract_survey_components(context, session, survey, survey_new_runcycleid, form_components, position):
-    if (form_components) is None:
-        context.log.info('Survey Found without any component in form_json: %s. Skipping it', survey.id)
-        return position
+# update the active analytics survey row of the source survey in place and return its id, so the questions,
+# options and responses that point at it stay put. a row is only inserted for a survey that has none active.
+def _load_survey_row(session, survey, survey_new_runcycleid):
+    values = dict(name=survey.name, engagement_id=survey.engagement_id, created_date=survey.created_date,
+                  updated_date=survey.updated_date, runcycle_id=survey_new_runcycleid,
+                  generate_dashboard=survey.generate_dashboard)
+
+    active_rows = session.query(EtlSurveyModel).filter(EtlSurveyModel.source_survey_id == survey.id,
+                                                       EtlSurveyModel.is_active == True).order_by(
+        EtlSurveyModel.id.desc()).all()
+
+    if len(active_rows) == 1:
+        for column, value in values.items():
+            setattr(active_rows[0], column, value)
+        return active_rows[0].id
+
+    # a new survey, one deleted and loaded again, or more than one active row left by the earlier loader:
+    # keep a single active row and move everything of the inactive ones over to it
+    if active_rows:
+        etl_survey = active_rows[0]
+        for column, value in values.items():
+            setattr(etl_survey, column, value)
+        for extra_row in active_rows[1:]:
+            extra_row.is_active = False
+    else:
+        etl_survey = EtlSurveyModel(source_survey_id=survey.id, is_active=True, **values)
+        session.add(etl_survey)
+    session.flush()
 
     _refresh_questions_and_available_option_status(session, survey.id)
-
-    for component in form_components:
-        position = position + 1
-        component_type = component.get('type', None)
-        context.log.info('Survey: %s.%s Processing component with id %s and type: %s and label %s ',
-                         survey.id,
-                         survey.name,
-                         component.get('id', None),
-                         component_type,
-                         component.get('label', None))
-
-        if not component_type:
-            continue
-
-        has_valid_question_type = _validate_form_type(context, component_type)
-
-        if has_valid_question_type:
-            etl_survey_rows = session.query(EtlSurveyModel.id).filter(EtlSurveyModel.source_survey_id == survey.id,
-                                                                      EtlSurveyModel.is_active == True).all()
-            for row in etl_survey_rows:
-                survey_id = row[0]
-                position = _do_etl_survey_inputs(session, survey_id, component, component_type,
-                                                 survey_new_runcycleid, position)
-                _load_available_response_option(context, session, survey_id, component, component_type,
-                                                survey_new_runcycleid)
-
-    return position
+    _update_survey_responses_with_active_survey_id(session, survey)
+    return etl_survey.id
 
 
 # inactivate if record is existing in analytics database
@@ -159,206 +162,160 @@ def _refresh_questions_and_available_option_status(session, source_survey_id):
     if not etl_survey_rows:
         return
 
-    deactivate_flag = {'is_active': False}
+    survey_ids = [row[0] for row in etl_survey_rows]
+    deactivate(session, EtlRequestTypeOption.survey_id, survey_ids)
+    deactivate(session, EtlAvailableResponseOption.survey_id, survey_ids)
 
-    for row in etl_survey_rows:
-        survey_id = row[0]
-        session.query(EtlRequestTypeOption).filter(EtlRequestTypeOption.survey_id == survey_id).update(deactivate_flag)
-        session.query(EtlAvailableResponseOption).filter(
-            EtlAvailableResponseOption.survey_id == survey_id).update(deactivate_flag)
 
+# the question and available option rows the survey's form should have, as
+# question key -> column values and option request key -> [(value, request_id)] in form order
+def _form_rows(context, survey):
+    questions = {}
+    options = {}
+    position = 0
 
-def _do_etl_survey_data(session, survey, survey_new_runcycleid):
-    session.query(EtlSurveyModel).filter(EtlSurveyModel.source_survey_id == survey.id).update({'is_active': False})
-
-    survey_model = EtlSurveyModel(name=survey.name, source_survey_id=survey.id,
-                                  engagement_id=survey.engagement_id, is_active=True,
-                                  created_date=survey.created_date, updated_date=survey.updated_date,
-                                  runcycle_id=survey_new_runcycleid, generate_dashboard=survey.generate_dashboard)
-
-    session.add(survey_model)
-
-    session.commit()
-
-
-# load data to table request type tables
-def _do_etl_survey_inputs(session, survey_id, component, component_type, survey_new_runcycleid, position):
-    if component_type == FormIoComponentType.SURVEY.value:
-        questions = component.get('questions', None)
-
-        if not questions:
-            return position
-
-        # Parent row stores the matrix question label; sub-question rows link back via request_id prefix
-        session.add(EtlRequestTypeOption(survey_id=survey_id,
-                                         request_id=component['id'],
-                                         label=component['label'],
-                                         is_active=True,
-                                         key=component['key'],
-                                         type=component['type'],
-                                         runcycle_id=survey_new_runcycleid,
-                                         position=position
-                                         ))
-        session.commit()
-
-        for question in questions:
-            position = position + 1
-            model_name = EtlRequestTypeOption(survey_id=survey_id,
-                                              request_id=component['id'] + '-' + question['value'],
-                                              label=question['label'],
-                                              is_active=True,
-                                              key=component['key'] + '-' + question['value'],
-                                              type=component['type'],
-                                              runcycle_id=survey_new_runcycleid,
-                                              position=position
-                                              )
-
-            session.add(model_name)
+    components = form_components(survey.form_json)
+    if not components:
+        context.log.info('Survey Found without any component in form_json: %s. Skipping it', survey.id)
 
-            session.commit()
-    elif component_type == FormIoComponentType.RANKING.value:
-        statements = component.get('statements', None)
-
-        if not statements:
-            return position
-
-        # Parent row stores the ranking question label; statement rows link back via request_id prefix
-        session.add(EtlRequestTypeOption(survey_id=survey_id,
-                                         request_id=component['id'],
-                                         label=component['label'],
-                                         is_active=True,
-                                         key=component['key'],
-                                         type=component['type'],
-                                         runcycle_id=survey_new_runcycleid,
-                                         position=position
-                                         ))
-        session.commit()
+    for component in components:
+        position = position + 1
+        component_type = component.get('type', None)
+        context.log.info('Survey: %s.%s Processing component with id %s and type: %s and label %s ',
+                         survey.id,
+                         survey.name,
+                         component.get('id', None),
+                         component_type,
+                         component.get('label', None))
 
-        for statement in statements:
-            position = position + 1
-            statement_id = str(statement['id'])
-            model_name = EtlRequestTypeOption(survey_id=survey_id,
-                                              request_id=component['id'] + '-' + statement_id,
-                                              label=statement['label'],
-                                              is_active=True,
-                                              key=component['key'] + '-' + statement_id,
-                                              type=component['type'],
-                                              runcycle_id=survey_new_runcycleid,
-                                              position=position
-                                              )
-
-            session.add(model_name)
+        if not component_type or not _validate_form_type(context, component_type):
+            continue
 
-            session.commit()
-    else:
-        model_name = EtlRequestTypeOption(survey_id=survey_id,
-                                          request_id=component['id'],
-                                          label=component['label'],
-                                          is_active=True,
-                                          key=component['key'],
-                                          type=component['type'],
-                                          runcycle_id=survey_new_runcycleid,
-                                          position=position
-                                          )
+        position = _question_rows(questions, component, component_type, position)
+        _available_response_rows(options, component, component_type)
 
-        session.add(model_name)
+    return questions, options
 
-        session.commit()
 
-    return position
+def _question_row(questions, key, request_id, label, component_type, position):
+    questions.setdefault(key, dict(request_id=request_id, label=label, type=component_type, position=position))
 
 
-# load data to table available response option
-def _load_available_response_option(context, session, survey_id, component, component_type, survey_new_runcycleid):
-   
+# the question rows of a component. matrix (survey) and ranking questions have a parent row with the question
+# label and a row per sub question or statement, linked back to it by the request_id prefix.
+def _question_rows(questions, component, component_type, position):
     if component_type == FormIoComponentType.SURVEY.value:
-        _load_survey_available_response(session, component, survey_id, survey_new_runcycleid)
-    elif component_type == FormIoComponentType.SELECTLIST.value:
-        _load_selectlist_available_response(session, component, survey_id, survey_new_runcycleid)
+        sub_questions = [(str(question['value']), question['label']) for question in component.get('questions') or []]
     elif component_type == FormIoComponentType.RANKING.value:
-        _load_ranking_available_response(session, component, survey_id, survey_new_runcycleid)
+        sub_questions = [(str(statement['id']), statement['label'])
+                         for statement in component.get('statements') or []]
     else:
-        _load_default_available_response(session, component, survey_id, survey_new_runcycleid)
+        _question_row(questions, component['key'], component['id'], component['label'], component['type'], position)
+        return position
 
+    if not sub_questions:
+        return position
 
-def _load_survey_available_response(session, component, survey_id, survey_new_runcycleid):
-    values = component.get('values', None)
-    if not values:
-        return
-    
-    questions = component.get('questions', None)
-    if not questions:
-        return
-    
-    for question in questions:
-        request_key = component['key'] + '-' + question['value']
-        _do_etl_available_response_data(session, component, survey_id, values,
-                                        request_key, survey_new_runcycleid)
+    _question_row(questions, component['key'], component['id'], component['label'], component['type'], position)
+    for sub_key, label in sub_questions:
+        position = position + 1
+        _question_row(questions, component['key'] + '-' + sub_key, component['id'] + '-' + sub_key, label,
+                      component['type'], position)
+    return position
 
-def _load_selectlist_available_response(session, component, survey_id, survey_new_runcycleid):
-    data = component.get('data', None)
-    values = data.get('values', None)
 
-    if not values:
-        return
-    
-    request_key = component['key']
-    _do_etl_available_response_data(session, component, survey_id, values,
-                                    request_key, survey_new_runcycleid)
-
-def _load_default_available_response(session, component, survey_id, survey_new_runcycleid):
-    values = component.get('values', None)
-    if not values:
-        return
-    
-    request_key = component['key']
-    _do_etl_available_response_data(session, component, survey_id, values,
-                                    request_key, survey_new_runcycleid)
-
-
-def _load_ranking_available_response(session, component, survey_id, survey_new_runcycleid):
-    """Load available response options for ranking components.
-    
-    For ranking, the available responses are rank values (1, 2, 3, etc.)
-    based on the number of statements.
-    """
-    statements = component.get('statements', None)
-    if not statements:
-        return
-    
-    num_statements = len(statements)
-    
-    for statement in statements:
-        statement_id = str(statement['id'])
-        request_key = component['key'] + '-' + statement_id
-        
-        # Create available response options for each possible rank value
-        for rank in range(1, num_statements + 1):
-            model_name = EtlAvailableResponseOption(
-                survey_id=survey_id,
-                request_key=request_key,
-                value=str(rank),
-                request_id=component['id'] + '-' + statement_id,
-                is_active=True,
-                runcycle_id=survey_new_runcycleid
-            )
-            session.add(model_name)
-    
-    session.commit()
+# the available response options of a component
+def _available_response_rows(options, component, component_type):
+    if component_type == FormIoComponentType.SURVEY.value:
+        values = component.get('values') or []
+        if not values:
+            return
+        for question in component.get('questions') or []:
+            options.setdefault(component['key'] + '-' + str(question['value']),
+                               [(value['label'], component['id']) for value in values])
 
+    elif component_type == FormIoComponentType.RANKING.value:
+        # the available responses of a ranking are the rank values, 1 up to the number of statements
+        statements = component.get('statements') or []
+        for statement in statements:
+            statement_id = str(statement['id'])
+            options.setdefault(component['key'] + '-' + statement_id,
+                               [(str(rank), component['id'] + '-' + statement_id)
+                                for rank in range(1, len(statements) + 1)])
 
-def _do_etl_available_response_data(session, component, survey_id, values, request_key, survey_new_runcycleid):
-    for value in values:
-        model_name = EtlAvailableResponseOption(survey_id=survey_id,
-                                                request_key=request_key,
-                                                value=value['label'],
-                                                request_id=component['id'],
-                                                is_active=True,
-                                                runcycle_id=survey_new_runcycleid)
+    else:
+        if component_type == FormIoComponentType.SELECTLIST.value:
+            values = (component.get('data') or {}).get('values') or []
+        else:
+            values = component.get('values') or []
+        if values:
+            options.setdefault(component['key'], [(value['label'], component['id']) for value in values])
+
+
+# bring the active questions of the survey in line with the form: changed questions are updated in place, new
+# ones inserted and the ones no longer in the form deactivated. returns (inserted, updated, deactivated).
+def _sync_questions(session, survey_id, questions, survey_new_runcycleid):
+    existing = {}
+    stale_ids = []
+    for row in session.query(EtlRequestTypeOption).filter(EtlRequestTypeOption.survey_id == survey_id,
+                                                          EtlRequestTypeOption.is_active == True).order_by(
+            EtlRequestTypeOption.id):
+        if row.key in existing:
+            stale_ids.append(row.id)
+        else:
+            existing[row.key] = row
+
+    new_rows = []
+    updated = 0
+    for key, values in questions.items():
+        row = existing.pop(key, None)
+        if row is None:
+            new_rows.append(dict(values, survey_id=survey_id, key=key, is_active=True,
+                                 runcycle_id=survey_new_runcycleid))
+        elif any(getattr(row, column) != value for column, value in values.items()):
+            for column, value in values.items():
+                setattr(row, column, value)
+            row.runcycle_id = survey_new_runcycleid
+            updated += 1
+
+    stale_ids.extend(row.id for row in existing.values())
+    deactivate(session, EtlRequestTypeOption.id, stale_ids)
+    insert_rows(session, EtlRequestTypeOption, new_rows)
+    return len(new_rows), updated, len(stale_ids)
+
+
+# bring the active available options of the survey in line with the form, one question at a time. dashboards
+# list a question's options in id order, so a question whose option values changed at all gets its options
+# replaced to keep them in form order; one whose values are unchanged is left alone or has its request_id fixed.
+# returns (inserted, updated, deactivated).
+def _sync_options(session, survey_id, options, survey_new_runcycleid):
+    existing = {}
+    for row in session.query(EtlAvailableResponseOption).filter(
+            EtlAvailableResponseOption.survey_id == survey_id,
+            EtlAvailableResponseOption.is_active == True).order_by(EtlAvailableResponseOption.id):
+        existing.setdefault(row.request_key, []).append(row)
+
+    new_rows = []
+    stale_ids = []
+    updated = 0
+    for request_key, values in options.items():
+        rows = existing.pop(request_key, [])
+        if [row.value for row in rows] == [value for value, _ in values]:
+            for row, (_, request_id) in zip(rows, values):
+                if row.request_id != request_id:
+                    row.request_id = request_id
+                    row.runcycle_id = survey_new_runcycleid
+                    updated += 1
+            continue
 
-        session.add(model_name)
+        stale_ids.extend(row.id for row in rows)
+        new_rows.extend(dict(survey_id=survey_id, request_key=request_key, value=value, request_id=request_id,
+                             is_active=True, runcycle_id=survey_new_runcycleid) for value, request_id in values)
 
-    session.commit()
+    stale_ids.extend(row.id for rows in existing.values() for row in rows)
+    deactivate(session, EtlAvailableResponseOption.id, stale_ids)
+    insert_rows(session, EtlAvailableResponseOption, new_rows)
+    return len(new_rows), updated, len(stale_ids)
 
 
 def _validate_form_type(context, component_type):
@@ -378,16 +335,11 @@ def _validate_form_type(context, component_type):
 def survey_end_run_cycle(context, survey_new_runcycleid):
     met_etl_db_session = context.resources.met_etl_db_session
 
-    met_etl_db_session.query(EtlRunCycleModel).filter(
-        EtlRunCycleModel.id == survey_new_runcycleid, EtlRunCycleModel.packagename == 'survey',
-        EtlRunCycleModel.success == False).update(
-        {'success': True, 'enddatetime': datetime.utcnow(),
-         'description': 'ended the load for tables survey and requests'})
+    end_package_run(met_etl_db_session, 'survey', survey_new_runcycleid,
+                    'ended the load for tables survey and requests')
 
     context.log.info("run cycle ended for survey table")
 
-    met_etl_db_session.commit()
-
     met_etl_db_session.close()
 
     yield Output("survey", "flag_to_run_step_after_survey")
@@ -403,13 +355,5 @@ def _update_survey_responses_with_active_survey_id(session, survey):
         .scalar_subquery()
     )
 
-    # Fetch response records
-    response_records = session.query(EtlResponseTypeOptionModel).filter(
-        EtlResponseTypeOptionModel.survey_id.in_(subquery)).all()
-
-    # Update each response record individually
-    for record in response_records:
-        session.query(EtlResponseTypeOptionModel).filter(EtlResponseTypeOptionModel.id == record.id).update(
-            {'survey_id': etl_active_survey_id}, synchronize_session='fetch')
-
-    session.commit()
+    session.query(EtlResponseTypeOptionModel).filter(EtlResponseTypeOptionModel.survey_id.in_(subquery)).update(
+        {'survey_id': etl_active_survey_id}, synchronize_session=False)
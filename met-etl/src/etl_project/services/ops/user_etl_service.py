@@ -1,10 +1,11 @@
 from dagster import Out, Output, op
-from sqlalchemy import func
 from datetime import datetime
 
 from met_api.models.participant import Participant as MetParticipantModel
 from analytics_api.models.user_details import UserDetails as EtlUserDetailsModel
-from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from utils.change_log import fetch_changed, read_changes
+from utils.op_metrics import op_metrics
+from utils.run_cycle import end_package_run, start_package_run
 
 
 # get the last run cycle id for user detail etl
@@ -14,21 +15,9 @@ def get_user_last_run_cycle_time(context):
     met_etl_db_session = context.resources.met_etl_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
 
-    user_details_last_run_cycle_datetime = met_etl_db_session.query(
-        func.coalesce(func.max(EtlRunCycleModel.enddatetime), default_datetime)).filter(
-        EtlRunCycleModel.packagename == 'userdetails', EtlRunCycleModel.success == True).first()
-
-    max_run_cycle_id = met_etl_db_session.query(func.coalesce(func.max(EtlRunCycleModel.id), 0)).first()
-
-    for last_run_cycle_time in user_details_last_run_cycle_datetime:
-
-        for run_cycle_id in max_run_cycle_id:
-            new_run_cycle_id = run_cycle_id + 1
-            met_etl_db_session.add(
-                EtlRunCycleModel(id=new_run_cycle_id, packagename='userdetails', startdatetime=datetime.utcnow(),
-                                 enddatetime=None, description='started the load for table user_details',
-                                 success=False))
-            met_etl_db_session.commit()
+    last_enddatetime, new_run_cycle_id = start_package_run(context, met_etl_db_session, 'userdetails',
+                                                           'started the load for table user_details')
+    user_details_last_run_cycle_datetime = (last_enddatetime or default_datetime,)
 
     met_etl_db_session.close()
 
@@ -42,31 +31,43 @@ def get_user_last_run_cycle_time(context):
     out={"new_participants": Out(), "updated_participants": Out(), "user_details_new_run_cycle_id": Out()})
 def extract_participant(context, user_details_last_run_cycle_datetime, user_details_new_run_cycle_id):
     session = context.resources.met_db_session
+    met_etl_db_session = context.resources.met_etl_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
     new_participants = []
     updated_participants = []
 
-    for last_run_cycle_time in user_details_last_run_cycle_datetime:
+    with op_metrics(context, 'userdetails', user_details_new_run_cycle_id) as metrics:
+        changes = read_changes(session, met_etl_db_session, 'userdetails', 'participant', user_details_new_run_cycle_id)
+
+        if changes is not None:
+            # user_details is keyed by email address, which a deleted participant no longer has, so deletes are skipped
+            context.log.info("started extracting changed data from user_details table")
+            updated_participants, _ = fetch_changed(session, MetParticipantModel, *changes)
+        else:
+            for last_run_cycle_time in user_details_last_run_cycle_datetime:
 
-        context.log.info("started extracting new data from user_details table")
-        new_participants = session.query(MetParticipantModel).filter(MetParticipantModel.created_date > last_run_cycle_time).all()
+                context.log.info("started extracting new data from user_details table")
+                new_participants = session.query(MetParticipantModel).filter(MetParticipantModel.created_date > last_run_cycle_time).all()
 
-        if last_run_cycle_time > default_datetime:
-            context.log.info("started extracting updated data from user_details table")
-            updated_participants = session.query(MetParticipantModel).filter(MetParticipantModel.updated_date > last_run_cycle_time,
-                                                               MetParticipantModel.updated_date != MetParticipantModel.created_date).all()
+                if last_run_cycle_time > default_datetime:
+                    context.log.info("started extracting updated data from user_details table")
+                    updated_participants = session.query(MetParticipantModel).filter(MetParticipantModel.updated_date > last_run_cycle_time,
+                                                                       MetParticipantModel.updated_date != MetParticipantModel.created_date).all()
+
+        metrics.rows_out = len(new_participants) + len(updated_participants)
 
     yield Output(new_participants, "new_participants")
 
     yield Output(updated_participants, "updated_participants")
 
-    yield Output(user_details_new_run_cycle_id, "user_details_new_run_cycle_id")
+    yield Output(user_details_new_run_cycle_id, "user_details_new_run_cycle_id", metadata=metrics.metadata)
 
     context.log.info("completed extracting data from user_details table")
 
     session.commit()
 
     session.close()
+    met_etl_db_session.close()
 
 
 # load the users created or updated after last run to the analytics database
@@ -75,21 +76,26 @@ def load_user(context, new_participants, updated_participants, user_details_new_
     session = context.resources.met_etl_db_session
     all_participants = new_participants + updated_participants
 
-    if len(all_participants) > 0:
+    with op_metrics(context, 'userdetails', user_details_new_run_cycle_id) as metrics:
+        metrics.rows_in = len(all_participants)
+
+        if len(all_participants) > 0:
 
-        context.log.info("loading new participants")
+            context.log.info("loading new participants")
 
-        for participant in all_participants:
-            session.query(EtlUserDetailsModel).filter(EtlUserDetailsModel.name == participant.email_address).update(
-                {'is_active': False})
-            user_model = EtlUserDetailsModel(name=participant.email_address, is_active=True, created_date=participant.created_date,
-                                          updated_date=participant.updated_date, runcycle_id=user_details_new_run_cycle_id)
+            for participant in all_participants:
+                session.query(EtlUserDetailsModel).filter(EtlUserDetailsModel.name == participant.email_address).update(
+                    {'is_active': False})
+                user_model = EtlUserDetailsModel(name=participant.email_address, is_active=True, created_date=participant.created_date,
+                                              updated_date=participant.updated_date, runcycle_id=user_details_new_run_cycle_id)
 
-            session.add(user_model)
+                session.add(user_model)
 
-            session.commit()
+                session.commit()
 
-    yield Output(user_details_new_run_cycle_id, "user_details_new_run_cycle_id")
+        metrics.rows_out = len(all_participants)
+
+    yield Output(user_details_new_run_cycle_id, "user_details_new_run_cycle_id", metadata=metrics.metadata)
 
     context.log.info("completed loading user_details table")
 
@@ -101,15 +107,11 @@ def load_user(context, new_participants, updated_participants, user_details_new_
 def user_end_run_cycle(context, user_details_new_run_cycle_id):
     met_etl_db_session = context.resources.met_etl_db_session
 
-    met_etl_db_session.query(EtlRunCycleModel).filter(
-        EtlRunCycleModel.id == user_details_new_run_cycle_id, EtlRunCycleModel.packagename == 'userdetails',
-        EtlRunCycleModel.success == False).update(
-        {'success': True, 'enddatetime': datetime.utcnow(), 'description': 'ended the load for table user_details'})
+    end_package_run(met_etl_db_session, 'userdetails', user_details_new_run_cycle_id,
+                    'ended the load for table user_details')
 
     context.log.info("run cycle ended for user_details table")
 
     yield Output("userdetails", "flag_to_run_step_after_user")
 
-    met_etl_db_session.commit()
-
     met_etl_db_session.close()
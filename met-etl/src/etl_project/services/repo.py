@@ -1,5 +1,6 @@
 from dagster import repository
 from jobs.met_data_ingestion import met_data_ingestion
+from jobs.met_data_rebuild import met_data_rebuild, met_data_rebuild_prepare, met_data_rebuild_swap
 from jobs.test_db import job_sample_db_test
 from schedules.met_data_ingestion_schedule import (
     met_data_ingestion_schedule,
@@ -7,4 +8,5 @@ from schedules.met_data_ingestion_schedule import (
 
 @repository
 def etl_project():
-    return [job_sample_db_test, met_data_ingestion, met_data_ingestion_schedule]
\ No newline at end of file
+    return [job_sample_db_test, met_data_ingestion, met_data_ingestion_schedule, met_data_rebuild_prepare,
+            met_data_rebuild, met_data_rebuild_swap]
\ No newline at end of file
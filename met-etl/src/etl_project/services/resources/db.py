@@ -5,37 +5,83 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 
-@resource
+# engines are built once per process and shared by every op that runs in it, so an op only pays for
+# connection setup when the pool is empty. keyed by pid as well, a forked process must not reuse the
+# parent's connections.
+_session_makers = {}
+
+
+def _get_session_maker(env_prefix, default_port):
+    key = (env_prefix, os.getpid())
+    session_maker = _session_makers.get(key)
+    if session_maker is None:
+        user = os.getenv(f"{env_prefix}_USER", "")
+        password = os.getenv(f"{env_prefix}_PASSWORD", "")
+        db = os.getenv(f"{env_prefix}_DB", "")
+        host = os.getenv(f"{env_prefix}_HOST", "")
+        port = int(os.getenv(f"{env_prefix}_PORT", default_port))
+
+        connect_args = {}
+        # milliseconds, 0 turns the timeout off
+        statement_timeout = int(os.getenv("MET_ETL_DB_STATEMENT_TIMEOUT", 600000))
+        if statement_timeout > 0:
+            connect_args["options"] = f"-c statement_timeout={statement_timeout}"
+
+        engine = create_engine(f'postgresql://{user}:{password}@{host}:{port}/{db}',
+                               pool_size=int(os.getenv("MET_ETL_DB_POOL_SIZE", 2)),
+                               max_overflow=int(os.getenv("MET_ETL_DB_MAX_OVERFLOW", 2)),
+                               pool_pre_ping=True,
+                               pool_recycle=1800,
+                               connect_args=connect_args)
+        session_maker = sessionmaker(bind=engine)
+        _session_makers[key] = session_maker
+    return session_maker
+
+
+# a session on the analytics database for code that runs outside of an op, like the metrics report
+def analytics_session():
+    return _get_session_maker("MET_ANALYTICS_DB", 54334)()
+
+
+# hand the op a session and give its connection back to the pool afterwards. ops commit their own work;
+# anything still pending at teardown belongs to an op that failed part way through and is rolled back.
 @contextmanager
-def met_db_session(context):
+def _op_session(context, env_prefix, default_port):
+    session = _get_session_maker(env_prefix, default_port)()
     try:
-        user = os.getenv("MET_DB_USER", "")
-        password = os.getenv("MET_DB_PASSWORD", "")
-        db = os.getenv("MET_DB_DB", "")
-        host = os.getenv("MET_DB_HOST", "")
-        port = int(os.getenv("MET_DB_PORT", 54332))
-        db_connection = create_engine(f'postgresql://{user}:{password}@{host}:{port}/{db}')
-        session_maker = sessionmaker(bind=db_connection)
-        session = session_maker()
         yield session
     finally:
-        context.log.info('Close connection here')
-        ## TODO handle session closing
+        session.rollback()
+        session.close()
+        context.log.debug(f'{env_prefix} session closed')
+
+
+# commit the block's work or roll it back if the block raises
+@contextmanager
+def transaction(session):
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+
+# iterate a query through a server side cursor, batch_size rows at a time, instead of loading every row into
+# memory. the rows come from an open transaction, so don't commit the same session until the loop is done.
+def stream(query, batch_size=None):
+    return query.yield_per(batch_size or int(os.getenv("MET_ETL_STREAM_BATCH_SIZE", 1000)))
+
+
+@resource
+@contextmanager
+def met_db_session(context):
+    with _op_session(context, "MET_DB", 54332) as session:
+        yield session
 
 
 @resource
 @contextmanager
 def met_etl_db_session(context):
-    try:
-        user = os.getenv("MET_ANALYTICS_DB_USER", "")
-        password = os.getenv("MET_ANALYTICS_DB_PASSWORD", "")
-        db = os.getenv("MET_ANALYTICS_DB_DB", "")
-        host = os.getenv("MET_ANALYTICS_DB_HOST", "")
-        port = os.getenv("MET_ANALYTICS_DB_PORT", 54334)
-        db_connection = create_engine(f'postgresql://{user}:{password}@{host}:{port}/{db}')
-        session_maker = sessionmaker(bind=db_connection)
-        session = session_maker()
+    with _op_session(context, "MET_ANALYTICS_DB", 54334) as session:
         yield session
-    finally:
-        context.log.info('Close connection here')
-        ## TODO handle session closing
@@ -1,11 +1,19 @@
-from dagster import schedule
+from dagster import DagsterRunStatus, RunRequest, RunsFilter, SkipReason, schedule
 from jobs.met_data_ingestion import met_data_ingestion
 
+IN_FLIGHT_STATUSES = [DagsterRunStatus.QUEUED, DagsterRunStatus.NOT_STARTED, DagsterRunStatus.STARTING,
+                      DagsterRunStatus.STARTED]
+
 
 @schedule(
     cron_schedule="*/30 * * * *",
     job=met_data_ingestion,
     execution_timezone="US/Central",
 )
-def met_data_ingestion_schedule(_context):
-    return {}
+def met_data_ingestion_schedule(context):
+    # don't stack a new run behind one that is still going; the next tick picks up whatever it missed
+    in_flight = context.instance.get_run_records(
+        filters=RunsFilter(job_name=met_data_ingestion.name, statuses=IN_FLIGHT_STATUSES), limit=1)
+    if in_flight:
+        return SkipReason(f"met_data_ingestion run {in_flight[0].dagster_run.run_id} is still in progress")
+    return RunRequest(run_config={})
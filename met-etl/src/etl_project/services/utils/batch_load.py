@@ -0,0 +1,68 @@
+import os
+from itertools import islice
+
+from sqlalchemy import insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# number of source rows loaded per transaction
+LOAD_CHUNK_SIZE = int(os.getenv("MET_ETL_LOAD_CHUNK_SIZE", 500))
+
+
+# merge the extracted lists, keeping the last copy of a row that shows up in more than one of them
+# (e.g. created and then updated since the last run), so a chunk never loads the same source row twice.
+def unique_by_id(*row_lists):
+    rows = {}
+    for row_list in row_lists:
+        for row in row_list:
+            rows[row.id] = row
+    return list(rows.values())
+
+
+# split the rows into lists of at most size rows. rows can be a stream, only one chunk is held at a time.
+def chunked(rows, size=None):
+    rows = iter(rows)
+    size = size or LOAD_CHUNK_SIZE
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+# fetch the rows of a model for all the keys in one IN query, as a dict of key -> row. when more than one row
+# has the same key the first one in order_by wins.
+def lookup(session, key_column, keys, filters=(), order_by=()):
+    keys = {key for key in keys if key is not None}
+    if not keys:
+        return {}
+
+    rows_by_key = {}
+    for row in session.query(key_column.class_).filter(key_column.in_(keys), *filters).order_by(*order_by):
+        rows_by_key.setdefault(getattr(row, key_column.key), row)
+    return rows_by_key
+
+
+# mark every row superseded by this load inactive with a single UPDATE
+def deactivate(session, key_column, keys):
+    keys = list(keys)
+    if not keys:
+        return
+    session.execute(update(key_column.class_).where(key_column.in_(keys)).values(is_active=False)
+                    .execution_options(synchronize_session=False))
+
+
+# insert the rows (dicts of column values) in one batched statement. sqlalchemy sends an executemany insert on
+# psycopg2 as multi-row VALUES pages, the same as execute_values, and still applies the model's column defaults.
+def insert_rows(session, model, rows):
+    if rows:
+        session.execute(insert(model), rows)
+
+
+# insert the rows, or update the columns of the row already loaded under the same unique key (index_elements and
+# index_where name the unique index), so loading the same source rows again leaves one copy of each.
+# a statement can't touch the same key twice, the rows must be unique on it.
+def upsert_rows(session, model, rows, index_elements, index_where, update_columns):
+    if not rows:
+        return
+    statement = pg_insert(model)
+    statement = statement.on_conflict_do_update(
+        index_elements=index_elements, index_where=index_where,
+        set_={column: statement.excluded[column] for column in update_columns})
+    session.execute(statement, rows)
@@ -0,0 +1,86 @@
+from sqlalchemy import text
+
+from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from analytics_api.models.package_watermark import PackageWatermark as PackageWatermarkModel
+from met_api.models.change_log import ChangeLog as MetChangeLogModel
+from utils.rebuild import latest_rebuild
+
+
+# read the met-api change_log entries for an entity type written since the package's last successful run
+# (the horizon in its watermark).
+# returns the ids that were inserted or updated and the ids that were deleted, or None when the package has
+# never consumed the change log (first run after it was introduced) and has to fall back to polling the
+# created and updated dates once.
+#
+# the window is bounded by transaction ids rather than by seq: a transaction that is still open when we read
+# can commit later with a lower seq than what we've already seen, but every transaction below the snapshot
+# xmin has finished, so the entries under it can't change any more. a long running transaction on the met
+# database holds the horizon back, it delays changes rather than losing them.
+def read_changes(met_db_session, met_etl_db_session, package_name, entity_type, run_cycle_id):
+    last_horizon = met_etl_db_session.query(PackageWatermarkModel.change_log_horizon).filter(
+        PackageWatermarkModel.packagename == package_name).scalar()
+
+    horizon = current_horizon(met_db_session)
+
+    met_etl_db_session.query(EtlRunCycleModel).filter(EtlRunCycleModel.id == run_cycle_id).update(
+        {'change_log_horizon': horizon})
+    met_etl_db_session.commit()
+
+    if last_horizon is None:
+        return None
+
+    changes = met_db_session.query(MetChangeLogModel.entity_id, MetChangeLogModel.operation).filter(
+        MetChangeLogModel.entity_type == entity_type,
+        MetChangeLogModel.txid >= last_horizon,
+        MetChangeLogModel.txid < horizon).order_by(MetChangeLogModel.seq)
+
+    # only the last operation on each id matters
+    changed_ids = set()
+    deleted_ids = set()
+    for entity_id, operation in changes:
+        if operation == 'DELETE':
+            changed_ids.discard(entity_id)
+            deleted_ids.add(entity_id)
+        else:
+            deleted_ids.discard(entity_id)
+            changed_ids.add(entity_id)
+
+    return changed_ids, deleted_ids
+
+
+# the oldest transaction id still running on the met database. every change below it has been committed.
+def current_horizon(met_db_session):
+    return met_db_session.execute(text("SELECT txid_snapshot_xmin(txid_current_snapshot())")).scalar()
+
+
+# fetch the current rows for the changed ids. an id whose row is gone was deleted after its last logged change
+# (e.g. an engagement removed together with its settings), so it's reported as deleted too.
+def fetch_changed(met_db_session, model, changed_ids, deleted_ids):
+    rows = []
+    if changed_ids:
+        rows = met_db_session.query(model).filter(model.id.in_(changed_ids)).all()
+
+    missing_ids = set(changed_ids) - {row.id for row in rows}
+
+    return rows, sorted(set(deleted_ids) | missing_ids)
+
+
+# delete the change_log entries no package will read again: those below the lowest horizon in the package
+# watermarks, and below the horizon of a prepared rebuild that hasn't been swapped in yet, since the swap rewinds
+# the submission package to it. packages that never read the log have no horizon and don't hold it back, while a
+# rebuild that is prepared but never swapped does, until it is swapped or a new one is prepared.
+# returns the number of entries deleted.
+def prune_changes(met_db_session, met_etl_db_session):
+    horizons = [horizon for (horizon,) in met_etl_db_session.query(PackageWatermarkModel.change_log_horizon).filter(
+        PackageWatermarkModel.change_log_horizon.isnot(None))]
+
+    prepared, swapped = latest_rebuild(met_etl_db_session)
+    if prepared is not None and not swapped and prepared.change_log_horizon is not None:
+        horizons.append(prepared.change_log_horizon)
+
+    if not horizons:
+        return 0
+
+    deleted = MetChangeLogModel.delete_before(min(horizons), met_db_session)
+    met_db_session.commit()
+    return deleted
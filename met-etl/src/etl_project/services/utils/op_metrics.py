@@ -0,0 +1,90 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from analytics_api.models.etl_op_metrics import EtlOpMetrics as EtlOpMetricsModel
+
+# the metrics of the op_metrics block being run, None outside of one so other statements aren't counted
+_active_metrics = ContextVar("op_metrics", default=None)
+
+
+# counts the statements sent to any engine while an op_metrics block runs. the traffic is estimated from the
+# statement text and the number of parameter sets, so the batch loads' parameters aren't walked to be measured.
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_db_traffic(conn, cursor, statement, parameters, context, executemany):
+    metrics = _active_metrics.get()
+    if metrics is None:
+        return
+    metrics.db_round_trips += 1
+    metrics.db_bytes_sent_estimate += len(statement) * (len(parameters) if executemany else 1)
+
+
+class OpMetrics:
+    def __init__(self):
+        self.rows_in = 0
+        self.rows_out = 0
+        self.duration_seconds = 0.0
+        self.db_round_trips = 0
+        self.db_bytes_sent_estimate = 0
+
+    # dagster output metadata, shown against the op in the run view
+    @property
+    def metadata(self):
+        return {
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "db_round_trips": self.db_round_trips,
+            "db_bytes_sent_estimate": self.db_bytes_sent_estimate,
+        }
+
+
+# measure the block of an op and record it to etl_op_metrics, whether the block succeeds or fails. the op sets
+# rows_in and rows_out on the yielded metrics and attaches .metadata to the output it yields afterwards.
+@contextmanager
+def op_metrics(context, package_name, run_cycle_id):
+    metrics = OpMetrics()
+    start_datetime = datetime.utcnow()
+    start = time.perf_counter()
+    token = _active_metrics.set(metrics)
+    error = None
+    try:
+        yield metrics
+    except Exception as e:
+        error = repr(e)[:3000]
+        raise
+    finally:
+        metrics.duration_seconds = time.perf_counter() - start
+        _active_metrics.reset(token)
+        _record(context, package_name, run_cycle_id, start_datetime, metrics, error)
+
+
+def _record(context, package_name, run_cycle_id, start_datetime, metrics, error):
+    session = context.resources.met_etl_db_session
+    try:
+        # drop whatever a failed op left half done before writing its metrics
+        if error is not None:
+            session.rollback()
+        session.add(EtlOpMetricsModel(runcycle_id=run_cycle_id,
+                                      run_id=context.run_id,
+                                      packagename=package_name,
+                                      op_name=context.op_def.name,
+                                      startdatetime=start_datetime,
+                                      duration_seconds=metrics.duration_seconds,
+                                      rows_in=metrics.rows_in,
+                                      rows_out=metrics.rows_out,
+                                      db_round_trips=metrics.db_round_trips,
+                                      db_bytes_sent_estimate=metrics.db_bytes_sent_estimate,
+                                      success=error is None,
+                                      error=error))
+        session.commit()
+    except Exception as e:
+        # metrics are best effort, they must never fail the load
+        session.rollback()
+        context.log.warning(f"could not record metrics for {context.op_def.name}: {e!r}")
+
+    context.log.info(f"{context.op_def.name}: {metrics.metadata}")
@@ -0,0 +1,72 @@
+# print the throughput of each etl op over its recent runs, to spot the stage that slows down as data grows.
+#   cd src/etl_project/services && python -m utils.op_metrics_report --runs 10 [--package submission]
+import argparse
+from statistics import median
+
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+
+from analytics_api.models.etl_op_metrics import EtlOpMetrics as EtlOpMetricsModel
+from resources.db import analytics_session
+
+
+def _throughput(metrics):
+    if not metrics.duration_seconds:
+        return None
+    # extract ops only count the rows they produce, load ops the rows they read
+    return (metrics.rows_in or metrics.rows_out or 0) / metrics.duration_seconds
+
+
+def _format(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def report(session, runs, package_name=None):
+    # number the runs of each op newest first in the database, so only the last runs of each are fetched
+    run_number = func.row_number().over(
+        partition_by=(EtlOpMetricsModel.packagename, EtlOpMetricsModel.op_name),
+        order_by=EtlOpMetricsModel.startdatetime.desc()).label("run_number")
+    query = session.query(EtlOpMetricsModel, run_number).filter(EtlOpMetricsModel.success == True)
+    if package_name:
+        query = query.filter(EtlOpMetricsModel.packagename == package_name)
+    ranked = query.subquery()
+    recent = aliased(EtlOpMetricsModel, ranked)
+
+    by_op = {}
+    for metrics in session.query(recent).filter(ranked.c.run_number <= runs).order_by(
+            recent.packagename, recent.op_name, ranked.c.run_number):
+        by_op.setdefault((metrics.packagename, metrics.op_name), []).append(metrics)
+
+    lines = [f"{'package':<18}{'op':<32}{'runs':>5}{'rows in':>10}{'rows out':>10}{'secs':>9}{'rows/s':>10}"
+             f"{'db trips':>10}{'vs median':>11}"]
+    for (package, op_name), op_runs in sorted(by_op.items()):
+        latest = op_runs[0]
+        throughput = _throughput(latest)
+        earlier = [value for value in (_throughput(metrics) for metrics in op_runs[1:]) if value]
+        # change of the latest run against the median of the runs before it
+        trend = None
+        if throughput is not None and earlier:
+            trend = (throughput / median(earlier) - 1) * 100
+
+        lines.append(f"{package:<18}{op_name:<32}{len(op_runs):>5}{_format(latest.rows_in, 'd'):>10}"
+                     f"{_format(latest.rows_out, 'd'):>10}"
+                     f"{_format(latest.duration_seconds, '.2f'):>9}{_format(throughput, '.1f'):>10}"
+                     f"{latest.db_round_trips:>10}{_format(trend, '+.0f') + ('%' if trend is not None else ''):>11}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per op throughput of the recent met-etl runs.")
+    parser.add_argument("--runs", type=int, default=10, help="number of recent runs per op to compare")
+    parser.add_argument("--package", help="only show the ops of this package, e.g. submission")
+    args = parser.parse_args()
+
+    session = analytics_session()
+    try:
+        print(report(session, args.runs, args.package))
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
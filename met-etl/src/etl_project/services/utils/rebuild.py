@@ -0,0 +1,123 @@
+import os
+import re
+
+from sqlalchemy import MetaData, text
+
+from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from analytics_api.models.response_type_option import ResponseTypeOption as EtlResponseTypeOptionModel
+from analytics_api.models.user_response_detail import UserResponseDetail as EtlUserResponseDetailModel
+
+# number of engagement buckets a rebuild is split into. a submission belongs to bucket engagement_id % count.
+# changing it between preparing a rebuild and swapping it in means starting the rebuild again.
+REBUILD_PARTITION_COUNT = int(os.getenv("MET_ETL_REBUILD_PARTITIONS", 8))
+
+# the tables a rebuild reloads from scratch. surveys and engagements are small and are kept up to date by
+# met_data_ingestion, only the submission derived tables are worth rebuilding.
+REBUILD_MODELS = (EtlResponseTypeOptionModel, EtlUserResponseDetailModel)
+
+STAGING_SUFFIX = "_rebuild"
+
+# run cycle packages of the three steps. each partition has a package of its own, so the swap can tell which
+# partitions have been loaded.
+PREPARE_PACKAGE_NAME = 'submission_rebuild_prepare'
+PARTITION_PACKAGE_NAME = 'submission_rebuild'
+SWAP_PACKAGE_NAME = 'submission_rebuild_swap'
+
+
+def partition_package_name(partition):
+    return f"{PARTITION_PACKAGE_NAME}_{partition}"
+
+
+# the run cycle of the latest prepared rebuild and whether it has been swapped in yet, or (None, False) when no
+# rebuild has ever been prepared
+def latest_rebuild(session):
+    prepared = session.query(EtlRunCycleModel).filter(
+        EtlRunCycleModel.packagename == PREPARE_PACKAGE_NAME, EtlRunCycleModel.success == True).order_by(
+        EtlRunCycleModel.id.desc()).first()
+    if prepared is None:
+        return None, False
+
+    swapped = session.query(EtlRunCycleModel.id).filter(
+        EtlRunCycleModel.packagename == SWAP_PACKAGE_NAME, EtlRunCycleModel.success == True,
+        EtlRunCycleModel.id > prepared.id).first() is not None
+    return prepared, swapped
+
+
+def staging_name(name):
+    return f"{name}{STAGING_SUFFIX}"
+
+
+# a copy of the model's table under the staging name, for inserts and deletes against the staging table
+def staging_table(model):
+    return model.__table__.to_metadata(MetaData(), name=staging_name(model.__tablename__))
+
+
+# (re)create an empty staging table for every rebuilt table, with the same columns, defaults, keys and indexes
+# as the live one. constraints and indexes get the staging suffix on their names and lose it again on the swap,
+# so the swapped in table matches what the migrations created.
+def prepare_staging(session):
+    for model in REBUILD_MODELS:
+        table = model.__tablename__
+        staging = staging_name(table)
+        session.execute(text(f'DROP TABLE IF EXISTS "{staging}"'))
+        session.execute(text(f'CREATE TABLE "{staging}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+
+        for name, definition in _constraints(session, table):
+            session.execute(text(f'ALTER TABLE "{staging}" ADD CONSTRAINT "{staging_name(name)}" {definition}'))
+
+        for name, definition in _indexes(session, table):
+            definition = re.sub(rf'^CREATE (UNIQUE )?INDEX {name} ON (ONLY )?((?:\w+\.)?){table} ',
+                                rf'CREATE \1INDEX {staging_name(name)} ON \2\3{staging} ', definition)
+            session.execute(text(definition))
+
+
+# replace every live table with its staging table in the current transaction. readers see the old rows until
+# the caller commits and the rebuilt rows after, never a mix or an empty table.
+def swap_staging(session):
+    for model in REBUILD_MODELS:
+        table = model.__tablename__
+        staging = staging_name(table)
+        constraint_names = [name for name, _ in _constraints(session, staging)]
+        index_names = [name for name, _ in _indexes(session, staging)]
+
+        # the id sequence belongs to the live table, hand it over before the live table and its owned objects go
+        sequence = session.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table}).scalar()
+        if sequence:
+            session.execute(text(f'ALTER SEQUENCE {sequence} OWNED BY "{staging}".id'))
+
+        session.execute(text(f'DROP TABLE "{table}"'))
+        session.execute(text(f'ALTER TABLE "{staging}" RENAME TO "{table}"'))
+        # renaming a primary key or unique constraint renames its index as well
+        for name in constraint_names:
+            session.execute(text(f'ALTER TABLE "{table}" RENAME CONSTRAINT "{name}" TO "{_live_name(name)}"'))
+        for name in index_names:
+            session.execute(text(f'ALTER INDEX "{name}" RENAME TO "{_live_name(name)}"'))
+
+        # a survey that was republished while the rebuild ran was loaded under the survey row that was active
+        # then, point its responses at the active one like load_survey does for the live tables
+        session.execute(text(f'''
+            UPDATE "{table}" AS staged SET survey_id = active.id
+            FROM survey AS replaced, survey AS active
+            WHERE staged.survey_id = replaced.id AND replaced.is_active = false
+              AND active.source_survey_id = replaced.source_survey_id AND active.is_active = true'''))
+
+
+def _live_name(name):
+    return name[:-len(STAGING_SUFFIX)] if name.endswith(STAGING_SUFFIX) else name
+
+
+def _constraints(session, table):
+    return session.execute(text('''
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = CAST(:table AS regclass) AND contype IN ('p', 'u', 'f')
+        ORDER BY contype DESC, conname'''), {"table": table}).all()
+
+
+# the indexes that don't back a constraint, those come with the constraint
+def _indexes(session, table):
+    return session.execute(text('''
+        SELECT index_class.relname, pg_get_indexdef(index_class.oid) FROM pg_index
+        JOIN pg_class AS index_class ON index_class.oid = pg_index.indexrelid
+        WHERE pg_index.indrelid = CAST(:table AS regclass)
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE pg_constraint.conindid = pg_index.indexrelid)
+        ORDER BY index_class.relname'''), {"table": table}).all()
@@ -0,0 +1,151 @@
+from analytics_api.utils.util import FormIoComponentType
+
+# comments for a category type question have a different format in the source system and aren't used for
+# analytics yet, so they're left out until the key is finalized there.
+SKIPPED_COMPONENT_KEYS = {'categorycommentcontainer'}
+
+_NOT_FOUND = object()
+
+
+# compile the questions of a survey form into (answer key, flatten function) pairs. the option value -> label
+# maps are built once here, so flattening a submission is a dict lookup per answer rather than a walk through
+# every option of every question. components of a type that isn't loaded to analytics are left out.
+def compile_extractor(form_json):
+    extractors = []
+    for component in form_components(form_json):
+        key = component.get('key')
+        if key is None or key in SKIPPED_COMPONENT_KEYS:
+            continue
+
+        compile_component = _COMPILERS.get((component.get('type') or '').lower())
+        if compile_component:
+            extractors.append((key, compile_component(component)))
+    return extractors
+
+
+# flatten the answers of one submission into (request_key, value, request_id) tuples
+def extract_responses(extractors, submission_json):
+    for key, flatten in extractors:
+        answer = submission_json.get(key)
+
+        # skip if answer is not present or no option was selected (eg. in radio buttons or dropdown)
+        if answer is None or answer == '':
+            continue
+
+        yield from flatten(answer)
+
+
+# the question components of a form, across all the pages of a multi page form
+def form_components(form_json):
+    if not form_json:
+        return []
+
+    components = form_json.get('components') or []
+    form_type = form_json.get('display', None)
+
+    # single page survey
+    if form_type == 'form':
+        return components
+
+    # multi page survey
+    if form_type == 'wizard':
+        return [component for page in components for component in (page.get('components') or [])]
+
+    return []
+
+
+def _first_labels(options):
+    labels = {}
+    for option in options or []:
+        labels.setdefault(option.get('value'), option.get('label'))
+    return labels
+
+
+def _last_labels(options):
+    return {option.get('value'): option.get('label') for option in options or []}
+
+
+# radio responses just have the value of the selected option, so the label has to be found from the question
+def _compile_radio(component, options=None):
+    key = component['key']
+    request_id = component['id']
+    labels = _first_labels(component.get('values') if options is None else options)
+
+    def flatten(answer):
+        label = labels.get(str(answer), _NOT_FOUND)
+        if label is not _NOT_FOUND:
+            yield key, label, request_id
+
+    return flatten
+
+
+# select responses work like radios, with the options under data
+def _compile_select(component):
+    return _compile_radio(component, (component.get('data') or {}).get('values') or [])
+
+
+# checkbox responses are a map of option value -> checked, each checked option is a row
+def _compile_checkbox(component):
+    key = component['key']
+    request_id = component['id']
+    labels = _last_labels(component.get('values'))
+
+    def flatten(answer):
+        if not isinstance(answer, dict):
+            return
+
+        for value, checked in answer.items():
+            if _is_truthy(checked):
+                yield key, labels.get(value), request_id
+
+    return flatten
+
+
+# survey (likert) responses are a map of sub question -> selected value. the id is the same for all the sub
+# questions, so the request key and id are combined with the sub question key
+def _compile_survey(component):
+    key = component['key']
+    request_id = component['id']
+    labels = _last_labels(component.get('values'))
+
+    def flatten(answer):
+        if not isinstance(answer, dict):
+            return
+
+        for question, value in answer.items():
+            yield f'{key}-{question}', labels.get(value), f'{request_id}-{question}'
+
+    return flatten
+
+
+# ranking responses are a list of {statementId, statement, rank}, one row per ranked statement
+def _compile_ranking(component):
+    key = component['key']
+    request_id = component['id']
+
+    def flatten(answer):
+        if not isinstance(answer, list):
+            return
+
+        for item in answer:
+            statement_id = str(item.get('statementId', ''))
+            rank = item.get('rank')
+            if statement_id and rank is not None and rank != '':
+                yield f'{key}-{statement_id}', str(rank), f'{request_id}-{statement_id}'
+
+    return flatten
+
+
+def _is_truthy(answer):
+    if isinstance(answer, str):
+        return answer.casefold() in ('yes', 'true')
+    return answer is True
+
+
+_COMPILERS = {
+    FormIoComponentType.RADIO.value: _compile_radio,
+    FormIoComponentType.CHECKBOX.value: _compile_checkbox,
+    FormIoComponentType.SELECTLIST.value: _compile_select,
+    FormIoComponentType.SURVEY.value: _compile_survey,
+    FormIoComponentType.RANKING.value: _compile_ranking,
+}
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+from dagster import DagsterRunStatus, Failure
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from analytics_api.models.package_watermark import PackageWatermark as PackageWatermarkModel
+
+IN_FLIGHT_STATUSES = {DagsterRunStatus.QUEUED, DagsterRunStatus.NOT_STARTED, DagsterRunStatus.STARTING,
+                      DagsterRunStatus.STARTED, DagsterRunStatus.CANCELING}
+
+
+# insert a new run cycle row for the package with the success status as false and return its id.
+# the id comes from the table's sequence, so packages starting in parallel never claim the same one.
+def start_run_cycle(met_etl_db_session, package_name, description):
+    new_run_cycle_id = _add_run_cycle(met_etl_db_session, package_name, description)
+    met_etl_db_session.commit()
+
+    return new_run_cycle_id
+
+
+# start a run cycle for the package and claim the package for this dagster run. fails when another run that is
+# still in progress holds the package, e.g. a manual run launched while the scheduled one is loading. a claim
+# left behind by a run that failed or was killed is taken over. returns the end time of the package's last
+# successful run cycle (None on the first run) and the new run cycle id.
+def start_package_run(context, met_etl_db_session, package_name, description):
+    watermark = lock_watermark(met_etl_db_session, package_name)
+
+    holder = watermark.running_run_id
+    if holder and holder != context.run_id and _is_in_flight(context, holder):
+        met_etl_db_session.rollback()
+        raise Failure(description=f"{package_name} is already being loaded by run {holder}")
+
+    new_run_cycle_id = _add_run_cycle(met_etl_db_session, package_name, description)
+    watermark.running_runcycle_id = new_run_cycle_id
+    watermark.running_run_id = context.run_id
+    last_enddatetime = watermark.last_enddatetime
+    met_etl_db_session.commit()
+
+    return last_enddatetime, new_run_cycle_id
+
+
+# mark the run cycle successful, move the package's watermark up to it and release the package
+def end_package_run(met_etl_db_session, package_name, run_cycle_id, description):
+    watermark = lock_watermark(met_etl_db_session, package_name)
+    end_datetime = datetime.utcnow()
+
+    run_cycle = met_etl_db_session.get(EtlRunCycleModel, run_cycle_id)
+    run_cycle.success = True
+    run_cycle.enddatetime = end_datetime
+    run_cycle.description = description
+
+    watermark.last_runcycle_id = run_cycle_id
+    watermark.last_enddatetime = end_datetime
+    if run_cycle.change_log_horizon is not None:
+        watermark.change_log_horizon = run_cycle.change_log_horizon
+    if watermark.running_runcycle_id == run_cycle_id:
+        watermark.running_runcycle_id = None
+        watermark.running_run_id = None
+
+    met_etl_db_session.commit()
+
+
+# the package's watermark row, created on the package's first run and locked until the session commits.
+# starting, ending and rewinding a package all go through this lock, so they never interleave.
+def lock_watermark(met_etl_db_session, package_name):
+    met_etl_db_session.execute(
+        pg_insert(PackageWatermarkModel).values(packagename=package_name).on_conflict_do_nothing())
+    return met_etl_db_session.query(PackageWatermarkModel).filter(
+        PackageWatermarkModel.packagename == package_name).with_for_update().populate_existing().one()
+
+
+def _add_run_cycle(met_etl_db_session, package_name, description):
+    run_cycle = EtlRunCycleModel(packagename=package_name, startdatetime=datetime.utcnow(), enddatetime=None,
+                                 description=description, success=False)
+    met_etl_db_session.add(run_cycle)
+    met_etl_db_session.flush()
+    return run_cycle.id
+
+
+def _is_in_flight(context, run_id):
+    run = context.instance.get_run_by_id(run_id)
+    return run is not None and run.status in IN_FLIGHT_STATUSES
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the ops import their helpers as top level modules, the way the user code image lays them out
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "etl_project", "services"))
@@ -0,0 +1,31 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from ops.submission_etl_service import build_response_rows
+
+
+def _checkbox_survey():
+    return {
+        "display": "form",
+        "components": [{
+            "key": "colours",
+            "id": "q1",
+            "type": "simplecheckboxes",
+            "values": [{"value": "red", "label": "Red"}, {"value": "blank", "label": ""}],
+        }],
+    }
+
+
+def test_build_response_rows_dedups_like_the_unique_index():
+    # an option missing from the form flattens to None and a blank label to '', which the unique index on
+    # md5(coalesce(value, '')) treats as the same answer
+    now = datetime(2024, 1, 1)
+    met_survey = SimpleNamespace(id=1, updated_date=now, form_json=_checkbox_survey())
+    submission = SimpleNamespace(id=10, participant_id=5, created_date=now, updated_date=now,
+                                 submission_json={"colours": {"red": True, "removed": True, "blank": True}})
+
+    rows = build_response_rows({}, submission, met_survey, SimpleNamespace(id=2), 7)
+
+    assert [(row["request_key"], row["value"]) for row in rows] == [("colours", "Red"), ("colours", None)]
+    keys = [(row["source_submission_id"], row["request_key"], row["value"] or "") for row in rows]
+    assert len(keys) == len(set(keys))